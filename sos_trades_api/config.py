@@ -65,6 +65,8 @@ class Config:
     CONFIG_FLAVOR_KUBERNETES = "CONFIG_FLAVOR_KUBERNETES"
     CONFIG_FLAVOR_POD_EXECUTION = "PodExec"
     CONFIG_KEYCLOAK_GROUP_LIST = "KEYCLOAK_GROUP_LIST"
+    CONFIG_PARALLEL_POST_PROCESSING = "SOS_TRADES_PARALLEL_POST_PROCESSING"
+    CONFIG_MAX_UPLOAD_SIZE = "SOS_TRADES_MAX_UPLOAD_SIZE"
 
     def __init__(self):
         """
@@ -382,6 +384,29 @@ class Config:
 
         return self.__study_pod_delay
 
+    @property
+    def parallel_post_processing(self):
+        """
+        parallel post-processing (get)
+        optional, False by default
+        Generate the charts of a study in forked processes, to enable only on servers
+        having spare cores and memory for the duplicated study
+
+        :return boolean
+        """
+        return self.__server_config_file.get(self.CONFIG_PARALLEL_POST_PROCESSING, False) is True
+
+    @property
+    def max_upload_size(self):
+        """
+        max upload size (get)
+        optional
+        Maximum size in bytes of a file uploaded in several parts (stand-alone study zip)
+
+        :return int, None if not set
+        """
+        return self.__server_config_file.get(self.CONFIG_MAX_UPLOAD_SIZE)
+
     @property
     def local_folder_path(self):
         """
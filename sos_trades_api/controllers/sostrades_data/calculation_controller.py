@@ -30,7 +30,6 @@ from sos_trades_api.controllers.sostrades_data.study_case_controller import get_
 from sos_trades_api.models.calculation_dashboard import CalculationDashboard
 from sos_trades_api.models.database_models import (
     PodAllocation,
-    Process,
     StudyCase,
     StudyCaseDisciplineStatus,
     StudyCaseExecution,
@@ -45,6 +44,7 @@ from sos_trades_api.tools.allocation_management.allocation_management import (
     create_and_load_allocation,
     delete_pod_allocation,
 )
+from sos_trades_api.tools.cache.process_catalogue_cache import get_process_catalogue
 from sos_trades_api.tools.code_tools import file_tail
 from sos_trades_api.tools.execution.execution_engine_subprocess import (
     ExecutionEngineSubprocess,
@@ -406,7 +406,7 @@ def get_calculation_dashboard():
     Retrieve all the study cases, groups names running
     """
     # Get existing process name
-    all_process = Process.query.all()
+    all_process = get_process_catalogue().get_processes()
 
     process_names = []
     repository_names = []
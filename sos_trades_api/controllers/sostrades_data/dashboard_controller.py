@@ -59,4 +59,70 @@ def save_study_dashboard_in_file(dashboard_data):
     study_manager = StudyCaseManager(dashboard_data['study_case_id'])
     dashboard = Dashboard.deserialize(dashboard_data)
     study_manager.write_dashboard_json_file(dashboard)
-    return
\ No newline at end of file
+    return
+
+
+def get_study_dashboard_changes(study_id, since_version=None):
+    """
+    get the dashboard layout with the content of the items changed since the version the client has
+     :param: study_id, id of the study
+     :type: integer
+     :param: since_version, dashboard version already known by the client, None to get all the items
+     :type: integer
+    """
+    study_manager = StudyCaseManager(study_id)
+    return study_manager.get_dashboard_store().get_changes(since_version)
+
+
+def add_study_dashboard_item(study_id, item, position=None):
+    """
+    add an item to the study dashboard without rewriting the other items
+     :param: study_id, id of the study
+     :type: integer
+     :param: item, serialised dashboard item
+     :type: dict
+     :param: position, position of the item in the dashboard, at the end if not given
+     :type: integer
+    """
+    study_manager = StudyCaseManager(study_id)
+    return study_manager.get_dashboard_store().add_item(item, position)
+
+
+def update_study_dashboard_item(study_id, item_id, item):
+    """
+    replace the content of an item of the study dashboard
+     :param: study_id, id of the study
+     :type: integer
+     :param: item_id, identifier of the item in the dashboard
+     :type: str
+     :param: item, serialised dashboard item
+     :type: dict
+    """
+    study_manager = StudyCaseManager(study_id)
+    return study_manager.get_dashboard_store().update_item(item_id, item)
+
+
+def move_study_dashboard_item(study_id, item_id, position):
+    """
+    move an item of the study dashboard
+     :param: study_id, id of the study
+     :type: integer
+     :param: item_id, identifier of the item in the dashboard
+     :type: str
+     :param: position, new position of the item in the dashboard
+     :type: integer
+    """
+    study_manager = StudyCaseManager(study_id)
+    return study_manager.get_dashboard_store().move_item(item_id, position)
+
+
+def remove_study_dashboard_item(study_id, item_id):
+    """
+    remove an item of the study dashboard
+     :param: study_id, id of the study
+     :type: integer
+     :param: item_id, identifier of the item in the dashboard
+     :type: str
+    """
+    study_manager = StudyCaseManager(study_id)
+    return study_manager.get_dashboard_store().remove_item(item_id)
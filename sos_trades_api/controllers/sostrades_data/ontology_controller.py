@@ -561,12 +561,12 @@ def load_ontology_general_information():
 
 
 @ontology_enable({})
-def load_n2_matrix(treeview):
+def load_n2_matrix(treenode):
     """
-    Regarding the given treeview object, generate the n2 matrix parameters associated to the process
+    Regarding the given treeview data, generate the n2 matrix parameters associated to the process
 
-    :params: treeview
-    :type: sostrades_core.tools.tree.treeview.Treeview
+    :params: treenode, serialized treeview (reduced to the coupling variables, see get_n2_treenode)
+    :type: dict
 
     :return: tuple of parameters
     """
@@ -576,7 +576,7 @@ def load_n2_matrix(treeview):
 
     complete_url = f"{ontology_endpoint}/n2"
 
-    data = {"treeview": treeview.to_dict()}
+    data = {"treeview": treenode}
 
     try:
         resp = requests.request(
@@ -21,13 +21,13 @@ from sos_trades_api.controllers.sostrades_data.ontology_controller import (
     load_ontology_processes,
 )
 from sos_trades_api.models.database_models import (
-    Process,
     ReferenceStudy,
     StudyCase,
     User,
 )
 from sos_trades_api.models.loaded_process import LoadedProcess
 from sos_trades_api.models.study_case_dto import StudyCaseDto
+from sos_trades_api.tools.cache.process_catalogue_cache import get_process_catalogue
 from sos_trades_api.tools.right_management.functional.process_access_right import (
     ProcessAccess,
 )
@@ -70,11 +70,11 @@ def api_get_processes_for_user(user: User) -> List[LoadedProcess]:
             authorized_process_list, key=lambda res: res.process_name.lower())
 
         # Adding reference list
-        all_references = ReferenceStudy.query.filter(ReferenceStudy.execution_status == ReferenceStudy.FINISHED).all()
+        catalogue = get_process_catalogue()
 
         for authorized_process in authorized_process_list:
-            process_references = list(
-                filter(lambda ref_process: ref_process.process_id == authorized_process.id, all_references))
+            process_references = [reference for reference in catalogue.get_process_references(authorized_process.id)
+                                  if reference.execution_status == ReferenceStudy.FINISHED]
             process_ref_list = []
             for ref in process_references:
                 new_ref = StudyCaseDto()
@@ -109,7 +109,7 @@ def api_get_processes_for_dashboard() -> List[LoadedProcess]:
     Retrieve all database processes
 
     """
-    all_processes = Process.query.all()
+    all_processes = get_process_catalogue().get_processes()
 
     results = []
 
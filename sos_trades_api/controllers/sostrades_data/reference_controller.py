@@ -35,6 +35,10 @@ from sos_trades_api.tools.allocation_management.allocation_management import (
     delete_pod_allocation,
     get_allocation_status,
 )
+from sos_trades_api.tools.cache.process_catalogue_cache import (
+    bump_catalogue_version,
+    get_process_catalogue,
+)
 from sos_trades_api.tools.reference_management.reference_generation_subprocess import (
     ReferenceGenerationSubprocess,
 )
@@ -80,6 +84,7 @@ def generate_reference(repository_name:str, process_name:str, usecase_name:str,
         gen_ref_status.user_id = user_id
 
         db.session.add(gen_ref_status)
+        bump_catalogue_version()
         db.session.commit()
 
         #create pod allocation, launch pod in case of kubernetes strategy
@@ -107,6 +112,7 @@ def generate_reference(repository_name:str, process_name:str, usecase_name:str,
                     "creation_date": None,
                 },
             )
+            bump_catalogue_version()
             db.session.commit()
             raise ex
 
@@ -162,10 +168,23 @@ def get_all_references(user_id, logger):
     """
     all_references_proc_ref_tuple_list = []
 
-    all_references = ReferenceStudy.query.all()
     process_access = ProcessAccess(user_id)
     authorized_process_list = process_access.get_authorized_process()
 
+    # Load only the references of the processes the user can manage or contribute to
+    catalogue = get_process_catalogue()
+    references_by_process = {}
+    for authorized_process in authorized_process_list:
+        if authorized_process.is_manager or authorized_process.is_contributor:
+            references_by_process[authorized_process.id] = [
+                reference.id for reference in catalogue.get_process_references(authorized_process.id)]
+
+    reference_ids = [reference_id for reference_ids in references_by_process.values() for reference_id in reference_ids]
+    all_references = {}
+    if len(reference_ids) > 0:
+        all_references = {reference.id: reference for reference in
+                          ReferenceStudy.query.filter(ReferenceStudy.id.in_(reference_ids)).all()}
+
     # Apply Ontology
     processes_metadata = []
     repositories_metadata = []
@@ -183,8 +202,9 @@ def get_all_references(user_id, logger):
 
     for authorized_process in authorized_process_list:
         # Retrieve references for process
-        process_references = list(filter(lambda ref_process: ref_process.process_id == authorized_process.id
-                            and (authorized_process.is_manager or authorized_process.is_contributor), all_references))
+        process_references = [all_references[reference_id]
+                              for reference_id in references_by_process.get(authorized_process.id, [])
+                              if reference_id in all_references]
         for proc_ref in process_references:
 
             new_usecase = StudyCaseDto()
@@ -275,6 +295,7 @@ def stop_generation(reference_id):
             reference = ReferenceStudy.query.filter(ReferenceStudy.id.like(reference_id)).first()
             reference.execution_status = ReferenceStudy.STOPPED
             db.session.add(reference)
+            bump_catalogue_version()
             db.session.commit()
 
         except Exception as error:
@@ -284,6 +305,7 @@ def stop_generation(reference_id):
             reference_study.generation_logs = error
             reference.execution_status = ReferenceStudy.STOPPED
             db.session.add(reference_study)
+            bump_catalogue_version()
             db.session.commit()
 
             raise error
@@ -327,6 +349,8 @@ def get_reference_status_from_allocation(reference, pod_allocation):
         ReferenceStudy.query.filter(ReferenceStudy.id == reference.id)\
             .update({"execution_status": ReferenceStudy.POD_ERROR,
                     "generation_logs": pod_status + error_msg})
+        if reference.execution_status != ReferenceStudy.POD_ERROR:
+            bump_catalogue_version()
 
         reference.execution_status = ReferenceStudy.POD_ERROR
         reference.generation_logs = pod_status + error_msg
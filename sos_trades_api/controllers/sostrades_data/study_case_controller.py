@@ -14,6 +14,8 @@ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 See the License for the specific language governing permissions and
 limitations under the License.
 '''
+import base64
+import json
 import os
 import shutil
 from datetime import datetime, timedelta, timezone
@@ -21,9 +23,9 @@ from io import BytesIO
 from os.path import join
 from shutil import rmtree
 
-from sostrades_core.tools.tree.deserialization import isevaluatable
-from sostrades_core.tools.tree.serializer import DataSerializer
-from sqlalchemy.sql.expression import and_, desc
+from sqlalchemy import DateTime, func
+from sqlalchemy.orm import defer
+from sqlalchemy.sql.expression import and_, desc, or_
 
 from sos_trades_api.controllers.error_classes import (
     InvalidFile,
@@ -65,10 +67,13 @@ from sos_trades_api.tools.coedition.coedition import (
     CoeditionMessage,
     UserCoeditionAction,
     add_notification_db,
+    delete_orphan_change_blobs,
+    get_change_old_value_blob,
 )
 from sos_trades_api.tools.execution.execution_tools import (
     update_study_case_execution_status,
 )
+from sos_trades_api.tools.file_stream.csv_parameter_reader import evaluate_literal_cell
 from sos_trades_api.tools.loading.study_case_manager import StudyCaseManager
 from sos_trades_api.tools.loading.study_read_only_rw_manager import (
     StudyReadOnlyRWHelper,
@@ -84,6 +89,15 @@ from sos_trades_api.tools.study_management.study_management import (
 Study case Functions
 """
 
+# default number of notifications by page of the study case notifications list
+NOTIFICATIONS_PAGE_SIZE = 20
+
+# default number of studies by page of the user study list
+STUDY_LIST_PAGE_SIZE = 50
+# study attributes the user study list can be sorted by
+STUDY_LIST_SORT_ATTRIBUTES = ("creation_date", "modification_date", "name", "process", "group_name")
+STUDY_LIST_DEFAULT_SORT = "creation_date"
+
 
 def create_empty_study_case(
     user_identifier: int,
@@ -314,11 +328,8 @@ def copy_study(source_study_case_identifier, new_study_identifier, user_identifi
         try:
             study_case_manager = StudyCaseManager(new_study_identifier)
 
-            # Copy dm.pkl in the new
-            study_case_manager.copy_pkl_file(DataSerializer.pkl_filename, study_case_manager, study_manager_source)
-
-            # Copy disciplines_status.pkl in the new directory
-            study_case_manager.copy_pkl_file(DataSerializer.disc_status_filename, study_case_manager, study_manager_source)
+            # Copy dm.pkl, disciplines_status.pkl and cache files in the new directory
+            study_case_manager.copy_study_files_from(study_manager_source)
 
             # Copy log file from studyExecutionLog
             if study_execution is not None:
@@ -551,6 +562,11 @@ def delete_study_cases_and_allocation(studies):
                 execution_allocations = PodAllocation.query.filter(PodAllocation.identifier.in_(studies), PodAllocation.pod_type == PodAllocation.TYPE_EXECUTION).all()
                 for allocation in execution_allocations:
                     db.session.delete(allocation)
+
+                # remove the old values of the deleted changes that are not shared with other studies
+                db.session.flush()
+                delete_orphan_change_blobs()
+
                 # delete studies
                 db.session.commit()
                 app.logger.info(f"Deletion of studies ({','.join(str(study) for study in studies)}) has been successfully commited")
@@ -590,117 +606,288 @@ def get_user_shared_study_case(user_identifier: int):
             all_user_studies, key=lambda res: res.creation_date, reverse=True,
         )
 
-        # Apply Ontology
-        processes_metadata = []
-        repositories_metadata = []
+        add_user_studies_information(user_identifier, all_user_studies)
 
-        # Iterate through study to aggregate needed information's
-        for user_study in all_user_studies:
+        result = sorted(all_user_studies, key=lambda res: res.is_favorite, reverse=True)
 
-            # Manage gathering of all data needed for the ontology request
-            process_key = f"{user_study.repository}.{user_study.process}"
-            if process_key not in processes_metadata:
-                processes_metadata.append(process_key)
+    return result
 
-            repository_key = user_study.repository
 
-            if repository_key not in repositories_metadata:
-                repositories_metadata.append(repository_key)
+def get_user_shared_study_case_page(user_identifier: int, process: str = None, repository: str = None,
+                                    group_identifier: int = None, execution_status: str = None,
+                                    favorite: bool = None, search: str = None,
+                                    sort_by: str = STUDY_LIST_DEFAULT_SORT, descending: bool = True,
+                                    cursor: str = None, page_size: int = STUDY_LIST_PAGE_SIZE):
+    """
+    Retrieve one page of the study cases shared with the user, filtered and sorted.
+    Filters are applied on the study access list, the expensive information (ontology, execution and pod status,
+    read only availability) is retrieved only for the studies of the page
 
-            if not user_study.is_stand_alone:
-                add_study_information_on_status(user_study)
+    :param user_identifier: user identifier for which available study will be extracted
+    :type user_identifier: int
+    :param process: keep only the studies of this process
+    :type process: str
+    :param repository: keep only the studies of this repository
+    :type repository: str
+    :param group_identifier: keep only the studies owned by this group
+    :type group_identifier: int
+    :param execution_status: keep only the studies with this execution status
+    :type execution_status: str
+    :param favorite: keep only the favorite (True) or not favorite (False) studies of the user
+    :type favorite: bool
+    :param search: keep only the studies whose name contains this text (case insensitive)
+    :type search: str
+    :param sort_by: study attribute used to sort the list (one of STUDY_LIST_SORT_ATTRIBUTES)
+    :type sort_by: str
+    :param descending: sort order
+    :type descending: bool
+    :param cursor: cursor returned with the previous page, first page if None
+    :type cursor: str
+    :param page_size: maximum number of studies in the page
+    :type page_size: int
+    :return: dict with the page studies, the cursor of the next page (None for the last page) and the total count
+    """
+    if sort_by not in STUDY_LIST_SORT_ATTRIBUTES:
+        raise InvalidStudy(f"Study list cannot be sorted by {sort_by}, available: {', '.join(STUDY_LIST_SORT_ATTRIBUTES)}")
+
+    favorite_study_identifiers = {
+        favorite_study.study_case_id
+        for favorite_study in UserStudyFavorite.query.filter(UserStudyFavorite.user_id == user_identifier).all()
+    }
+
+    # Filters on the study attributes are applied by the study list query
+    study_case_filters = []
+    if process is not None:
+        study_case_filters.append(StudyCase.process == process)
+    if repository is not None:
+        study_case_filters.append(StudyCase.repository == repository)
+    if group_identifier is not None:
+        study_case_filters.append(StudyCase.group_id == group_identifier)
+    if favorite is not None:
+        study_case_filters.append(StudyCase.id.in_(favorite_study_identifiers) if favorite
+                                  else StudyCase.id.notin_(favorite_study_identifiers))
+    if search:
+        study_case_filters.append(func.lower(StudyCase.name).contains(search.lower(), autoescape=True))
+
+    # Access rights, filters, sort and pagination are applied by the database, only the page studies are loaded
+    study_case_access = StudyCaseAccess(user_identifier, load_study_cases=False)
+    owner_right = AccessRights.query.filter(AccessRights.access_right == AccessRights.OWNER).first()
+    sort_column = get_study_list_sort_column(sort_by)
+
+    studies_query = (
+        db.session.query(StudyCase.id, sort_column)
+        .join(StudyCaseAccessGroup, and_(StudyCaseAccessGroup.study_case_id == StudyCase.id,
+                                         StudyCaseAccessGroup.right_id == owner_right.id))
+        .join(Group, Group.id == StudyCaseAccessGroup.group_id)
+        .filter(study_case_access.get_user_study_cases_criterion(), *study_case_filters)
+    )
 
-        process_metadata = load_processes_metadata(processes_metadata)
-        repository_metadata = load_repositories_metadata(repositories_metadata)
+    if execution_status is not None:
+        # studies without execution are not executed
+        studies_query = studies_query.outerjoin(StudyCaseExecution,
+                                                StudyCaseExecution.id == StudyCase.current_execution_id)
+        execution_status_criterion = StudyCaseExecution.execution_status == execution_status
+        if execution_status == StudyCaseExecution.NOT_EXECUTED:
+            execution_status_criterion = or_(execution_status_criterion, StudyCaseExecution.id.is_(None))
+        studies_query = studies_query.filter(execution_status_criterion)
+
+    total_count = studies_query.count()
+
+    # Position after the cursor (sort value and identifier of the last study of the previous page)
+    if cursor is not None:
+        cursor_value, cursor_identifier = decode_study_list_cursor(cursor, sort_column)
+        studies_query = studies_query.filter(
+            get_study_list_cursor_criterion(sort_column, descending, cursor_value, cursor_identifier))
+    if descending:
+        studies_query = studies_query.order_by(sort_column.desc(), StudyCase.id.desc())
+    else:
+        studies_query = studies_query.order_by(sort_column.asc(), StudyCase.id.asc())
+
+    # one more study tells if there is a next page
+    page_rows = studies_query.limit(page_size + 1).all()
+    next_cursor = None
+    if len(page_rows) > page_size:
+        page_rows = page_rows[:page_size]
+        next_cursor = encode_study_list_cursor(page_rows[-1])
+
+    page_studies = []
+    page_identifiers = [study_identifier for study_identifier, _ in page_rows]
+    if len(page_identifiers) > 0:
+        study_case_access.retrieve_user_study_cases(study_case_filters=[StudyCase.id.in_(page_identifiers)])
+        user_studies_by_id = {user_study.id: user_study for user_study in study_case_access.user_study_cases}
+        page_studies = [user_studies_by_id[study_identifier] for study_identifier in page_identifiers
+                        if study_identifier in user_studies_by_id]
+
+    add_user_studies_information(user_identifier, page_studies, favorite_study_identifiers)
 
-        # Get all study identifier
-        all_study_identifier = [user_study.id for user_study in all_user_studies]
+    return {
+        "studies": page_studies,
+        "next_cursor": next_cursor,
+        "total_count": total_count,
+    }
 
-        # Retrieve all favorite study
-        all_favorite_studies = (
-            UserStudyFavorite.query.filter(
+
+def get_study_list_sort_column(sort_by):
+    """
+    Return the column sorting the study list, StudyCase sort columns are indexed with the identifier
+    """
+    if sort_by == "group_name":
+        return Group.name
+    return getattr(StudyCase, sort_by)
+
+
+def get_study_list_cursor_criterion(sort_column, descending, cursor_value, cursor_identifier):
+    """
+    Return the criterion keeping the studies after the cursor in the (sort column, identifier) order.
+    Null sort values are the lowest ones, as ordered by MySQL and SQLite
+    """
+    if descending:
+        if cursor_value is None:
+            return and_(sort_column.is_(None), StudyCase.id < cursor_identifier)
+        return or_(sort_column < cursor_value,
+                   and_(sort_column == cursor_value, StudyCase.id < cursor_identifier),
+                   sort_column.is_(None))
+    if cursor_value is None:
+        return or_(sort_column.isnot(None), StudyCase.id > cursor_identifier)
+    return or_(sort_column > cursor_value,
+               and_(sort_column == cursor_value, StudyCase.id > cursor_identifier))
+
+
+def encode_study_list_cursor(study_row) -> str:
+    """
+    Encode the identifier and sort value of the last study of a page into an opaque cursor
+    """
+    study_identifier, sort_value = study_row
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    return base64.urlsafe_b64encode(json.dumps([sort_value, study_identifier]).encode()).decode()
+
+
+def decode_study_list_cursor(cursor, sort_column) -> tuple:
+    """
+    Decode a cursor returned by get_user_shared_study_case_page into the sort value and the study identifier
+    """
+    try:
+        sort_value, study_identifier = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(study_identifier, int) or not isinstance(sort_value, (str, type(None))):
+            raise ValueError("Invalid cursor content")
+        if sort_value is not None and isinstance(sort_column.type, DateTime):
+            sort_value = datetime.fromisoformat(sort_value)
+        return (sort_value, study_identifier)
+    except (ValueError, TypeError):
+        raise InvalidStudy("Invalid study list cursor")
+
+
+def add_user_studies_information(user_identifier: int, user_studies: list, favorite_study_identifiers=None):
+    """
+    Update the given studies with the ontology, user favorite and last opened information,
+    read only availability and execution and creation status
+
+    :param user_identifier: user identifier for which the studies are requested
+    :type user_identifier: int
+    :param user_studies: studies to update
+    :type user_studies: sos_trades_api.models.study_case_dto.StudyCaseDto[]
+    :param favorite_study_identifiers: identifiers of the user favorite studies if already retrieved
+    :type favorite_study_identifiers: set
+    """
+    if len(user_studies) == 0:
+        return
+
+    # Apply Ontology
+    processes_metadata = []
+    repositories_metadata = []
+
+    # Iterate through study to aggregate needed information's
+    for user_study in user_studies:
+
+        # Manage gathering of all data needed for the ontology request
+        process_key = f"{user_study.repository}.{user_study.process}"
+        if process_key not in processes_metadata:
+            processes_metadata.append(process_key)
+
+        repository_key = user_study.repository
+
+        if repository_key not in repositories_metadata:
+            repositories_metadata.append(repository_key)
+
+        if not user_study.is_stand_alone:
+            add_study_information_on_status(user_study)
+
+    process_metadata = load_processes_metadata(processes_metadata)
+    repository_metadata = load_repositories_metadata(repositories_metadata)
+
+    # Get all study identifier
+    all_study_identifier = [user_study.id for user_study in user_studies]
+
+    # Retrieve all favorite study
+    if favorite_study_identifiers is None:
+        favorite_study_identifiers = {
+            favorite_study.study_case_id
+            for favorite_study in UserStudyFavorite.query.filter(
                 UserStudyFavorite.study_case_id.in_(all_study_identifier),
             )
             .filter(UserStudyFavorite.user_id == user_identifier)
             .all()
-        )
-        all_favorite_studies_identifier = [
-            favorite_study.study_case_id for favorite_study in all_favorite_studies
-        ]
-
-        # Retrieve all last studies opened
-        all_last_studies_opened = (
-            UserLastOpenedStudy.query.filter(UserLastOpenedStudy.study_case_id.in_(all_study_identifier))
-            .filter(UserLastOpenedStudy.user_id == user_identifier)
-            .all()
-        )
-        all_last_studies_opened_identifier = [
-            last_study.study_case_id for last_study in all_last_studies_opened
-        ]
-
-        # Get all related study case execution id
-        all_study_case_execution_identifiers = [
-            user_study.current_execution_id
-            for user_study in filter(
-                lambda s: s.current_execution_id is not None, all_user_studies,
-            )
-        ]
-        
-
-        # Final loop to update study dto
-        for user_study in all_user_studies:
-
-            # Update ontology display name
-            user_study.apply_ontology(process_metadata, repository_metadata)
+        }
 
-            # Manage favorite study list
-            if user_study.id in all_favorite_studies_identifier:
-                user_study.is_favorite = True
+    # Retrieve all last studies opened
+    all_last_studies_opened = (
+        UserLastOpenedStudy.query.filter(UserLastOpenedStudy.study_case_id.in_(all_study_identifier))
+        .filter(UserLastOpenedStudy.user_id == user_identifier)
+        .all()
+    )
+    last_studies_opening_date = {
+        last_study.study_case_id: last_study.opening_date for last_study in all_last_studies_opened
+    }
+
+    # Get all related study case execution
+    all_study_case_execution_identifiers = [
+        user_study.current_execution_id
+        for user_study in filter(
+            lambda s: s.current_execution_id is not None, user_studies,
+        )
+    ]
+    all_study_case_execution = []
+    if len(all_study_case_execution_identifiers) > 0:
+        all_study_case_execution = StudyCaseExecution.query.filter(
+            StudyCaseExecution.id.in_(all_study_case_execution_identifiers),
+        ).all()
+    study_case_execution_by_study = {
+        study_case_execution.study_case_id: study_case_execution for study_case_execution in all_study_case_execution
+    }
 
-            # Manage last study opened list
-            if user_study.id in all_last_studies_opened_identifier:
-                # refresh all study opened:
-                all_last_studies_opened = (
-                    UserLastOpenedStudy.query.filter(UserLastOpenedStudy.study_case_id.in_(all_study_identifier))
-                    .filter(UserLastOpenedStudy.user_id == user_identifier)
-                    .all()
-                )
-                for last_study_opened in all_last_studies_opened:
-                    if last_study_opened.study_case_id == user_study.id:
-                        user_study.opening_date = last_study_opened.opening_date
+    # Final loop to update study dto
+    for user_study in user_studies:
 
-                user_study.is_last_study_opened = True
+        # Update ontology display name
+        user_study.apply_ontology(process_metadata, repository_metadata)
 
-            # Display empty string if study pod flavor is None
-            if user_study.study_pod_flavor is None:
-                user_study.study_pod_flavor = ""
-            user_study.has_read_only_file = check_read_only_mode_available(user_study.id)
+        # Manage favorite study list
+        if user_study.id in favorite_study_identifiers:
+            user_study.is_favorite = True
 
-            if user_study.is_stand_alone:
-                continue
+        # Manage last study opened list
+        if user_study.id in last_studies_opening_date:
+            user_study.opening_date = last_studies_opening_date[user_study.id]
+            user_study.is_last_study_opened = True
 
-            # Manage execution status
-            all_study_case_execution = StudyCaseExecution.query.filter(
-                StudyCaseExecution.id.in_(all_study_case_execution_identifiers),
-            ).all()
-            study_case_execution = list(
-                filter(
-                    lambda sce: sce.study_case_id == user_study.id,
-                    all_study_case_execution,
-                ),
-            )
-            if study_case_execution is None or len(study_case_execution) == 0:
-                user_study.execution_status = StudyCaseExecution.NOT_EXECUTED
-            else:
-                current_execution = study_case_execution[0]
-                if current_execution.execution_status != StudyCaseExecution.FINISHED:
-                    update_study_case_execution_status(user_study.id, current_execution)
-                user_study.execution_status = current_execution.execution_status
-                user_study.error = current_execution.message
+        # Display empty string if study pod flavor is None
+        if user_study.study_pod_flavor is None:
+            user_study.study_pod_flavor = ""
+        user_study.has_read_only_file = check_read_only_mode_available(user_study.id)
 
-        result = sorted(all_user_studies, key=lambda res: res.is_favorite, reverse=True)
+        if user_study.is_stand_alone:
+            continue
 
-    return result
+        # Manage execution status
+        current_execution = study_case_execution_by_study.get(user_study.id)
+        if current_execution is None:
+            user_study.execution_status = StudyCaseExecution.NOT_EXECUTED
+        else:
+            if current_execution.execution_status != StudyCaseExecution.FINISHED:
+                update_study_case_execution_status(user_study.id, current_execution)
+            user_study.execution_status = current_execution.execution_status
+            user_study.error = current_execution.message
 
 
 def get_user_study_case(user_identifier: int, study_identifier: int):
@@ -797,32 +984,52 @@ def get_change_file_stream(notification_identifier, parameter_key):
     )
 
     if change is not None:
-        if change.old_value_blob is not None:
-            return BytesIO(change.old_value_blob)
+        old_value_blob = get_change_old_value_blob(change)
+        if old_value_blob is not None:
+            return BytesIO(old_value_blob)
 
     raise InvalidFile(f"Error, cannot retrieve change file {parameter_key}.csv")
 
 
-def get_study_case_notifications(study_identifier):
+def get_study_case_notifications(study_identifier, page=None, page_size=NOTIFICATIONS_PAGE_SIZE):
     """
-    Get study case notification list
+    Get study case notification list, most recent first, with their changes
 
     :param study_identifier: study identifier to look
     :type study_identifier: int
-    :return: sos_trades_api.models.database_models.Notification[]
+    :param page: index (starting at 0) of the page of notifications to return, all notifications are returned if None
+    :type page: int
+    :param page_size: number of notifications by page
+    :type page_size: int
+    :return: sos_trades_api.models.study_notification.StudyNotification[]
     """
     notification_list = []
 
     with app.app_context():
-
-        notification_query = (
-            Notification.query.filter(Notification.study_case_id == study_identifier)
-            .order_by(Notification.created.desc())
+        # notifications are ordered by identifier (same order than creation date) to use the study_case_id index
+        notification_ids_query = (
+            db.session.query(Notification.id)
+            .filter(Notification.study_case_id == study_identifier)
+            .order_by(Notification.id.desc())
+        )
+        if page is not None:
+            notification_ids_query = notification_ids_query.limit(page_size).offset(page * page_size)
+        notification_ids = notification_ids_query.subquery()
+
+        # notifications and their changes are retrieved in one query, old value blobs are not loaded
+        rows = (
+            db.session.query(Notification, StudyCaseChange, StudyCaseChange.old_value_blob.isnot(None))
+            .join(notification_ids, Notification.id == notification_ids.c.id)
+            .outerjoin(StudyCaseChange, StudyCaseChange.notification_id == Notification.id)
+            .options(defer(StudyCaseChange.old_value_blob))
+            .order_by(Notification.id.desc(), StudyCaseChange.last_modified.desc(), StudyCaseChange.id.desc())
             .all()
         )
 
-        if len(notification_query) > 0:
-            for notif in notification_query:
+        notifications_by_id = {}
+        for notif, ch, has_old_value_blob in rows:
+            new_notif = notifications_by_id.get(notif.id)
+            if new_notif is None:
                 new_notif = StudyNotification(
                     notif.id,
                     notif.created,
@@ -831,43 +1038,45 @@ def get_study_case_notifications(study_identifier):
                     notif.message,
                     [],
                 )
-                if notif.type == UserCoeditionAction.SAVE or notif.type == UserCoeditionAction.EXPORT:
-                    changes_query = (
-                        StudyCaseChange.query.filter(
-                            StudyCaseChange.notification_id == notif.id,
-                        )
-                        .order_by(StudyCaseChange.last_modified.desc())
-                        .all()
-                    )
-
-                    if len(changes_query) > 0:
-                        notif_changes = []
-                        for ch in changes_query:
-                            new_change = StudyCaseChange()
-                            new_change.id = ch.id
-                            new_change.notification_id = notif.id
-                            new_change.variable_id = ch.variable_id
-                            new_change.variable_type = ch.variable_type
-                            new_change.change_type = ch.change_type
-                            new_change.new_value = isevaluatable(ch.new_value)
-                            new_change.old_value = isevaluatable(ch.old_value)
-                            new_change.old_value_blob = ch.old_value_blob
-                            new_change.last_modified = ch.last_modified
-                            new_change.deleted_columns = ch.deleted_columns
-                            new_change.dataset_connector_id = ch.dataset_connector_id
-                            new_change.dataset_id = ch.dataset_id
-                            new_change.dataset_parameter_id = ch.dataset_parameter_id
-                            new_change.dataset_data_path = ch.dataset_data_path
-                            new_change.variable_key = ch.variable_key
-                            notif_changes.append(new_change)
-
-                        new_notif.changes = notif_changes
-
+                notifications_by_id[notif.id] = new_notif
                 notification_list.append(new_notif)
 
+            if ch is not None and (notif.type == UserCoeditionAction.SAVE or notif.type == UserCoeditionAction.EXPORT):
+                new_change = StudyCaseChange()
+                new_change.id = ch.id
+                new_change.notification_id = notif.id
+                new_change.variable_id = ch.variable_id
+                new_change.variable_type = ch.variable_type
+                new_change.change_type = ch.change_type
+                new_change.new_value = evaluate_literal_cell(ch.new_value)
+                new_change.old_value = evaluate_literal_cell(ch.old_value)
+                # only the presence of the old value file is serialized, the blob is retrieved with get_change_file_stream
+                new_change.old_value_blob = True if has_old_value_blob else None
+                new_change.old_value_blob_id = ch.old_value_blob_id
+                new_change.last_modified = ch.last_modified
+                new_change.deleted_columns = ch.deleted_columns
+                new_change.dataset_connector_id = ch.dataset_connector_id
+                new_change.dataset_id = ch.dataset_id
+                new_change.dataset_parameter_id = ch.dataset_parameter_id
+                new_change.dataset_data_path = ch.dataset_data_path
+                new_change.variable_key = ch.variable_key
+                new_notif.changes.append(new_change)
+
         return notification_list
 
 
+def get_study_case_notifications_count(study_identifier):
+    """
+    Get the number of notifications of a study case
+
+    :param study_identifier: study identifier to look
+    :type study_identifier: int
+    :return: int
+    """
+    with app.app_context():
+        return Notification.query.filter(Notification.study_case_id == study_identifier).count()
+
+
 def create_new_notification_after_update_parameter(study_id, change_type, coedition_action, user):
     """
     Create a new notification after updating a parameter in the study.
@@ -15,23 +15,36 @@ limitations under the License.
 '''
 
 import json
+import os
 import threading
 from datetime import datetime
 from os.path import join
+from shutil import copyfileobj
 from tempfile import gettempdir
-from zipfile import ZipFile
+from zipfile import BadZipFile, ZipFile
 
+from sos_trades_api.config import Config
 from sos_trades_api.controllers.error_classes import InvalidFile, StudyCaseError
 from sos_trades_api.controllers.sostrades_data.study_case_controller import (
     create_empty_study_case,
 )
 from sos_trades_api.models.database_models import StudyCase
 from sos_trades_api.server.base_server import app
+from sos_trades_api.tools.file_stream.chunked_upload import (
+    UPLOAD_BLOCK_SIZE,
+    UPLOAD_MAX_FILE_SIZE,
+    ChunkedUploadError,
+    ChunkedUploadSession,
+)
+from sos_trades_api.tools.gzip_tools import generate_base64_stream
 from sos_trades_api.tools.loading.study_case_manager import StudyCaseManager
 from sos_trades_api.tools.study_management.study_management import (
     update_study_case_creation_status,
 )
 
+# folder (in the data root folder) where stand-alone zip chunked uploads are stored
+STAND_ALONE_UPLOAD_FOLDER_NAME = "stand_alone_upload"
+
 
 def get_study_stand_alone_zip(study_id, file_name: str):
     """
@@ -53,40 +66,115 @@ def get_study_stand_alone_zip(study_id, file_name: str):
             f"The following study file raised this error while trying to zip it : {error}")
     return zip_file_path
 
+def get_study_stand_alone_zip_stream(study_id):
+    """
+    export study read only and data in a zip archive streamed chunk by chunk, no temporary file is written
+    Args:
+        study_id (int), id of the study to export
+    """
+    study_manager = StudyCaseManager(study_id)
+    zip_stream = study_manager.stream_study_read_only_zip()
+    if zip_stream is None:
+        raise InvalidFile(
+            f"The following study file raised this error while trying to zip it : "
+            f"Study {study_manager.study.name} has no read only to export")
+    return zip_stream
+
+
+def get_study_stand_alone_zip_base64_stream(study_id, file_name: str):
+    """
+    export study read only and data in a zip archive streamed as a base64 encoded json document
+    (to bypass proxy restrictions), the archive is encoded chunk by chunk
+    Args:
+        study_id (int), id of the study to export
+        file_name (str), name of the exported file
+    """
+    zip_stream = get_study_stand_alone_zip_stream(study_id)
+
+    def generate_json_document():
+        zip_size = 0
+
+        def count_zip_size(zip_stream):
+            nonlocal zip_size
+            for zip_chunk in zip_stream:
+                zip_size += len(zip_chunk)
+                yield zip_chunk
+
+        yield f'{{"filename": {json.dumps(file_name)}, "mimetype": "application/zip", "data": "'
+        yield from generate_base64_stream(count_zip_size(zip_stream))
+        # size is only known once the archive is written
+        yield f'", "size": {zip_size}}}'
+
+    return generate_json_document()
+
+
+def get_stand_alone_upload_folder() -> str:
+    """
+    Return the folder where stand-alone zip chunked uploads are stored (shared by the servers like study data)
+    """
+    return join(Config().data_root_dir, STAND_ALONE_UPLOAD_FOLDER_NAME)
+
+
+def read_study_stand_alone_metadata(zip_file_path: str):
+    """
+    Read and check the metadata of a stand-alone zip, only the zip central directory and the metadata
+    entry are read
+    Args:
+        zip_file_path (str), path of the zip file
+    """
+    study_metadata = None
+    try:
+        with ZipFile(zip_file_path, 'r') as zfile:
+            files_list = zfile.namelist()
+
+            # read metadata file
+            if "metadata.json" not in files_list:
+                raise InvalidFile(
+                    "The Study Stand alone zip file is not valid : the metadata file is missing")
+
+            with zfile.open("metadata.json") as metadata_file:
+
+                try:
+                    metadata = json.load(metadata_file)
+                    study_metadata = StudyCaseManager.UnboundStudyCase()
+                    study_metadata.deserialize_standalone(metadata)
+                except Exception as error:
+                    raise InvalidFile(
+                        f"Error while reading the metadata of the study stand-alone zip: {str(error)}")
+    except BadZipFile as error:
+        raise InvalidFile(f"The Study Stand alone zip file is not valid : {str(error)}")
+
+    if study_metadata is None:
+        raise InvalidFile(
+            "The Study Stand alone zip file is not valid : metadata not found")
+    return study_metadata
+
+
 def create_study_stand_alone_from_zip(user_id, group_id, zip_file):
     # check the zip content
     # read metadata
     # create studyCase in db
     # unzip files in read only folder
-    study_metadata = None
-    # save zip_file in temporary folder
+    # save zip_file in temporary folder, block by block
     tmp_folder = gettempdir()
     file_name = f"zip_study_{datetime.now().strftime('%d-%m-%Y-%H-%M-%S-%f')}.zip" 
     zip_file_path = join(tmp_folder, file_name)
     with open(zip_file_path, 'wb') as f:
-        f.write(zip_file.read())
+        copyfileobj(zip_file, f, UPLOAD_BLOCK_SIZE)
 
-    with ZipFile(zip_file_path, 'r') as zfile:
-        files_list = zfile.namelist()
+    try:
+        study_metadata = read_study_stand_alone_metadata(zip_file_path)
+    except Exception:
+        os.remove(zip_file_path)
+        raise
 
-        # read metadata file
-        if "metadata.json" not in files_list:
-            raise InvalidFile(
-                "The Study Stand alone zip file is not valid : the metadata file is missing")
-        
-        with zfile.open("metadata.json") as metadata_file:
+    return _create_study_stand_alone(user_id, group_id, study_metadata, zip_file_path)
 
-            try:
-                metadata = json.load(metadata_file)
-                study_metadata = StudyCaseManager.UnboundStudyCase()
-                study_metadata.deserialize_standalone(metadata)
-            except Exception as error:
-                raise InvalidFile(
-                    f"Error while reading the metadata of the study stand-alone zip: {str(error)}")
-    if study_metadata is None:
-        raise InvalidFile(
-            "The Study Stand alone zip file is not valid : metadata not found")
-            
+
+def _create_study_stand_alone(user_id, group_id, study_metadata, zip_file_path, upload_session=None):
+    """
+    Create the study case in database then write the zip files into the study folder in a thread
+    """
     # create study case
     study_case = create_empty_study_case(user_id, study_metadata.name, study_metadata.repository,
                                             study_metadata.process, group_identifier=group_id, reference=None, from_type=StudyCase.FROM_STANDALONE,
@@ -95,34 +183,139 @@ def create_study_stand_alone_from_zip(user_id, group_id, zip_file):
     # launch a thread that will write the zip files into the study folder
     threading.Thread(
                 target=save_study_data_from_zip,
-                args=(study_case.id, zip_file_path)).start()
+                args=(study_case.id, zip_file_path, upload_session)).start()
     
 
     return study_case
 
-def save_study_data_from_zip(study_case_id, zip_file_path:str):
+
+def create_stand_alone_upload_session(user_id, group_id, file_name, file_size):
+    """
+    Start a chunked upload of a stand-alone zip
+    Args:
+        user_id (int), id of the user uploading the file
+        group_id (int), id of the group of the study to create
+        file_name (str), name of the zip file
+        file_size (int), size of the zip file in bytes
+    """
+    upload_folder = get_stand_alone_upload_folder()
+    # abandoned uploads are removed with their pre-allocated file when new ones start
+    removed_sessions = ChunkedUploadSession.remove_expired_sessions(upload_folder)
+    if len(removed_sessions) > 0:
+        app.logger.info(f"{len(removed_sessions)} expired stand-alone upload sessions removed")
+    max_file_size = Config().max_upload_size
+    try:
+        upload_session = ChunkedUploadSession.create(
+            upload_folder, file_name, file_size, {"user_id": user_id, "group_id": group_id},
+            max_file_size if max_file_size is not None else UPLOAD_MAX_FILE_SIZE)
+    except ChunkedUploadError as error:
+        raise InvalidFile(str(error))
+    return upload_session
+
+
+def get_stand_alone_upload_session(user_id, session_id):
+    """
+    Retrieve a chunked upload session of the user
+    Args:
+        user_id (int), id of the user uploading the file
+        session_id (str), upload session identifier
+    """
+    try:
+        upload_session = ChunkedUploadSession(get_stand_alone_upload_folder(), session_id)
+    except ChunkedUploadError as error:
+        raise InvalidFile(str(error))
+    if upload_session.metadata.get("user_id") != user_id:
+        raise InvalidFile(f"Upload session {session_id} does not exist")
+    return upload_session
+
+
+def upload_stand_alone_part(user_id, session_id, part_index, offset, checksum, stream):
+    """
+    Write a part of a stand-alone zip chunked upload
+    Args:
+        user_id (int), id of the user uploading the file
+        session_id (str), upload session identifier
+        part_index (int), index of the part
+        offset (int), offset of the part in the zip file
+        checksum (str), sha256 hexadecimal digest of the part
+        stream (file-like object), part content
+    """
+    upload_session = get_stand_alone_upload_session(user_id, session_id)
+    try:
+        upload_session.write_part(part_index, offset, checksum, stream)
+    except ChunkedUploadError as error:
+        raise InvalidFile(str(error))
+    return upload_session
+
+
+def finalize_stand_alone_upload(user_id, session_id):
+    """
+    Check a stand-alone zip chunked upload is complete, validate its metadata and create the study,
+    the zip is extracted in a thread, progress can be followed with the upload session
+    Args:
+        user_id (int), id of the user uploading the file
+        session_id (str), upload session identifier
+    """
+    upload_session = get_stand_alone_upload_session(user_id, session_id)
+    if upload_session.status != ChunkedUploadSession.IN_PROGRESS:
+        raise InvalidFile(f"Upload session {session_id} is already finalized")
+    if not upload_session.is_complete():
+        raise InvalidFile(f"Upload session {session_id} is not complete, some parts are missing")
+
+    try:
+        # checked again under the session lock so that concurrent finalizations create one study,
+        # the zip cannot be modified by a part sent again once finalized
+        upload_session.finalize()
+    except ChunkedUploadError as error:
+        raise InvalidFile(str(error))
+
+    try:
+        study_metadata = read_study_stand_alone_metadata(upload_session.uploaded_file_path)
+    except InvalidFile as error:
+        upload_session.set_status(ChunkedUploadSession.IN_ERROR, error=str(error))
+        upload_session.delete_uploaded_file()
+        raise error
+
+    return _create_study_stand_alone(user_id, upload_session.metadata.get("group_id"), study_metadata,
+                                      upload_session.uploaded_file_path, upload_session)
+
+
+def save_study_data_from_zip(study_case_id, zip_file_path:str, upload_session=None):
     with app.app_context():
         update_study_case_creation_status(study_case_id, StudyCase.CREATION_IN_PROGRESS)
 
         study_case_manager = StudyCaseManager(study_case_id)
         try:
-            # unzip all files
+            # unzip files one by one, each file is written block by block
             with ZipFile(zip_file_path, 'r') as zfile:
-                zfile.extractall(study_case_manager.dump_directory)
+                zip_entries = zfile.infolist()
+                total_size = max(sum(zip_entry.file_size for zip_entry in zip_entries), 1)
+                extracted_size = 0
+                for zip_entry in zip_entries:
+                    zfile.extract(zip_entry, study_case_manager.dump_directory)
+                    extracted_size += zip_entry.file_size
+                    if upload_session is not None:
+                        upload_session.set_status(ChunkedUploadSession.FINALIZED,
+                                                  progress=int(100 * extracted_size / total_size))
         except Exception as error:
             error_msg = f"Study Stand alone creation error: {str(error)}"
             update_study_case_creation_status(study_case_id, StudyCase.CREATION_ERROR, error_msg)
+            if upload_session is not None:
+                upload_session.set_status(ChunkedUploadSession.IN_ERROR, error=error_msg)
             raise StudyCaseError(error_msg)
+        finally:
+            # the zip is not needed anymore once extracted
+            if upload_session is not None:
+                upload_session.delete_uploaded_file()
+            elif os.path.exists(zip_file_path):
+                os.remove(zip_file_path)
 
         # check that needed files are present 
         if not study_case_manager.check_study_standalone_files():
             error_msg = "Study Stand alone creation error: study case zip doesn't contain all necessary study files"
             update_study_case_creation_status(study_case_id, StudyCase.CREATION_ERROR, error_msg)
+            if upload_session is not None:
+                upload_session.set_status(ChunkedUploadSession.IN_ERROR, error=error_msg)
             raise StudyCaseError(error_msg)
         
         update_study_case_creation_status(study_case_id, StudyCase.CREATION_DONE)
-
-
-
-
-
@@ -324,13 +324,13 @@ def reset_user_password(user_id):
             reset_uuid = str(uuid.uuid4())
             user.reset_uuid = reset_uuid
 
-            # Generate reset link
-            reset_link = f'{app.config["SOS_TRADES_FRONT_END_DNS"]}/reset-password?token={user.reset_uuid}'
-            send_password_reset_mail(user, reset_link)
-
             db.session.add(user)
             db.session.commit()
 
+            # Generate reset link, sent once the token is saved so that the link is valid when received
+            reset_link = f'{app.config["SOS_TRADES_FRONT_END_DNS"]}/reset-password?token={user.reset_uuid}'
+            send_password_reset_mail(user, reset_link)
+
             return reset_link
         except Exception as ex:
             db.session.rollback()
@@ -16,12 +16,10 @@ limitations under the License.
 '''
 import importlib.util
 import os
-import shutil
 import sys
 import threading
 import traceback
 from datetime import datetime, timezone
-from os import remove
 from os.path import join
 from tempfile import gettempdir
 
@@ -38,7 +36,6 @@ from sostrades_core.tools.proc_builder.process_builder_parameter_type import (
     ProcessBuilderParameterType,
 )
 from sostrades_core.tools.rw.load_dump_dm_data import DirectLoadDump
-from sostrades_core.tools.tree.deserialization import isevaluatable
 from sostrades_core.tools.tree.serializer import DataSerializer
 from sostrades_core.tools.tree.treenode import TreeNode
 from sqlalchemy import desc
@@ -80,18 +77,20 @@ from sos_trades_api.tools.allocation_management.allocation_management import (
 )
 from sos_trades_api.tools.coedition.coedition import (
     CoeditionMessage,
+    StudyCaseChangesBatch,
     UserCoeditionAction,
-    add_change_db,
     add_notification_db,
+    delete_orphan_change_blobs,
 )
 from sos_trades_api.tools.data_graph_validation.data_graph_validation import (
     invalidate_namespace_after_save,
 )
+from sos_trades_api.tools.file_stream.csv_parameter_reader import read_csv_parameter
+from sos_trades_api.tools.file_stream.file_stream import copy_file_copy_on_write
 from sos_trades_api.tools.loading.loading_study_and_engine import (
     study_case_manager_export_from_dataset_mapping,
     study_case_manager_loading,
     study_case_manager_loading_from_reference,
-    study_case_manager_loading_from_study,
     study_case_manager_loading_from_usecase_data,
     study_case_manager_update,
     study_case_manager_update_from_dataset_mapping,
@@ -197,10 +196,13 @@ def light_load_study_case(study_id, reload=False):
 # END BACKGROUND LOADING FUNCTION section
 
 
-def get_study_case(user_id, study_case_identifier, study_access_right=None):
+def get_study_case(user_id, study_case_identifier, study_access_right=None, treeview_version=None):
     """
     get a loaded studycase in read only if needed or not, launch load_or_create if it is not in cache
 
+    :param treeview_version: version of the treeview the client already has, only the treeview changes
+        are returned if this version is still known
+    :type treeview_version: str
     """
     with app.app_context():
         # check if the study needs to be created or needs reload
@@ -226,7 +228,8 @@ def get_study_case(user_id, study_case_identifier, study_access_right=None):
         # get loaded study in edition mode or if there was a problem with read_only mode
         if loaded_study_case is None:
 
-            loaded_study_case = LoadedStudyCase(study_case_manager, no_data, read_only, user_id)
+            loaded_study_case = LoadedStudyCase(study_case_manager, no_data, read_only, user_id,
+                                                treeview_version=treeview_version)
             # update access rights
             if study_access_right == AccessRights.MANAGER:
                 loaded_study_case.study_case.is_manager = True
@@ -423,7 +426,8 @@ def _copy_study_case(study_id, source_study_case_identifier):
 
     """
     with app.app_context():
-        study_manager_source = study_case_cache.get_study_case(source_study_case_identifier, False)
+        # the source study is not loaded nor added to the cache, only its files are copied
+        study_manager_source = StudyCaseManager(source_study_case_identifier)
 
         # Copy the last study case execution and then update study_id, creation
         # date and request_by.
@@ -460,18 +464,8 @@ def _copy_study_case(study_id, source_study_case_identifier):
         try:
             study_manager = study_case_cache.get_study_case(study_case.id, False)
 
-            if study_manager.load_status == LoadStatus.NONE:
-                study_manager.load_status = LoadStatus.IN_PROGESS
-                threading.Thread(
-                    target=study_case_manager_loading_from_study,
-                    args=(study_manager, False, False, study_manager_source)).start()
-
-            if study_manager.load_status == LoadStatus.IN_ERROR:
-                raise InvalidStudy(study_manager.error_message)
-
-            # Update cache modification date and release study
-            study_case_cache.update_study_case_modification_date(
-                study_case.id, study_case.modification_date)
+            # Copy dm.pkl, disciplines_status.pkl and cache files in the new directory
+            study_manager.copy_study_files_from(study_manager_source)
 
             # Copy log file from studyExecutionLog
             if study_execution is not None:
@@ -480,16 +474,22 @@ def _copy_study_case(study_id, source_study_case_identifier):
                 if os.path.exists(file_path_initial):
                     file_path_final = study_manager.raw_log_file_path_absolute()
 
-                    # Create a folder if the thread 'study_case_manager_loading_from_study'
-                    # does not have time to create it
                     path_folder_final = os.path.dirname(file_path_final)
                     if not os.path.exists(path_folder_final):
-                        os.mkdir(path_folder_final)
-                    try:
-                        shutil.copyfile(file_path_initial, file_path_final)
-                    except BaseException as ex:
-                        raise ex
+                        os.makedirs(path_folder_final)
+                    copy_file_copy_on_write(file_path_initial, file_path_final)
+
+            study_case.creation_status = StudyCase.CREATION_DONE
+            db.session.add(study_case)
+            db.session.commit()
+            study_manager.study.creation_status = StudyCase.CREATION_DONE
 
+            # Update cache modification date
+            study_case_cache.update_study_case_modification_date(
+                study_case.id, study_case.modification_date)
+
+            # The study is left unloaded: its execution engine and read only mode are built from the copied
+            # files when it is opened, like any other study
         except:
 
             exc_type, exc_value, exc_traceback = sys.exc_info()
@@ -635,7 +635,8 @@ def get_dataset_export_error_message(study_id, notification_id):
     return study_manager.dataset_export_error_dict.get(notification_id, "")
 
 
-def update_study_parameters(study_id, user, files_list, file_info, parameters_to_save, columns_to_delete):
+def update_study_parameters(study_id, user, files_list, file_info, parameters_to_save, columns_to_delete,
+                            treeview_version=None):
     """
     Configure the study case in the data manager or dump the study case on disk from a parameters list
     :param: study_id, id of the study
@@ -648,6 +649,8 @@ def update_study_parameters(study_id, user, files_list, file_info, parameters_to
     :type: dictionary with notification change data on each file
     :param: parameters_to_save, list of parameters that changed
     :type: dictionary of parameters data
+    :param: treeview_version, version of the treeview the client has, to return only the treeview changes
+    :type: string
     """
     user_fullname = f"{user.firstname} {user.lastname}"
     user_department = user.department
@@ -657,28 +660,26 @@ def update_study_parameters(study_id, user, files_list, file_info, parameters_to
         study_manager = study_case_cache.get_study_case(study_id, True)
 
         # Create notification
+        changes_batch = None
         if parameters_to_save != [] or files_list is not None or columns_to_delete != []:
             # Add notification to database
             new_notification_id = add_notification_db(study_id, user, UserCoeditionAction.SAVE, CoeditionMessage.SAVE)
+            # Changes are inserted at once when all of them are collected
+            changes_batch = StudyCaseChangesBatch(new_notification_id)
 
         if files_list is not None:
             for file in files_list:
-                # Converted file stream to a data frame
-                # Write temporarly the received file
-                tmp_folder = gettempdir()
-                file_name = secure_filename(file.filename)
-                file_path = join(tmp_folder, file_name)
-                file.save(file_path)
-
-                # Create a dataframe from it
-                value = pd.read_csv(file_path, na_filter=False)
-
-                # Convert string to Python type if possible (list, tuple,
-                # etc..)
-                value = value.applymap(isevaluatable)
+                # Retrieve targeted parameter dataframe descriptor to choose columns converters
+                dataframe_descriptor = None
+                uuid_param = study_manager.execution_engine.dm.data_id_map.get(
+                    file_info[file.filename]["variable_id"])
+                if uuid_param in study_manager.execution_engine.dm.data_dict:
+                    dataframe_descriptor = study_manager.execution_engine.dm.data_dict[uuid_param].get(
+                        "dataframe_descriptor")
 
-                # Delete file
-                remove(file_path)
+                # Create a dataframe directly from the received file stream and
+                # convert string to Python type if possible (list, tuple, etc..)
+                value = read_csv_parameter(file.stream, dataframe_descriptor)
 
                 # Check column of dataframe
                 column_to_delete_str = ""
@@ -708,20 +709,19 @@ def update_study_parameters(study_id, user, files_list, file_info, parameters_to
                     old_value_bytes = old_value_stream.getvalue()
 
                 # Add change to database
-                add_change_db(new_notification_id,  # pylint: disable=possibly-used-before-assignment
-                              file_info[file.filename]["variable_id"],
-                              StudyCaseChange.CSV_CHANGE,
-                              column_to_delete_str,
-                              StudyCaseChange.CSV_CHANGE,
-                              None,
-                              None,
-                              old_value_bytes,
-                              datetime.now(),
-                              None,
-                              None,
-                              None,
-                              None,
-                              None)
+                changes_batch.add_change(file_info[file.filename]["variable_id"],
+                                         StudyCaseChange.CSV_CHANGE,
+                                         column_to_delete_str,
+                                         StudyCaseChange.CSV_CHANGE,
+                                         None,
+                                         None,
+                                         old_value_bytes,
+                                         datetime.now(),
+                                         None,
+                                         None,
+                                         None,
+                                         None,
+                                         None)
 
         values = {}
         for parameter in parameters_to_save:
@@ -824,36 +824,35 @@ def update_study_parameters(study_id, user, files_list, file_info, parameters_to
                         for colname in df_descriptor.keys():
                             type = df_descriptor[colname]
                             if type[0] == "array":
-                                list_array = []
-                                for row in list(value[colname]):
-                                    list_array.append(array(row))
-
-                                value[colname] = tuple(list_array)
+                                value[colname] = tuple(array(row) for row in value[colname].tolist())
                 else:
                     # Add standard parameter change
-                    try:
-                        add_change_db(new_notification_id,
-                                      parameter["variableId"],
-                                      parameter_dm_data_dict["type"],
-                                      parameter["columnDeleted"],
-                                      parameter["changeType"],
-                                      str(parameter["newValue"]),
-                                      str(parameter["oldValue"]),
-                                      None,
-                                      datetime.now(),
-                                      None,
-                                      None,
-                                      None,
-                                      None,
-                                      None)
-                    except Exception as error:
-                        app.logger.exception(f"Study change database insertion error: {error}")
+                    changes_batch.add_change(parameter["variableId"],
+                                             parameter_dm_data_dict["type"],
+                                             parameter["columnDeleted"],
+                                             parameter["changeType"],
+                                             str(parameter["newValue"]),
+                                             str(parameter["oldValue"]),
+                                             None,
+                                             datetime.now(),
+                                             None,
+                                             None,
+                                             None,
+                                             None,
+                                             None)
                 values[parameter["variableId"]] = value
 
                 # Invalidate all linked validation discipline
                 invalidate_namespace_after_save(study_manager.study.id, user_fullname, user_department,
                                                 parameter["namespace"])
 
+        if changes_batch is not None:
+            try:
+                changes_batch.commit()
+            except Exception as error:
+                db.session.rollback()
+                app.logger.exception(f"Study change database insertion error: {error}")
+
         if study_manager.load_status != LoadStatus.IN_PROGESS:
             study_manager.clear_error()
             study_manager.load_status = LoadStatus.IN_PROGESS
@@ -868,7 +867,7 @@ def update_study_parameters(study_id, user, files_list, file_info, parameters_to
 
         # Return logical treeview coming from execution engine
         loaded_study_case = LoadedStudyCase(
-            study_manager, False, False, user_id)
+            study_manager, False, False, user_id, treeview_version=treeview_version)
 
         # Get execution status
         loaded_study_case.study_case.execution_status = StudyCaseExecution.NOT_EXECUTED
@@ -903,6 +902,10 @@ def delete_study_cases(studies):
                     # Delete study from cache if it exist
                     study_case_cache.delete_study_case_from_cache(sc.id)
 
+                # remove the old values of the deleted changes that are not shared with other studies
+                db.session.flush()
+                delete_orphan_change_blobs()
+
                 db.session.commit()
             except Exception as ex:
                 db.session.rollback()
@@ -1007,7 +1010,7 @@ def set_study_data_file(study_identifier, files_list):
     db.session.commit()
 
 
-def copy_study_discipline_data(study_id, discipline_from, discipline_to):
+def copy_study_discipline_data(study_id, discipline_from, discipline_to, study_from_id=None):
     """
     Copy discipline data from a discipline to another
     :param: study_id, id of the study
@@ -1016,38 +1019,56 @@ def copy_study_discipline_data(study_id, discipline_from, discipline_to):
     :type: string
     :param: discipline_to, name of the discipline to update
     :type: string
+    :param: study_from_id, id of the study of the discipline to copy, the updated study if not given.
+        The data are read from the study data files if this study is not loaded
+    :type: integer
     """
     study_manager = study_case_cache.get_study_case(study_id, False)
-    # Check if each discipline key exisit in the current study case
-    if discipline_from in study_manager.execution_engine.dm.disciplines_dict and discipline_to \
-            in study_manager.execution_engine.dm.disciplines_dict:
-
-        results = {}
-
-        # Retrieve inputs data from the two disciplines using the datamanger dictionary to take into account
-        # parameter visibility aspects
+    source_study_manager = study_manager
+    if study_from_id is not None and study_from_id != study_id:
+        source_study_manager = study_case_cache.get_study_case(study_from_id, False)
 
-        for key, value in study_manager.execution_engine.dm.data_dict.items():
+    dm = study_manager.execution_engine.dm
+    # Check if each discipline key exisit in the current study case
+    if source_study_manager.load_status == LoadStatus.LOADED \
+            and discipline_from not in source_study_manager.execution_engine.dm.disciplines_id_map:
+        raise StudyCaseError(f"The discipline '{discipline_from}' does not exist in the source study case")
 
-            if key.startswith(discipline_from):
+    if discipline_to in dm.disciplines_id_map:
 
-                # Extract parameter name to update target discipline
-                from_parameter_name = key.replace(f"{discipline_from}.", "")
+        results = {}
 
-                # Build target parameter
-                to_parameter_key = f"{discipline_to}.{from_parameter_name}"
-                uuid_param = study_manager.execution_engine.dm.data_id_map[to_parameter_key]
-                if uuid_param in study_manager.execution_engine.dm.data_dict:
-                    study_manager.execution_engine.dm.data_dict[uuid_param][DataManager.VALUE] = value[
-                        DataManager.VALUE]
+        # Retrieve inputs data from the source discipline using the datamanger dictionary to take into account
+        # parameter visibility aspects, then update the target parameters at once
+        from_parameters_values = source_study_manager.get_namespace_parameters_values(discipline_from)
 
-                    results[uuid_param] = study_manager.execution_engine.dm.data_dict[uuid_param]
+        for from_parameter_name, value in from_parameters_values.items():
+            # Build target parameter
+            uuid_param = dm.data_id_map.get(f"{discipline_to}.{from_parameter_name}")
+            if uuid_param in dm.data_dict:
+                dm.data_dict[uuid_param][DataManager.VALUE] = value
+                results[uuid_param] = dm.data_dict[uuid_param]
 
         return results
 
     else:
         raise StudyCaseError(
-            f"One those two disciplines '{discipline_from}' or '{discipline_from}' does not exist in this study case")
+            f"One those two disciplines '{discipline_from}' or '{discipline_to}' does not exist in this study case")
+
+
+def get_study_cases_memory_footprint(refresh=False):
+    """
+    Get the estimated memory used by each study case in cache
+    :param: refresh, estimate again the memory used by the loaded study cases
+    :type: boolean
+    """
+    studies_footprints = study_case_cache.get_memory_footprints(refresh)
+    return {
+        "studies": studies_footprints,
+        "total": sum(study_footprint["memory_footprint"]["sizes"]["total"]
+                     for study_footprint in studies_footprints.values()
+                     if study_footprint["memory_footprint"] is not None),
+    }
 
 
 def clean_database_with_disabled_study_case(logger=None):
@@ -19,10 +19,22 @@ from sostrades_core.tools.post_processing.post_processing_factory import (
     PostProcessingFactory,
 )
 
+from sos_trades_api.controllers.error_classes import InvalidStudy
 from sos_trades_api.controllers.sostrades_main.study_case_controller import (
     light_load_study_case,
 )
-from sos_trades_api.server.base_server import study_case_cache
+from sos_trades_api.models.database_models import StudyCase
+from sos_trades_api.models.loaded_study_case import LoadStatus
+from sos_trades_api.server.base_server import chart_cache, db, study_case_cache
+from sos_trades_api.tools.cache.chart_cache import (
+    get_chart_key,
+    get_study_version_stamp,
+)
+from sos_trades_api.tools.chart_payload import ChartPayloadEncoder
+from sos_trades_api.tools.loading.study_case_manager import StudyCaseManager
+from sos_trades_api.tools.study_management.study_management import (
+    check_read_only_mode_available,
+)
 
 
 class PostProcessingError(Exception):
@@ -38,6 +50,7 @@ class PostProcessingError(Exception):
 def load_post_processing(study_id, namespace, filters, discipline_module=""):
     """
     load post processing regarding a namespace and a specific discipline inside this namespace
+    Charts are cached for the current version of the study data, the study is only loaded if they are not
 
     :params: study_id, study to  load
     :type: integer
@@ -50,28 +63,77 @@ def load_post_processing(study_id, namespace, filters, discipline_module=""):
 
     :return: tbd
     """
+    study_case = db.session.query(StudyCase.group_id, StudyCase.modification_date).filter(
+        StudyCase.id == study_id).first()
+    if study_case is None:
+        raise InvalidStudy(f"Requested study case (identifier {study_id}) does not exist in the database")
+
+    study_folder = StudyCaseManager.get_root_study_data_folder(study_case.group_id, study_id)
+    chart_key = get_chart_key(namespace, discipline_module, filters)
+    all_post_processing_data = chart_cache.get(
+        study_id, study_folder, get_study_version_stamp(study_case.modification_date), chart_key)
+    if all_post_processing_data is not None:
+        return all_post_processing_data
+
     study_manager = light_load_study_case(study_id)
 
-    all_post_processing_data = []
-    discipline_list = []
     post_processing_factory = PostProcessingFactory()
     all_post_processing_data = post_processing_factory.get_post_processings_by_discipline_name(
         namespace, discipline_module, study_manager.execution_engine, filters
     )
 
-    
+    # charts are stored for the version of the loaded study
+    chart_cache.set(study_id, study_folder, get_study_version_stamp(study_manager.study.modification_date),
+                    chart_key, all_post_processing_data)
 
     return all_post_processing_data
 
 
+def encode_post_processing_payload(post_processings, width=None, encoding=None, dtype="float64"):
+    """
+    Convert post-processings into a compact payload, the post-processings are not modified
+    (charts with all their points are sent again when no option is given)
+    :params: post_processings, post-processings to convert
+    :type: list
+    :params: width, number of pixels the charts are displayed on, denser series are downsampled to it
+    :type: integer
+    :params: encoding, "typed_array" to send numeric series as base64 little-endian typed arrays
+    :type: str
+    :params: dtype, type of the typed arrays values (float32 or float64)
+    :type: str
+    """
+    if width is not None and width < 3:
+        raise PostProcessingError(f"Chart width must be at least 3 pixels, got {width}")
+
+    payload_encoder = ChartPayloadEncoder(width, encoding == ChartPayloadEncoder.TYPED_ARRAY_ENCODING, dtype)
+    return payload_encoder.encode(post_processings)
+
+
+def get_chart_cache_statistics():
+    """
+    Return the hit and miss counters of the post-processing charts cache of this server
+    """
+    return chart_cache.statistics.serialize()
+
+
 def load_post_processing_graph_filters(study_id, discipline_key):
     """
     get post processing filters
+    Filters saved with the read only mode are used when the study is not loaded, the study is only loaded
+    if they are missing or if they have been saved for another execution
     :params: study_id, study id
     :type: integer
     :params: discipline_key, key of the discipline to load
     :type: string
     """
+    study_manager = study_case_cache.get_study_case(study_id, False)
+    if study_manager.load_status != LoadStatus.LOADED and check_read_only_mode_available(study_id):
+        current_execution_id = db.session.query(StudyCase.current_execution_id).filter(
+            StudyCase.id == study_id).scalar()
+        discipline_filters = study_manager.read_post_processing_filters_in_json_file(current_execution_id)
+        if discipline_filters is not None and discipline_key in discipline_filters:
+            return discipline_filters[discipline_key]
+
     study_manager = light_load_study_case(study_id)
 
     if discipline_key in study_manager.execution_engine.dm.disciplines_dict:
@@ -90,6 +152,17 @@ def load_post_processing_graph_filters(study_id, discipline_key):
             f"Discipline '{discipline_key}' does not exist in this study case.")
 
 
+def load_study_post_processings(study_id):
+    """
+    get post processing filters of all the study disciplines (loaded on demand when the post-processing panel is opened)
+    :params: study_id, study id
+    :type: integer
+    """
+    study_manager = light_load_study_case(study_id)
+
+    return study_manager.get_post_processings()
+
+
 def reset_study_from_cache(study_id):
     """
     Reset study from cache
@@ -97,6 +170,12 @@ def reset_study_from_cache(study_id):
     :type: integer
     """
     try:
+        # Cached charts are generated again from the reloaded study
+        study_case = StudyCase.query.filter(StudyCase.id == study_id).first()
+        if study_case is not None:
+            chart_cache.invalidate_study(
+                study_id, StudyCaseManager.get_root_study_data_folder(study_case.group_id, study_id))
+
         # Check if study is already in cache
         if study_case_cache.is_study_case_cached(study_id):
             # Remove outdated study from the cache
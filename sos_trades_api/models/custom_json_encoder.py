@@ -15,6 +15,7 @@ See the License for the specific language governing permissions and
 limitations under the License.
 '''
 import json
+import os
 from datetime import datetime
 from typing import Union
 
@@ -77,59 +78,137 @@ from sos_trades_api.models.study_notification import StudyNotification
 from sos_trades_api.models.user_application_right import UserApplicationRight
 from sos_trades_api.models.user_dto import UserDto
 
+# Optional orjson backend, used by the json provider when selected and installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
 """
 Class overlad defaut json encoder to manage our class
 """
 
+# environment variable selecting the json backend of the api responses (simplejson or orjson)
+JSON_BACKEND_ENVIRONMENT_VARIABLE = "SOS_TRADES_JSON_BACKEND"
+JSON_BACKEND_SIMPLEJSON = "simplejson"
+JSON_BACKEND_ORJSON = "orjson"
+
+
+def serialize_object(o):
+    return o.serialize()
+
+
+def convert_object_to_dict(o):
+    return o.to_dict()
+
+
+def encode_series(o):
+    """
+    Encode a pandas Series as a list, numeric values are converted at once with non finite values set to None
+    """
+    values = o.to_numpy()
+    if values.dtype.kind == "f":
+        return np.where(np.isfinite(values), values, None).tolist()
+    elif values.dtype.kind in "iub":
+        return values.tolist()
+    return list(o)
+
+
+def encode_numpy_floating(o):
+    return float(o) if np.isfinite(o) else None
+
+
+# (types, handler) rules, an object is encoded by the handler of the first rule its type matches
+JSON_ENCODING_RULES = [
+    ((AccessRightsSelectable, CalculationDashboard, EntityRight, EntityRights, Group, GroupAccessUser, Link, LoadedGroup, LoadedProcess, LoadedStudyCase, LoadedStudyCaseExecutionStatus, ModelStatus, News, PodAllocation, ReferenceStudy, StudyCase, StudyCaseChange, StudyCaseLog, StudyCaseValidation, StudyNotification, User, UserApplicationRight, UserDto, UserProfile, UserStudyPreference, Dashboard), serialize_object),
+    (DataFrame, lambda o: "://dataframe"),
+    (Index, lambda o: "://index"),
+    (np.ndarray, lambda o: "://ndarray"),
+    (np.bool_, bool),
+    (Series, encode_series),
+    (type, lambda o: str(o).lower()),
+    ((ChartFilter, InstanciatedTable, TableStyles, TwoAxesInstanciatedChart), convert_object_to_dict),
+    (np.integer, int),
+    (float, float),
+    (np.floating, encode_numpy_floating),
+    (complex, lambda o: o.real),
+    ((datetime, np.dtype), str),
+    (StudyCaseExecutionLog, serialize_object),
+    (Namespace, convert_object_to_dict),
+    ((AccessRights, GroupEntityRights, ProcessEntityRights, StudyCaseDto, StudyCaseEntityRights), serialize_object),
+    (PostProcessingBundle, convert_object_to_dict),
+    (InstantiatedPlotlyNativeChart, lambda o: o.to_plotly_dict()),
+    (set, list),
+]
+
+# handler of each encoded class, resolved from the rules the first time an instance is encoded
+__json_handlers = {}
+
+
+def get_json_handler(object_type):
+    """
+    Return the handler encoding the instances of a class, None if no rule matches it
+    """
+    try:
+        return __json_handlers[object_type]
+    except KeyError:
+        handler = None
+        for rule_types, rule_handler in JSON_ENCODING_RULES:
+            if issubclass(object_type, rule_types):
+                handler = rule_handler
+                break
+        __json_handlers[object_type] = handler
+        return handler
+
+
+def encode_json_object(o):
+    """
+    Encode an object not natively supported by the json backends
+    """
+    try:
+        handler = get_json_handler(type(o))
+    except Exception as e:
+        raise TypeError("Custom json encoder error for %s : %s" % (type(o).__name__, str(e))) from e
+
+    if handler is None:
+        # default, if not one of the specified object. Caller's problem if this is not serializable.
+        raise TypeError("Custom json encoder error for %s : Object of type %s is not JSON serializable"
+                        % (type(o).__name__, type(o).__name__))
+    try:
+        return handler(o)
+    except Exception as e:
+        raise TypeError("Custom json encoder error for %s : %s" % (type(o).__name__, str(e))) from e
+
+
 class CustomJsonEncoder(JSONEncoder):
     def __init__(self, *args, **kwargs):
         kwargs["ignore_nan"] = True
         super().__init__(*args, **kwargs)
 
     def default(self, o):  # pylint: disable=E0202
-        try:
-            if isinstance(o, (AccessRightsSelectable, CalculationDashboard, EntityRight, EntityRights, Group, GroupAccessUser, Link, LoadedGroup, LoadedProcess, LoadedStudyCase, LoadedStudyCaseExecutionStatus, ModelStatus, News, PodAllocation, ReferenceStudy, StudyCase, StudyCaseChange, StudyCaseLog, StudyCaseValidation, StudyNotification, User, UserApplicationRight, UserDto, UserProfile, UserStudyPreference, Dashboard)):
-                return o.serialize()
-            elif isinstance(o, DataFrame):
-                return "://dataframe"
-            elif isinstance(o, Index):
-                return "://index"
-            elif isinstance(o, np.ndarray):
-                return "://ndarray"
-            elif isinstance(o, np.bool_):
-                return bool(o)
-            elif isinstance(o, Series):
-                return list(o)
-            elif isinstance(o, type):
-                return str(o).lower()
-            elif isinstance(o, (ChartFilter, InstanciatedTable, TableStyles, TwoAxesInstanciatedChart)):
-                return o.to_dict()
-            elif isinstance(o, np.integer):
-                return int(o)
-            elif isinstance(o, float):
-                return float(o)
-            elif isinstance(o, complex):
-                return o.real
-            elif isinstance(o, (datetime, np.dtype)):
-                return str(o)
-            elif isinstance(o, StudyCaseExecutionLog):
-                return o.serialize()
-            elif isinstance(o, Namespace):
-                return o.to_dict()
-            elif isinstance(o, (AccessRights, GroupEntityRights, ProcessEntityRights, StudyCaseDto, StudyCaseEntityRights)):
-                return o.serialize()
-            elif isinstance(o, PostProcessingBundle):
-                return o.to_dict()
-            elif isinstance(o, InstantiatedPlotlyNativeChart):
-                return o.to_plotly_dict()
-            elif isinstance(o, set):
-                return list(o)
-
-            # default, if not one of the specified object. Caller's problem if this is not
-            # serializable.
-            return JSONEncoder.default(self, o)
-        except Exception as e:
-            raise TypeError("Custom json encoder error for %s : %s" % (type(o).__name__, str(e))) from e
+        return encode_json_object(o)
+
+
+def get_json_backend() -> str:
+    """
+    Return the json backend selected by the environment, simplejson if orjson is selected but not installed
+    """
+    if os.environ.get(JSON_BACKEND_ENVIRONMENT_VARIABLE, JSON_BACKEND_SIMPLEJSON) == JSON_BACKEND_ORJSON \
+            and ORJSON_AVAILABLE:
+        return JSON_BACKEND_ORJSON
+    return JSON_BACKEND_SIMPLEJSON
+
+
+def dumps_with_orjson(obj) -> str:
+    """
+    Serialize an object with orjson, giving the same json as the custom json encoder:
+    datetime and dataclass are encoded by the custom rules, numpy objects are not serialised natively
+    """
+    return orjson.dumps(obj, default=encode_json_object,
+                        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+                        | orjson.OPT_PASSTHROUGH_DATACLASS).decode()
 
 
 class CustomJsonProvider(JSONProvider):
@@ -137,7 +216,17 @@ class CustomJsonProvider(JSONProvider):
     Custom json provider class
     """
 
+    def __init__(self, app):
+        super().__init__(app)
+        self.json_backend = get_json_backend()
+
     def dumps(self, obj, **kwargs):
+        if self.json_backend == JSON_BACKEND_ORJSON and len(kwargs) == 0:
+            try:
+                return dumps_with_orjson(obj)
+            except TypeError:
+                # objects orjson does not support (integers over 64 bits for example)
+                pass
         kwargs["cls"] = CustomJsonEncoder
         return json.dumps(obj, **kwargs)
 
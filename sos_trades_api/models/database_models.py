@@ -23,11 +23,13 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     LargeBinary,
     String,
     Text,
     UniqueConstraint,
+    func,
 )
 from sqlalchemy.dialects.mysql.types import LONGBLOB, TEXT
 from werkzeug.security import check_password_hash, generate_password_hash
@@ -195,6 +197,8 @@ class Process(db.Model):
     name = Column(String(64), index=True)
     process_path = Column(String(255))
     disabled = Column(Boolean, default=False, nullable=False)
+    # fingerprint of the process directory when its references were last discovered
+    reference_discovery_fingerprint = Column(String(64), nullable=True)
 
     def serialize(self):
         """
@@ -252,6 +256,14 @@ class StudyCase(db.Model):
     execution_pod_flavor = Column(String(64), unique=False, nullable=True)
     is_stand_alone = Column(Boolean, default=False)
 
+    # keyset pagination of the study list, sorted by one of these columns then by identifier
+    __table_args__ = (
+        Index("ix_study_case_creation_date_id", "creation_date", "id"),
+        Index("ix_study_case_modification_date_id", "modification_date", "id"),
+        Index("ix_study_case_name_id", "name", "id"),
+        Index("ix_study_case_process_id", "process", "id"),
+    )
+
     def serialize(self):
         """
         json serializer for dto purpose
@@ -365,6 +377,10 @@ class UserStudyFavorite(db.Model):
                                name="fk_user_study_favorite_study_case_id"),
                            nullable=False)
 
+    __table_args__ = (
+        Index("ix_user_study_favorite_user_id_study_case_id", "user_id", "study_case_id"),
+    )
+
     def serialize(self):
         """
         json serializer for dto purpose
@@ -394,6 +410,10 @@ class UserLastOpenedStudy(db.Model):
                            nullable=False)
     opening_date = Column(DateTime(timezone=True), server_default=str(datetime.utcnow()))
 
+    __table_args__ = (
+        Index("ix_user_last_opened_study_user_id_study_case_id", "user_id", "study_case_id"),
+    )
+
     def serialize(self):
         """
         json serializer for dto purpose
@@ -643,6 +663,7 @@ class StudyCaseAccessGroup(db.Model):
 
     __table_args__ = (
         UniqueConstraint("group_id", "study_case_id"),
+        Index("ix_study_case_access_group_study_case_id_right_id", "study_case_id", "right_id"),
     )
 
     def serialize(self):
@@ -685,6 +706,17 @@ class Notification(db.Model):
         }
 
 
+class StudyCaseChangeBlob(db.Model):
+    """
+    Class that stores compressed the old values of the study case changes, identical values are stored once
+    """
+
+    id = Column(Integer, primary_key=True)
+    content_hash = Column(String(64), index=True, unique=True, nullable=False)
+    data = Column(LargeBinary().with_variant(LONGBLOB, "mysql"), nullable=False)
+    size = Column(Integer, nullable=False)
+
+
 class StudyCaseChange(db.Model):
     """StudyCaseChanges class"""
 
@@ -705,6 +737,11 @@ class StudyCaseChange(db.Model):
     new_value = Column(Text, index=False, unique=False)
     old_value = Column(Text, index=False, unique=False)
     old_value_blob = Column(LargeBinary().with_variant(LONGBLOB, "mysql"), index=False, unique=False)
+    old_value_blob_id = Column(Integer,
+                               ForeignKey(
+                                   f"{StudyCaseChangeBlob.__tablename__}.id",
+                                   name="fk_study_case_change_old_value_blob_id"),
+                               nullable=True)
     last_modified = Column(DateTime(timezone=True), server_default=str(datetime.utcnow()), onupdate=str(datetime.utcnow()))
     deleted_columns = Column(TEXT, index=False, unique=False)
 
@@ -726,7 +763,7 @@ class StudyCaseChange(db.Model):
             "change_type": self.change_type,
             "new_value": self.new_value,
             "old_value": self.old_value,
-            "old_value_blob": True if self.old_value_blob is not None else False,
+            "old_value_blob": self.old_value_blob is not None or self.old_value_blob_id is not None,
             "last_modified": self.last_modified,
             "deleted_columns": self.deleted_columns,
             "dataset_connector_id": self.dataset_connector_id,
@@ -977,6 +1014,17 @@ class ReferenceStudy(db.Model):
         }
 
 
+class CatalogueVersion(db.Model):
+    """
+    Version of the process and reference catalogue, incremented each time processes or references are updated
+    so that the servers rebuild their in-memory catalogue
+    """
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    modification_date = Column(DateTime(timezone=True), nullable=True)
+
+
 class ReferenceStudyExecutionLog(db.Model):
     id = Column(Integer, primary_key=True)
     reference_id = Column(Integer,
@@ -1175,3 +1223,27 @@ class UserApiKey(db.Model):
         """Update the last_used timestamp"""
         self.last_used = datetime.now().astimezone(pytz.UTC)
 
+
+
+class MailQueueItem(db.Model):
+    """
+    Class that stores the outbound mails until they are sent by the mail queue worker
+    """
+
+    PENDING = "PENDING"
+    SENDING = "SENDING"
+    SENT = "SENT"
+    IN_ERROR = "IN_ERROR"
+
+    id = Column(Integer, primary_key=True)
+    sender = Column(String(255), nullable=True)
+    recipients = Column(Text, nullable=True)
+    subject = Column(String(255), nullable=True)
+    message = Column(LargeBinary().with_variant(LONGBLOB, "mysql"), nullable=False)
+    status = Column(String(64), index=True, nullable=False, default=PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    creation_date = Column(DateTime(timezone=True), server_default=func.now())
+    next_attempt_date = Column(DateTime(timezone=True), index=True, nullable=True)
+    claim_date = Column(DateTime(timezone=True), nullable=True)
+    sent_date = Column(DateTime(timezone=True), nullable=True)
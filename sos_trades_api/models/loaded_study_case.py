@@ -43,7 +43,13 @@ class LoadedStudyCase:
     EXECUTION_SEQUENCE = "execution_sequence"
     INTERFACE_DIAGRAM = "interface_diagram"
 
-    def __init__(self, study_case_manager, no_data, read_only, user_id, load_post_processings=False):
+    def __init__(self, study_case_manager, no_data, read_only, user_id, load_post_processings=False, lazy_loading=True,
+                 treeview_version=None):
+        """
+        :param treeview_version: version of the treeview the client already has, when it is still known
+            only the changes since this version are sent in treeview_delta instead of the whole treenode
+        :type treeview_version: str
+        """
 
         self.study_case = StudyCaseDto(study_case_manager.study)
 
@@ -51,10 +57,14 @@ class LoadedStudyCase:
         self.no_data = no_data
         self.read_only = read_only
         self.treenode = {}
+        self.treeview_version = None
+        self.treeview_delta = None
         self.study_case.execution_status = ""
         self.post_processings = {}
         self.plotly = {}
         self.n2_diagram = {}
+        self.diagrams_available = {}
+        self.post_processings_available = False
         self.can_reload = study_case_manager.check_study_can_reload()
         self.dashboard = {}
 
@@ -65,11 +75,20 @@ class LoadedStudyCase:
             self.user_id_execution_authorized = 0
 
         if self.load_status == LoadStatus.LOADED:
-            self.load_treeview_and_post_proc(
-                study_case_manager, no_data, read_only, user_id, load_post_processings)
-            self.load_n2_diagrams(study_case_manager)
+            if lazy_loading:
+                # only the treeview is sent, diagrams and post-processings are
+                # requested on their own endpoints when their panel is opened
+                self.load_treeview(study_case_manager, no_data, read_only, treeview_version)
+                self.load_availability(study_case_manager)
+            else:
+                self.load_treeview_and_post_proc(
+                    study_case_manager, no_data, read_only, user_id, load_post_processings, treeview_version)
+                self.load_n2_diagrams(study_case_manager)
 
-    def load_treeview_and_post_proc(self, study_case_manager, no_data, read_only, user_id, load_post_proc):
+    def load_treeview(self, study_case_manager, no_data, read_only, treeview_version=None):
+        """
+        Load the logical treeview of the study, or only its changes since the given treeview version
+        """
         study_case_manager.execution_engine.dm.treeview = None
 
         treeview = study_case_manager.execution_engine.get_treeview(
@@ -77,6 +96,30 @@ class LoadedStudyCase:
 
         if treeview is not None:
             self.treenode = treeview.to_dict()
+
+            treeview_snapshots = study_case_manager.get_treeview_snapshots(no_data, read_only)
+            self.treeview_version, self.treeview_delta = treeview_snapshots.add_snapshot(self.treenode,
+                                                                                         treeview_version)
+            if self.treeview_delta is not None:
+                self.treenode = {}
+
+    def load_availability(self, study_case_manager):
+        """
+        Set the flags telling which visualisation diagrams and post-processings can be requested
+        """
+        root_process = study_case_manager.execution_engine.root_process
+        is_configured = root_process is not None
+
+        self.diagrams_available = {
+            self.N2_DIAGRAM: is_configured,
+            self.INTERFACE_DIAGRAM: is_configured,
+            self.EXECUTION_SEQUENCE: is_configured,
+        }
+        self.post_processings_available = is_configured and root_process.status == ProxyDiscipline.STATUS_DONE
+
+    def load_treeview_and_post_proc(self, study_case_manager, no_data, read_only, user_id, load_post_proc,
+                                    treeview_version=None):
+        self.load_treeview(study_case_manager, no_data, read_only, treeview_version)
         self.post_processings = {}
         self.plotly = {}
                 
@@ -85,7 +128,7 @@ class LoadedStudyCase:
             # Get discipline filters
             self.post_processings = load_post_processing(
                 study_case_manager.execution_engine, load_post_proc)
-   
+        self.post_processings_available = len(self.post_processings) > 0
 
     def load_n2_diagrams(self, study_manager):
         """
@@ -95,6 +138,7 @@ class LoadedStudyCase:
         self.n2_diagram[self.N2_DIAGRAM] = study_manager.get_n2_diagram_graph_data()
         self.n2_diagram[self.INTERFACE_DIAGRAM] = study_manager.get_interface_diagram_graph_data()
         self.n2_diagram[self.EXECUTION_SEQUENCE] = study_manager.get_execution_sequence_graph_data()
+        self.diagrams_available = {name: bool(diagram) for name, diagram in self.n2_diagram.items()}
 
     def __load_user_execution_authorised(self, user_id):
         """
@@ -155,9 +199,13 @@ class LoadedStudyCase:
         return {
             "study_case": self.study_case,
             "treenode": self.treenode,
+            "treeview_version": self.treeview_version,
+            "treeview_delta": self.treeview_delta,
             "post_processings": self.post_processings,
             "plotly": self.plotly,
             "n2_diagram": self.n2_diagram,
+            "diagrams_available": self.diagrams_available,
+            "post_processings_available": self.post_processings_available,
             "user_id_execution_authorized": self.user_id_execution_authorized,
             "no_data": self.no_data,
             "read_only": self.read_only,
@@ -21,12 +21,18 @@ from sostrades_core.tools.dashboard.dashboard import (
 from werkzeug.exceptions import BadRequest
 
 from sos_trades_api.controllers.sostrades_data.dashboard_controller import (
+    add_study_dashboard_item,
+    get_study_dashboard_changes,
     get_study_dashboard_in_file,
+    move_study_dashboard_item,
+    remove_study_dashboard_item,
     save_study_dashboard_in_file,
+    update_study_dashboard_item,
 )
 from sos_trades_api.models.database_models import AccessRights
 from sos_trades_api.server.base_server import app
 from sos_trades_api.tools.authentication.authentication import auth_required
+from sos_trades_api.tools.loading.study_dashboard_store import DashboardItemNotFound
 from sos_trades_api.tools.right_management.functional.study_case_access_right import (
     StudyCaseAccess,
 )
@@ -86,3 +92,62 @@ def update_dashboard_data(study_id):
         except Exception as e:
             raise BadRequest(f"Invalid dashboard data: {str(e)}")
     raise BadRequest("Missing mandatory parameter: study identifier in url")
+
+
+def check_dashboard_access(study_id, access_right):
+    """
+    Raise a BadRequest if the authenticated user does not have the given right on the study
+    """
+    user = session["user"]
+    study_case_access = StudyCaseAccess(user.id, study_id)
+    if not study_case_access.check_user_right_for_study(access_right, study_id):
+        raise BadRequest(
+            "You do not have the necessary rights to load this study case")
+
+
+@app.route("/api/data/dashboard/<int:study_id>/changes", methods=["GET"])
+@auth_required
+def get_dashboard_changes(study_id):
+    check_dashboard_access(study_id, AccessRights.RESTRICTED_VIEWER)
+
+    since_version = request.args.get("since_version", None, type=int)
+    changes = get_study_dashboard_changes(study_id, since_version)
+    if changes is None:
+        return make_response(jsonify({}), 200)
+    return make_response(jsonify(changes), 200)
+
+
+@app.route("/api/data/dashboard/<int:study_id>/items", methods=["POST"])
+@auth_required
+def add_dashboard_item(study_id):
+    check_dashboard_access(study_id, AccessRights.CONTRIBUTOR)
+
+    request_json = request.get_json(force=True)
+    item = request_json.get("item", None)
+    if item is None:
+        raise BadRequest("Missing mandatory parameter: item")
+
+    item_id = add_study_dashboard_item(study_id, item, request_json.get("position", None))
+    return make_response(jsonify({"id": item_id}), 200)
+
+
+@app.route("/api/data/dashboard/<int:study_id>/items/<item_id>", methods=["PUT", "DELETE"])
+@auth_required
+def update_dashboard_item(study_id, item_id):
+    check_dashboard_access(study_id, AccessRights.CONTRIBUTOR)
+
+    try:
+        if request.method == "DELETE":
+            version = remove_study_dashboard_item(study_id, item_id)
+        else:
+            request_json = request.get_json(force=True)
+            if request_json.get("item", None) is not None:
+                version = update_study_dashboard_item(study_id, item_id, request_json["item"])
+            elif request_json.get("position", None) is not None:
+                version = move_study_dashboard_item(study_id, item_id, int(request_json["position"]))
+            else:
+                raise BadRequest("Missing mandatory parameter: item or position")
+    except DashboardItemNotFound as error:
+        raise BadRequest(str(error))
+
+    return make_response(jsonify({"version": version}), 200)
@@ -14,13 +14,26 @@ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 See the License for the specific language governing permissions and
 limitations under the License.
 '''
-import os
+import base64
+import io
 from datetime import datetime
 
-from flask import abort, jsonify, make_response, request, send_file, session
+from flask import (
+    Response,
+    abort,
+    jsonify,
+    make_response,
+    request,
+    send_file,
+    session,
+    stream_with_context,
+)
 from werkzeug.exceptions import BadRequest, MethodNotAllowed
 
 from sos_trades_api.controllers.sostrades_data.study_case_controller import (
+    NOTIFICATIONS_PAGE_SIZE,
+    STUDY_LIST_DEFAULT_SORT,
+    STUDY_LIST_PAGE_SIZE,
     add_favorite_study_case,
     check_study_already_exist,
     copy_study,
@@ -36,9 +49,11 @@ from sos_trades_api.controllers.sostrades_data.study_case_controller import (
     get_raw_logs,
     get_study_case_allocation,
     get_study_case_notifications,
+    get_study_case_notifications_count,
     get_study_execution_flavor,
     get_user_authorised_studies_for_process,
     get_user_shared_study_case,
+    get_user_shared_study_case_page,
     get_user_study_case,
     load_study_case_allocation,
     load_study_case_preference,
@@ -49,8 +64,13 @@ from sos_trades_api.controllers.sostrades_data.study_case_controller import (
     study_case_logs,
 )
 from sos_trades_api.controllers.sostrades_data.study_case_stand_alone_controller import (
+    create_stand_alone_upload_session,
     create_study_stand_alone_from_zip,
-    get_study_stand_alone_zip,
+    finalize_stand_alone_upload,
+    get_stand_alone_upload_session,
+    get_study_stand_alone_zip_base64_stream,
+    get_study_stand_alone_zip_stream,
+    upload_stand_alone_part,
 )
 from sos_trades_api.models.database_models import (
     AccessRights,
@@ -75,12 +95,48 @@ from sos_trades_api.tools.study_management.study_management import (
 @app.route("/api/data/study-case", methods=["GET"])
 @auth_required
 def study_cases():
+    """
+    Return the studies shared with the user
+
+    Without url parameters all the studies are returned as a list. With any of the following url parameters
+    one page of studies is returned with the cursor of the next page and the number of studies matching the filters:
+    page_size, cursor (next_cursor of the previous page), sort_by, order (asc or desc),
+    process, repository, group_id, execution_status, favorite (true or false), search (text in the study name)
+    """
     user = session["user"]
 
     if request.method == "GET":
-        # Transform object array to json convertible
-        result = [sc.serialize() for sc in get_user_shared_study_case(user.id)]
-        resp = make_response(jsonify(result), 200)
+        if len(request.args) == 0:
+            # Transform object array to json convertible
+            result = [sc.serialize() for sc in get_user_shared_study_case(user.id)]
+            resp = make_response(jsonify(result), 200)
+            return resp
+
+        page_size = request.args.get("page_size", STUDY_LIST_PAGE_SIZE, type=int)
+        order = request.args.get("order", "desc")
+        favorite = request.args.get("favorite", None)
+        if page_size is None or page_size <= 0:
+            raise BadRequest("Invalid parameter: page_size must be strictly positive")
+        if order not in ("asc", "desc"):
+            raise BadRequest("Invalid parameter: order must be asc or desc")
+        if favorite is not None and favorite.lower() not in ("true", "false"):
+            raise BadRequest("Invalid parameter: favorite must be true or false")
+
+        study_page = get_user_shared_study_case_page(
+            user.id,
+            process=request.args.get("process", None),
+            repository=request.args.get("repository", None),
+            group_identifier=request.args.get("group_id", None, type=int),
+            execution_status=request.args.get("execution_status", None),
+            favorite=None if favorite is None else favorite.lower() == "true",
+            search=request.args.get("search", None),
+            sort_by=request.args.get("sort_by", STUDY_LIST_DEFAULT_SORT),
+            descending=order == "desc",
+            cursor=request.args.get("cursor", None),
+            page_size=page_size)
+
+        study_page["studies"] = [sc.serialize() for sc in study_page["studies"]]
+        resp = make_response(jsonify(study_page), 200)
         return resp
 
     raise MethodNotAllowed()
@@ -102,18 +158,12 @@ def export_study_case_by_id_in_stand_alone(study_id):
         
         if check_read_only_mode_available(study_id):
             file_name = f"zip_study_{study_id}_{datetime.now().strftime('%d-%m-%Y-%H-%M-%S-%f')}.zip"
-            file_path = get_study_stand_alone_zip(study_id, file_name)
+            app.logger.info(f"Export study {study_id} in stand alone file: {file_name}")
 
-            app.logger.info(f"Export file path: {file_path}")
-            app.logger.info(f"File exists: {os.path.exists(file_path)}")
-            app.logger.info(f"File size: {os.path.getsize(file_path) if os.path.exists(file_path) else 'N/A'}")
-
-            response =  send_file(
-                file_path,
-                as_attachment=True,
-                download_name=file_name,
+            # the archive is written while it is sent, so its size is not known in advance
+            response = Response(
+                stream_with_context(get_study_stand_alone_zip_stream(study_id)),
                 mimetype='application/octet-stream')
-            response.headers['Content-Type'] = 'application/octet-stream'
             response.headers['Content-Disposition'] = f'attachment; filename="{file_name}"'
             response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
             response.headers['Pragma'] = 'no-cache'
@@ -140,32 +190,13 @@ def export_study_case_by_id_in_stand_alone_base64(study_id):
                 "You do not have the necessary rights to export this study case")
         
         if check_read_only_mode_available(study_id):
-            import base64
-            import os
-            
             file_name = f"study_{study_id}_{datetime.now().strftime('%d-%m-%Y-%H-%M-%S-%f')}.zip"
-            file_path = get_study_stand_alone_zip(study_id, file_name)
-
-            app.logger.info(f"Export file path: {file_path}")
-            app.logger.info(f"File exists: {os.path.exists(file_path)}")
-            
-            if not os.path.exists(file_path):
-                raise BadRequest("Export file not found")
-            
-            file_size = os.path.getsize(file_path)
-            app.logger.info(f"File size: {file_size}")
-            
-            # Read file and encode in base64
-            with open(file_path, 'rb') as f:
-                file_data = base64.b64encode(f.read()).decode('utf-8')
-            
-            # Return as JSON to avoid proxy detection
-            return jsonify({
-                'filename': file_name,
-                'data': file_data,
-                'size': file_size,
-                'mimetype': 'application/zip'
-            })
+            app.logger.info(f"Export study {study_id} in stand alone base64 file: {file_name}")
+
+            # Return as JSON to avoid proxy detection, the archive is encoded chunk by chunk while it is written
+            return Response(
+                stream_with_context(get_study_stand_alone_zip_base64_stream(study_id, file_name)),
+                mimetype='application/json')
         else:
             raise BadRequest("Export not possible, the study is not available in read only mode")
     else:       
@@ -225,9 +256,6 @@ def import_study_case_zip_base64():
         raise BadRequest(f"The Study Stand alone zip file is not valid : the file {filename} is not a zip file")
 
     try:
-        import base64
-        import io
-
         from werkzeug.datastructures import FileStorage
         
         # Décoder les données Base64
@@ -254,6 +282,107 @@ def import_study_case_zip_base64():
         raise BadRequest(f"Import failed: {str(e)}")
 
 
+@app.route("/api/data/study-case/stand-alone/upload", methods=["POST"])
+@auth_required
+def create_stand_alone_upload():
+    """
+    Start a chunked upload of a stand-alone zip file, parts are then sent one by one (and can be sent again
+    after a failure) before finalizing the upload
+
+    Request object is intended with the following data structure
+        {
+            filename: string, // name of the zip file
+            size: int, // size of the zip file in bytes
+            group_id: int // group of the study to create
+        }
+    """
+    user = session["user"]
+
+    filename = request.json.get('filename', None)
+    file_size = request.json.get('size', None)
+    group_id = request.json.get('group_id', None)
+
+    missing_parameter = []
+    if filename is None:
+        missing_parameter.append("Missing mandatory parameter: filename")
+    if file_size is None:
+        missing_parameter.append("Missing mandatory parameter: size")
+    if group_id is None:
+        missing_parameter.append("Missing mandatory parameter: group_id")
+
+    if len(missing_parameter) > 0:
+        raise BadRequest("\n".join(missing_parameter))
+
+    if not filename.endswith(".zip"):
+        raise BadRequest(f"The Study Stand alone zip file is not valid : the file {filename} is not a zip file")
+
+    upload_session = create_stand_alone_upload_session(user.id, int(group_id), filename, int(file_size))
+    resp = make_response(jsonify(upload_session.serialize()), 200)
+    return resp
+
+
+@app.route("/api/data/study-case/stand-alone/upload/<string:session_id>", methods=["GET"])
+@auth_required
+def get_stand_alone_upload(session_id):
+    """
+    Return the state of a chunked upload: received parts and progress of the study creation once finalized
+    """
+    user = session["user"]
+
+    resp = make_response(jsonify(get_stand_alone_upload_session(user.id, session_id).serialize()), 200)
+    return resp
+
+
+@app.route("/api/data/study-case/stand-alone/upload/<string:session_id>/part/<int:part_index>", methods=["PUT"])
+@auth_required
+def upload_stand_alone_part_by_index(session_id, part_index):
+    """
+    Write a part of a chunked upload, the part content is the raw request body, or a base64 encoded
+    'data' field of a json body to bypass proxy restrictions
+
+    Url parameters: offset (offset of the part in the zip file), checksum (sha256 hexadecimal digest of the part)
+    """
+    user = session["user"]
+
+    offset = request.args.get('offset', None, type=int)
+    checksum = request.args.get('checksum', None)
+
+    missing_parameter = []
+    if offset is None:
+        missing_parameter.append("Missing mandatory parameter: offset")
+    if checksum is None:
+        missing_parameter.append("Missing mandatory parameter: checksum")
+
+    if len(missing_parameter) > 0:
+        raise BadRequest("\n".join(missing_parameter))
+
+    if request.is_json:
+        part_data = request.json.get('data', None)
+        if part_data is None:
+            raise BadRequest("Missing mandatory parameter: data")
+        part_stream = io.BytesIO(base64.b64decode(part_data))
+    else:
+        part_stream = request.stream
+
+    upload_session = upload_stand_alone_part(user.id, session_id, part_index, offset, checksum, part_stream)
+    resp = make_response(jsonify(upload_session.serialize()), 200)
+    return resp
+
+
+@app.route("/api/data/study-case/stand-alone/upload/<string:session_id>/finalize", methods=["POST"])
+@auth_required
+def finalize_stand_alone_upload_by_session_id(session_id):
+    """
+    Create a study in stand alone from a complete chunked upload, the zip files are written in the study
+    folder in background, the upload session gives the progress
+    """
+    user = session["user"]
+
+    created_study = finalize_stand_alone_upload(user.id, session_id)
+    resp = make_response(jsonify(created_study), 200)
+    return resp
+
+
 @app.route("/api/data/study-case/<int:study_id>/save-ontology", methods=["POST"])
 @auth_required
 def save_ontology_usages_and_documentation(study_id):
@@ -673,7 +802,18 @@ def get_study_parameter_change_file_by_study_case_id(study_id):
 @app.route("/api/data/study-case/<int:study_id>/notifications", methods=["GET"])
 @auth_required
 def study_case_notifications(study_id):
+    """
+    Return the study notifications with their changes, most recent first
+
+    Url parameters (optional): page (index of the page starting at 0), page_size (number of notifications by page).
+    Without page all the notifications are returned as a list
+    """
     if request.method == "GET":
+        page = request.args.get("page", None, type=int)
+        page_size = request.args.get("page_size", NOTIFICATIONS_PAGE_SIZE, type=int)
+        if page is not None and (page < 0 or page_size <= 0):
+            raise BadRequest("Invalid parameters: page must be positive and page_size strictly positive")
+
         # Checking if user can access study data
         user = session["user"]
         # Verify user has study case authorisation to get study notifications
@@ -681,7 +821,14 @@ def study_case_notifications(study_id):
         study_case_access = StudyCaseAccess(user.id, study_id)
         results = []
         if study_case_access.check_user_right_for_study(AccessRights.COMMENTER, study_id):
-            results = get_study_case_notifications(study_id)
+            results = get_study_case_notifications(study_id, page, page_size)
+            if page is not None:
+                results = {
+                    "notifications": results,
+                    "page": page,
+                    "page_size": page_size,
+                    "total_count": get_study_case_notifications_count(study_id),
+                }
         else:
             raise BadRequest(
                 "You do not have the necessary rights to retrieve this information about study case")
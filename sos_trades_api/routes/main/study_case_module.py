@@ -30,6 +30,7 @@ from sos_trades_api.controllers.sostrades_main.study_case_controller import (
     get_dataset_import_error_message,
     get_markdown_documentation,
     get_study_case,
+    get_study_cases_memory_footprint,
     get_study_data_file_path,
     get_study_data_stream,
     get_study_load_status,
@@ -43,7 +44,10 @@ from sos_trades_api.controllers.sostrades_main.study_case_controller import (
 from sos_trades_api.models.database_models import AccessRights
 from sos_trades_api.models.loaded_study_case import LoadStatus
 from sos_trades_api.server.base_server import app
-from sos_trades_api.tools.authentication.authentication import auth_required
+from sos_trades_api.tools.authentication.authentication import (
+    auth_required,
+    study_manager_profile,
+)
 from sos_trades_api.tools.gzip_tools import make_gzipped_response
 from sos_trades_api.tools.right_management.functional.study_case_access_right import (
     StudyCaseAccess,
@@ -80,6 +84,20 @@ def study_cases():
     raise BadRequest("Missing mandatory parameter: study identifier in url")
 
 
+@app.route("/api/main/study-case/memory-footprint", methods=["GET"])
+@auth_required
+@study_manager_profile
+def get_study_cases_memory_footprint_in_cache():
+    """
+    Return the estimated memory used by each study case loaded on this server
+    """
+    refresh = request.args.get("refresh", "false").lower() == "true"
+
+    resp = make_response(
+        jsonify(get_study_cases_memory_footprint(refresh)), 200)
+    return resp
+
+
 @app.route("/api/main/study-case/<int:study_id>", methods=["GET"])
 @auth_required
 def main_load_study_case_by_id(study_id):
@@ -107,7 +125,10 @@ def main_load_study_case_by_id(study_id):
         app.logger.info(
             f"User {user.id:<5} => get_user_right_for_study {study_access_right_duration - check_user_right_for_study_duration:<5} sec")
 
-        loaded_study = get_study_case(user.id, study_id, study_access_right)
+        # treeview version the client already has, to receive only the treeview changes
+        treeview_version = request.args.get("treeview_version", None)
+
+        loaded_study = get_study_case(user.id, study_id, study_access_right, treeview_version)
         loaded_study_duration = time.time()
         app.logger.info(
             f"User {user.id:<5} => loadedStudy_duration {loaded_study_duration - study_access_right_duration :<5} sec")
@@ -261,6 +282,8 @@ def update_study_parameters_by_study_case_id(study_id):
         if "column_deleted" in request.form:
             columns_to_delete = json.loads(request.form["column_deleted"])
 
+        treeview_version = request.form.get("treeview_version", None)
+
         missing_parameter = []
         if files_data is None or file_info is None:
             missing_parameter.append(
@@ -273,7 +296,8 @@ def update_study_parameters_by_study_case_id(study_id):
             raise BadRequest("\n".join(missing_parameter))
 
         resp = make_response(
-            jsonify(update_study_parameters(study_id, user, files_data, file_info, parameters, columns_to_delete)), 200)
+            jsonify(update_study_parameters(study_id, user, files_data, file_info, parameters, columns_to_delete,
+                                            treeview_version)), 200)
         return resp
 
     raise BadRequest("Missing mandatory parameter: study identifier in url")
@@ -394,6 +418,15 @@ def copy_study_discipline_data_by_study_case_id(study_id):
         # Proceeding after rights verification
         discipline_from = request.json.get("discipline_from", None)
         discipline_to = request.json.get("discipline_to", None)
+        # optional study of the discipline to copy
+        study_from_id = request.json.get("study_from", None)
+
+        if study_from_id is not None and study_from_id != study_id:
+            # Verify user has study case authorisation to read the source study data (Commenter)
+            study_from_access = StudyCaseAccess(user.id, study_from_id)
+            if not study_from_access.check_user_right_for_study(AccessRights.COMMENTER, study_from_id):
+                raise BadRequest(
+                    "You do not have the necessary rights to retrieve the data of the source study case")
 
         missing_parameter = []
         if discipline_from is None:
@@ -407,7 +440,7 @@ def copy_study_discipline_data_by_study_case_id(study_id):
             raise BadRequest("\n".join(missing_parameter))
 
         resp = make_response(
-            jsonify(copy_study_discipline_data(study_id, discipline_from, discipline_to)), 200)
+            jsonify(copy_study_discipline_data(study_id, discipline_from, discipline_to, study_from_id)), 200)
         return resp
 
     raise BadRequest("Missing mandatory parameter: study identifier in url")
@@ -19,8 +19,12 @@ from sostrades_core.tools.post_processing.charts.chart_filter import ChartFilter
 from werkzeug.exceptions import BadRequest
 
 from sos_trades_api.controllers.sostrades_post_processing.post_processing_controller import (
+    PostProcessingError,
+    encode_post_processing_payload,
+    get_chart_cache_statistics,
     load_post_processing,
     load_post_processing_graph_filters,
+    load_study_post_processings,
 )
 from sos_trades_api.models.database_models import AccessRights
 from sos_trades_api.server.base_server import app
@@ -75,8 +79,21 @@ def get_post_processing(study_id):
                     object_filter = ChartFilter.from_dict(filter)
                     object_filters.append(object_filter)
 
+            # payload options are not mandatory, charts are sent with all their points as json lists by default
+            width = request.json.get("width", None)
+            encoding = request.json.get("encoding", None)
+            dtype = request.json.get("dtype", "float64")
+
+            post_processings = load_post_processing(study_id, discipline_key, object_filters, module_name)
+            if width is not None or encoding is not None:
+                try:
+                    post_processings = encode_post_processing_payload(
+                        post_processings, None if width is None else int(width), encoding, dtype)
+                except (PostProcessingError, ValueError) as error:
+                    raise BadRequest(str(error))
+
             resp = make_response(
-                jsonify(load_post_processing(study_id, discipline_key, object_filters, module_name)), 200)
+                jsonify(post_processings), 200)
             return resp
 
     raise BadRequest("Missing mandatory parameter: study identifier in url")
@@ -109,3 +126,31 @@ def get_post_processing_filter(study_id):
     resp = make_response(
         jsonify(load_post_processing_graph_filters(study_id, discipline_key)), 200)
     return resp
+
+
+@app.route("/api/post-processing/study-case/<int:study_id>/post-processings", methods=["GET"])
+@auth_required
+def get_study_post_processings(study_id):
+
+    # Checking if user can access study data
+    user = get_authenticated_user()
+    # Verify user has study case authorisation to retrieve study post
+    # processing filters (RESTRICTED_VIEWER)
+    study_case_access = StudyCaseAccess(user.id, study_id)
+    if not study_case_access.check_user_right_for_study(AccessRights.RESTRICTED_VIEWER, study_id):
+        raise BadRequest(
+            "You do not have the necessary rights to retrieve this study case post processing filters")
+
+    # Proceeding after rights verification
+    resp = make_response(
+        jsonify(load_study_post_processings(study_id)), 200)
+    return resp
+
+
+@app.route("/api/post-processing/chart-cache/statistics", methods=["GET"])
+@auth_required
+def get_post_processing_chart_cache_statistics():
+
+    resp = make_response(
+        jsonify(get_chart_cache_statistics()), 200)
+    return resp
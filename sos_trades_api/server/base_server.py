@@ -84,6 +84,7 @@ try:
     app.logger.info("Importing dependencies")
     from sos_trades_api.models.custom_json_encoder import CustomJsonProvider
     from sos_trades_api.models.database_models import Group, User, UserProfile
+    from sos_trades_api.tools.cache.chart_cache import ChartCache
     from sos_trades_api.tools.cache.study_case_cache import StudyCaseCache
     from sos_trades_api.tools.logger.application_request_formatter import (
         ApplicationRequestFormatter,
@@ -124,6 +125,9 @@ except Exception as error:
 # Register own class for studycase caching
 study_case_cache = StudyCaseCache(logger=app.logger)
 
+# Register own class for post-processing charts caching
+chart_cache = ChartCache(logger=app.logger)
+
 # Create authentication token (JWT) manager
 jwt = JWTManager(app)
 
@@ -29,6 +29,13 @@ from sos_trades_api.server.base_server import check_identity_provider_availabili
 check_identity_provider_availability()
 
 config = base_server.config
+
+# send the mails left in the outbound mail queue by a previous run
+if app.config.get("SMTP_SERVER"):
+    from sos_trades_api.tools.smtp.mail_queue import MailQueueWorker
+
+    MailQueueWorker.get_instance().start()
+
 # if config.execution_strategy == config.CONFIG_EXECUTION_STRATEGY_K8S or \
 #     config.server_mode == config.CONFIG_SERVER_MODE_K8S:
 #
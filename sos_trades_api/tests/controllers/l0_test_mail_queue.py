@@ -0,0 +1,246 @@
+'''
+Copyright 2026 Capgemini
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import socketserver
+import threading
+import time
+from types import SimpleNamespace
+
+from sos_trades_api.tests.controllers.unit_test_basic_config import (
+    DatabaseUnitTestConfiguration,
+)
+
+"""
+Test class for the outbound mail queue
+"""
+
+
+class StandInSMTPHandler(socketserver.StreamRequestHandler):
+    """
+    Minimal SMTP dialog, each connection waits for the greeting delay like a distant mail server
+    """
+
+    def __reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        with self.server.lock:
+            self.server.connection_count += 1
+        time.sleep(self.server.greeting_delay)
+        self.__reply("220 localhost stand-in SMTP server")
+
+        while line := self.rfile.readline():
+            command = line.decode().strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                self.__reply("250 localhost")
+            elif command.startswith(("MAIL", "RCPT", "RSET", "NOOP")):
+                self.__reply("250 OK")
+            elif command.startswith("DATA"):
+                self.__reply("354 End data with <CR><LF>.<CR><LF>")
+                data_lines = []
+                while (data_line := self.rfile.readline()) not in (b".\r\n", b""):
+                    data_lines.append(data_line)
+                with self.server.lock:
+                    self.server.messages.append(b"".join(data_lines))
+                self.__reply("250 OK")
+            elif command.startswith("QUIT"):
+                self.__reply("221 Bye")
+                return
+            else:
+                self.__reply("502 Command not implemented")
+
+
+class StandInSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, greeting_delay):
+        super().__init__(("localhost", 0), StandInSMTPHandler)
+        self.greeting_delay = greeting_delay
+        self.lock = threading.Lock()
+        self.connection_count = 0
+        self.messages = []
+
+
+class TestMailQueue(DatabaseUnitTestConfiguration):
+    """
+    Test class for methods related to the outbound mail queue
+    """
+
+    MAIL_COUNT = 20
+    GREETING_DELAY = 0.5
+
+    def setUp(self):
+        super().setUp()
+        self.smtp_server = StandInSMTPServer(self.GREETING_DELAY)
+        threading.Thread(target=self.smtp_server.serve_forever, daemon=True).start()
+
+        self.smtp_server_address = DatabaseUnitTestConfiguration.app.config.get("SMTP_SERVER")
+        DatabaseUnitTestConfiguration.app.config["SMTP_SERVER"] = f"localhost:{self.smtp_server.server_address[1]}"
+
+    def tearDown(self):
+        DatabaseUnitTestConfiguration.app.config["SMTP_SERVER"] = self.smtp_server_address
+        self.smtp_server.shutdown()
+        self.smtp_server.server_close()
+        super().tearDown()
+
+    def test_01_queued_mails_sent_on_one_connection(self):
+        from sos_trades_api.models.database_models import MailQueueItem
+        from sos_trades_api.server.base_server import db
+        from sos_trades_api.tools.smtp.smtp_service import send_right_update_mail
+
+        with DatabaseUnitTestConfiguration.app.app_context():
+            start_time = time.perf_counter()
+            for index in range(self.MAIL_COUNT):
+                self.assertTrue(send_right_update_mail(SimpleNamespace(email=f"user{index}@fake.com"), "Study user"))
+            queue_duration = time.perf_counter() - start_time
+
+            # sending synchronously would have waited for the server greeting for each mail
+            self.assertLess(queue_duration, self.MAIL_COUNT * self.GREETING_DELAY / 2,
+                            "Mails are not sent asynchronously")
+
+            timeout = time.monotonic() + 30
+            while len(self.smtp_server.messages) < self.MAIL_COUNT and time.monotonic() < timeout:
+                time.sleep(0.1)
+            send_duration = time.perf_counter() - start_time
+
+            self.assertEqual(len(self.smtp_server.messages), self.MAIL_COUNT, "Queued mails have not been sent")
+            self.assertEqual(self.smtp_server.connection_count, 1, "SMTP connection is not reused between mails")
+            self.assertLess(send_duration, self.MAIL_COUNT * self.GREETING_DELAY)
+
+            db.session.expire_all()
+            timeout = time.monotonic() + 10
+            while MailQueueItem.query.filter(MailQueueItem.status != MailQueueItem.SENT).count() > 0 \
+                    and time.monotonic() < timeout:
+                time.sleep(0.1)
+                db.session.expire_all()
+            self.assertEqual(MailQueueItem.query.filter(MailQueueItem.status == MailQueueItem.SENT).count(),
+                             self.MAIL_COUNT)
+
+    def test_02_mail_retried_then_set_in_error(self):
+        from email.message import EmailMessage
+
+        from sos_trades_api.models.database_models import MailQueueItem
+        from sos_trades_api.server.base_server import db
+        from sos_trades_api.tools.smtp.mail_queue import MailQueueWorker, get_utc_now
+
+        with DatabaseUnitTestConfiguration.app.app_context():
+            message = EmailMessage()
+            message["Subject"] = "Retried mail"
+            message["To"] = "user@fake.com"
+            message.set_content("Retried mail")
+
+            mail = MailQueueItem()
+            mail.subject = message["Subject"]
+            mail.recipients = message["To"]
+            mail.message = message.as_bytes()
+            mail.status = MailQueueItem.PENDING
+            mail.attempts = 0
+            mail.next_attempt_date = get_utc_now()
+            db.session.add(mail)
+            db.session.commit()
+            mail_id = mail.id
+
+            # the mail server is down
+            self.smtp_server.shutdown()
+            self.smtp_server.server_close()
+
+            worker = MailQueueWorker(max_attempts=2, retry_delay=0)
+            worker.process_batch()
+            mail = MailQueueItem.query.filter(MailQueueItem.id == mail_id).first()
+            self.assertEqual(mail.status, MailQueueItem.PENDING)
+            self.assertEqual(mail.attempts, 1)
+            self.assertIsNotNone(mail.last_error)
+
+            worker.process_batch()
+            mail = MailQueueItem.query.filter(MailQueueItem.id == mail_id).first()
+            self.assertEqual(mail.status, MailQueueItem.IN_ERROR)
+            self.assertEqual(mail.attempts, 2)
+            self.assertEqual(mail.message, b"")
+
+    def test_03_unexpected_error_only_fails_its_mail(self):
+        from email.message import EmailMessage
+
+        from sos_trades_api.models.database_models import MailQueueItem
+        from sos_trades_api.server.base_server import db
+        from sos_trades_api.tools.smtp.mail_queue import MailQueueWorker, get_utc_now
+
+        with DatabaseUnitTestConfiguration.app.app_context():
+            mail_ids = []
+            for subject in ["Ambiguous mail", "Valid mail"]:
+                message = EmailMessage()
+                message["Subject"] = subject
+                message["To"] = "user@fake.com"
+                if subject == "Ambiguous mail":
+                    # several resent blocks make smtplib raise a ValueError instead of an SMTP error
+                    message["Resent-Date"] = "Mon, 05 Jan 2026 10:00:00 +0000"
+                    message["Resent-Date"] = "Mon, 05 Jan 2026 11:00:00 +0000"
+                message.set_content(subject)
+
+                mail = MailQueueItem()
+                mail.subject = message["Subject"]
+                mail.recipients = message["To"]
+                mail.message = message.as_bytes()
+                mail.status = MailQueueItem.PENDING
+                mail.attempts = 0
+                mail.next_attempt_date = get_utc_now()
+                db.session.add(mail)
+                db.session.commit()
+                mail_ids.append(mail.id)
+
+            MailQueueWorker(max_attempts=2, retry_delay=0).process_batch()
+
+            db.session.expire_all()
+            ambiguous_mail = MailQueueItem.query.filter(MailQueueItem.id == mail_ids[0]).first()
+            valid_mail = MailQueueItem.query.filter(MailQueueItem.id == mail_ids[1]).first()
+            self.assertEqual(ambiguous_mail.status, MailQueueItem.PENDING)
+            self.assertEqual(ambiguous_mail.attempts, 1)
+            self.assertIsNotNone(ambiguous_mail.last_error)
+            self.assertEqual(valid_mail.status, MailQueueItem.SENT)
+            self.assertEqual(len(self.smtp_server.messages), 1)
+
+    def test_04_caller_changes_kept_and_content_removed_once_sent(self):
+        from sos_trades_api.models.database_models import MailQueueItem, User
+        from sos_trades_api.server.base_server import db
+        from sos_trades_api.tools.smtp.smtp_service import send_password_reset_mail
+
+        with DatabaseUnitTestConfiguration.app.app_context():
+            user = User.query.first()
+            self.assertIsNotNone(user)
+            firstname = user.firstname
+            user.firstname = "Pending change"
+
+            self.assertTrue(send_password_reset_mail(SimpleNamespace(email="user@fake.com"), "reset-link-token"))
+            # the pending changes of the caller are neither committed nor rolled back by the queue
+            self.assertIn(user, db.session.dirty)
+            db.session.rollback()
+            self.assertEqual(User.query.filter(User.id == user.id).first().firstname, firstname)
+
+            timeout = time.monotonic() + 30
+            while len(self.smtp_server.messages) < 1 and time.monotonic() < timeout:
+                time.sleep(0.1)
+            self.assertIn(b"reset-link-token", b"".join(self.smtp_server.messages))
+
+            # the reset link is not kept in database once the mail is sent
+            db.session.expire_all()
+            timeout = time.monotonic() + 10
+            mail = MailQueueItem.query.order_by(MailQueueItem.id.desc()).first()
+            while mail.status != MailQueueItem.SENT and time.monotonic() < timeout:
+                time.sleep(0.1)
+                db.session.expire_all()
+                mail = MailQueueItem.query.order_by(MailQueueItem.id.desc()).first()
+            self.assertEqual(mail.status, MailQueueItem.SENT)
+            self.assertEqual(mail.message, b"")
+            self.assertIsNotNone(mail.creation_date)
@@ -0,0 +1,97 @@
+'''
+Copyright 2026 Capgemini
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+from sos_trades_api.tests.controllers.unit_test_basic_config import (
+    DatabaseUnitTestConfiguration,
+)
+
+"""
+Test class for the in-memory process and reference catalogue
+"""
+
+
+class TestProcessCatalogue(DatabaseUnitTestConfiguration):
+    """
+    Test class for methods related to the process and reference catalogue
+    """
+
+    test_repository_name = "sostrades_core.sos_processes.test"
+    test_process_name = "test_disc1_disc2_coupling"
+
+    @classmethod
+    def setUpClass(cls):
+        DatabaseUnitTestConfiguration.setUpClass()
+
+        from sos_trades_api.server.base_server import database_process_setup
+        database_process_setup()
+
+    def test_01_catalogue_matches_database(self):
+        from sos_trades_api.models.database_models import Process, ReferenceStudy
+        from sos_trades_api.tools.cache.process_catalogue_cache import (
+            get_process_catalogue,
+        )
+
+        with DatabaseUnitTestConfiguration.app.app_context():
+            catalogue = get_process_catalogue()
+            self.assertIs(get_process_catalogue(), catalogue, "Catalogue is rebuilt without version change")
+
+            processes = Process.query.all()
+            self.assertEqual(sorted(process.id for process in catalogue.get_processes()),
+                             sorted(process.id for process in processes))
+
+            process = catalogue.get_process_by_name(self.test_process_name, self.test_repository_name)
+            self.assertIsNotNone(process)
+            self.assertIs(catalogue.get_process(process.id), process)
+            self.assertIn(process, catalogue.get_repository_processes(self.test_repository_name))
+
+            references = ReferenceStudy.query.filter(ReferenceStudy.process_id == process.id).all()
+            self.assertEqual([reference.id for reference in catalogue.get_process_references(process.id)],
+                             sorted(reference.id for reference in references))
+
+    def test_02_catalogue_rebuilt_on_version_bump(self):
+        from sos_trades_api.controllers.sostrades_data.process_controller import (
+            api_get_processes_for_user,
+        )
+        from sos_trades_api.models.database_models import ReferenceStudy, User
+        from sos_trades_api.server.base_server import db
+        from sos_trades_api.tools.cache.process_catalogue_cache import (
+            bump_catalogue_version,
+            get_process_catalogue,
+        )
+
+        with DatabaseUnitTestConfiguration.app.app_context():
+            catalogue = get_process_catalogue()
+            process = catalogue.get_process_by_name(self.test_process_name, self.test_repository_name)
+            reference = ReferenceStudy.query.filter(ReferenceStudy.process_id == process.id).first()
+            self.assertIsNotNone(reference)
+
+            ReferenceStudy.query.filter(ReferenceStudy.id == reference.id).update(
+                {"execution_status": ReferenceStudy.FINISHED})
+            bump_catalogue_version()
+            db.session.commit()
+
+            new_catalogue = get_process_catalogue()
+            self.assertIsNot(new_catalogue, catalogue)
+            self.assertGreater(new_catalogue.version[0], catalogue.version[0])
+            catalogue_reference = [ref for ref in new_catalogue.get_process_references(process.id)
+                                   if ref.id == reference.id][0]
+            self.assertEqual(catalogue_reference.execution_status, ReferenceStudy.FINISHED)
+
+            # the finished reference is listed in the process panel
+            user = User.query.filter(User.username == User.STANDARD_USER_ACCOUNT_NAME).first()
+            user_process = [loaded_process for loaded_process in api_get_processes_for_user(user)
+                            if loaded_process.id == process.id][0]
+            self.assertIn(reference.reference_path.split(".")[-1],
+                          [ref.name for ref in user_process.reference_list or []])
@@ -0,0 +1,130 @@
+'''
+Copyright 2026 Capgemini
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import logging
+import os
+import sys
+from importlib import invalidate_caches
+from tempfile import TemporaryDirectory
+
+from sos_trades_api.tests.controllers.unit_test_basic_config import (
+    DatabaseUnitTestConfiguration,
+)
+
+"""
+Test class for the incremental reference discovery
+"""
+
+
+class TestReferenceDiscovery(DatabaseUnitTestConfiguration):
+    """
+    Test class for methods related to the reference discovery
+    """
+
+    test_repository_name = "sostrades_core.sos_processes.test"
+    test_process_name = "test_disc1_disc2_coupling"
+
+    @classmethod
+    def setUpClass(cls):
+        DatabaseUnitTestConfiguration.setUpClass()
+
+        from sos_trades_api.server.base_server import database_process_setup
+        database_process_setup()
+
+    def test_01_unchanged_processes_are_not_imported_again(self):
+        from sos_trades_api.models.database_models import Process, ReferenceStudy
+        from sos_trades_api.tools.reference_management.reference_management import (
+            update_database_with_references,
+        )
+
+        logger = logging.getLogger("reference_discovery_test")
+        with DatabaseUnitTestConfiguration.app.app_context():
+            process = Process.query.filter(Process.name == self.test_process_name,
+                                           Process.process_path == self.test_repository_name).first()
+            self.assertIsNotNone(process.reference_discovery_fingerprint)
+            references = {(reference.id, reference.reference_path, reference.reference_type)
+                          for reference in ReferenceStudy.query.all()}
+            self.assertTrue(any(reference_path.startswith(f"{self.test_repository_name}.{self.test_process_name}.")
+                                for _, reference_path, _ in references))
+
+            with self.assertLogs(logger, level="INFO") as logs:
+                update_database_with_references(logger)
+            self.assertTrue(any("0 usecase(s) to import" in message for message in logs.output), logs.output)
+
+            # references are kept with their identifiers and types
+            self.assertEqual({(reference.id, reference.reference_path, reference.reference_type)
+                              for reference in ReferenceStudy.query.all()}, references)
+
+    def test_02_modified_process_is_imported_again(self):
+        from sos_trades_api.models.database_models import Process, ReferenceStudy
+        from sos_trades_api.server.base_server import db
+        from sos_trades_api.tools.reference_management.reference_management import (
+            update_database_with_references,
+        )
+
+        logger = logging.getLogger("reference_discovery_test")
+        with DatabaseUnitTestConfiguration.app.app_context():
+            process = Process.query.filter(Process.name == self.test_process_name,
+                                           Process.process_path == self.test_repository_name).first()
+            process_references = {reference.reference_path: reference.reference_type for reference in
+                                  ReferenceStudy.query.filter(ReferenceStudy.process_id == process.id).all()}
+            process.reference_discovery_fingerprint = None
+            db.session.commit()
+
+            with self.assertLogs(logger, level="INFO") as logs:
+                update_database_with_references(logger)
+            self.assertTrue(any("1 new or modified process(es)" in message for message in logs.output), logs.output)
+
+            self.assertEqual({reference.reference_path: reference.reference_type for reference in
+                              ReferenceStudy.query.filter(ReferenceStudy.process_id == process.id).all()},
+                             process_references)
+
+    def test_03_process_with_failed_usecase_is_discovered_again(self):
+        from sos_trades_api.models.database_models import Process
+        from sos_trades_api.server.base_server import db
+        from sos_trades_api.tools.reference_management.reference_management import (
+            update_database_with_references,
+        )
+
+        logger = logging.getLogger("reference_discovery_test")
+        with TemporaryDirectory() as repository_folder, DatabaseUnitTestConfiguration.app.app_context():
+            # process whose usecase cannot be imported
+            process_folder = os.path.join(repository_folder, "discovery_test_repository", "broken_process")
+            os.makedirs(process_folder)
+            for package_folder in (os.path.dirname(process_folder), process_folder):
+                open(os.path.join(package_folder, "__init__.py"), "w").close()
+            with open(os.path.join(process_folder, "usecase.py"), "w") as usecase_file:
+                usecase_file.write('raise ImportError("broken usecase")\n')
+            sys.path.insert(0, repository_folder)
+            invalidate_caches()
+
+            process = Process()
+            process.name = "broken_process"
+            process.process_path = "discovery_test_repository"
+            db.session.add(process)
+            db.session.commit()
+            try:
+                update_database_with_references(logger)
+                self.assertIsNone(Process.query.filter(Process.id == process.id).first().reference_discovery_fingerprint)
+
+                # the usecase is imported again at the next discovery
+                with self.assertLogs(logger, level="INFO") as logs:
+                    update_database_with_references(logger)
+                self.assertTrue(any("1 usecase(s) to import in 1 new or modified process(es)" in message
+                                    for message in logs.output), logs.output)
+            finally:
+                sys.path.remove(repository_folder)
+                db.session.delete(Process.query.filter(Process.id == process.id).first())
+                db.session.commit()
@@ -259,6 +259,59 @@ class TestStudy(DatabaseUnitTestConfiguration):
             self.assertEqual(len(user_shared_study_cases), 3,
                              "User study case list does not match, study case list created and shared in test")
 
+    def test_get_user_shared_study_case_page(self):
+        from sos_trades_api.controllers.sostrades_data.study_case_controller import (
+            get_user_shared_study_case,
+            get_user_shared_study_case_page,
+        )
+        with DatabaseUnitTestConfiguration.app.app_context():
+            all_study_names = sorted(study.name.lower() for study in get_user_shared_study_case(self.test_user_id))
+
+            # browse the 3 studies sorted by name two by two
+            first_page = get_user_shared_study_case_page(self.test_user_id, sort_by="name", descending=False,
+                                                         page_size=2)
+            self.assertEqual(first_page["total_count"], 3)
+            self.assertEqual(len(first_page["studies"]), 2)
+            self.assertIsNotNone(first_page["next_cursor"])
+
+            second_page = get_user_shared_study_case_page(self.test_user_id, sort_by="name", descending=False,
+                                                          cursor=first_page["next_cursor"], page_size=2)
+            self.assertEqual(len(second_page["studies"]), 1)
+            self.assertIsNone(second_page["next_cursor"])
+            self.assertEqual([study.name.lower() for study in first_page["studies"] + second_page["studies"]],
+                             all_study_names)
+
+            # every study is listed once when browsing one by one, whatever the sort values ties
+            for sort_by in ["creation_date", "group_name"]:
+                browsed_study_ids = []
+                cursor = None
+                while True:
+                    page = get_user_shared_study_case_page(self.test_user_id, sort_by=sort_by, cursor=cursor,
+                                                           page_size=1)
+                    browsed_study_ids.extend(study.id for study in page["studies"])
+                    cursor = page["next_cursor"]
+                    if cursor is None:
+                        break
+                self.assertEqual(sorted(browsed_study_ids),
+                                 sorted(study.id for study in get_user_shared_study_case(self.test_user_id)))
+
+            # filters
+            process_page = get_user_shared_study_case_page(self.test_user_id, process=self.test_csv_process_name,
+                                                           repository=self.test_repository_name)
+            self.assertEqual([study.name for study in process_page["studies"]], [self.test_study_csv_name])
+
+            search_page = get_user_shared_study_case_page(self.test_user_id, search=self.test_study_name.upper())
+            self.assertIn(self.test_study_name, [study.name for study in search_page["studies"]])
+
+            favorite_page = get_user_shared_study_case_page(self.test_user_id, favorite=True)
+            self.assertTrue(all(study.is_favorite for study in favorite_page["studies"]))
+            not_favorite_page = get_user_shared_study_case_page(self.test_user_id, favorite=False)
+            self.assertFalse(any(study.is_favorite for study in not_favorite_page["studies"]))
+            self.assertEqual(favorite_page["total_count"] + not_favorite_page["total_count"], 3)
+
+            # the search text is matched literally by the database query
+            self.assertEqual(get_user_shared_study_case_page(self.test_user_id, search="%")["total_count"], 0)
+
     def test_load_study_case(self):
         from sos_trades_api.controllers.sostrades_main.study_case_controller import (
             load_study_case,
@@ -969,6 +1022,15 @@ class TestStudy(DatabaseUnitTestConfiguration):
                 "test_study_copy_read_only.dataframe_mix_types" in str(study_json),
                 "the parameter is not in the read only file")
 
+            # check that the post-processing filters are saved for the current execution only
+            discipline_filters = study_manager.read_post_processing_filters_in_json_file(
+                study_manager.study.current_execution_id)
+            self.assertIsNotNone(discipline_filters, "Unable to read post-processing filters file")
+            self.assertEqual(set(discipline_filters.keys()),
+                             set(study_manager.execution_engine.dm.disciplines_dict.keys()))
+            self.assertIsNone(study_manager.read_post_processing_filters_in_json_file(-1),
+                              "Post-processing filters of another execution are used")
+
             studies_id_list_to_delete = [study_case_copy_id]
             delete_study_cases(studies_id_list_to_delete)
 
@@ -0,0 +1,193 @@
+'''
+Copyright 2026 Capgemini
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import hashlib
+from datetime import datetime
+
+from sos_trades_api.tests.controllers.unit_test_basic_config import (
+    DatabaseUnitTestConfiguration,
+)
+
+"""
+Test class for study case changes history
+"""
+
+
+class TestStudyCaseChanges(DatabaseUnitTestConfiguration):
+    """
+    Test class for methods related to study case changes history
+    """
+
+    test_study_name = "test_changes_history"
+
+    def setUp(self):
+        super().setUp()
+        from sos_trades_api.models.database_models import Group, StudyCase, User
+
+        with DatabaseUnitTestConfiguration.app.app_context():
+            study_case = StudyCase.query.filter(StudyCase.name == self.test_study_name).first()
+            if study_case is None:
+                group = Group.query.filter(Group.name == Group.ALL_USERS_GROUP).first()
+                study_case = StudyCase()
+                study_case.name = self.test_study_name
+                study_case.group_id = group.id
+                study_case.repository = "test_repository"
+                study_case.process = "test_process"
+                DatabaseUnitTestConfiguration.db.session.add(study_case)
+                DatabaseUnitTestConfiguration.db.session.commit()
+            self.test_study_id = study_case.id
+
+            user = User.query.filter(User.username == User.STANDARD_USER_ACCOUNT_NAME).first()
+            self.assertIsNotNone(user, "Standard user not found in database, check migrations")
+            self.test_user_id = user.id
+
+    def __add_save_notification(self):
+        from sos_trades_api.models.database_models import User
+        from sos_trades_api.tools.coedition.coedition import (
+            CoeditionMessage,
+            UserCoeditionAction,
+            add_notification_db,
+        )
+
+        user = User.query.filter(User.id == self.test_user_id).first()
+        return add_notification_db(self.test_study_id, user, UserCoeditionAction.SAVE, CoeditionMessage.SAVE)
+
+    def test_01_batch_stores_identical_old_values_once(self):
+        from sos_trades_api.controllers.sostrades_data.study_case_controller import (
+            get_change_file_stream,
+        )
+        from sos_trades_api.models.database_models import (
+            StudyCaseChange,
+            StudyCaseChangeBlob,
+        )
+        from sos_trades_api.tools.coedition.coedition import StudyCaseChangesBatch
+
+        old_value_csv = b"years,value\n" + b"".join(f"{year},{year * 1.5}\n".encode() for year in range(2000, 2200))
+
+        with DatabaseUnitTestConfiguration.app.app_context():
+            notification_ids = []
+            for _ in range(2):
+                notification_id = self.__add_save_notification()
+                notification_ids.append(notification_id)
+
+                changes_batch = StudyCaseChangesBatch(notification_id)
+                for parameter_name in ("df_a", "df_b"):
+                    changes_batch.add_change(f"{self.test_study_name}.{parameter_name}", StudyCaseChange.CSV_CHANGE, "",
+                                             StudyCaseChange.CSV_CHANGE, None, None, old_value_csv, datetime.now(),
+                                             None, None, None, None, None)
+                changes_batch.add_change(f"{self.test_study_name}.x", "float", "", StudyCaseChange.SCALAR_CHANGE,
+                                         "2.0", "1.0", None, datetime.now(), None, None, None, None, None)
+                changes_batch.commit()
+
+            changes = StudyCaseChange.query.filter(StudyCaseChange.notification_id.in_(notification_ids)).all()
+            self.assertEqual(len(changes), 6)
+
+            blob_ids = {change.old_value_blob_id for change in changes if change.change_type == StudyCaseChange.CSV_CHANGE}
+            self.assertEqual(len(blob_ids), 1, "Identical old values are not stored once")
+            blob = StudyCaseChangeBlob.query.filter(StudyCaseChangeBlob.id == blob_ids.pop()).first()
+            self.assertEqual(blob.size, len(old_value_csv))
+            self.assertLess(len(blob.data), len(old_value_csv), "Old value is not stored compressed")
+
+            for notification_id in notification_ids:
+                self.assertEqual(get_change_file_stream(notification_id, f"{self.test_study_name}.df_b").getvalue(),
+                                 old_value_csv)
+
+    def test_02_notifications_pages(self):
+        from sos_trades_api.controllers.sostrades_data.study_case_controller import (
+            get_study_case_notifications,
+            get_study_case_notifications_count,
+        )
+        from sos_trades_api.models.database_models import StudyCaseChange
+        from sos_trades_api.tools.coedition.coedition import StudyCaseChangesBatch
+
+        with DatabaseUnitTestConfiguration.app.app_context():
+            for index in range(5):
+                changes_batch = StudyCaseChangesBatch(self.__add_save_notification())
+                changes_batch.add_change(f"{self.test_study_name}.x", "float", "", StudyCaseChange.SCALAR_CHANGE,
+                                         str(float(index + 1)), str(float(index)), None, datetime.now(),
+                                         None, None, None, None, None)
+                changes_batch.commit()
+
+            notifications_count = get_study_case_notifications_count(self.test_study_id)
+            all_notifications = get_study_case_notifications(self.test_study_id)
+            self.assertEqual(len(all_notifications), notifications_count)
+
+            first_page = get_study_case_notifications(self.test_study_id, 0, 2)
+            second_page = get_study_case_notifications(self.test_study_id, 1, 2)
+            self.assertEqual([notification.id for notification in first_page + second_page],
+                             [notification.id for notification in all_notifications[:4]])
+
+            # most recent notification first, with its values evaluated
+            change = first_page[0].changes[0]
+            self.assertEqual(change.variable_id, f"{self.test_study_name}.x")
+            self.assertEqual(change.new_value, 5.0)
+            self.assertEqual(change.old_value, 4.0)
+
+            last_page_index = (notifications_count - 1) // 2
+            self.assertEqual(len(get_study_case_notifications(self.test_study_id, last_page_index, 2)),
+                             notifications_count - 2 * last_page_index)
+            self.assertEqual(get_study_case_notifications(self.test_study_id, last_page_index + 1, 2), [])
+
+    def test_03_orphan_old_values_deleted_with_studies(self):
+        from sos_trades_api.controllers.sostrades_main.study_case_controller import (
+            delete_study_cases,
+        )
+        from sos_trades_api.models.database_models import (
+            StudyCase,
+            StudyCaseChange,
+            StudyCaseChangeBlob,
+            User,
+        )
+        from sos_trades_api.tools.coedition.coedition import (
+            CoeditionMessage,
+            StudyCaseChangesBatch,
+            UserCoeditionAction,
+            add_notification_db,
+        )
+
+        shared_csv = b"years,value\n2020,1.0\n"
+        deleted_study_csv = b"years,value\n2020,2.0\n"
+
+        with DatabaseUnitTestConfiguration.app.app_context():
+            source_study = StudyCase.query.filter(StudyCase.id == self.test_study_id).first()
+            deleted_study = StudyCase()
+            deleted_study.name = f"{self.test_study_name}_deleted"
+            deleted_study.group_id = source_study.group_id
+            deleted_study.repository = source_study.repository
+            deleted_study.process = source_study.process
+            DatabaseUnitTestConfiguration.db.session.add(deleted_study)
+            DatabaseUnitTestConfiguration.db.session.commit()
+            deleted_study_id = deleted_study.id
+
+            user = User.query.filter(User.id == self.test_user_id).first()
+            for study_id, old_values in ((self.test_study_id, [shared_csv]),
+                                         (deleted_study_id, [shared_csv, deleted_study_csv])):
+                changes_batch = StudyCaseChangesBatch(
+                    add_notification_db(study_id, user, UserCoeditionAction.SAVE, CoeditionMessage.SAVE))
+                for index, old_value in enumerate(old_values):
+                    changes_batch.add_change(f"{self.test_study_name}.df_{index}", StudyCaseChange.CSV_CHANGE, "",
+                                             StudyCaseChange.CSV_CHANGE, None, None, old_value, datetime.now(),
+                                             None, None, None, None, None)
+                changes_batch.commit()
+
+            delete_study_cases([deleted_study_id])
+
+            blobs_count = {
+                content: StudyCaseChangeBlob.query.filter(
+                    StudyCaseChangeBlob.content_hash == hashlib.sha256(content).hexdigest()).count()
+                for content in (shared_csv, deleted_study_csv)}
+            # the old value still referenced by the other study is kept
+            self.assertEqual(blobs_count, {shared_csv: 1, deleted_study_csv: 0})
+            self.assertIsNone(StudyCase.query.filter(StudyCase.id == deleted_study_id).first())
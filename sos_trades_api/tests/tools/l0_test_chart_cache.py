@@ -0,0 +1,116 @@
+'''
+Copyright 2026 Capgemini
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import os
+import unittest
+from datetime import datetime, timedelta
+from tempfile import TemporaryDirectory
+
+from sos_trades_api.tools.cache.chart_cache import (
+    CHART_CACHE_FOLDER_NAME,
+    ChartCache,
+    get_chart_key,
+    get_study_version_stamp,
+)
+
+"""
+Test class for the post-processing charts cache
+"""
+
+
+class StandInChartFilter:
+
+    def __init__(self, filter_key, selected_values):
+        self.filter_key = filter_key
+        self.selected_values = selected_values
+
+    def to_dict(self):
+        return {"filter_key": self.filter_key, "selected_values": self.selected_values}
+
+
+class TestChartCache(unittest.TestCase):
+
+    STUDY_ID = 1
+
+    def setUp(self):
+        self.temporary_directory = TemporaryDirectory()
+        self.study_folder = self.temporary_directory.name
+        self.modification_date = datetime(2026, 10, 19, 12, 0, 0)
+        self.version_stamp = get_study_version_stamp(self.modification_date)
+        self.charts = [{"chart_name": "Chart", "series": list(range(100))}]
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def test_01_chart_key_normalises_filters(self):
+        first_filter = StandInChartFilter("years", [2020, 2030])
+        second_filter = StandInChartFilter("charts", ["Chart"])
+
+        self.assertEqual(get_chart_key("study.Disc1", "", [first_filter, second_filter]),
+                         get_chart_key("study.Disc1", None, [second_filter, first_filter]))
+        self.assertNotEqual(get_chart_key("study.Disc1", "", None), get_chart_key("study.Disc1", "", []))
+        self.assertNotEqual(get_chart_key("study.Disc1", "", [first_filter]),
+                            get_chart_key("study.Disc1", "", [StandInChartFilter("years", [2020])]))
+
+    def test_02_memory_then_disk_tier(self):
+        chart_key = get_chart_key("study.Disc1", "", None)
+        chart_cache = ChartCache()
+
+        self.assertIsNone(chart_cache.get(self.STUDY_ID, self.study_folder, self.version_stamp, chart_key))
+        chart_cache.set(self.STUDY_ID, self.study_folder, self.version_stamp, chart_key, self.charts)
+        self.assertIs(chart_cache.get(self.STUDY_ID, self.study_folder, self.version_stamp, chart_key), self.charts)
+
+        # another server reads the serialised charts
+        other_chart_cache = ChartCache()
+        self.assertEqual(other_chart_cache.get(self.STUDY_ID, self.study_folder, self.version_stamp, chart_key),
+                         self.charts)
+        self.assertEqual(other_chart_cache.statistics.disk_hits, 1)
+
+        self.assertEqual(chart_cache.statistics.serialize(),
+                         {"memory_hits": 1, "disk_hits": 0, "misses": 1, "hit_rate": 0.5})
+
+    def test_03_new_study_version_drops_previous_charts(self):
+        chart_key = get_chart_key("study.Disc1", "", None)
+        chart_cache = ChartCache()
+        chart_cache.set(self.STUDY_ID, self.study_folder, self.version_stamp, chart_key, self.charts)
+
+        new_version_stamp = get_study_version_stamp(self.modification_date + timedelta(seconds=1))
+        self.assertIsNone(chart_cache.get(self.STUDY_ID, self.study_folder, new_version_stamp, chart_key))
+
+        # charts generated from the previous version after the new one has been requested are not stored
+        chart_cache.set(self.STUDY_ID, self.study_folder, self.version_stamp, chart_key, self.charts)
+        self.assertIsNone(chart_cache.get(self.STUDY_ID, self.study_folder, self.version_stamp, chart_key))
+
+        chart_cache.set(self.STUDY_ID, self.study_folder, new_version_stamp, chart_key, self.charts)
+        self.assertEqual(len(os.listdir(os.path.join(self.study_folder, CHART_CACHE_FOLDER_NAME))), 1)
+
+        chart_cache.invalidate_study(self.STUDY_ID, self.study_folder)
+        self.assertIsNone(chart_cache.get(self.STUDY_ID, self.study_folder, new_version_stamp, chart_key))
+
+    def test_04_memory_tier_is_bounded(self):
+        chart_cache = ChartCache(max_memory_entries=2)
+        chart_keys = [get_chart_key(f"study.Disc{index}", "", None) for index in range(3)]
+        for chart_key in chart_keys:
+            chart_cache.set(self.STUDY_ID, self.study_folder, self.version_stamp, chart_key, self.charts)
+
+        for chart_key in reversed(chart_keys):
+            self.assertIsNotNone(chart_cache.get(self.STUDY_ID, self.study_folder, self.version_stamp, chart_key))
+        # the least recently used charts have been read from the disk tier
+        self.assertEqual(chart_cache.statistics.memory_hits, 2)
+        self.assertEqual(chart_cache.statistics.disk_hits, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+'''
+Copyright 2026 Capgemini
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import json
+import unittest
+
+import numpy as np
+
+from sos_trades_api.tools.chart_payload import (
+    ORIGINAL_LENGTH_KEY,
+    TYPED_ARRAY_KEY,
+    ChartPayloadEncoder,
+    decode_typed_array,
+    get_lttb_indices,
+)
+
+"""
+Test class for the compact encoding of the post-processing charts payload
+"""
+
+
+class StandInChart:
+
+    def __init__(self, series):
+        self.series = series
+
+    def to_dict(self):
+        return {"chart_name": "Hourly production", "series": self.series}
+
+
+class TestChartPayload(unittest.TestCase):
+
+    # 30 years of hourly values
+    POINTS_COUNT = 30 * 8760
+
+    def setUp(self):
+        abscissa = np.arange(self.POINTS_COUNT, dtype=float)
+        ordinate = np.sin(abscissa / 500.0) * 100.0
+        ordinate[123456] = 1000.0
+        self.series = {"series_name": "production", "abscissa": abscissa.tolist(), "ordinate": ordinate.tolist()}
+        self.chart = StandInChart([self.series])
+
+    def test_01_lttb_keeps_bounds_and_peaks(self):
+        abscissa = np.array(self.series["abscissa"])
+        ordinate = np.array(self.series["ordinate"])
+        indices = get_lttb_indices(abscissa, ordinate, 1000)
+
+        self.assertEqual(len(indices), 1000)
+        self.assertEqual(indices[0], 0)
+        self.assertEqual(indices[-1], self.POINTS_COUNT - 1)
+        self.assertTrue(np.all(np.diff(indices) > 0))
+        self.assertIn(123456, indices)
+        self.assertEqual(len(get_lttb_indices(abscissa[:10], ordinate[:10], 1000)), 10)
+
+    def test_02_typed_arrays_without_downsampling(self):
+        payload = ChartPayloadEncoder().encode([self.chart])
+
+        encoded_series = payload[0]["series"][0]
+        self.assertEqual(encoded_series["series_name"], "production")
+        self.assertEqual(encoded_series["ordinate"][TYPED_ARRAY_KEY], "float64")
+        self.assertTrue(np.array_equal(decode_typed_array(encoded_series["ordinate"]), self.series["ordinate"]))
+        self.assertNotIn(ORIGINAL_LENGTH_KEY, encoded_series)
+
+        # short or non numeric lists are kept as json lists
+        short_payload = ChartPayloadEncoder().encode({"x": [1.0, 2.0], "labels": ["a"] * 100})
+        self.assertEqual(short_payload, {"x": [1.0, 2.0], "labels": ["a"] * 100})
+
+    def test_03_downsampling_reduces_payload(self):
+        original_payload = json.dumps(self.chart.to_dict())
+        encoded_payload = json.dumps(ChartPayloadEncoder(width=1000, dtype="float32").encode([self.chart]))
+
+        encoded_series = json.loads(encoded_payload)[0]["series"][0]
+        self.assertEqual(encoded_series[ORIGINAL_LENGTH_KEY], self.POINTS_COUNT)
+        self.assertEqual(len(decode_typed_array(encoded_series["abscissa"])), 1000)
+        self.assertLess(len(encoded_payload) * 10, len(original_payload))
+
+        # the chart kept in cache is not modified
+        self.assertEqual(len(self.chart.series[0]["ordinate"]), self.POINTS_COUNT)
+
+
+if __name__ == "__main__":
+    unittest.main()
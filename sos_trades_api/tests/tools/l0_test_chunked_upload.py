@@ -0,0 +1,150 @@
+'''
+Copyright 2026 Capgemini
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import hashlib
+import io
+import os
+import threading
+import time
+import unittest
+from os.path import exists, join
+from tempfile import TemporaryDirectory
+
+from sos_trades_api.tools.file_stream.chunked_upload import (
+    ChunkedUploadError,
+    ChunkedUploadSession,
+)
+
+"""
+Test class for chunked upload sessions
+"""
+
+
+class TestChunkedUpload(unittest.TestCase):
+
+    PART_SIZE = 100000
+
+    def setUp(self):
+        self.temporary_directory = TemporaryDirectory()
+        self.upload_folder = self.temporary_directory.name
+        self.data = os.urandom(3 * self.PART_SIZE + 500)
+        self.parts = [(part_index, offset, self.data[offset:offset + self.PART_SIZE])
+                      for part_index, offset in enumerate(range(0, len(self.data), self.PART_SIZE))]
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def test_01_upload_parts_in_any_order(self):
+        upload_session = ChunkedUploadSession.create(self.upload_folder, "study.zip", len(self.data), {"user_id": 1})
+
+        for part_index, offset, part in reversed(self.parts):
+            # each part may be received by another request
+            upload_session = ChunkedUploadSession(self.upload_folder, upload_session.session_id)
+            self.assertFalse(upload_session.is_complete())
+            upload_session.write_part(part_index, offset, hashlib.sha256(part).hexdigest(), io.BytesIO(part))
+
+        self.assertTrue(upload_session.is_complete())
+        self.assertEqual(upload_session.get_received_size(), len(self.data))
+        self.assertEqual(upload_session.metadata, {"user_id": 1})
+        with open(upload_session.uploaded_file_path, "rb") as uploaded_file:
+            self.assertEqual(uploaded_file.read(), self.data)
+
+    def test_02_resend_invalid_part(self):
+        upload_session = ChunkedUploadSession.create(self.upload_folder, "study.zip", len(self.data))
+        for part_index, offset, part in self.parts:
+            upload_session.write_part(part_index, offset, hashlib.sha256(part).hexdigest(), io.BytesIO(part))
+
+        # a corrupted part is rejected and unregistered
+        part_index, offset, part = self.parts[1]
+        with self.assertRaises(ChunkedUploadError):
+            upload_session.write_part(part_index, offset, hashlib.sha256(part).hexdigest(), io.BytesIO(b"0" * len(part)))
+        self.assertFalse(upload_session.is_complete())
+
+        # the upload is resumed by sending the part again
+        upload_session.write_part(part_index, offset, hashlib.sha256(part).hexdigest(), io.BytesIO(part))
+        self.assertTrue(upload_session.is_complete())
+        with open(upload_session.uploaded_file_path, "rb") as uploaded_file:
+            self.assertEqual(uploaded_file.read(), self.data)
+
+    def test_03_part_outside_of_file(self):
+        upload_session = ChunkedUploadSession.create(self.upload_folder, "study.zip", len(self.data))
+        with self.assertRaises(ChunkedUploadError):
+            upload_session.write_part(10, len(self.data), "", io.BytesIO(b"0"))
+        with self.assertRaises(ChunkedUploadError):
+            upload_session.write_part(10, len(self.data) - 1, "", io.BytesIO(b"00"))
+        with self.assertRaises(ChunkedUploadError):
+            ChunkedUploadSession(self.upload_folder, "unknown_session")
+
+    def test_04_concurrent_parts_and_finalizations(self):
+        upload_session = ChunkedUploadSession.create(self.upload_folder, "study.zip", len(self.data))
+        session_id = upload_session.session_id
+
+        def write_part(part_index, offset, part):
+            ChunkedUploadSession(self.upload_folder, session_id).write_part(
+                part_index, offset, hashlib.sha256(part).hexdigest(), io.BytesIO(part))
+
+        threads = [threading.Thread(target=write_part, args=part) for part in self.parts]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # no part registration has been lost
+        upload_session = ChunkedUploadSession(self.upload_folder, session_id)
+        self.assertEqual(len(upload_session.serialize()["parts"]), len(self.parts))
+        self.assertTrue(upload_session.is_complete())
+
+        # a second finalization of the same session, even from an outdated instance, is rejected
+        outdated_session = ChunkedUploadSession(self.upload_folder, session_id)
+        upload_session.finalize()
+        with self.assertRaises(ChunkedUploadError):
+            outdated_session.finalize()
+        self.assertEqual(ChunkedUploadSession(self.upload_folder, session_id).status, ChunkedUploadSession.FINALIZED)
+
+        # a part sent after the finalization is rejected without modifying the uploaded file
+        part_index, offset, part = self.parts[0]
+        with self.assertRaises(ChunkedUploadError):
+            outdated_session.write_part(part_index, offset, hashlib.sha256(part).hexdigest(),
+                                        io.BytesIO(b"0" * len(part)))
+        with open(upload_session.uploaded_file_path, "rb") as uploaded_file:
+            self.assertEqual(uploaded_file.read(), self.data)
+
+    def test_05_invalid_session_id_and_size(self):
+        for session_id in ["../" + "0" * 29, join(self.upload_folder, "0" * 32), "0" * 31, "0" * 32 + "/", None]:
+            with self.assertRaises(ChunkedUploadError):
+                ChunkedUploadSession(self.upload_folder, session_id)
+
+        with self.assertRaises(ChunkedUploadError):
+            ChunkedUploadSession.create(self.upload_folder, "study.zip", 0)
+        with self.assertRaises(ChunkedUploadError):
+            ChunkedUploadSession.create(self.upload_folder, "study.zip", len(self.data), max_file_size=len(self.data) - 1)
+        self.assertEqual(os.listdir(self.upload_folder), [])
+
+    def test_06_remove_expired_sessions(self):
+        expired_session = ChunkedUploadSession.create(self.upload_folder, "expired.zip", len(self.data))
+        time.sleep(0.05)
+        active_session = ChunkedUploadSession.create(self.upload_folder, "active.zip", len(self.data))
+
+        removed_sessions = ChunkedUploadSession.remove_expired_sessions(self.upload_folder, expiry_delay=0.02)
+        self.assertEqual(removed_sessions, [expired_session.session_id])
+        self.assertFalse(exists(expired_session.uploaded_file_path))
+        self.assertTrue(exists(active_session.uploaded_file_path))
+        with self.assertRaises(ChunkedUploadError):
+            ChunkedUploadSession(self.upload_folder, expired_session.session_id)
+        self.assertEqual(ChunkedUploadSession.remove_expired_sessions(join(self.upload_folder, "unknown")), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
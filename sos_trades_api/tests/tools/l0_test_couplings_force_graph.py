@@ -0,0 +1,234 @@
+'''
+Copyright 2026 Capgemini
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import copy
+import json
+import unittest
+from types import SimpleNamespace
+
+import pandas as pd
+
+from sos_trades_api.tools.visualisation.couplings_force_graph import (
+    get_couplings_force_graph,
+    get_n2_treenode,
+)
+
+"""
+Test class for couplings force graph generation
+"""
+
+
+def legacy_couplings_force_graph(coupling_matrix_df, ontology_matrix_data):
+    """
+    Reference quadratic implementation, used to check the indexed one
+    """
+    tree_nodes = ontology_matrix_data["tree_nodes"]
+    parameter_nodes = ontology_matrix_data["parameter_nodes"]
+    hierarchy_links = ontology_matrix_data["hierarchy_links"]
+
+    def get_ancestors(treeview, starting_id):
+        ancestors = []
+        parent_id = treeview[starting_id]["Parent Node"]
+        while parent_id != "":
+            ancestors.append(parent_id)
+            parent_id = treeview[parent_id]["Parent Node"]
+        return ancestors
+
+    coupling_links = []
+    grouped_links_dict = {}
+    tree_nodes_dict = {element["id"]: element for element in tree_nodes}
+    parameters_dict = {element["id"]: element for element in parameter_nodes}
+
+    coupling_matrix_dict = coupling_matrix_df.to_dict(orient="index")
+    ids_list = set([key["id"] for key in parameter_nodes + tree_nodes])
+
+    for row in coupling_matrix_dict.values():
+        row_links = []
+        disc_from_id = row["disc_1"]
+        disc_to_id = row["disc_2"]
+        parameter_id = row["var_name"]
+        if disc_from_id in ids_list and parameter_id in ids_list and disc_to_id in ids_list:
+            row_links.append({"id": disc_from_id + "_TO_" + parameter_id + "_TYPE_OUTPUT OF",
+                              "source": disc_from_id, "target": parameter_id, "Type": "OUTPUT_OF", "Size": 3,
+                              "ancestors": get_ancestors(tree_nodes_dict, disc_from_id), "active": 0})
+            row_links.append({"id": parameter_id + "_TO_" + disc_to_id + "_TYPE_INPUT OF",
+                              "source": parameter_id, "target": disc_to_id, "Type": "INPUT_TO", "Size": 3,
+                              "ancestors": get_ancestors(tree_nodes_dict, disc_to_id), "active": 0})
+            coupling_links.extend(row_links)
+
+            id = disc_from_id + "_TO_" + disc_to_id + "_TYPE_GROUPLINK"
+            if id in grouped_links_dict:
+                grouped_links_dict[id]["Size"] += 1
+                grouped_links_dict[id]["parameterList"].append(
+                    {"id": parameter_id, "Name": parameters_dict.get(parameter_id, {}).get("label", "")})
+                grouped_links_dict[id]["groupedLinks"] += row_links,
+                grouped_links_dict[id]["groupedNodes"].append(parameter_id)
+            else:
+                grouped_links_dict[id] = {
+                    "id": id, "source": disc_from_id, "sourceLabel": tree_nodes_dict[disc_from_id]["Name"],
+                    "target": disc_to_id, "targetLabel": tree_nodes_dict[disc_to_id]["Name"],
+                    "Type": "parameterExchange", "Size": 1,
+                    "parameterList": [{"id": parameter_id,
+                                       "Name": parameters_dict.get(parameter_id, {}).get("label", "")}],
+                    "sourceAncestors": get_ancestors(tree_nodes_dict, disc_from_id),
+                    "targetAncestors": get_ancestors(tree_nodes_dict, disc_to_id),
+                    "groupedLinks": row_links, "groupedNodes": [parameter_id], "active": 1,
+                }
+
+    for p in parameter_nodes:
+        in_links = []
+        out_links = []
+        for row in coupling_matrix_dict.values():
+            if p["id"] == row["var_name"]:
+                out_links.append({"link": row["disc_1"] + "_TO_" + row["var_name"] + "_TYPE_OUTPUT OF",
+                                  "node": row["disc_1"]})
+                in_links.append({"link": row["var_name"] + "_TO_" + row["disc_2"] + "_TYPE_INPUT OF",
+                                 "node": row["disc_2"]})
+        p["in_links"] = in_links
+        p["out_links"] = out_links
+
+    for node in tree_nodes:
+        in_parameter_list = []
+        out_parameter_list = []
+        id_list = node["childrenIDs"] + [node["id"]]
+        for p in coupling_links:
+            if p["Type"] == "OUTPUT_OF":
+                if p["source"] in id_list:
+                    out_parameter_list.append(p["id"])
+            elif p["Type"] == "INPUT_TO":
+                if p["target"] in id_list:
+                    in_parameter_list.append(p["id"])
+        node["in_parameter_list"] = in_parameter_list
+        node["out_parameter_list"] = out_parameter_list
+
+    return {"nodes": tree_nodes + parameter_nodes,
+            "links": hierarchy_links + coupling_links,
+            "treeNodes": tree_nodes,
+            "parameterNodes": parameter_nodes,
+            "hierarchyLinks": hierarchy_links,
+            "couplingLinks": coupling_links,
+            "groupedLinks": hierarchy_links + list(grouped_links_dict.values()),
+            }
+
+
+class TestCouplingsForceGraph(unittest.TestCase):
+    """
+    Test class for methods related to couplings force graph
+    """
+
+    COUPLINGS_COUNT = 10000
+    PARAMETERS_COUNT = 1000
+    GROUPS_COUNT = 20
+    DISCIPLINES_BY_GROUP = 10
+
+    def setUp(self):
+        """
+        Build a synthetic ontology matrix and coupling matrix: root > groups > disciplines
+        """
+        tree_nodes = [{"id": "root", "Name": "root", "Parent Node": "", "childrenIDs": []}]
+        hierarchy_links = []
+        disciplines = []
+        for group_index in range(self.GROUPS_COUNT):
+            group_id = f"root.group_{group_index}"
+            group_node = {"id": group_id, "Name": f"group_{group_index}", "Parent Node": "root", "childrenIDs": []}
+            tree_nodes.append(group_node)
+            tree_nodes[0]["childrenIDs"].append(group_id)
+            hierarchy_links.append({"id": f"root_TO_{group_id}", "source": "root", "target": group_id})
+            for disc_index in range(self.DISCIPLINES_BY_GROUP):
+                disc_id = f"{group_id}.disc_{disc_index}"
+                tree_nodes.append({"id": disc_id, "Name": f"disc_{disc_index}", "Parent Node": group_id,
+                                   "childrenIDs": []})
+                group_node["childrenIDs"].append(disc_id)
+                tree_nodes[0]["childrenIDs"].append(disc_id)
+                hierarchy_links.append({"id": f"{group_id}_TO_{disc_id}", "source": group_id, "target": disc_id})
+                disciplines.append(disc_id)
+
+        parameter_nodes = [{"id": f"root.parameter_{index}", "label": f"parameter {index}"}
+                           for index in range(self.PARAMETERS_COUNT)]
+
+        rows = []
+        for index in range(self.COUPLINGS_COUNT):
+            rows.append({
+                "disc_1": disciplines[index % len(disciplines)],
+                "disc_2": disciplines[(index * 7 + 3) % len(disciplines)],
+                "var_name": parameter_nodes[index % self.PARAMETERS_COUNT]["id"],
+            })
+        # coupling referencing an unknown discipline must be ignored
+        rows.append({"disc_1": "root.unknown", "disc_2": disciplines[0], "var_name": parameter_nodes[0]["id"]})
+
+        self.coupling_matrix_df = pd.DataFrame(rows)
+        self.ontology_matrix_data = {
+            "tree_nodes": tree_nodes,
+            "parameter_nodes": parameter_nodes,
+            "hierarchy_links": hierarchy_links,
+        }
+
+    def test_01_same_result_as_reference_implementation(self):
+        expected = legacy_couplings_force_graph(self.coupling_matrix_df, copy.deepcopy(self.ontology_matrix_data))
+        result = get_couplings_force_graph(self.coupling_matrix_df, copy.deepcopy(self.ontology_matrix_data))
+
+        self.assertEqual(json.dumps(expected, sort_keys=True), json.dumps(result, sort_keys=True),
+                         "Indexed couplings graph is different from the reference one")
+        self.assertEqual(len(result["couplingLinks"]), 2 * self.COUPLINGS_COUNT)
+
+    def test_02_empty_coupling_matrix(self):
+        result = get_couplings_force_graph(None, copy.deepcopy(self.ontology_matrix_data))
+
+        self.assertEqual(len(result["couplingLinks"]), 0)
+        for node in result["treeNodes"]:
+            self.assertEqual(node["in_parameter_list"], [])
+            self.assertEqual(node["out_parameter_list"], [])
+
+    def test_03_n2_treenode_keeps_coupling_variables_only(self):
+        def get_variable(name, io_type):
+            return {"var_name": name, "io_type": io_type, "type": "array", "value": list(range(1000))}
+
+        discipline = SimpleNamespace(to_dict=lambda: {
+            "model_name_full_path": "models.disc1",
+            "disciplinary_inputs": {"study.Disc1.x": get_variable("x", "in"),
+                                    "study.Disc1.a": get_variable("a", "in")},
+            "disciplinary_outputs": {"study.Disc1.y": get_variable("y", "out")},
+        })
+        child = SimpleNamespace(
+            name="Disc1", full_namespace="study.Disc1", status="DONE",
+            data={"study.Disc1.x": get_variable("x", "in"), "study.Disc1.a": get_variable("a", "in")},
+            data_management_disciplines={"study.Disc1": discipline}, children=[])
+        root = SimpleNamespace(name="study", full_namespace="study", status="DONE", data={},
+                               data_management_disciplines={}, children=[child])
+        coupling_variables = {"study.Disc1.x", "study.Disc1.y"}
+
+        n2_treenode = get_n2_treenode(root, coupling_variables)
+
+        n2_child = n2_treenode["children"][0]
+        self.assertEqual(n2_child["full_namespace"], "study.Disc1")
+        self.assertEqual(list(n2_child["data"]), ["study.Disc1.x"])
+        n2_discipline = n2_child["data_management_disciplines"]["study.Disc1"]
+        self.assertEqual(n2_discipline["model_name_full_path"], "models.disc1")
+        self.assertEqual(list(n2_discipline["disciplinary_inputs"]), ["study.Disc1.x"])
+        self.assertEqual(list(n2_discipline["disciplinary_outputs"]), ["study.Disc1.y"])
+        self.assertNotIn("value", n2_discipline["disciplinary_outputs"]["study.Disc1.y"])
+
+        # a serialized treeview gives the same reduced treeview
+        serialized_root = {"name": "study", "full_namespace": "study", "status": "DONE", "data": {},
+                           "data_management_disciplines": {}, "children": [{
+                               "name": "Disc1", "full_namespace": "study.Disc1", "status": "DONE",
+                               "data": child.data,
+                               "data_management_disciplines": {"study.Disc1": discipline.to_dict()},
+                               "children": []}]}
+        self.assertEqual(get_n2_treenode(serialized_root, coupling_variables), n2_treenode)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+'''
+Copyright 2026 Capgemini
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import io
+import unittest
+from os.path import dirname, join
+
+import pandas as pd
+from sostrades_core.tools.tree.deserialization import isevaluatable
+
+from sos_trades_api.tests import data
+from sos_trades_api.tools.file_stream.csv_parameter_reader import read_csv_parameter
+
+"""
+Test class for csv parameter upload reading
+"""
+
+
+def legacy_read_csv_parameter(file_stream):
+    """
+    Reference implementation, evaluating every cell of the csv file
+    """
+    value = pd.read_csv(file_stream, na_filter=False)
+    return value.applymap(isevaluatable)
+
+
+class TestCsvParameterReader(unittest.TestCase):
+
+    def test_01_read_mixed_types_csv(self):
+        for file_name in ["array_mix_types.csv", "dict_mix_types.csv", "dataframe_mix_types.csv",
+                          "dict_as_dict_dataframe.csv", "correct_design_space.csv"]:
+            with open(join(dirname(data.__file__), file_name), "rb") as csv_file:
+                expected = legacy_read_csv_parameter(csv_file)
+                csv_file.seek(0)
+                value = read_csv_parameter(csv_file)
+
+            self.assertTrue(expected.equals(value), f"{file_name} is not read as before:\n{value}\n{expected}")
+
+    def test_02_read_blank_and_literal_cells_in_numerical_columns(self):
+        # numerical columns with blank cells or literals are not typed by the csv parser, their cells are
+        # evaluated one by one and blank cells are kept as empty strings
+        value = read_csv_parameter(io.StringIO("years,value\n2020,1\n2021,\n2022,3"))
+        self.assertEqual(value["years"].tolist(), [2020, 2021, 2022])
+        self.assertEqual(value["value"].tolist(), [1, "", 3])
+
+        csv_content = "years,value,name,list\n2020,1.5,a,[1]\n2021,None,b,\"[2, 3]\"\n2022,,c,[]\n"
+        value = read_csv_parameter(io.StringIO(csv_content))
+        expected = legacy_read_csv_parameter(io.StringIO(csv_content))
+
+        self.assertTrue(expected.equals(value), f"csv is not read as before:\n{value}\n{expected}")
+        self.assertEqual(value["value"].tolist(), [1.5, None, ""])
+
+    def test_03_read_large_csv(self):
+        # 100 000 rows x 10 columns = 1M cells, with numerical and object columns
+        rows_count = 100000
+        dataframe = pd.DataFrame({
+            "years": range(rows_count),
+            "float_1": [i * 0.5 for i in range(rows_count)],
+            "float_2": [i * 1.5 for i in range(rows_count)],
+            "float_3": [i * 2.5 for i in range(rows_count)],
+            "float_4": [i * 3.5 for i in range(rows_count)],
+            "float_5": [i * 4.5 for i in range(rows_count)],
+            "bool": [i % 2 == 0 for i in range(rows_count)],
+            "name": [f"name_{i}" for i in range(rows_count)],
+            "list": [f"[{i}, {i + 1}]" for i in range(rows_count)],
+            "mixed": ["None" if i % 10 == 0 else f"value_{i}" for i in range(rows_count)],
+        })
+        csv_content = dataframe.to_csv(index=False)
+
+        expected = legacy_read_csv_parameter(io.StringIO(csv_content))
+        value = read_csv_parameter(io.StringIO(csv_content))
+
+        self.assertTrue(expected.equals(value), "large csv is not read as before")
+
+
+    def test_04_read_with_dataframe_descriptor(self):
+        dataframe_descriptor = {
+            "years": ("int", None, False),
+            "value": ("float", None, False),
+            "name": ("string", None, False),
+            "list": ("list", None, False),
+        }
+
+        # numerical columns of the descriptor are converted as a whole, blank cells are kept as empty strings
+        csv_content = "years,value,name,list\n2020,1.5,a,[1]\n2021,,b,\"[2, 3]\"\n2022,3,,[]\n"
+        value = read_csv_parameter(io.StringIO(csv_content), dataframe_descriptor)
+        expected = legacy_read_csv_parameter(io.StringIO(csv_content))
+        self.assertEqual(value["value"].tolist(), [1.5, "", 3.0])
+        for column_name in ["years", "name", "list"]:
+            self.assertEqual(value[column_name].tolist(), expected[column_name].tolist())
+
+        # numerical columns with literals are evaluated cell by cell as before
+        csv_content = "years,value,name,list\n2020,1.5,a,[1]\n2021,None,b,\"[2, 3]\"\n2022,,c,[]\n"
+        value = read_csv_parameter(io.StringIO(csv_content), dataframe_descriptor)
+        expected = legacy_read_csv_parameter(io.StringIO(csv_content))
+        self.assertTrue(expected.equals(value), f"csv is not read as before:\n{value}\n{expected}")
+
+
+if __name__ == "__main__":
+    unittest.main()
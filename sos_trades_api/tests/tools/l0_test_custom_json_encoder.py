@@ -0,0 +1,131 @@
+'''
+Copyright 2026 Capgemini
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import logging
+import time
+import unittest
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import simplejson
+
+from sos_trades_api.models.custom_json_encoder import (
+    ORJSON_AVAILABLE,
+    CustomJsonEncoder,
+    dumps_with_orjson,
+    get_json_handler,
+)
+
+"""
+Test class and micro-benchmarks of the custom json encoder on treeview and chart payloads
+"""
+
+
+class TestCustomJsonEncoder(unittest.TestCase):
+
+    BENCHMARK_REPEAT = 5
+
+    @staticmethod
+    def get_treeview_payload(nodes_count=2000):
+        """
+        Treeview like payload: nested nodes with parameters of various types
+        """
+        return {
+            "root_node": {
+                "name": "study",
+                "children": [{
+                    "name": f"Disc{index}",
+                    "status": "DONE",
+                    "last_modification": datetime(2026, 1, 1),
+                    "data": {
+                        f"study.Disc{index}.x": {"value": np.float64(index), "type": float},
+                        f"study.Disc{index}.n": {"value": np.int64(index), "type": int},
+                        f"study.Disc{index}.flag": {"value": np.bool_(index % 2), "type": bool},
+                        f"study.Disc{index}.df": {"value": pd.DataFrame({"a": [1, 2]}), "type": "dataframe"},
+                        f"study.Disc{index}.array": {"value": np.arange(3), "type": "array"},
+                        f"study.Disc{index}.tags": {"value": {"tag"}, "type": "list"},
+                    },
+                } for index in range(nodes_count)],
+            },
+        }
+
+    @staticmethod
+    def get_chart_payload(points_count=200000):
+        """
+        Chart like payload: dense series with missing values
+        """
+        values = np.sin(np.arange(points_count) / 100.0)
+        values[::1000] = np.nan
+        values[1] = np.inf
+        return {
+            "chart_name": "Hourly production",
+            "series": [{"abscissa": pd.Series(np.arange(points_count)), "ordinate": pd.Series(values)}],
+        }
+
+    def benchmark(self, dumps, payload) -> float:
+        start_time = time.perf_counter()
+        for _ in range(self.BENCHMARK_REPEAT):
+            dumps(payload)
+        return (time.perf_counter() - start_time) / self.BENCHMARK_REPEAT
+
+    def test_01_handlers_follow_rules_order(self):
+        self.assertIs(get_json_handler(np.float64), float)
+        self.assertIs(get_json_handler(np.int32), int)
+        self.assertIsNone(get_json_handler(object))
+        # handlers are cached per class
+        self.assertIs(get_json_handler(pd.Series), get_json_handler(pd.Series))
+
+        encoded = simplejson.loads(simplejson.dumps(self.get_treeview_payload(1), cls=CustomJsonEncoder))
+        encoded_data = encoded["root_node"]["children"][0]["data"]
+        self.assertEqual(encoded_data["study.Disc0.df"]["value"], "://dataframe")
+        self.assertEqual(encoded_data["study.Disc0.array"]["value"], "://ndarray")
+        self.assertEqual(encoded_data["study.Disc0.x"]["type"], "<class 'float'>")
+        self.assertEqual(encoded_data["study.Disc0.flag"]["value"], False)
+        self.assertEqual(encoded_data["study.Disc0.tags"]["value"], ["tag"])
+        self.assertEqual(encoded["root_node"]["children"][0]["last_modification"], "2026-01-01 00:00:00")
+
+        with self.assertRaises(TypeError):
+            simplejson.dumps(object(), cls=CustomJsonEncoder)
+
+    def test_02_series_non_finite_values_are_null(self):
+        payload = self.get_chart_payload(2000)
+        encoded_series = simplejson.loads(simplejson.dumps(payload, cls=CustomJsonEncoder))["series"][0]
+
+        # same values as the element by element encoding of the series
+        expected_ordinate = [None if not np.isfinite(value) else float(value) for value in payload["series"][0]["ordinate"]]
+        self.assertEqual(encoded_series["ordinate"], expected_ordinate)
+        self.assertEqual(encoded_series["abscissa"], list(range(2000)))
+
+    @unittest.skipUnless(ORJSON_AVAILABLE, "orjson is not installed")
+    def test_03_orjson_backend_gives_same_json(self):
+        for payload in [self.get_treeview_payload(10), self.get_chart_payload(2000)]:
+            self.assertEqual(simplejson.loads(dumps_with_orjson(payload)),
+                             simplejson.loads(simplejson.dumps(payload, cls=CustomJsonEncoder)))
+
+    @unittest.skipUnless(ORJSON_AVAILABLE, "orjson is not installed")
+    def test_04_benchmark_treeview_and_chart_payloads(self):
+        for payload_name, payload in [("treeview", self.get_treeview_payload()), ("chart", self.get_chart_payload())]:
+            simplejson_duration = self.benchmark(lambda obj: simplejson.dumps(obj, cls=CustomJsonEncoder), payload)
+            orjson_duration = self.benchmark(dumps_with_orjson, payload)
+            logging.getLogger(__name__).info(
+                f"{payload_name} payload: simplejson {simplejson_duration * 1000:.1f}ms, "
+                f"orjson {orjson_duration * 1000:.1f}ms")
+
+            self.assertEqual(simplejson.loads(dumps_with_orjson(payload)),
+                             simplejson.loads(simplejson.dumps(payload, cls=CustomJsonEncoder)))
+
+if __name__ == "__main__":
+    unittest.main()
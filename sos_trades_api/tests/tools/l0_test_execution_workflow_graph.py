@@ -0,0 +1,228 @@
+'''
+Copyright 2026 Capgemini
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import json
+import unittest
+from types import SimpleNamespace
+
+from sos_trades_api.tools.visualisation.execution_workflow_graph import (
+    SoSExecutionWorkflow,
+)
+
+"""
+Test class for the execution workflow graph generation, its links indexes and the summary of large parallel nodes
+"""
+
+
+class StandInDataManager:
+
+    @staticmethod
+    def get_data(parameter_name):
+        return {"io_type": "out", "var_name": parameter_name.split(".")[-1]}
+
+
+class StandInDiscipline:
+
+    def __init__(self, name, inputs=(), outputs=()):
+        self.name = name
+        self.disc_id = f"id_{name}"
+        self.status = "DONE"
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.ee = SimpleNamespace(dm=StandInDataManager())
+
+    def get_disc_full_name(self):
+        return f"study.{self.name}"
+
+    def get_module(self):
+        return f"models.{self.name.lower()}"
+
+    def get_input_data_names(self):
+        return self.inputs
+
+    def get_output_data_names(self):
+        return self.outputs
+
+
+class SoSCoupling(StandInDiscipline):
+    """
+    Coupling discipline, identified by its class name in the execution workflow
+    """
+
+    def __init__(self, name, sub_graph, inputs=(), outputs=()):
+        super().__init__(name, inputs, outputs)
+        self.disciplines = sub_graph.disciplines
+        self.coupling_structure = SimpleNamespace(graph=sub_graph)
+
+
+class StandInGraph:
+
+    def __init__(self, execution_sequence, couplings):
+        self.execution_sequence = execution_sequence
+        self.couplings = couplings
+        self.disciplines = [disc for parallel_tasks in execution_sequence
+                            for cycle_disc in parallel_tasks for disc in cycle_disc]
+
+    def get_execution_sequence(self):
+        return self.execution_sequence
+
+    def get_disciplines_couplings(self):
+        return self.couplings
+
+
+class LegacyExecutionWorkflow(SoSExecutionWorkflow):
+    """
+    Reference implementation scanning all the links and walking the parents of each link,
+    used to check the indexed one
+    """
+
+    def create_from_to_links_with_parents(self, node):
+        node["hasLinks"] = False
+        inLinksDict = {link_id: link for (link_id, link) in self.links_dict.items() if link["to"] == node["id"]}
+        outLinksDict = {link_id: link for (link_id, link) in self.links_dict.items() if link["from"] == node["id"]}
+        inLinksList = list(inLinksDict.keys())
+        outLinksList = list(outLinksDict.keys())
+        if len(inLinksList) > 0 or len(outLinksList) > 0:
+            node["hasLinks"] = True
+
+        for outlink in outLinksDict.values():
+            parent_id = self.nodes_dict[outlink["to"]]["parent"]
+            while parent_id is not None:
+                if outlink["from"] != parent_id:
+                    link_id = f'{outlink["from"]}->{parent_id}'
+                    if link_id not in self.links_dict:
+                        self.links_dict[link_id] = {"id": link_id, "from": outlink["from"], "to": parent_id,
+                                                    "parameters": outlink["parameters"], "type": outlink["type"]}
+                        outLinksList.append(link_id)
+                    else:
+                        self.links_dict[link_id]["parameters"] = self.links_dict[link_id]["parameters"].union(
+                            outlink["parameters"])
+                parent_id = self.nodes_dict[parent_id]["parent"]
+
+        for inlink in inLinksDict.values():
+            parent_id = self.nodes_dict[inlink["from"]]["parent"]
+            while parent_id is not None:
+                if inlink["to"] != parent_id:
+                    link_id = f'{parent_id}->{inlink["to"]}'
+                    if link_id not in self.links_dict:
+                        self.links_dict[link_id] = {"id": link_id, "from": parent_id, "to": inlink["to"],
+                                                    "parameters": inlink["parameters"], "type": inlink["type"]}
+                        inLinksList.append(link_id)
+                    else:
+                        self.links_dict[link_id]["parameters"] = self.links_dict[link_id]["parameters"].union(
+                            inlink["parameters"])
+                parent_id = self.nodes_dict[parent_id]["parent"]
+
+        node["inLinks"] = inLinksList
+        node["outLinks"] = outLinksList
+        return node
+
+
+class TestExecutionWorkflowGraph(unittest.TestCase):
+
+    PARALLEL_DISCIPLINES_COUNT = 6
+
+    @classmethod
+    def get_gems_graph(cls):
+        """
+        Graph of a study with a discipline, parallel disciplines and a coupling made of an MDA and a discipline:
+        A -> P0..Pn -> Coupling(MDA(G, H) -> I)
+        """
+        parallel_count = cls.PARALLEL_DISCIPLINES_COUNT
+        parallel_outputs = [f"study.y{index}" for index in range(parallel_count)]
+        disc_a = StandInDiscipline("A", outputs=["study.x"])
+        parallel_discs = [StandInDiscipline(f"P{index}", inputs=["study.x"], outputs=[parallel_outputs[index]])
+                          for index in range(parallel_count)]
+
+        disc_g = StandInDiscipline("G", inputs=parallel_outputs + ["study.h"], outputs=["study.g"])
+        disc_h = StandInDiscipline("H", inputs=["study.g"], outputs=["study.h"])
+        disc_i = StandInDiscipline("I", inputs=["study.h"], outputs=["study.z"])
+        sub_graph = StandInGraph([[[disc_g, disc_h]], [[disc_i]]], [
+            (disc_g, disc_h, ["study.g"]), (disc_h, disc_g, ["study.h"]), (disc_h, disc_i, ["study.h"])])
+        coupling = SoSCoupling("Coupling", sub_graph, inputs=parallel_outputs, outputs=["study.z"])
+
+        couplings = [(disc_a, disc, ["study.x"]) for disc in parallel_discs]
+        couplings += [(disc, coupling, [output]) for disc, output in zip(parallel_discs, parallel_outputs)]
+        return StandInGraph([[[disc_a]], [[disc] for disc in parallel_discs], [[coupling]]], couplings)
+
+    @staticmethod
+    def get_result(execution_workflow):
+        execution_workflow.get_execution_workflow_graph()
+        result = execution_workflow.create_result()
+        for link in result["links_list"]:
+            link["parameters"] = sorted(link["parameters"])
+        return result
+
+    def test_01_same_result_as_reference_implementation(self):
+        expected = self.get_result(LegacyExecutionWorkflow(self.get_gems_graph()))
+        result = self.get_result(SoSExecutionWorkflow(self.get_gems_graph()))
+
+        self.assertEqual(json.dumps(expected, sort_keys=True), json.dumps(result, sort_keys=True))
+        # parent links have been created up to the coupling node
+        self.assertIn("id_P0->id_Coupling", [link["id"] for link in result["links_list"]])
+        self.assertIn("id_P0->cycleDisc1", [link["id"] for link in result["links_list"]])
+
+        # a threshold not reached changes nothing
+        not_summarised = self.get_result(SoSExecutionWorkflow(self.get_gems_graph(),
+                                                              self.PARALLEL_DISCIPLINES_COUNT))
+        self.assertEqual(json.dumps(not_summarised, sort_keys=True), json.dumps(result, sort_keys=True))
+
+    def test_02_links_indexes_and_ancestors(self):
+        execution_workflow = SoSExecutionWorkflow(self.get_gems_graph())
+        execution_workflow.get_execution_workflow_graph()
+
+        links_dict = execution_workflow.links_dict
+        for link_id, link in links_dict.items():
+            self.assertIn(link_id, execution_workflow.links_from_index[link["from"]])
+            self.assertIn(link_id, execution_workflow.links_to_index[link["to"]])
+        self.assertEqual(sum(len(ids) for ids in execution_workflow.links_from_index.values()), len(links_dict))
+        self.assertEqual(sum(len(ids) for ids in execution_workflow.links_to_index.values()), len(links_dict))
+
+        # G is in the MDA of the coupling
+        ancestors = execution_workflow.get_ancestors("id_G")
+        self.assertEqual(ancestors, ["cycleDisc1", "id_Coupling"])
+        self.assertIs(execution_workflow.get_ancestors("id_G"), ancestors)
+        self.assertEqual(execution_workflow.ancestors_dict["cycleDisc1"], ["id_Coupling"])
+        self.assertEqual(execution_workflow.get_ancestors("id_A"), [])
+
+    def test_03_parallel_nodes_summarised_above_threshold(self):
+        max_parallel_nodes = 2
+        execution_workflow = SoSExecutionWorkflow(self.get_gems_graph(), max_parallel_nodes)
+        result = self.get_result(execution_workflow)
+
+        nodes = {node["id"]: node for node in result["nodes_list"]}
+        summary_node = nodes["parallelDiscs1Summary"]
+        summarised_count = self.PARALLEL_DISCIPLINES_COUNT - max_parallel_nodes
+        self.assertEqual(summary_node["summarised_count"], summarised_count)
+        self.assertEqual(summary_node["parent"], "parallelDiscs1")
+        self.assertEqual(nodes["parallelDiscs1"]["children"], ["id_P0", "id_P1", "parallelDiscs1Summary"])
+        self.assertNotIn("id_P2", nodes)
+
+        # links of the summarised disciplines are merged on the summary node
+        links = {link["id"]: link for link in result["links_list"]}
+        summarised_ids = {f"id_P{index}" for index in range(max_parallel_nodes, self.PARALLEL_DISCIPLINES_COUNT)}
+        self.assertFalse([link_id for link_id, link in links.items()
+                          if link["from"] in summarised_ids or link["to"] in summarised_ids])
+        self.assertIn("id_A->parallelDiscs1Summary", links)
+        self.assertEqual(links["parallelDiscs1Summary->id_G"]["parameters"],
+                         [f"y{index}" for index in range(max_parallel_nodes, self.PARALLEL_DISCIPLINES_COUNT)])
+        self.assertIn("parallelDiscs1Summary", summary_node["outLinks"][0])
+        self.assertTrue(summary_node["hasLinks"])
+        for link_id, link in execution_workflow.links_dict.items():
+            self.assertIn(link_id, execution_workflow.links_from_index[link["from"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
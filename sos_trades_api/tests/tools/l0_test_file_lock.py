@@ -0,0 +1,71 @@
+'''
+Copyright 2026 Capgemini
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import multiprocessing
+import unittest
+from os.path import join
+from tempfile import TemporaryDirectory
+
+from sos_trades_api.tools.file_stream.file_lock import file_lock
+
+"""
+Test class for the inter-process file lock
+"""
+
+
+def hold_lock(lock_file_path, locked_event, release_event):
+    with file_lock(lock_file_path):
+        locked_event.set()
+        release_event.wait(10)
+
+
+class TestFileLock(unittest.TestCase):
+
+    def setUp(self):
+        self.temporary_directory = TemporaryDirectory()
+        self.lock_file_path = join(self.temporary_directory.name, "test.lock")
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def test_01_lock_held_by_another_process(self):
+        locked_event = multiprocessing.Event()
+        release_event = multiprocessing.Event()
+        process = multiprocessing.Process(target=hold_lock,
+                                          args=(self.lock_file_path, locked_event, release_event))
+        process.start()
+        try:
+            self.assertTrue(locked_event.wait(10))
+            with self.assertRaises(TimeoutError):
+                with file_lock(self.lock_file_path, timeout=0.1):
+                    pass
+        finally:
+            release_event.set()
+            process.join(10)
+
+        # lock released by the other process
+        with file_lock(self.lock_file_path, timeout=1):
+            pass
+
+    def test_02_lock_released_on_error(self):
+        with self.assertRaises(ValueError):
+            with file_lock(self.lock_file_path):
+                raise ValueError("error in locked section")
+        with file_lock(self.lock_file_path, timeout=0.1):
+            pass
+
+
+if __name__ == "__main__":
+    unittest.main()
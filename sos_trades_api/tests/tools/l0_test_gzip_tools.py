@@ -0,0 +1,202 @@
+'''
+Copyright 2026 Capgemini
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import base64
+import gzip
+import io
+import json
+import logging
+import os
+import time
+import tracemalloc
+import unittest
+import zipfile
+import zlib
+from os.path import join
+from tempfile import TemporaryDirectory
+
+"""
+Test class for streamed zip archive and compressed json responses generation
+"""
+
+
+class TestGzipTools(unittest.TestCase):
+
+    def setUp(self):
+        self.temporary_directory = TemporaryDirectory()
+        root_directory = self.temporary_directory.name
+        self.dm_file_path = join(root_directory, "dm.pkl")
+        self.read_only_folder_path = join(root_directory, "read_only_study")
+        os.makedirs(join(self.read_only_folder_path, "documentation"))
+
+        with open(self.dm_file_path, "wb") as dm_file:
+            dm_file.write(os.urandom(300000))
+        with open(join(self.read_only_folder_path, "loaded_study_case.json"), "w") as json_file:
+            json_file.write("{}" * 100000)
+        with open(join(self.read_only_folder_path, "documentation", "discipline.md"), "w") as md_file:
+            md_file.write("# documentation")
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def test_01_generate_zip_stream(self):
+        from sos_trades_api.tools.gzip_tools import (
+            generate_zip_stream,
+            zip_files_and_folders,
+        )
+
+        zip_chunks = list(generate_zip_stream([self.dm_file_path, self.read_only_folder_path],
+                                              '{"name": "study"}', chunk_size=65536))
+        self.assertTrue(all(len(zip_chunk) > 0 for zip_chunk in zip_chunks))
+
+        with zipfile.ZipFile(io.BytesIO(b"".join(zip_chunks))) as zip_file:
+            self.assertIsNone(zip_file.testzip())
+            self.assertEqual(sorted(zip_file.namelist()),
+                             sorted(["dm.pkl", "read_only_study/loaded_study_case.json",
+                                     "read_only_study/documentation/discipline.md", "metadata.json"]))
+            with open(self.dm_file_path, "rb") as dm_file:
+                self.assertEqual(zip_file.read("dm.pkl"), dm_file.read())
+            self.assertEqual(zip_file.read("metadata.json"), b'{"name": "study"}')
+
+            # entries are compressed with the fast level of the archive, like a zip written to a file
+            zip_file_path = join(self.temporary_directory.name, "study.zip")
+            zip_files_and_folders(zip_file_path, [self.dm_file_path, self.read_only_folder_path])
+            with zipfile.ZipFile(zip_file_path) as written_zip_file:
+                self.assertEqual(zip_file.getinfo("read_only_study/loaded_study_case.json").compress_size,
+                                 written_zip_file.getinfo("read_only_study/loaded_study_case.json").compress_size)
+
+    def test_02_generate_base64_stream(self):
+        from sos_trades_api.tools.gzip_tools import generate_base64_stream
+
+        data = os.urandom(100000)
+        # chunks sizes not multiple of 3
+        chunks = [data[index:index + 1000] for index in range(0, len(data), 1000)]
+        encoded_data = "".join(generate_base64_stream(chunks))
+        self.assertEqual(encoded_data, base64.b64encode(data).decode("ascii"))
+
+    @staticmethod
+    def get_treeview_payload(nodes_count=2000, values_count=200):
+        return {
+            "study_case": {"id": 1, "name": "study"},
+            "treenode": {
+                "name": "study",
+                "children": [{"name": f"Disc{index}", "data": {"values": [index + value / 7 for value in range(values_count)],
+                                                               "nan": float("nan")}}
+                             for index in range(nodes_count)],
+            },
+            1: True,
+        }
+
+    def test_03_generate_compressed_json_stream(self):
+        from sos_trades_api.models.custom_json_encoder import CustomJsonEncoder
+        from sos_trades_api.tools.gzip_tools import (
+            GZIP_ENCODING,
+            IDENTITY_ENCODING,
+            generate_compressed_json_stream,
+        )
+
+        payload = self.get_treeview_payload(200)
+        expected_json = json.dumps(payload, cls=CustomJsonEncoder)
+
+        compressed_chunks = list(generate_compressed_json_stream(payload, GZIP_ENCODING, chunk_size=4096))
+        self.assertGreater(len(compressed_chunks), 1)
+        self.assertTrue(all(len(compressed_chunk) > 0 for compressed_chunk in compressed_chunks))
+        self.assertEqual(gzip.decompress(b"".join(compressed_chunks)).decode("utf-8"), expected_json)
+
+        identity_chunks = generate_compressed_json_stream(payload, IDENTITY_ENCODING, chunk_size=4096)
+        self.assertEqual(b"".join(identity_chunks).decode("utf-8"), expected_json)
+
+    def test_04_select_content_encoding(self):
+        from sos_trades_api.tools.gzip_tools import (
+            GZIP_ENCODING,
+            IDENTITY_ENCODING,
+            get_available_content_encodings,
+            select_content_encoding,
+        )
+
+        self.assertEqual(select_content_encoding("gzip, deflate"), GZIP_ENCODING)
+        self.assertEqual(select_content_encoding("deflate"), IDENTITY_ENCODING)
+        self.assertEqual(select_content_encoding(None), IDENTITY_ENCODING)
+        self.assertEqual(select_content_encoding("gzip;q=0, identity"), IDENTITY_ENCODING)
+        self.assertEqual(select_content_encoding("*"), get_available_content_encodings()[0])
+        self.assertEqual(select_content_encoding("br;q=0.5, zstd;q=0.8, gzip;q=0.9"), GZIP_ENCODING)
+
+    def test_05_first_chunk_and_peak_memory(self):
+        from sos_trades_api.models.custom_json_encoder import CustomJsonEncoder
+        from sos_trades_api.tools.gzip_tools import (
+            GZIP_ENCODING,
+            generate_compressed_json_stream,
+        )
+
+        payload = self.get_treeview_payload()
+
+        # former response: whole json then whole gzip in memory
+        tracemalloc.start()
+        start_time = time.perf_counter()
+        json_data = json.dumps(payload, cls=CustomJsonEncoder)
+        gzip_buffer = io.BytesIO()
+        with gzip.GzipFile(mode="w", fileobj=gzip_buffer) as gz:
+            gz.write(json_data.encode("utf-8"))
+        buffered_first_byte_time = time.perf_counter() - start_time
+        buffered_peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        del json_data
+
+        # streamed response
+        tracemalloc.start()
+        start_time = time.perf_counter()
+        compressed_stream = generate_compressed_json_stream(payload, GZIP_ENCODING)
+        first_chunk = next(compressed_stream)
+        streamed_first_byte_time = time.perf_counter() - start_time
+        first_chunk_peak_memory = tracemalloc.get_traced_memory()[1]
+        decompressor = zlib.decompressobj(31)
+        decompressor.decompress(first_chunk)
+        for compressed_chunk in compressed_stream:
+            decompressor.decompress(compressed_chunk)
+        streamed_peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        logging.getLogger(__name__).info(
+            f"buffered gzip: first byte {buffered_first_byte_time * 1000:.0f}ms, "
+            f"peak memory {buffered_peak_memory / 1024 / 1024:.1f}MB, "
+            f"streamed gzip: first byte {streamed_first_byte_time * 1000:.0f}ms, "
+            f"peak memory {streamed_peak_memory / 1024 / 1024:.1f}MB")
+        # the first chunk is sent before the whole json is written
+        self.assertLess(first_chunk_peak_memory, buffered_peak_memory / 2)
+        self.assertLess(streamed_peak_memory, buffered_peak_memory)
+
+    def test_06_serialisation_errors(self):
+        from flask import Flask
+
+        from sos_trades_api.tools.gzip_tools import make_gzipped_response
+
+        app = Flask(__name__)
+
+        # an error in a small payload is raised before the response is returned
+        with app.test_request_context(headers={"Accept-Encoding": "gzip"}):
+            with self.assertRaises(TypeError):
+                make_gzipped_response({"study_case": {"id": 1}, "treenode": object()})
+
+        # an error after the headers are sent is logged and aborts the response
+        payload = self.get_treeview_payload()
+        payload["treenode"]["children"].append(object())
+        with app.test_request_context(headers={"Accept-Encoding": "gzip"}):
+            response = make_gzipped_response(payload)
+            with self.assertLogs(app.logger, level="ERROR"), self.assertRaises(TypeError):
+                for _ in response.response:
+                    pass
+
+if __name__ == "__main__":
+    unittest.main()
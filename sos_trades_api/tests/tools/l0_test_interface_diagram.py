@@ -0,0 +1,176 @@
+'''
+Copyright 2026 Capgemini
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import unittest
+from collections import Counter
+from types import SimpleNamespace
+
+"""
+Test class for the interface diagram generation, its identifiers caches and its level of detail
+"""
+
+
+class StandInDataManager:
+
+    def __init__(self, disciplines_dict, parameters_origin):
+        self.disciplines_dict = disciplines_dict
+        self.parameters_origin = parameters_origin
+        self.get_data_calls = Counter()
+
+    def convert_disciplines_dict_with_full_name(self):
+        return self.disciplines_dict
+
+    def get_data(self, parameter_full_name):
+        self.get_data_calls[parameter_full_name] += 1
+        return {"var_name": parameter_full_name.split(".")[-1], "type": "float", "unit": "-", "value": 1.0,
+                "model_origin": self.parameters_origin.get(parameter_full_name)}
+
+    def get_discipline(self, discipline_uuid):
+        return next(disc_dict["reference"] for disc_list in self.disciplines_dict.values()
+                    for disc_dict in disc_list if disc_dict["reference"].disc_id == discipline_uuid)
+
+
+class ProxyDiscipline:
+    """
+    Discipline wrapping a model, identified by the class name of its wrapper in the interface diagram
+    """
+
+    def __init__(self, full_name, wrapper_classname):
+        self.full_name = full_name
+        self.disc_id = f"uuid-{full_name}"
+        self.discipline_wrapp = SimpleNamespace(wrapper=type(wrapper_classname, (), {})())
+        self.full_name_calls = 0
+
+    def get_disc_full_name(self):
+        self.full_name_calls += 1
+        return self.full_name
+
+
+class SoSCoupling(ProxyDiscipline):
+    """
+    Coupling of a sub-process, its outputs are coupled from the discipline that computes them
+    """
+
+    def __init__(self, full_name, sub_couplings):
+        super().__init__(full_name, "SoSCoupling")
+        self.coupling_structure = SimpleNamespace(
+            graph=SimpleNamespace(get_disciplines_couplings=lambda: sub_couplings))
+
+
+class TestInterfaceDiagram(unittest.TestCase):
+    """
+    Test class for the interface diagram generator on a stand-in study:
+    A -> x -> Sub(B -> z -> C) -> y -> D, and A -> x -> D
+    """
+
+    def get_interface_diagram_generator(self, max_depth=None):
+        from sos_trades_api.tools.visualisation.interface_diagram import (
+            InterfaceDiagramGenerator,
+        )
+
+        disc_a = ProxyDiscipline("study.A", "DiscA")
+        disc_b = ProxyDiscipline("study.Sub.Deep.B", "DiscB")
+        disc_c = ProxyDiscipline("study.Sub.Deep.C", "DiscC")
+        disc_d = ProxyDiscipline("study.D", "DiscD")
+        sub_coupling = SoSCoupling("study.Sub", [(disc_b, disc_c, ["study.Sub.z"])])
+        self.disciplines = {"A": disc_a, "B": disc_b, "C": disc_c, "D": disc_d, "Sub": sub_coupling}
+
+        disciplines_dict = {}
+        for disc in [disc_a, sub_coupling, disc_b, disc_c, disc_d]:
+            classname = type(disc).__name__
+            disciplines_dict.setdefault(disc.full_name, []).append(
+                {"reference": disc, "classname": classname, "model_name_full_path": f"models.{classname}"})
+        dm = StandInDataManager(disciplines_dict, {"study.Sub.y": disc_b.disc_id})
+
+        root_couplings = [(disc_a, sub_coupling, ["study.x"]), (sub_coupling, disc_d, ["study.Sub.y"]),
+                          (disc_a, disc_d, ["study.x"])]
+        study = SimpleNamespace(
+            execution_engine=SimpleNamespace(
+                root_process=SimpleNamespace(coupling_structure=SimpleNamespace(
+                    graph=SimpleNamespace(get_disciplines_couplings=lambda: root_couplings))),
+                get_treeview=lambda: None),
+            ee=SimpleNamespace(dm=dm),
+            process_name="stand_in_process",
+        )
+        generator = InterfaceDiagramGenerator(study, draw_subgraphs=False, max_depth=max_depth)
+        # namespaces tree of the process, built from a base study when subgraphs are drawn
+        generator.base_namespace_dict = {"": ["", "A", "D"], "Sub": ["Sub", "Sub.Deep"]}
+        return generator, dm
+
+    def test_01_coupling_outputs_come_from_their_origin_discipline(self):
+        generator, dm = self.get_interface_diagram_generator()
+        discipline_nodes = generator.generate_disciplines_data()
+        self.assertEqual([node["id"] for node in discipline_nodes],
+                         ["A.DiscA", "Sub.Deep.B.DiscB", "Sub.Deep.C.DiscC", "D.DiscD"])
+
+        parameter_nodes, links = generator.generate_parameters_and_links_data(discipline_nodes)
+        links_ids = {link["id"] for link in links}
+        parameters = {node["id"]: node for node in parameter_nodes}
+
+        # y is linked from B, the unwrapped discipline computing it, not from the coupling
+        self.assertIn("Sub.Deep.B.DiscB->Sub.y", links_ids)
+        self.assertIn("Sub.y->D.DiscD", links_ids)
+        self.assertFalse([link_id for link_id in links_ids if "SoSCoupling" in link_id.split("->")[0]])
+        self.assertEqual(parameters["Sub.y"]["namespace"], "Sub.Deep.B")
+        self.assertIn("Sub.Deep.B.DiscB->Sub.z", links_ids)
+        self.assertIn("Sub.z->Sub.Deep.C.DiscC", links_ids)
+
+        # a parameter coupled several times is one node
+        self.assertEqual(len(parameter_nodes), len(parameters))
+        self.assertEqual(set(parameters), {"x", "Sub.y", "Sub.z"})
+
+    def test_02_identifiers_and_parameters_data_cached(self):
+        generator, dm = self.get_interface_diagram_generator()
+        discipline_nodes = generator.generate_disciplines_data()
+        generator.generate_parameters_and_links_data(discipline_nodes)
+
+        # x is coupled to two disciplines but read once from the data manager
+        self.assertEqual(dm.get_data_calls["study.x"], 1)
+        self.assertEqual(max(dm.get_data_calls.values()), 1)
+
+        # A is the source of two couplings, its node identifier is computed once
+        disc_a = self.disciplines["A"]
+        self.assertEqual(disc_a.full_name_calls, 1)
+        self.assertEqual(generator.get_discipline_node_id(disc_a), "A.DiscA")
+        self.assertEqual(disc_a.full_name_calls, 1)
+
+    def test_03_deep_disciplines_collapsed_into_sub_process(self):
+        generator, dm = self.get_interface_diagram_generator(max_depth=1)
+        discipline_nodes = generator.generate_disciplines_data()
+        nodes = {node["id"]: node for node in discipline_nodes}
+        self.assertEqual(list(nodes), ["A.DiscA", "Sub.SubProcess", "D.DiscD"])
+        self.assertEqual(nodes["Sub.SubProcess"]["collapsed_disciplines_count"], 2)
+        self.assertEqual(nodes["Sub.SubProcess"]["namespace"], "Sub")
+        self.assertEqual(nodes["Sub.SubProcess"]["cluster"], "Sub")
+        self.assertEqual(generator.collapsed_disc_ids, {"Sub.Deep.B.DiscB": "Sub.SubProcess",
+                                                        "Sub.Deep.C.DiscC": "Sub.SubProcess"})
+
+        parameter_nodes, links = generator.generate_parameters_and_links_data(discipline_nodes)
+        links_ids = {link["id"] for link in links}
+
+        # exchanges inside the sub-process are hidden, the ones with the outside are linked to its node
+        self.assertEqual({node["id"] for node in parameter_nodes}, {"x", "Sub.y"})
+        self.assertIn("Sub.SubProcess->Sub.y", links_ids)
+        self.assertIn("Sub.y->D.DiscD", links_ids)
+        self.assertFalse([link_id for link_id in links_ids if "DiscB" in link_id or "DiscC" in link_id])
+
+        # every link end is a displayed node
+        filtered_nodes = generator.filter_discipline_with_no_exchanges(discipline_nodes, links)
+        nodes_ids = {node["id"] for node in filtered_nodes} | {node["id"] for node in parameter_nodes}
+        self.assertTrue(all(link["from"] in nodes_ids for link in links))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+'''
+Copyright 2026 Capgemini
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import gc
+import logging
+import tracemalloc
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+from sos_trades_api.tools.memory_accounting import (
+    DATA_MANAGER_KEY,
+    DISCIPLINES_KEY,
+    POST_PROCESSINGS_KEY,
+    TOTAL_KEY,
+    get_deep_size,
+    get_study_memory_footprint,
+)
+
+"""
+Test class for the memory footprint estimation of the studies, checked against tracemalloc
+"""
+
+
+class StandInDiscipline:
+
+    def __init__(self, index):
+        self.name = f"Disc{index}"
+        self.status = "DONE"
+        self.jacobian = np.random.rand(20, 20)
+        self.logger = logging.getLogger(__name__)
+
+
+class StandInStudyCaseManager:
+
+    def __init__(self, parameters_count, disciplines_count):
+        data_dict = {}
+        data_id_map = {}
+        for index in range(parameters_count):
+            variable_id = f"uuid-{index:08d}"
+            data_id_map[f"study.Disc{index % disciplines_count}.x{index}"] = variable_id
+            data_dict[variable_id] = {
+                "value": np.arange(index % 500, dtype=float),
+                "type": "array",
+                "unit": "kW",
+                "description": "parameter " * (index % 20),
+                "editable": True,
+            }
+        disciplines_dict = {f"disc-{index}": {"reference": StandInDiscipline(index)}
+                            for index in range(disciplines_count)}
+        self.execution_engine = SimpleNamespace(
+            dm=SimpleNamespace(data_dict=data_dict, data_id_map=data_id_map, disciplines_dict=disciplines_dict))
+        self.post_processings = {f"study.Disc{index}": [{"series": list(range(1000))}]
+                                 for index in range(disciplines_count)}
+        self.n2_diagram = {}
+
+
+class TestMemoryAccounting(unittest.TestCase):
+
+    @staticmethod
+    def build_with_tracemalloc(build_function):
+        """
+        Return the built object and the memory allocated to build it measured by tracemalloc
+        """
+        gc.collect()
+        tracemalloc.start()
+        try:
+            start_memory = tracemalloc.get_traced_memory()[0]
+            built_object = build_function()
+            allocated_memory = tracemalloc.get_traced_memory()[0] - start_memory
+        finally:
+            tracemalloc.stop()
+        return built_object, allocated_memory
+
+    def test_01_deep_size_of_shared_and_excluded_objects(self):
+        shared_array = np.zeros(100000)
+        self.assertGreater(get_deep_size([shared_array]), shared_array.nbytes)
+        # shared objects are counted once
+        self.assertLess(get_deep_size([shared_array] * 10), 2 * shared_array.nbytes)
+        # views are counted with their base array
+        self.assertGreater(get_deep_size(shared_array[10:20]), shared_array.nbytes)
+
+        # sizing a second object with the objects already seen only counts the new ones
+        seen = set()
+        get_deep_size({"a": shared_array}, seen=seen)
+        self.assertLess(get_deep_size({"b": shared_array}, seen=seen), 1000)
+
+        # objects shared by the whole server are never counted
+        self.assertEqual(get_deep_size(logging.getLogger(__name__)), 0)
+        self.assertEqual(get_deep_size(np), 0)
+
+    def test_02_study_footprint_matches_tracemalloc(self):
+        study_case_manager, allocated_memory = self.build_with_tracemalloc(
+            lambda: StandInStudyCaseManager(parameters_count=20000, disciplines_count=200))
+
+        footprint = get_study_memory_footprint(study_case_manager)
+        logging.getLogger(__name__).info(
+            f"tracemalloc {allocated_memory / 1024 ** 2:.1f} MB, estimation "
+            + ", ".join(f"{part} {size / 1024 ** 2:.1f} MB" for part, size in footprint.items()))
+
+        self.assertAlmostEqual(footprint[TOTAL_KEY] / allocated_memory, 1.0, delta=0.15)
+        self.assertGreater(footprint[DATA_MANAGER_KEY], footprint[DISCIPLINES_KEY])
+        self.assertGreater(footprint[POST_PROCESSINGS_KEY], 0)
+
+        # sampled estimation is close to the walk of all the objects
+        full_size = get_deep_size(study_case_manager, sample_size=10 ** 9)
+        self.assertAlmostEqual(footprint[TOTAL_KEY] / full_size, 1.0, delta=0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
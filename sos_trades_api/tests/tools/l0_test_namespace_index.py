@@ -0,0 +1,69 @@
+'''
+Copyright 2026 Capgemini
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import logging
+import time
+import unittest
+
+from sos_trades_api.tools.loading.namespace_index import NamespaceIndex
+
+"""
+Test class for the namespace prefix index of the study parameters keys
+"""
+
+
+class TestNamespaceIndex(unittest.TestCase):
+
+    def setUp(self):
+        # large study: 2000 disciplines with 50 parameters each
+        self.keys = [f"study.Sector{index % 20}.Disc{index}.x{parameter}"
+                     for index in range(2000) for parameter in range(50)]
+
+    def test_01_namespace_keys(self):
+        namespace_index = NamespaceIndex(self.keys + ["study.Sector1", "study.Sector10.y"])
+        self.assertEqual(len(namespace_index), len(self.keys) + 2)
+
+        discipline_keys = namespace_index.get_namespace_keys("study.Sector1.Disc1")
+        self.assertEqual(discipline_keys, sorted(f"study.Sector1.Disc1.x{parameter}" for parameter in range(50)))
+
+        # the namespace itself and the namespaces sharing its prefix are not included
+        sector_keys = namespace_index.get_namespace_keys("study.Sector1")
+        self.assertEqual(len(sector_keys), 100 * 50)
+        self.assertNotIn("study.Sector1", sector_keys)
+        self.assertNotIn("study.Sector10.y", sector_keys)
+
+        self.assertEqual(namespace_index.get_namespace_keys("study.Unknown"), [])
+        self.assertEqual(len(namespace_index.get_keys_with_prefix("")), len(namespace_index))
+
+    def test_02_lookups_match_keys_scan(self):
+        namespace_index = NamespaceIndex(self.keys)
+        namespaces = [f"study.Sector{index % 20}.Disc{index}" for index in range(0, 2000, 100)]
+
+        start_time = time.perf_counter()
+        scanned_keys = [[key for key in self.keys if key.startswith(f"{namespace}.")] for namespace in namespaces]
+        scan_duration = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        indexed_keys = [namespace_index.get_namespace_keys(namespace) for namespace in namespaces]
+        index_duration = time.perf_counter() - start_time
+
+        self.assertEqual(indexed_keys, [sorted(keys) for keys in scanned_keys])
+        logging.getLogger(__name__).info(
+            f"{len(namespaces)} namespace lookups: keys scan {scan_duration * 1000:.1f}ms, "
+            f"index {index_duration * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+'''
+Copyright 2026 Capgemini
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import logging
+import os
+import time
+import unittest
+
+from sos_trades_api.tools.parallel_post_processing import (
+    generate_post_processings,
+    partition_namespaces,
+)
+
+"""
+Test class for the parallel generation of the post-processings
+"""
+
+
+class SyntheticStudy:
+    """
+    Synthetic study with many disciplines, each one generating a chart from its own data
+    """
+
+    def __init__(self, disciplines_count, points_count):
+        self.namespaces = [f"study.SubProcess{index % 10}.Disc{index}" for index in range(disciplines_count)]
+        self.data = {namespace: list(range(index, index + points_count))
+                     for index, namespace in enumerate(self.namespaces)}
+        self.failing_namespaces = set()
+
+    def generate_chart(self, namespace):
+        if namespace in self.failing_namespaces:
+            raise ValueError(f"Chart of {namespace} cannot be generated")
+        values = self.data[namespace]
+        cumulated_values = []
+        total = 0
+        for value in values:
+            total += value * value % 7
+            cumulated_values.append(total)
+        return [{"chart_name": namespace, "series": cumulated_values}]
+
+
+class TestParallelPostProcessing(unittest.TestCase):
+
+    logger = logging.getLogger("parallel_post_processing_test")
+
+    def test_01_partitions_cover_all_namespaces(self):
+        namespaces = [f"study.Disc{index}" for index in range(10)]
+        partitions = partition_namespaces(namespaces, 4)
+
+        self.assertEqual(len(partitions), 4)
+        self.assertEqual(sorted(namespace for partition in partitions for namespace in partition), sorted(namespaces))
+        self.assertLessEqual(max(map(len, partitions)) - min(map(len, partitions)), 1)
+        self.assertEqual(len(partition_namespaces(namespaces[:2], 4)), 2)
+
+    def test_02_results_are_merged_in_namespaces_order(self):
+        study = SyntheticStudy(40, 100)
+        serial_post_processings = generate_post_processings(study.namespaces, study.generate_chart, self.logger,
+                                                            max_workers=1)
+        parallel_post_processings = generate_post_processings(study.namespaces, study.generate_chart, self.logger,
+                                                              max_workers=4)
+
+        self.assertEqual(list(parallel_post_processings.keys()), study.namespaces)
+        self.assertEqual(parallel_post_processings, serial_post_processings)
+
+    def test_03_failures_are_isolated_per_namespace(self):
+        study = SyntheticStudy(40, 100)
+        study.failing_namespaces = {study.namespaces[3], study.namespaces[17]}
+
+        for max_workers in (1, 4):
+            with self.assertLogs(self.logger, level="ERROR") as logs:
+                post_processings = generate_post_processings(study.namespaces, study.generate_chart, self.logger,
+                                                             max_workers=max_workers)
+            self.assertEqual(list(post_processings.keys()),
+                             [namespace for namespace in study.namespaces if namespace not in study.failing_namespaces])
+            self.assertEqual(len(logs.output), 2, logs.output)
+
+    def test_04_serial_generation_by_default(self):
+        study = SyntheticStudy(40, 100)
+        generating_processes = generate_post_processings(study.namespaces, lambda namespace: [os.getpid()],
+                                                         self.logger)
+
+        self.assertEqual(list(generating_processes.keys()), study.namespaces)
+        self.assertEqual({process_id for process_ids in generating_processes.values() for process_id in process_ids},
+                         {os.getpid()})
+
+    def test_05_many_disciplines(self):
+        study = SyntheticStudy(400, 20000)
+        max_workers = min(8, os.cpu_count() or 1)
+
+        start_time = time.perf_counter()
+        serial_post_processings = generate_post_processings(study.namespaces, study.generate_chart, self.logger,
+                                                            max_workers=1)
+        serial_duration = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        parallel_post_processings = generate_post_processings(study.namespaces, study.generate_chart, self.logger,
+                                                              max_workers=max_workers)
+        parallel_duration = time.perf_counter() - start_time
+
+        self.logger.info(f"{len(study.namespaces)} disciplines: serial generation {serial_duration:.2f}s, "
+                         f"parallel generation with {max_workers} worker(s) {parallel_duration:.2f}s")
+        self.assertEqual(parallel_post_processings, serial_post_processings)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+'''
+Copyright 2026 Capgemini
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import json
+import multiprocessing
+import os
+import unittest
+from os.path import join
+from tempfile import TemporaryDirectory
+
+from sos_trades_api.tools.loading.study_dashboard_store import (
+    DashboardItemNotFound,
+    StudyDashboardStore,
+)
+
+"""
+Test class for the incremental study dashboard store
+"""
+
+
+class TestStudyDashboardStore(unittest.TestCase):
+
+    def setUp(self):
+        self.temporary_directory = TemporaryDirectory()
+        self.read_only_folder = self.temporary_directory.name
+        self.items_folder = join(self.read_only_folder, StudyDashboardStore.DASHBOARD_FOLDER_NAME,
+                                 StudyDashboardStore.ITEMS_FOLDER_NAME)
+        self.dashboard = {
+            "study_case_id": 1,
+            "items": [self.get_chart_item(index) for index in range(3)],
+        }
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    @staticmethod
+    def get_chart_item(index, points_count=1000):
+        return {"type": "chart", "discipline": f"study.Disc{index}", "data": list(range(index, index + points_count))}
+
+    def get_item_files_modification_times(self) -> dict:
+        return {file_name: os.stat(join(self.items_folder, file_name)).st_mtime_ns
+                for file_name in os.listdir(self.items_folder)}
+
+    def test_01_write_and_read_dashboard(self):
+        store = StudyDashboardStore(self.read_only_folder)
+        self.assertFalse(store.store_exists)
+        self.assertIsNone(store.read_dashboard())
+
+        version = store.write_dashboard(self.dashboard)
+        self.assertEqual(store.read_dashboard(), self.dashboard)
+        self.assertEqual(len(os.listdir(self.items_folder)), 3)
+
+        # saving the same dashboard again changes nothing
+        self.assertEqual(store.write_dashboard(self.dashboard), version)
+        self.assertEqual(StudyDashboardStore(self.read_only_folder).read_dashboard(), self.dashboard)
+
+    def test_02_only_changed_items_are_written_and_fetched(self):
+        store = StudyDashboardStore(self.read_only_folder)
+        first_version = store.write_dashboard(self.dashboard)
+        first_changes = store.get_changes()
+        item_files = self.get_item_files_modification_times()
+
+        self.dashboard["items"][1] = self.get_chart_item(10)
+        second_version = store.write_dashboard(self.dashboard)
+        self.assertGreater(second_version, first_version)
+
+        # unchanged items are neither rewritten nor fetched again, the replaced item is removed later
+        new_item_files = self.get_item_files_modification_times()
+        self.assertEqual(len(new_item_files), 4)
+        self.assertEqual(set(new_item_files.items()) & set(item_files.items()), set(item_files.items()))
+
+        changes = store.get_changes(first_version)
+        self.assertEqual(changes["version"], second_version)
+        self.assertEqual(list(changes["payloads"].values()), [self.get_chart_item(10)])
+        self.assertEqual([entry["id"] for entry in changes["items"]][0::2],
+                         [entry["id"] for entry in first_changes["items"]][0::2])
+        self.assertEqual(store.get_changes(second_version)["payloads"], {})
+
+    def test_03_partial_updates(self):
+        store = StudyDashboardStore(self.read_only_folder)
+        store.write_dashboard(self.dashboard)
+        item_ids = [entry["id"] for entry in store.get_changes()["items"]]
+
+        added_item_id = store.add_item(self.get_chart_item(20), 0)
+        version = store.get_changes()["version"]
+        self.assertEqual([entry["id"] for entry in store.get_changes()["items"]], [added_item_id, *item_ids])
+
+        store.move_item(added_item_id, 3)
+        store.remove_item(item_ids[0])
+        changes = store.get_changes(version)
+        self.assertEqual([entry["id"] for entry in changes["items"]], [item_ids[1], item_ids[2], added_item_id])
+        self.assertEqual(changes["payloads"], {})
+
+        store.update_item(item_ids[1], self.get_chart_item(30))
+        self.assertEqual(store.read_dashboard()["items"],
+                         [self.get_chart_item(30), self.get_chart_item(2), self.get_chart_item(20)])
+        self.assertEqual(store.read_dashboard()["study_case_id"], 1)
+
+        with self.assertRaises(DashboardItemNotFound):
+            store.remove_item(item_ids[0])
+
+    def test_04_unreferenced_items_removed_in_batches(self):
+        store = StudyDashboardStore(self.read_only_folder)
+        store.write_dashboard(self.dashboard)
+        item_id = store.add_item(self.get_chart_item(100))
+
+        for index in range(StudyDashboardStore.ORPHAN_ITEMS_CLEANUP_THRESHOLD - 1):
+            store.update_item(item_id, self.get_chart_item(101 + index))
+        self.assertEqual(len(os.listdir(self.items_folder)), 4 + StudyDashboardStore.ORPHAN_ITEMS_CLEANUP_THRESHOLD - 1)
+
+        # an item file left by an interrupted write is removed with the unreferenced items
+        with open(join(self.items_folder, "interrupted.tmp"), "w") as temporary_file:
+            temporary_file.write("{")
+        store.update_item(item_id, self.get_chart_item(1000))
+        self.assertEqual(len(os.listdir(self.items_folder)), 4)
+        self.assertEqual(store.read_dashboard()["items"][-1], self.get_chart_item(1000))
+
+    def test_05_concurrent_processes(self):
+        dashboard_file_path = join(self.read_only_folder, "dashboard.json")
+        with open(dashboard_file_path, "w") as dashboard_file:
+            json.dump(self.dashboard, dashboard_file)
+
+        context = multiprocessing.get_context("spawn")
+        processes = [context.Process(target=add_items, args=(self.read_only_folder, dashboard_file_path, index))
+                     for index in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        self.assertEqual([process.exitcode for process in processes], [0] * len(processes))
+
+        # the single file dashboard is imported once and no edit has been lost
+        self.assertFalse(os.path.exists(dashboard_file_path))
+        dashboard = StudyDashboardStore(self.read_only_folder).read_dashboard()
+        self.assertEqual(dashboard["items"][:3], self.dashboard["items"])
+        self.assertEqual(len(dashboard["items"]), 3 + 4 * 5)
+
+
+def add_items(read_only_folder, dashboard_file_path, process_index):
+    """
+    Import the single file dashboard then add items, like a server process opening the study
+    """
+    store = StudyDashboardStore(read_only_folder)
+    if os.path.exists(dashboard_file_path):
+        store.import_dashboard_file(dashboard_file_path)
+    for index in range(5):
+        store.add_item(TestStudyDashboardStore.get_chart_item(1000 * process_index + index, 10))
+        store.get_changes()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+'''
+Copyright 2026 Capgemini
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import os
+import pickle
+import threading
+import unittest
+from os.path import join
+from tempfile import TemporaryDirectory
+
+import numpy as np
+import pandas as pd
+
+from sos_trades_api.tools.loading.study_parameters_store import StudyParametersStore
+
+"""
+Test class for study parameters side-car store
+"""
+
+
+class TestStudyParametersStore(unittest.TestCase):
+
+    def setUp(self):
+        self.temporary_directory = TemporaryDirectory()
+        self.dump_directory = self.temporary_directory.name
+        self.source_file_path = join(self.dump_directory, "dm.pkl")
+        self.parameters_values = {
+            "<study>.x": 1.0,
+            "<study>.z": np.array([5.0, 2.0]),
+            "<study>.df": pd.DataFrame({"years": [2020, 2021], "value": [1.0, 2.0]}),
+            "<study>.none": None,
+        }
+        with open(self.source_file_path, "wb") as source_file:
+            pickle.dump(self.parameters_values, source_file)
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def test_01_write_and_read_parameters(self):
+        store = StudyParametersStore(self.dump_directory)
+        self.assertFalse(store.is_up_to_date(self.source_file_path))
+
+        store.write(self.parameters_values, self.source_file_path)
+        self.assertTrue(store.is_up_to_date(self.source_file_path))
+
+        self.assertEqual(store.read_parameter("<study>.x"), 1.0)
+        self.assertTrue(np.array_equal(store.read_parameter("<study>.z"), self.parameters_values["<study>.z"]))
+        self.assertTrue(store.read_parameter("<study>.df").equals(self.parameters_values["<study>.df"]))
+        self.assertTrue(store.has_parameter("<study>.none"))
+        self.assertIsNone(store.read_parameter("<study>.none"))
+        self.assertFalse(store.has_parameter("<study>.unknown"))
+
+        # a new instance reads the store written by another one
+        self.assertEqual(StudyParametersStore(self.dump_directory).read_parameter("<study>.x"), 1.0)
+
+    def test_02_store_outdated_when_source_changes(self):
+        store = StudyParametersStore(self.dump_directory)
+        store.write(self.parameters_values, self.source_file_path)
+
+        self.parameters_values["<study>.x"] = 2.0
+        self.parameters_values["<study>.y"] = "new parameter"
+        with open(self.source_file_path, "wb") as source_file:
+            pickle.dump(self.parameters_values, source_file)
+        self.assertFalse(store.is_up_to_date(self.source_file_path))
+
+        store.write(self.parameters_values, self.source_file_path)
+        self.assertTrue(store.is_up_to_date(self.source_file_path))
+        self.assertEqual(store.read_parameter("<study>.x"), 2.0)
+        self.assertEqual(store.read_parameter("<study>.y"), "new parameter")
+
+    def test_03_read_namespace_parameters(self):
+        store = StudyParametersStore(self.dump_directory)
+        self.parameters_values.update({"<study>.Disc1.a": 1, "<study>.Disc1.b": [2], "<study>.Disc10.a": 10})
+        store.write(self.parameters_values, self.source_file_path)
+
+        namespace_keys = store.get_namespace_keys("<study>.Disc1")
+        self.assertEqual(namespace_keys, ["<study>.Disc1.a", "<study>.Disc1.b"])
+        self.assertEqual(store.read_parameters(namespace_keys + ["<study>.unknown"]),
+                         {"<study>.Disc1.a": 1, "<study>.Disc1.b": [2]})
+
+        # keys lookup follows the store updates
+        self.parameters_values["<study>.Disc1.c"] = 3
+        with open(self.source_file_path, "wb") as source_file:
+            pickle.dump(self.parameters_values, source_file)
+        store.write(self.parameters_values, self.source_file_path)
+        self.assertEqual(len(store.get_namespace_keys("<study>.Disc1")), 3)
+
+    def get_data_files(self):
+        return [file_name for file_name in os.listdir(self.dump_directory)
+                if file_name.startswith(StudyParametersStore.DATA_FILE_PREFIX)
+                and file_name.endswith(StudyParametersStore.DATA_FILE_SUFFIX)]
+
+    def rewrite_source(self, value):
+        self.parameters_values["<study>.x"] = value
+        self.parameters_values["<study>.padding"] = "-" * value
+        with open(self.source_file_path, "wb") as source_file:
+            pickle.dump(self.parameters_values, source_file)
+
+    def test_04_data_file_switched_with_index(self):
+        store = StudyParametersStore(self.dump_directory)
+        self.assertTrue(store.write(self.parameters_values, self.source_file_path))
+        # up to date store is not written again
+        self.assertFalse(store.write(self.parameters_values, self.source_file_path))
+        first_data_files = self.get_data_files()
+        self.assertEqual(len(first_data_files), 1)
+
+        # a reader with the previous index reloads it when its data file has been removed by a write
+        reader = StudyParametersStore(self.dump_directory)
+        self.assertTrue(reader.is_up_to_date(self.source_file_path))
+        self.rewrite_source(2)
+        StudyParametersStore(self.dump_directory).write(self.parameters_values, self.source_file_path)
+        data_files = self.get_data_files()
+        self.assertEqual(len(data_files), 1)
+        self.assertNotEqual(data_files, first_data_files)
+        self.assertEqual(reader.read_parameter("<study>.x"), 2)
+
+    def test_05_store_not_written_from_outdated_source_read(self):
+        store = StudyParametersStore(self.dump_directory)
+        # values read from the source before it is saved again
+        source_signature = StudyParametersStore.get_source_signature(self.source_file_path)
+        outdated_values = dict(self.parameters_values)
+        self.rewrite_source(3)
+
+        self.assertFalse(store.write(outdated_values, self.source_file_path, source_signature))
+        self.assertFalse(store.is_up_to_date(self.source_file_path))
+        self.assertTrue(store.write(self.parameters_values, self.source_file_path,
+                                    StudyParametersStore.get_source_signature(self.source_file_path)))
+        self.assertEqual(store.read_parameter("<study>.x"), 3)
+
+    def test_06_concurrent_writes_and_reads(self):
+        errors = []
+
+        def write_store(value):
+            try:
+                values = {"<study>.x": value, "<study>.padding": "-" * value}
+                StudyParametersStore(self.dump_directory).write(values, self.source_file_path)
+            except Exception as error:
+                errors.append(error)
+
+        def read_store():
+            reader = StudyParametersStore(self.dump_directory)
+            try:
+                for _ in range(50):
+                    if reader.store_exists:
+                        values = reader.read_parameters(["<study>.x", "<study>.padding"])
+                        # index and data file always come from the same write
+                        self.assertEqual(values["<study>.padding"], "-" * values["<study>.x"])
+            except Exception as error:
+                errors.append(error)
+
+        for value in range(1, 6):
+            self.rewrite_source(value)
+            threads = [threading.Thread(target=write_store, args=(value * 10 + index,)) for index in range(4)]
+            threads += [threading.Thread(target=read_store) for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(self.get_data_files()), 1)
+        self.assertTrue(StudyParametersStore(self.dump_directory).is_up_to_date(self.source_file_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
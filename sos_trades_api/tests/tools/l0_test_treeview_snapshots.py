@@ -0,0 +1,146 @@
+'''
+Copyright 2026 Capgemini
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import copy
+import json
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from sos_trades_api.tools.loading.treeview_snapshots import (
+    ADDED_NODES_KEY,
+    CHANGED_DATA_KEY,
+    CHANGED_NODES_KEY,
+    REMOVED_NODES_KEY,
+    VERSION_KEY,
+    TreeviewSnapshots,
+    apply_treeview_delta,
+    get_fingerprint,
+)
+
+"""
+Test class for the treeview versions and deltas sent to the clients after a study update
+"""
+
+
+class TestTreeviewSnapshots(unittest.TestCase):
+
+    @staticmethod
+    def get_discipline_node(discipline_index, parameters_count):
+        namespace = f"study.Disc{discipline_index}"
+        return {
+            "name": f"Disc{discipline_index}",
+            "full_namespace": namespace,
+            "status": "CONFIGURE",
+            "data": {f"{namespace}.x{index}": {"value": [float(index)] * 10, "type": "array", "editable": True}
+                     for index in range(parameters_count)},
+            "children": [],
+        }
+
+    def get_treenode(self, disciplines_count=50, parameters_count=100):
+        """
+        Treeview of a study with disciplines_count * parameters_count parameters
+        """
+        return {
+            "name": "study",
+            "full_namespace": "study",
+            "status": "CONFIGURE",
+            "data": {},
+            "children": [self.get_discipline_node(index, parameters_count) for index in range(disciplines_count)],
+        }
+
+    def test_01_parameter_edit_sends_changed_values_only(self):
+        snapshots = TreeviewSnapshots()
+        treenode = self.get_treenode()
+        version, delta = snapshots.add_snapshot(treenode)
+        self.assertIsNone(delta)
+        self.assertEqual(snapshots.add_snapshot(copy.deepcopy(treenode))[0], version)
+
+        new_treenode = copy.deepcopy(treenode)
+        new_treenode["children"][3]["data"]["study.Disc3.x7"]["value"] = [0.0]
+        new_treenode["children"][3]["status"] = "DONE"
+        new_version, delta = snapshots.add_snapshot(new_treenode, version)
+        self.assertNotEqual(new_version, version)
+        self.assertEqual(delta[VERSION_KEY], new_version)
+
+        self.assertEqual(delta[CHANGED_DATA_KEY], {"study.Disc3": {"study.Disc3.x7": {
+            "value": [0.0], "type": "array", "editable": True}}})
+        self.assertEqual(delta[CHANGED_NODES_KEY], {"study.Disc3": {"status": "DONE"}})
+        self.assertEqual(apply_treeview_delta(treenode, delta), new_treenode)
+
+        # 5000 parameters study, the delta is a few hundred bytes
+        self.assertLess(len(json.dumps(delta)) * 1000, len(json.dumps(new_treenode)))
+
+        # client already up to date
+        up_to_date_delta = snapshots.add_snapshot(new_treenode, new_version)[1]
+        self.assertEqual(up_to_date_delta[CHANGED_DATA_KEY], {})
+        self.assertEqual(up_to_date_delta[CHANGED_NODES_KEY], {})
+
+    def test_02_structural_changes(self):
+        snapshots = TreeviewSnapshots()
+        treenode = self.get_treenode(5, 10)
+        version = snapshots.add_snapshot(treenode)[0]
+
+        new_treenode = copy.deepcopy(treenode)
+        new_treenode["children"].pop(1)
+        new_treenode["children"].append(self.get_discipline_node(10, 10))
+        new_treenode["children"][0]["children"].append(self.get_discipline_node(11, 2))
+        del new_treenode["children"][2]["data"]["study.Disc3.x0"]
+        delta = snapshots.add_snapshot(new_treenode, version)[1]
+        self.assertEqual(delta[REMOVED_NODES_KEY], ["study.Disc1"])
+        self.assertEqual(set(delta[ADDED_NODES_KEY]), {"study.Disc10", "study.Disc11"})
+        self.assertEqual(apply_treeview_delta(treenode, delta), new_treenode)
+
+    def test_03_unknown_versions_need_full_reload(self):
+        snapshots = TreeviewSnapshots(snapshots_count=2)
+        treenode = self.get_treenode(2, 2)
+        first_version = snapshots.add_snapshot(treenode)[0]
+        for index in range(2):
+            treenode = copy.deepcopy(treenode)
+            treenode["children"][0]["status"] = f"STATUS{index}"
+            snapshots.add_snapshot(treenode)
+
+        self.assertIsNone(snapshots.add_snapshot(treenode, first_version)[1])
+        self.assertIsNone(snapshots.add_snapshot(treenode, None)[1])
+        # versions of another study manager are never matched
+        self.assertIsNone(TreeviewSnapshots().add_snapshot(treenode, snapshots.current_version)[1])
+
+    def test_04_fingerprints(self):
+        dataframe = pd.DataFrame({"years": np.arange(2020, 2050), "value": np.linspace(0.0, 1.0, 30)})
+        changed_dataframe = dataframe.copy()
+        changed_dataframe.loc[10, "value"] = 2.0
+        array = np.linspace(0.0, 1.0, 1000)
+
+        self.assertEqual(get_fingerprint(dataframe), get_fingerprint(dataframe.copy()))
+        self.assertNotEqual(get_fingerprint(dataframe), get_fingerprint(changed_dataframe))
+        self.assertNotEqual(get_fingerprint(dataframe), get_fingerprint(dataframe.rename(columns={"value": "v"})))
+        self.assertNotEqual(get_fingerprint(dataframe), get_fingerprint(dataframe.astype(float)))
+        self.assertEqual(get_fingerprint(array), get_fingerprint(array[::-1][::-1].copy()))
+        self.assertNotEqual(get_fingerprint(array), get_fingerprint(array.reshape(10, 100)))
+        self.assertEqual(get_fingerprint({"value": dataframe, "unit": "-"}),
+                         get_fingerprint({"value": dataframe.copy(), "unit": "-"}))
+        # object columns are pickled
+        self.assertEqual(get_fingerprint(pd.DataFrame({"list": [[1, 2], [3]]})),
+                         get_fingerprint(pd.DataFrame({"list": [[1, 2], [3]]})))
+
+        self.assertEqual(get_fingerprint(float("nan")), get_fingerprint(float("nan")))
+        self.assertNotEqual(get_fingerprint(1), get_fingerprint(1.0))
+        self.assertNotEqual(get_fingerprint(1), get_fingerprint(True))
+        self.assertNotEqual(get_fingerprint("a" * 100), get_fingerprint("a" * 101))
+
+
+if __name__ == "__main__":
+    unittest.main()
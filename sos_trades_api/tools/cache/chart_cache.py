@@ -0,0 +1,246 @@
+'''
+Copyright 2026 Capgemini
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import hashlib
+import json
+import logging
+import os
+import pickle
+import shutil
+import threading
+from collections import OrderedDict
+from os.path import join
+from tempfile import NamedTemporaryFile
+
+"""
+Cache of the generated post-processing charts, with a memory tier and a serialised tier in the study folder
+"""
+
+# number of chart results kept in memory by the server
+CHART_CACHE_MEMORY_MAX_ENTRIES = 256
+# name of the folder storing the serialised charts in the study folder
+CHART_CACHE_FOLDER_NAME = "chart_cache"
+CHART_CACHE_FILE_EXTENSION = ".pkl"
+
+
+def get_study_version_stamp(modification_date) -> str:
+    """
+    Return the stamp identifying a version of the study data from its last modification date
+    """
+    if modification_date is None:
+        return "none"
+    return modification_date.strftime("%Y%m%d%H%M%S%f")
+
+
+def get_chart_key(namespace, discipline_module, filters) -> str:
+    """
+    Return the key of a chart request, filters are normalised so that their order does not matter
+
+    :param namespace: namespace of the post-processings
+    :type namespace: str
+    :param discipline_module: specific discipline module of the post-processings
+    :type discipline_module: str
+    :param filters: filters applied on the post-processings, None for the default filters
+    :type filters: list[ChartFilter]
+    """
+    normalised_filters = None
+    if filters is not None:
+        normalised_filters = sorted((chart_filter.to_dict() for chart_filter in filters),
+                                    key=lambda chart_filter: json.dumps(chart_filter, sort_keys=True, default=str))
+
+    chart_request = [namespace, discipline_module or "", normalised_filters]
+    return hashlib.sha256(json.dumps(chart_request, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class ChartCacheStatistics:
+    """
+    Hit and miss counters of the chart cache
+    """
+
+    def __init__(self):
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        requests_count = self.memory_hits + self.disk_hits + self.misses
+        if requests_count == 0:
+            return 0.0
+        return (self.memory_hits + self.disk_hits) / requests_count
+
+    def serialize(self):
+        """
+        json serializer for dto purpose
+        """
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+        }
+
+
+class ChartCache:
+    """
+    Class that stores the post-processing charts of the studies by version of the study data.
+    Charts of a study version are never updated, they are dropped as soon as a newer version of the study is requested.
+    """
+
+    def __init__(self, max_memory_entries=CHART_CACHE_MEMORY_MAX_ENTRIES, logger=logging.getLogger(__name__)):
+        """
+        Constructor
+
+        :param max_memory_entries: number of chart results kept in memory, least recently used ones are dropped
+        :type max_memory_entries: int
+        """
+        self.max_memory_entries = max_memory_entries
+        self.logger = logger
+        self.statistics = ChartCacheStatistics()
+        self.__memory_cache = OrderedDict()
+        self.__study_version_stamps = {}
+        self.__lock = threading.Lock()
+
+    def get(self, study_id, study_folder, version_stamp, chart_key):
+        """
+        Return the cached charts of a study version, None if they are not in cache
+
+        :param study_id: study case identifier
+        :type study_id: int
+        :param study_folder: folder of the study data, where the charts are serialised
+        :type study_folder: str
+        :param version_stamp: stamp of the study data version (see get_study_version_stamp)
+        :type version_stamp: str
+        :param chart_key: key of the chart request (see get_chart_key)
+        :type chart_key: str
+        """
+        memory_key = (study_id, version_stamp, chart_key)
+        with self.__lock:
+            self.__check_study_version(study_id, version_stamp)
+            if self.__study_version_stamps.get(study_id) != version_stamp:
+                # a newer version of the study has already been requested
+                self.statistics.misses += 1
+                return None
+            charts = self.__memory_cache.get(memory_key)
+            if charts is not None:
+                self.__memory_cache.move_to_end(memory_key)
+                self.statistics.memory_hits += 1
+                return charts
+
+        charts = self.__read_charts_file(self.__get_charts_file_path(study_folder, version_stamp, chart_key))
+
+        with self.__lock:
+            if charts is None:
+                self.statistics.misses += 1
+            else:
+                self.statistics.disk_hits += 1
+                if self.__study_version_stamps.get(study_id) == version_stamp:
+                    self.__add_in_memory(memory_key, charts)
+        return charts
+
+    def set(self, study_id, study_folder, version_stamp, chart_key, charts):
+        """
+        Store the charts of a study version in memory and in the study folder
+
+        :param charts: post-processings generated for the chart request
+        :type charts: list
+        """
+        with self.__lock:
+            self.__check_study_version(study_id, version_stamp)
+            if self.__study_version_stamps.get(study_id) != version_stamp:
+                # charts of an outdated version of the study
+                return
+            self.__add_in_memory((study_id, version_stamp, chart_key), charts)
+
+        charts_folder = join(study_folder, CHART_CACHE_FOLDER_NAME)
+        try:
+            # serialised charts of the previous versions are not reachable anymore
+            if os.path.isdir(charts_folder):
+                for file_name in os.listdir(charts_folder):
+                    if not file_name.startswith(f"{version_stamp}_"):
+                        os.remove(join(charts_folder, file_name))
+            else:
+                os.makedirs(charts_folder, exist_ok=True)
+
+            with NamedTemporaryFile(dir=charts_folder, prefix=f"{version_stamp}_", suffix=".tmp",
+                                    delete=False) as charts_file:
+                pickle.dump(charts, charts_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(charts_file.name, self.__get_charts_file_path(study_folder, version_stamp, chart_key))
+        except Exception as error:
+            self.logger.warning(f"Unable to serialise charts of study {study_id} in cache: {error}")
+
+    def get_study_memory_charts(self, study_id) -> list:
+        """
+        Return the charts of a study kept in memory
+
+        :param study_id: study case identifier
+        :type study_id: int
+        """
+        with self.__lock:
+            return [charts for key, charts in self.__memory_cache.items() if key[0] == study_id]
+
+    def invalidate_study(self, study_id, study_folder=None):
+        """
+        Remove all the charts of a study from the cache
+
+        :param study_id: study case identifier
+        :type study_id: int
+        :param study_folder: folder of the study data, the serialised charts are removed if it is given
+        :type study_folder: str
+        """
+        with self.__lock:
+            self.__study_version_stamps.pop(study_id, None)
+            self.__remove_study_from_memory(study_id)
+
+        if study_folder is not None:
+            shutil.rmtree(join(study_folder, CHART_CACHE_FOLDER_NAME), ignore_errors=True)
+
+    def __check_study_version(self, study_id, version_stamp):
+        """
+        Drop the charts of the previous versions of a study when a newer one is requested
+        """
+        current_version_stamp = self.__study_version_stamps.get(study_id)
+        if current_version_stamp is None or current_version_stamp < version_stamp:
+            self.__study_version_stamps[study_id] = version_stamp
+            if current_version_stamp is not None:
+                self.__remove_study_from_memory(study_id)
+
+    def __remove_study_from_memory(self, study_id):
+        for memory_key in [key for key in self.__memory_cache if key[0] == study_id]:
+            del self.__memory_cache[memory_key]
+
+    def __add_in_memory(self, memory_key, charts):
+        self.__memory_cache[memory_key] = charts
+        self.__memory_cache.move_to_end(memory_key)
+        while len(self.__memory_cache) > self.max_memory_entries:
+            self.__memory_cache.popitem(last=False)
+
+    @staticmethod
+    def __get_charts_file_path(study_folder, version_stamp, chart_key) -> str:
+        return join(study_folder, CHART_CACHE_FOLDER_NAME, f"{version_stamp}_{chart_key}{CHART_CACHE_FILE_EXTENSION}")
+
+    def __read_charts_file(self, charts_file_path):
+        if not os.path.exists(charts_file_path):
+            return None
+        try:
+            with open(charts_file_path, "rb") as charts_file:
+                return pickle.load(charts_file)
+        except Exception as error:
+            self.logger.warning(f"Unable to read serialised charts {charts_file_path}, they are removed: {error}")
+            try:
+                os.remove(charts_file_path)
+            except OSError:
+                pass
+            return None
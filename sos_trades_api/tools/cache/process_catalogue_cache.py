@@ -0,0 +1,201 @@
+'''
+Copyright 2026 Capgemini
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import threading
+from datetime import datetime, timezone
+
+from sos_trades_api.models.database_models import (
+    CatalogueVersion,
+    Process,
+    ReferenceStudy,
+)
+from sos_trades_api.server.base_server import db
+
+"""
+In-memory catalogue of processes and references, rebuilt when the catalogue version stored in database changes
+"""
+
+# identifier of the single row of the catalogue version table
+CATALOGUE_VERSION_ID = 1
+
+
+class CatalogueProcess:
+    """
+    Process as stored in the catalogue, detached from the database session
+    """
+
+    def __init__(self, id, name, process_path, disabled):
+        self.id = id
+        self.name = name
+        self.process_path = process_path
+        self.disabled = disabled
+
+
+class CatalogueReference:
+    """
+    Reference as stored in the catalogue, detached from the database session
+    """
+
+    def __init__(self, id, process_id, name, reference_path, reference_type, execution_status, creation_date):
+        self.id = id
+        self.process_id = process_id
+        self.name = name
+        self.reference_path = reference_path
+        self.reference_type = reference_type
+        self.execution_status = execution_status
+        self.creation_date = creation_date
+
+
+class ProcessCatalogue:
+    """
+    Snapshot of the processes and references of a catalogue version with its indexes, never modified once built
+    """
+
+    def __init__(self, version, processes, references):
+        """
+        Constructor
+
+        :param version: catalogue version the snapshot has been built from, with its modification date so that
+            a version of a recreated database is not mistaken for the cached one
+        :type version: tuple[int, datetime]
+        :param processes: processes of the catalogue
+        :type processes: list[CatalogueProcess]
+        :param references: references of the catalogue
+        :type references: list[CatalogueReference]
+        """
+        self.version = version
+        self.__processes = {process.id: process for process in sorted(processes, key=lambda p: p.id)}
+        self.__processes_by_name = {}
+        self.__processes_by_repository = {}
+        self.__references_by_process = {}
+
+        for process in self.__processes.values():
+            self.__processes_by_name[f"{process.process_path}.{process.name}"] = process
+            self.__processes_by_repository.setdefault(process.process_path, []).append(process)
+
+        for reference in sorted(references, key=lambda r: r.id):
+            self.__references_by_process.setdefault(reference.process_id, []).append(reference)
+
+    def get_processes(self, disabled=None) -> list[CatalogueProcess]:
+        """
+        Return the processes of the catalogue ordered by identifier
+
+        :param disabled: if set, return only the processes with this disabled flag
+        :type disabled: bool
+        """
+        if disabled is None:
+            return list(self.__processes.values())
+        return [process for process in self.__processes.values() if process.disabled == disabled]
+
+    def get_process(self, process_id) -> CatalogueProcess:
+        """
+        Return a process from its identifier, None if it is not in the catalogue
+        """
+        return self.__processes.get(process_id)
+
+    def get_process_by_name(self, process_name, repository_name) -> CatalogueProcess:
+        """
+        Return a process from its name and repository, None if it is not in the catalogue
+        """
+        return self.__processes_by_name.get(f"{repository_name}.{process_name}")
+
+    def get_repository_processes(self, repository_name) -> list[CatalogueProcess]:
+        """
+        Return the processes of a repository
+        """
+        return list(self.__processes_by_repository.get(repository_name, []))
+
+    def get_process_references(self, process_id) -> list[CatalogueReference]:
+        """
+        Return the references of a process ordered by identifier
+        """
+        return list(self.__references_by_process.get(process_id, []))
+
+
+class ProcessCatalogueCache:
+    """
+    Class that keeps the catalogue of the current version in memory, shared by all the requests of the server
+    """
+
+    def __init__(self):
+        self.__catalogue = None
+        self.__lock = threading.Lock()
+
+    def get_catalogue(self) -> ProcessCatalogue:
+        """
+        Return the catalogue of the current version, it is rebuilt if the version stored in database changed
+        """
+        version = get_catalogue_version()
+        catalogue = self.__catalogue
+        if catalogue is None or catalogue.version != version:
+            with self.__lock:
+                catalogue = self.__catalogue
+                if catalogue is None or catalogue.version != version:
+                    # the version is read before the tables so a change made meanwhile triggers a new rebuild
+                    catalogue = self.__build_catalogue(version)
+                    self.__catalogue = catalogue
+        return catalogue
+
+    @staticmethod
+    def __build_catalogue(version) -> ProcessCatalogue:
+        processes = [CatalogueProcess(*row) for row in db.session.query(
+            Process.id, Process.name, Process.process_path, Process.disabled).all()]
+
+        references = [CatalogueReference(*row) for row in db.session.query(
+            ReferenceStudy.id, ReferenceStudy.process_id, ReferenceStudy.name, ReferenceStudy.reference_path,
+            ReferenceStudy.reference_type, ReferenceStudy.execution_status, ReferenceStudy.creation_date).all()]
+
+        return ProcessCatalogue(version, processes, references)
+
+
+process_catalogue_cache = ProcessCatalogueCache()
+
+
+def get_process_catalogue() -> ProcessCatalogue:
+    """
+    Return the process and reference catalogue of the current version
+    """
+    return process_catalogue_cache.get_catalogue()
+
+
+def get_catalogue_version() -> tuple:
+    """
+    Return the catalogue version stored in database and its modification date
+    """
+    catalogue_version = db.session.query(CatalogueVersion.version, CatalogueVersion.modification_date).filter(
+        CatalogueVersion.id == CATALOGUE_VERSION_ID).first()
+    if catalogue_version is None:
+        return 0, None
+    return tuple(catalogue_version)
+
+
+def bump_catalogue_version():
+    """
+    Increment the catalogue version in the current transaction, so that it is committed with the catalogue changes
+    and all the servers rebuild their catalogue at the next access
+    """
+    modification_date = datetime.now().astimezone(timezone.utc).replace(tzinfo=None)
+    updated_count = CatalogueVersion.query.filter(CatalogueVersion.id == CATALOGUE_VERSION_ID).update(
+        {
+            CatalogueVersion.version: CatalogueVersion.version + 1,
+            CatalogueVersion.modification_date: modification_date,
+        }, synchronize_session=False)
+
+    if updated_count == 0:
+        catalogue_version = CatalogueVersion()
+        catalogue_version.id = CATALOGUE_VERSION_ID
+        catalogue_version.version = 1
+        catalogue_version.modification_date = modification_date
+        db.session.add(catalogue_version)
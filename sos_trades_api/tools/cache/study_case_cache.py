@@ -234,5 +234,25 @@ class StudyCaseCache:
             has_been_updated = True
         return has_been_updated
 
+    def get_memory_footprints(self, refresh=False) -> dict:
+        """
+        Return the last memory footprint estimated for each cached study case
+
+        :param refresh: estimate again the memory footprint of the loaded study cases
+        :type refresh: boolean
+        :return: dictionary with the load status and the memory footprint of each study case by identifier
+        """
+        from sos_trades_api.models.loaded_study_case import LoadStatus
+
+        memory_footprints = {}
+        for study_case_identifier, study_case_manager in list(self.__study_case_manager_dict.items()):
+            if refresh and study_case_manager.load_status == LoadStatus.LOADED:
+                study_case_manager.update_memory_footprint("request")
+            memory_footprints[study_case_identifier] = {
+                "load_status": study_case_manager.load_status,
+                "memory_footprint": study_case_manager.memory_footprint,
+            }
+        return memory_footprints
+
     def get_saved_active_study(self):
         return self.__last_alive_date.keys()
@@ -0,0 +1,197 @@
+'''
+Copyright 2026 Capgemini
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import base64
+
+import numpy as np
+
+"""
+Compact encoding of the post-processing charts payload: dense numeric series are downsampled
+for the displayed width and sent as base64 little-endian typed arrays instead of json lists
+"""
+
+# key identifying an encoded typed array in the payload
+TYPED_ARRAY_KEY = "__typed_array__"
+# numeric lists shorter than this are kept as json lists, encoding would not reduce their size
+TYPED_ARRAY_MIN_LENGTH = 64
+TYPED_ARRAY_DTYPES = {"float32": "<f4", "float64": "<f8"}
+# key added in a downsampled series with its number of points before downsampling
+ORIGINAL_LENGTH_KEY = "original_length"
+# abscissa and ordinate keys of the two axes charts series and of the plotly traces
+SERIES_AXES_KEYS = [("abscissa", "ordinate"), ("x", "y")]
+
+
+def get_lttb_indices(x_values, y_values, threshold) -> np.ndarray:
+    """
+    Return the indices of the points kept by the largest triangle three buckets downsampling,
+    which keeps the visual shape of a series (peaks included) with the given number of points
+
+    :param x_values: abscissa of the series points
+    :type x_values: np.ndarray
+    :param y_values: ordinate of the series points
+    :type y_values: np.ndarray
+    :param threshold: number of points to keep
+    :type threshold: int
+    """
+    points_count = len(y_values)
+    if threshold >= points_count or threshold < 3:
+        return np.arange(points_count)
+
+    # first and last points are kept, the other ones are split in threshold - 2 buckets
+    bucket_edges = np.linspace(1, points_count - 1, threshold - 1).astype(int)
+    indices = np.empty(threshold, dtype=int)
+    indices[0] = 0
+    indices[-1] = points_count - 1
+
+    selected_index = 0
+    for bucket in range(threshold - 2):
+        start, end = bucket_edges[bucket], bucket_edges[bucket + 1]
+        if bucket + 2 < len(bucket_edges):
+            next_start, next_end = bucket_edges[bucket + 1], bucket_edges[bucket + 2]
+            average_x = x_values[next_start:next_end].mean()
+            average_y = y_values[next_start:next_end].mean()
+        else:
+            average_x = x_values[-1]
+            average_y = y_values[-1]
+
+        areas = np.abs((x_values[selected_index] - average_x) * (y_values[start:end] - y_values[selected_index])
+                       - (x_values[selected_index] - x_values[start:end]) * (average_y - y_values[selected_index]))
+        selected_index = start + int(np.argmax(np.nan_to_num(areas, nan=-1.0)))
+        indices[bucket + 1] = selected_index
+
+    return indices
+
+
+def get_numeric_array(values) -> np.ndarray:
+    """
+    Return the values as a numeric array, None if they are not all numbers
+    """
+    if len(values) == 0 or isinstance(values[0], (bool, np.bool_)):
+        return None
+    try:
+        array = np.asarray(values)
+    except (TypeError, ValueError):
+        return None
+    if array.ndim != 1 or array.dtype.kind not in "iuf":
+        return None
+    return array
+
+
+def encode_typed_array(array, dtype="float64") -> dict:
+    """
+    Encode a numeric array as a base64 little-endian typed array
+
+    :param array: values to encode
+    :type array: np.ndarray
+    :param dtype: type of the encoded values, float32 or float64
+    :type dtype: str
+    """
+    return {
+        TYPED_ARRAY_KEY: dtype,
+        "length": len(array),
+        "data": base64.b64encode(np.ascontiguousarray(array, dtype=TYPED_ARRAY_DTYPES[dtype]).tobytes()).decode(),
+    }
+
+
+def decode_typed_array(encoded_array) -> np.ndarray:
+    """
+    Decode a typed array encoded by encode_typed_array
+    """
+    return np.frombuffer(base64.b64decode(encoded_array["data"]),
+                         dtype=TYPED_ARRAY_DTYPES[encoded_array[TYPED_ARRAY_KEY]])
+
+
+class ChartPayloadEncoder:
+    """
+    Class that converts post-processings into a compact json-ready payload, the post-processings themselves are
+    not modified so that they can be kept in cache and sent again with other options
+    """
+    # encoding requested by the client to receive typed arrays
+    TYPED_ARRAY_ENCODING = "typed_array"
+
+    def __init__(self, width=None, typed_arrays=True, dtype="float64"):
+        """
+        Constructor
+
+        :param width: number of pixels the charts are displayed on, series with more points are downsampled
+            to this number of points, None to keep all the points
+        :type width: int
+        :param typed_arrays: encode the numeric lists as base64 typed arrays
+        :type typed_arrays: bool
+        :param dtype: type of the encoded values, float32 or float64
+        :type dtype: str
+        """
+        if dtype not in TYPED_ARRAY_DTYPES:
+            raise ValueError(f"Unknown typed array type {dtype}, expected one of {list(TYPED_ARRAY_DTYPES)}")
+        self.width = width
+        self.typed_arrays = typed_arrays
+        self.dtype = dtype
+
+    def encode(self, payload):
+        """
+        Return the json-ready payload with its dense series downsampled and encoded
+
+        :param payload: post-processings (bundles, charts, tables) or json-ready structure containing them
+        """
+        if isinstance(payload, dict):
+            # downsampled series are encoded from their kept points only
+            encoded_payload = self.__downsample_series(payload) if self.width is not None else {}
+            for key, value in payload.items():
+                if key not in encoded_payload:
+                    encoded_payload[key] = self.encode(value)
+            return encoded_payload
+        elif isinstance(payload, (list, tuple)):
+            return self.__encode_list(payload)
+        elif isinstance(payload, np.ndarray):
+            return self.__encode_list(payload)
+        elif hasattr(payload, "to_plotly_dict"):
+            return self.encode(payload.to_plotly_dict())
+        elif hasattr(payload, "to_dict"):
+            return self.encode(payload.to_dict())
+        return payload
+
+    def __encode_list(self, values):
+        if self.typed_arrays and len(values) >= TYPED_ARRAY_MIN_LENGTH:
+            array = get_numeric_array(values)
+            if array is not None:
+                return encode_typed_array(array, self.dtype)
+        if isinstance(values, np.ndarray):
+            return values.tolist()
+        return [self.encode(value) for value in values]
+
+    def __downsample_series(self, series) -> dict:
+        """
+        Return the encoded abscissa and ordinate of a series having more points than the width, downsampled
+        to the width, empty if the series does not need to be downsampled
+        """
+        encoded_series = {}
+        for x_key, y_key in SERIES_AXES_KEYS:
+            x_values = series.get(x_key)
+            y_values = series.get(y_key)
+            if not isinstance(x_values, (list, tuple, np.ndarray)) or not isinstance(y_values, (list, tuple, np.ndarray)) \
+                    or len(x_values) != len(y_values) or len(y_values) <= self.width:
+                continue
+            y_array = get_numeric_array(y_values)
+            if y_array is None:
+                continue
+            x_array = get_numeric_array(x_values)
+            indices = get_lttb_indices(x_array if x_array is not None else np.arange(len(y_array)),
+                                       y_array.astype(float), self.width)
+
+            encoded_series[x_key] = self.__encode_list(
+                x_array[indices] if x_array is not None else [x_values[index] for index in indices])
+            encoded_series[y_key] = self.__encode_list(y_array[indices])
+            encoded_series[ORIGINAL_LENGTH_KEY] = len(y_values)
+        return encoded_series
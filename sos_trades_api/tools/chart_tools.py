@@ -21,6 +21,12 @@ from sostrades_core.tools.post_processing.post_processing_factory import (
     PostProcessingFactory,
 )
 
+from sos_trades_api.config import Config
+from sos_trades_api.tools.parallel_post_processing import (
+    POST_PROCESSING_MAX_WORKERS,
+    generate_post_processings,
+)
+
 """
 various function  regarding chart api
 """
@@ -47,10 +53,49 @@ def load_post_processing(exec_engine, with_charts):
 
         post_processing_factory = PostProcessingFactory()
 
-        all_post_processings = post_processing_factory.get_all_post_processings(
-            exec_engine, not with_charts)
+        if with_charts and Config().parallel_post_processing:
+            # filters only are fast to generate, they give the namespaces having post-processings
+            post_processing_namespaces = list(post_processing_factory.get_all_post_processings(
+                exec_engine, True).keys())
+
+            # charts are generated namespace by namespace, in forked processes sharing the loaded study
+            all_post_processings = generate_post_processings(
+                post_processing_namespaces,
+                lambda namespace: post_processing_factory.get_post_processings_by_discipline_name(
+                    namespace, "", exec_engine),
+                exec_engine.logger,
+                max_workers=POST_PROCESSING_MAX_WORKERS)
+        else:
+            all_post_processings = post_processing_factory.get_all_post_processings(
+                exec_engine, not with_charts)
 
         exec_engine.logger.info(
             f"End of post-processing generation ({time.time() - start_time} seconds)")
 
     return all_post_processings
+
+
+def load_post_processing_filters_by_discipline(exec_engine):
+    """
+    Methods that requests the post-processing filters of each execution engine discipline,
+    a discipline failing to give its filters is left out of the result
+
+    :params: exec_engine execution engine to request
+    :type: ExecutionEngine
+
+    :return: dictionary with discipline key as key and ChartFilter list as value
+    """
+    discipline_filters = {}
+
+    if exec_engine is not None and exec_engine.dm is not None and exec_engine.dm.disciplines_dict is not None:
+        post_processing_factory = PostProcessingFactory()
+
+        for discipline_key in exec_engine.dm.disciplines_dict:
+            try:
+                discipline = exec_engine.dm.get_discipline(discipline_key)
+                discipline_filters[discipline_key] = post_processing_factory.get_post_processing_filters_by_discipline(
+                    discipline)
+            except Exception as error:
+                exec_engine.logger.warning(f"Unable to retrieve post-processing filters of {discipline_key}: {error}")
+
+    return discipline_filters
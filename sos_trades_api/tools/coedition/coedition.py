@@ -14,24 +14,32 @@ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 See the License for the specific language governing permissions and
 limitations under the License.
 '''
+import hashlib
+import zlib
 from datetime import datetime
 
 from sostrades_core.tools.base_functions.compute_size import compute_data_size_in_Mo
+from sqlalchemy import exists
+from sqlalchemy.exc import IntegrityError
 
 from sos_trades_api.models.database_models import (
     Notification,
     StudyCase,
     StudyCaseChange,
+    StudyCaseChangeBlob,
     StudyCoeditionUser,
     User,
 )
 from sos_trades_api.models.user_dto import UserDto
-from sos_trades_api.server.base_server import db
+from sos_trades_api.server.base_server import app, db
 
 """
 tools methods to manage coedition features
 """
 
+# changes values bigger than this size are not stored in database
+CHANGE_VALUE_MAX_SIZE_IN_MO = 2
+
 
 class UserCoeditionAction:
     JOIN_ROOM = "connection"
@@ -168,37 +176,146 @@ def add_notification_db(study_case_id, user, coedition_type: UserCoeditionAction
     return new_notification.id
 
 
-def add_change_db(notification_id, variable_id, variable_type, deleted_columns, change_type, new_value,
-                  old_value, old_value_blob, last_modified, dataset_connector_id, dataset_id, dataset_parameter_id,
-                  dataset_data_path, variable_key):
-    """
-    Add study change to database
-    """
-    new_change = StudyCaseChange()
-
-    new_change.notification_id = notification_id
-    new_change.variable_id = variable_id
-    new_change.variable_type = variable_type
-    new_change.change_type = change_type
-    # check the size to prevent saving too big values
-    if compute_data_size_in_Mo(new_value) < 2:
-        new_change.new_value = new_value
-    else:
-        new_change.new_value = "New data size exceeds 2Mo, it cannot be displayed"
-    if compute_data_size_in_Mo(old_value) < 2:
-        new_change.old_value = old_value
-    else:
-        new_change.old_value = "Old data size exceeds 2Mo, it cannot be displayed. Reset to this value is not possible"
-    if compute_data_size_in_Mo(old_value_blob) < 2:
-        new_change.old_value_blob = old_value_blob
-    new_change.last_modified = last_modified
-    new_change.deleted_columns = deleted_columns
-    new_change.dataset_connector_id = dataset_connector_id
-    new_change.dataset_id = dataset_id
-    new_change.dataset_parameter_id = dataset_parameter_id
-    new_change.dataset_data_path = dataset_data_path
-    new_change.variable_key = variable_key
-
-    # Save change
-    db.session.add(new_change)
-    db.session.commit()
+class StudyCaseChangesBatch:
+    """
+    Collect the changes of one notification to insert them in database at once.
+    Old values blobs are stored compressed in a separate table, identical contents are stored only once.
+    """
+
+    def __init__(self, notification_id):
+        self.notification_id = notification_id
+        self.__changes = []
+        self.__old_value_blobs = {}
+
+    def add_change(self, variable_id, variable_type, deleted_columns, change_type, new_value,
+                   old_value, old_value_blob, last_modified, dataset_connector_id, dataset_id, dataset_parameter_id,
+                   dataset_data_path, variable_key):
+        """
+        Add a study change to the batch
+        """
+        new_change = StudyCaseChange()
+
+        new_change.notification_id = self.notification_id
+        new_change.variable_id = variable_id
+        new_change.variable_type = variable_type
+        new_change.change_type = change_type
+        # check the size to prevent saving too big values
+        if get_value_size_in_mo(new_value) < CHANGE_VALUE_MAX_SIZE_IN_MO:
+            new_change.new_value = new_value
+        else:
+            new_change.new_value = "New data size exceeds 2Mo, it cannot be displayed"
+        if get_value_size_in_mo(old_value) < CHANGE_VALUE_MAX_SIZE_IN_MO:
+            new_change.old_value = old_value
+        else:
+            new_change.old_value = "Old data size exceeds 2Mo, it cannot be displayed. Reset to this value is not possible"
+        new_change.last_modified = last_modified
+        new_change.deleted_columns = deleted_columns
+        new_change.dataset_connector_id = dataset_connector_id
+        new_change.dataset_id = dataset_id
+        new_change.dataset_parameter_id = dataset_parameter_id
+        new_change.dataset_data_path = dataset_data_path
+        new_change.variable_key = variable_key
+
+        content_hash = None
+        if old_value_blob is not None:
+            content_hash = hashlib.sha256(old_value_blob).hexdigest()
+            if content_hash not in self.__old_value_blobs:
+                compressed_data = zlib.compress(old_value_blob)
+                # the size limit applies to the stored (compressed) value
+                if get_value_size_in_mo(compressed_data) < CHANGE_VALUE_MAX_SIZE_IN_MO:
+                    self.__old_value_blobs[content_hash] = (compressed_data, len(old_value_blob))
+                else:
+                    content_hash = None
+
+        self.__changes.append((new_change, content_hash))
+
+    def commit(self):
+        """
+        Insert the old values blobs not already stored and all the changes of the batch
+        """
+        blob_ids = store_change_blobs(self.__old_value_blobs)
+
+        for change, content_hash in self.__changes:
+            if content_hash is not None:
+                change.old_value_blob_id = blob_ids[content_hash]
+
+        db.session.add_all([change for change, _ in self.__changes])
+        db.session.commit()
+
+        self.__changes = []
+        self.__old_value_blobs = {}
+
+
+def get_value_size_in_mo(value) -> float:
+    """
+    Return the size of a change value, strings and bytes are measured without any conversion
+    """
+    if value is None:
+        return 0
+    if isinstance(value, (str, bytes)):
+        return len(value) / (1024 * 1024)
+    return compute_data_size_in_Mo(value)
+
+
+def store_change_blobs(old_value_blobs) -> dict:
+    """
+    Store the compressed old values blobs that are not already in database
+
+    :param old_value_blobs: compressed content and uncompressed size by content hash
+    :type old_value_blobs: dict
+    :return: blob identifier by content hash
+    """
+    if len(old_value_blobs) == 0:
+        return {}
+
+    # reused blobs are locked until the changes referencing them are committed, so that a concurrent
+    # deletion of the orphan blobs waits for them (or is seen deleted here and the blob is stored again)
+    blob_ids = dict(db.session.query(StudyCaseChangeBlob.content_hash, StudyCaseChangeBlob.id)
+                    .filter(StudyCaseChangeBlob.content_hash.in_(list(old_value_blobs.keys())))
+                    .with_for_update(read=True).all())
+
+    for content_hash, (compressed_data, size) in old_value_blobs.items():
+        if content_hash in blob_ids:
+            continue
+
+        new_blob = StudyCaseChangeBlob()
+        new_blob.content_hash = content_hash
+        new_blob.data = compressed_data
+        new_blob.size = size
+        try:
+            with db.session.begin_nested():
+                db.session.add(new_blob)
+            blob_ids[content_hash] = new_blob.id
+        except IntegrityError:
+            # the same content has been stored by a concurrent save
+            blob_ids[content_hash] = db.session.query(StudyCaseChangeBlob.id) \
+                .filter(StudyCaseChangeBlob.content_hash == content_hash).scalar()
+
+    return blob_ids
+
+
+def get_change_old_value_blob(change):
+    """
+    Return the old value bytes of a change, stored compressed in the blobs table or directly in the change
+    """
+    if change.old_value_blob_id is not None:
+        blob = StudyCaseChangeBlob.query.filter(StudyCaseChangeBlob.id == change.old_value_blob_id).first()
+        if blob is not None:
+            return zlib.decompress(blob.data)
+    return change.old_value_blob
+
+
+def delete_orphan_change_blobs():
+    """
+    Delete the old values blobs that are not referenced anymore (changes deleted with their study).
+    Called in the transaction deleting the studies, before its commit, the deletion is done in a savepoint:
+    if it fails (blob referenced by a concurrent save) the studies are deleted anyway and the orphan blobs are
+    deleted with the next studies.
+    """
+    try:
+        with db.session.begin_nested():
+            StudyCaseChangeBlob.query.filter(
+                ~exists().where(StudyCaseChange.old_value_blob_id == StudyCaseChangeBlob.id),
+            ).delete(synchronize_session=False)
+    except Exception as error:
+        app.logger.warning(f"Orphan study changes old values not deleted: {error}")
@@ -0,0 +1,306 @@
+'''
+Copyright 2026 Capgemini
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import hashlib
+import os
+import re
+import shutil
+import time
+import uuid
+from os.path import exists, isdir, join
+
+from sostrades_core.tools.folder_operations import makedirs_safe
+
+from sos_trades_api.tools.file_stream.file_lock import file_lock
+from sos_trades_api.tools.file_tools import (
+    read_object_in_json_file,
+    write_object_in_json_file,
+)
+
+# size of the blocks read from the request stream when writing a part
+UPLOAD_BLOCK_SIZE = 1024 * 1024
+# delay in seconds without any update after which a session is removed with its uploaded file
+UPLOAD_SESSION_EXPIRY_DELAY = 24 * 3600
+# maximum size in bytes of an uploaded file when the server configuration does not set one
+UPLOAD_MAX_FILE_SIZE = 10 * 1024 ** 3
+# session identifiers are uuid4 hexadecimal strings, anything else is not a session folder name
+SESSION_ID_PATTERN = re.compile(r"[0-9a-f]{32}")
+
+
+class ChunkedUploadError(Exception):
+    """Chunked upload Exception"""
+
+    def __init__(self, msg=None):
+        Exception.__init__(self, msg)
+
+    def __str__(self):
+        return self.__class__.__name__ + "(" + Exception.__str__(self) + ")"
+
+
+class ChunkedUploadSession():
+    """
+    Resumable upload of a file sent in several parts: each part is written directly at its offset
+    in the uploaded file (no part is kept in memory nor copied twice) and registered with its checksum.
+    The session state is stored in a json file next to the uploaded file so that any server sharing
+    the upload folder can continue the upload, it is updated under an inter-process lock.
+    Parts are written under a shared parts lock that the finalization takes exclusively, so that no part
+    can be written in the uploaded file once the session is finalized.
+    """
+    SESSION_FILE_NAME = "upload_session.json"
+    SESSION_LOCK_FILE_NAME = "upload_session.lock"
+    PARTS_LOCK_FILE_NAME = "upload_parts.lock"
+    UPLOADED_FILE_NAME = "uploaded_file"
+
+    IN_PROGRESS = "in_progress"
+    FINALIZED = "finalized"
+    IN_ERROR = "in_error"
+
+    def __init__(self, upload_root_folder, session_id):
+        if not isinstance(session_id, str) or SESSION_ID_PATTERN.fullmatch(session_id) is None:
+            raise ChunkedUploadError(f"Upload session {session_id} does not exist")
+        self.__session_id = session_id
+        self.__session_folder_path = join(upload_root_folder, session_id)
+        self.__session_file_path = join(self.__session_folder_path, self.SESSION_FILE_NAME)
+        self.__session_lock_file_path = join(self.__session_folder_path, self.SESSION_LOCK_FILE_NAME)
+        self.__parts_lock_file_path = join(self.__session_folder_path, self.PARTS_LOCK_FILE_NAME)
+        self.__uploaded_file_path = join(self.__session_folder_path, self.UPLOADED_FILE_NAME)
+        self.__session = read_object_in_json_file(self.__session_file_path)
+        if self.__session is None:
+            raise ChunkedUploadError(f"Upload session {session_id} does not exist")
+
+    @classmethod
+    def create(cls, upload_root_folder, file_name, file_size, metadata=None, max_file_size=UPLOAD_MAX_FILE_SIZE):
+        """
+        Create a new upload session
+
+        :param upload_root_folder: folder where upload sessions are stored
+        :type upload_root_folder: str
+        :param file_name: name of the uploaded file
+        :type file_name: str
+        :param file_size: total size of the uploaded file in bytes
+        :type file_size: int
+        :param metadata: information to keep with the session (owner...)
+        :type metadata: dict
+        :param max_file_size: maximum size in bytes of the uploaded file, it is allocated on disk at creation
+        :type max_file_size: int
+        """
+        if file_size <= 0:
+            raise ChunkedUploadError("Uploaded file size must be strictly positive")
+        if file_size > max_file_size:
+            raise ChunkedUploadError(f"Uploaded file size must not exceed {max_file_size} bytes")
+
+        session_id = uuid.uuid4().hex
+        session_folder_path = join(upload_root_folder, session_id)
+        makedirs_safe(session_folder_path, exist_ok=True)
+
+        # allocate the file so that parts can be written at their offset in any order
+        with open(join(session_folder_path, cls.UPLOADED_FILE_NAME), "wb") as uploaded_file:
+            uploaded_file.truncate(file_size)
+
+        cls.__write_session_file({
+            "session_id": session_id,
+            "file_name": file_name,
+            "file_size": file_size,
+            "status": cls.IN_PROGRESS,
+            "progress": 0,
+            "error": None,
+            "parts": {},
+            "metadata": metadata if metadata is not None else {},
+            "last_update": time.time(),
+        }, join(session_folder_path, cls.SESSION_FILE_NAME))
+
+        return cls(upload_root_folder, session_id)
+
+    @classmethod
+    def remove_expired_sessions(cls, upload_root_folder, expiry_delay=UPLOAD_SESSION_EXPIRY_DELAY) -> list:
+        """
+        Remove the sessions not updated for the expiry delay with their uploaded file: abandoned uploads
+        and finished ones kept to report their status
+
+        :param upload_root_folder: folder where upload sessions are stored
+        :type upload_root_folder: str
+        :param expiry_delay: delay in seconds without update after which a session is removed
+        :type expiry_delay: float
+        :return: identifiers of the removed sessions
+        """
+        removed_sessions = []
+        if not isdir(upload_root_folder):
+            return removed_sessions
+        expiry_time = time.time() - expiry_delay
+        for session_id in os.listdir(upload_root_folder):
+            session_folder_path = join(upload_root_folder, session_id)
+            if not isdir(session_folder_path):
+                continue
+            try:
+                session = read_object_in_json_file(join(session_folder_path, cls.SESSION_FILE_NAME))
+                # a session folder without session file comes from an interrupted creation
+                last_update = session.get("last_update", 0) if session is not None \
+                    else os.stat(session_folder_path).st_mtime
+            except (OSError, ValueError):
+                continue
+            if last_update < expiry_time:
+                shutil.rmtree(session_folder_path, ignore_errors=True)
+                removed_sessions.append(session_id)
+        return removed_sessions
+
+    @property
+    def session_id(self):
+        return self.__session_id
+
+    @property
+    def uploaded_file_path(self):
+        return self.__uploaded_file_path
+
+    @property
+    def metadata(self) -> dict:
+        return self.__session["metadata"]
+
+    @property
+    def status(self):
+        return self.__session["status"]
+
+    @staticmethod
+    def __write_session_file(session, session_file_path):
+        """
+        Write the session file through a temporary file so that a reader never sees a partial file
+        """
+        temporary_session_file_path = f"{session_file_path}.{uuid.uuid4().hex}.tmp"
+        write_object_in_json_file(session, temporary_session_file_path)
+        os.replace(temporary_session_file_path, session_file_path)
+
+    def __reload(self):
+        """
+        Reload the session, it may have been updated by concurrent requests
+        """
+        self.__session = read_object_in_json_file(self.__session_file_path)
+        if self.__session is None:
+            raise ChunkedUploadError(f"Upload session {self.__session_id} does not exist")
+
+    def __save(self):
+        self.__session["last_update"] = time.time()
+        self.__write_session_file(self.__session, self.__session_file_path)
+
+    def write_part(self, part_index, offset, checksum, stream):
+        """
+        Write a part read from a stream at its offset in the uploaded file, the part is registered only
+        if its sha256 checksum matches, a part can be sent again (resume after a failure)
+
+        :param part_index: index of the part
+        :type part_index: int
+        :param offset: offset of the part in the uploaded file
+        :type offset: int
+        :param checksum: sha256 hexadecimal digest of the part
+        :type checksum: str
+        :param stream: stream to read the part from
+        :type stream: file-like object
+        """
+        # parts of the same session are written concurrently, the finalization waits for them
+        with file_lock(self.__parts_lock_file_path, shared=True):
+            self.__reload()
+            if self.status != self.IN_PROGRESS:
+                raise ChunkedUploadError(f"Upload session {self.__session_id} does not accept parts anymore")
+            if offset < 0 or offset >= self.__session["file_size"]:
+                raise ChunkedUploadError(f"Part {part_index} offset {offset} is outside of the uploaded file")
+
+            part_hash = hashlib.sha256()
+            part_size = 0
+            with open(self.__uploaded_file_path, "r+b") as uploaded_file:
+                uploaded_file.seek(offset)
+                while block := stream.read(UPLOAD_BLOCK_SIZE):
+                    if offset + part_size + len(block) > self.__session["file_size"]:
+                        raise ChunkedUploadError(f"Part {part_index} exceeds the uploaded file size")
+                    uploaded_file.write(block)
+                    part_hash.update(block)
+                    part_size += len(block)
+
+            with file_lock(self.__session_lock_file_path):
+                self.__reload()
+                if part_hash.hexdigest() != checksum:
+                    # the bytes of a previously valid part may have been overwritten
+                    self.__session["parts"].pop(str(part_index), None)
+                    self.__save()
+                    raise ChunkedUploadError(
+                        f"Part {part_index} checksum does not match, the part must be sent again")
+
+                self.__session["parts"][str(part_index)] = {"offset": offset, "size": part_size,
+                                                            "checksum": checksum}
+                self.__save()
+
+    def get_received_size(self) -> int:
+        """
+        Return the number of bytes received in valid parts
+        """
+        return sum(part["size"] for part in self.__session["parts"].values())
+
+    def is_complete(self) -> bool:
+        """
+        Check that the valid parts cover the whole file without overlap
+        """
+        expected_offset = 0
+        for part in sorted(self.__session["parts"].values(), key=lambda part: part["offset"]):
+            if part["offset"] != expected_offset:
+                return False
+            expected_offset += part["size"]
+        return expected_offset == self.__session["file_size"]
+
+    def finalize(self):
+        """
+        Close the session to new parts once it is complete, only one of concurrent finalizations succeeds.
+        Parts being written are waited for, parts received afterwards are rejected without being written.
+        """
+        with file_lock(self.__parts_lock_file_path), file_lock(self.__session_lock_file_path):
+            self.__reload()
+            if self.status != self.IN_PROGRESS:
+                raise ChunkedUploadError(f"Upload session {self.__session_id} is already finalized")
+            if not self.is_complete():
+                raise ChunkedUploadError(f"Upload session {self.__session_id} is not complete, some parts are missing")
+            self.__session["status"] = self.FINALIZED
+            self.__session["progress"] = 0
+            self.__session["error"] = None
+            self.__save()
+
+    def set_status(self, status, progress=None, error=None):
+        """
+        Update the session status, with the progress (percentage) of the processing after the upload
+        """
+        with file_lock(self.__session_lock_file_path):
+            self.__reload()
+            self.__session["status"] = status
+            if progress is not None:
+                self.__session["progress"] = progress
+            self.__session["error"] = error
+            self.__save()
+
+    def delete_uploaded_file(self):
+        """
+        Remove the uploaded file once processed, the session file is kept to report the status
+        """
+        if exists(self.__uploaded_file_path):
+            os.remove(self.__uploaded_file_path)
+
+    def serialize(self):
+        """
+        json serializer for dto purpose
+        """
+        return {
+            "session_id": self.__session_id,
+            "file_name": self.__session["file_name"],
+            "file_size": self.__session["file_size"],
+            "received_size": self.get_received_size(),
+            "parts": self.__session["parts"],
+            "status": self.__session["status"],
+            "progress": self.__session["progress"],
+            "error": self.__session["error"],
+        }
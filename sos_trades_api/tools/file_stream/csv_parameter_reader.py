@@ -0,0 +1,100 @@
+'''
+Copyright 2025 Capgemini
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import re
+
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_numeric_dtype
+from sostrades_core.tools.tree.deserialization import isevaluatable
+
+"""
+Read parameters values uploaded as csv files
+"""
+
+# dataframe descriptor types whose column can be converted as a whole to a numeric column
+NUMERIC_DESCRIPTOR_TYPES = ("float", "int")
+
+# a python literal (number, string, container, True/False/None, set()) can only start with one of those patterns,
+# any other cell is a plain string that ast.literal_eval would reject
+LITERAL_START_PATTERN = re.compile(r"\s*(?:[-+.\d(\[{'\"]|True|False|None|set\(|[rRuUbB]{1,2}['\"])")
+
+
+def evaluate_literal_cell(cell):
+    """
+    Convert a csv cell into its python value if it looks like a python literal (list, tuple, etc...)
+    otherwise return the cell unchanged
+
+    :param cell: cell value read from the csv file
+    :type cell: any
+    """
+    if isinstance(cell, str) and LITERAL_START_PATTERN.match(cell) is None:
+        return cell
+    return isevaluatable(cell)
+
+
+def convert_csv_column(column, column_type=None):
+    """
+    Convert a column read from a csv file into python values
+
+    Numerical and boolean columns already typed by the csv parser are kept as is,
+    numerical columns of the dataframe descriptor are converted in one vectorised pass
+    (blank cells being kept as empty strings) and only object cells that look like python
+    literals are evaluated
+
+    :param column: column read from the csv file
+    :type column: pandas.Series
+    :param column_type: type of the column in the parameter dataframe descriptor if any
+    :type column_type: str
+    """
+    if is_numeric_dtype(column.dtype) or is_bool_dtype(column.dtype):
+        return column
+
+    if column_type in NUMERIC_DESCRIPTOR_TYPES:
+        filled_cells = column != ""
+        try:
+            numeric_values = pd.to_numeric(column[filled_cells])
+        except (ValueError, TypeError):
+            # column contains literals (None, lists...), evaluate them cell by cell
+            pass
+        else:
+            if filled_cells.all():
+                return numeric_values
+            converted_column = column.copy()
+            converted_column[filled_cells] = numeric_values.astype(object)
+            return converted_column
+
+    return column.map(evaluate_literal_cell)
+
+
+def read_csv_parameter(file_stream, dataframe_descriptor=None) -> pd.DataFrame:
+    """
+    Create a dataframe from an uploaded csv file stream, converting string cells to python types if possible
+
+    :param file_stream: csv file stream to read
+    :type file_stream: file-like object
+    :param dataframe_descriptor: dataframe descriptor of the targeted parameter if any (column name: (type, ...))
+    :type dataframe_descriptor: dict
+    """
+    value = pd.read_csv(file_stream, na_filter=False)
+
+    if dataframe_descriptor is None:
+        dataframe_descriptor = {}
+
+    for column_name in value.columns:
+        column_descriptor = dataframe_descriptor.get(column_name)
+        column_type = column_descriptor[0] if column_descriptor else None
+        value[column_name] = convert_csv_column(value[column_name], column_type)
+
+    return value
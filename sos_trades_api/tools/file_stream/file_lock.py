@@ -0,0 +1,86 @@
+'''
+Copyright 2026 Capgemini
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    # windows, only exclusive locks are available
+    fcntl = None
+    import msvcrt
+
+"""
+Inter-process lock on a lock file, shared by the server processes (and pods) working on the same study folder
+"""
+
+# delay between two attempts to take a lock, time.sleep yields to the other green threads when eventlet is used
+LOCK_RETRY_DELAY = 0.01
+# maximum time waited for a lock before raising a TimeoutError
+LOCK_TIMEOUT = 60
+
+
+def __try_lock(lock_file, shared) -> bool:
+    """
+    Try to take the lock without blocking, return True if it has been taken
+    """
+    try:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), (fcntl.LOCK_SH if shared else fcntl.LOCK_EX) | fcntl.LOCK_NB)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+        return True
+    except (BlockingIOError, PermissionError):
+        return False
+    except OSError as error:
+        # msvcrt raises a generic OSError when the region is already locked
+        if fcntl is None:
+            return False
+        raise error
+
+
+def __unlock(lock_file):
+    if fcntl is not None:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+    else:
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def file_lock(lock_file_path, shared=False, timeout=LOCK_TIMEOUT):
+    """
+    Hold an inter-process lock on the given lock file for the duration of the context.
+    The lock is polled instead of blocking so that other green threads of the process keep running while waiting.
+
+    :param lock_file_path: path of the lock file, created if it does not exist
+    :type lock_file_path: str
+    :param shared: take a shared (read) lock instead of an exclusive one, exclusive on windows
+    :type shared: bool
+    :param timeout: maximum time to wait for the lock in seconds
+    :type timeout: float
+    """
+    with open(lock_file_path, "a+b") as lock_file:
+        start_time = time.monotonic()
+        while not __try_lock(lock_file, shared):
+            if time.monotonic() - start_time > timeout:
+                raise TimeoutError(f"Lock {lock_file_path} not acquired after {timeout} seconds")
+            time.sleep(LOCK_RETRY_DELAY)
+        try:
+            yield
+        finally:
+            __unlock(lock_file)
@@ -15,6 +15,10 @@ limitations under the License.
 '''
 import hashlib
 import os
+import shutil
+
+# linux ioctl request cloning a file (reflink) on file systems supporting copy-on-write (btrfs, xfs...)
+FICLONE = 0x40049409
 
 
 def generate_large_file(file_path):
@@ -67,3 +71,24 @@ def verify_files_after_copy(original_path, copy_path, algorithm='sha256'):
     
     # Compare hashes
     return original_hash == copy_hash
+
+
+def copy_file_copy_on_write(source_path, destination_path):
+    """
+    Copy a file sharing its data blocks with the source file (reflink) when the file system supports it,
+    the data blocks are duplicated only when one of the files is modified.
+    A plain copy is done otherwise.
+
+    Args:
+        source_path (str): Path of the file to copy
+        destination_path (str): Path of the copy
+    """
+    try:
+        import fcntl
+        with open(source_path, 'rb') as source_file, open(destination_path, 'wb') as destination_file:
+            fcntl.ioctl(destination_file.fileno(), FICLONE, source_file.fileno())
+        return
+    except (ImportError, OSError):
+        # reflink not supported (other os or file system)
+        pass
+    shutil.copyfile(source_path, destination_path)
@@ -13,35 +13,269 @@ See the License for the specific language governing permissions and
 limitations under the License.
 
 '''
+import base64
 import gzip
 import io
+import itertools
 import json
 import os
 import zipfile
+import zlib
 from os.path import dirname, isdir, relpath
 from typing import Any
 
-from flask import Response
+from flask import Response, current_app, request, stream_with_context
 
-from sos_trades_api.models.custom_json_encoder import CustomJsonEncoder
-from sos_trades_api.server.base_server import app
-from sos_trades_api.tools.code_tools import time_function
+from sos_trades_api.models.custom_json_encoder import (
+    CustomJsonEncoder,
+    get_json_handler,
+)
+
+# Optional compression backends, used when the client accepts them
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+# size of the blocks read from the files written in a streamed zip archive
+ZIP_STREAM_CHUNK_SIZE = 1024 * 1024
+
+# size of the json text compressed at once in a streamed json response
+JSON_STREAM_CHUNK_SIZE = 256 * 1024
+# depth of the json structure split into fragments, deeper values are serialised at once
+JSON_STREAM_FRAGMENT_DEPTH = 3
+# json payloads larger than this size are compressed with the fastest level
+JSON_STREAM_LARGE_PAYLOAD_SIZE = 1024 * 1024
+
+GZIP_ENCODING = "gzip"
+BROTLI_ENCODING = "br"
+ZSTD_ENCODING = "zstd"
+IDENTITY_ENCODING = "identity"
+
+# compression levels (small payload, large payload) of each encoding
+COMPRESSION_LEVELS = {
+    GZIP_ENCODING: (6, 1),
+    BROTLI_ENCODING: (5, 1),
+    ZSTD_ENCODING: (6, 1),
+}
+
+
+def get_available_content_encodings() -> list[str]:
+    """
+    Return the content encodings supported by the server, in preference order
+    """
+    content_encodings = []
+    if ZSTD_AVAILABLE:
+        content_encodings.append(ZSTD_ENCODING)
+    if BROTLI_AVAILABLE:
+        content_encodings.append(BROTLI_ENCODING)
+    content_encodings.append(GZIP_ENCODING)
+    return content_encodings
+
+
+def select_content_encoding(accept_encoding) -> str:
+    """
+    Return the content encoding to use for a request Accept-Encoding header: the encoding with the highest
+    quality value, server preference order for equal quality values, identity if none is accepted
+
+    :param accept_encoding: value of the Accept-Encoding header
+    :type accept_encoding: str
+    """
+    qualities = {}
+    for accepted_encoding in (accept_encoding or "").split(","):
+        encoding_parameters = accepted_encoding.strip().split(";")
+        encoding = encoding_parameters[0].strip().lower()
+        quality = 1.0
+        for parameter in encoding_parameters[1:]:
+            parameter_name, _, parameter_value = parameter.strip().partition("=")
+            if parameter_name.strip() == "q":
+                try:
+                    quality = float(parameter_value)
+                except ValueError:
+                    quality = 0.0
+        if encoding:
+            qualities[encoding] = quality
+
+    best_encoding = IDENTITY_ENCODING
+    best_quality = 0.0
+    for encoding in get_available_content_encodings():
+        quality = qualities.get(encoding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best_encoding = encoding
+            best_quality = quality
+    return best_encoding
+
+
+class StreamCompressor:
+    """
+    Incremental compressor of a response body for a content encoding
+    """
+
+    def __init__(self, content_encoding, large_payload):
+        """
+        Constructor
+
+        :param content_encoding: content encoding of the response (gzip, br, zstd or identity)
+        :type content_encoding: str
+        :param large_payload: use the fastest compression level
+        :type large_payload: bool
+        """
+        self.content_encoding = content_encoding
+        if content_encoding == IDENTITY_ENCODING:
+            self.__compressor = None
+            return
+
+        level = COMPRESSION_LEVELS[content_encoding][1 if large_payload else 0]
+        if content_encoding == GZIP_ENCODING:
+            # wbits 31 writes the gzip header and trailer
+            self.__compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+        elif content_encoding == BROTLI_ENCODING:
+            self.__compressor = brotli.Compressor(quality=level)
+        elif content_encoding == ZSTD_ENCODING:
+            self.__compressor = zstandard.ZstdCompressor(level=level).compressobj()
+        else:
+            raise ValueError(f"Unsupported content encoding {content_encoding}")
+
+    def compress(self, data: bytes) -> bytes:
+        if self.__compressor is None:
+            return data
+        if self.content_encoding == BROTLI_ENCODING:
+            return self.__compressor.process(data)
+        return self.__compressor.compress(data)
+
+    def flush(self) -> bytes:
+        if self.__compressor is None:
+            return b""
+        if self.content_encoding == BROTLI_ENCODING:
+            return self.__compressor.finish()
+        return self.__compressor.flush()
+
+
+def encode_json_key(key) -> str:
+    """
+    Return the json text of an object key, converted as the json encoder does
+    """
+    if isinstance(key, str):
+        return json.dumps(key)
+    elif key is True:
+        return '"true"'
+    elif key is False:
+        return '"false"'
+    elif key is None:
+        return '"null"'
+    elif isinstance(key, (int, float)):
+        return json.dumps(json.dumps(key))
+    raise TypeError(f"keys must be str, int, float, bool or None, not {type(key).__name__}")
+
+
+def generate_json_fragments(obj, depth=JSON_STREAM_FRAGMENT_DEPTH):
+    """
+    generator that yields the json text of an object in fragments, the concatenation of the fragments is
+    equal to the json serialisation of the object. The first levels of the structure are walked, deeper
+    values are serialised at once with the custom json encoder.
+
+    Args:
+        obj: object to serialise
+        depth (int): number of levels of the structure to walk
+    """
+    if depth > 0 and not isinstance(obj, (dict, list, tuple, str, int, float)) and obj is not None:
+        # custom objects (loaded study case for example) are converted before walking them
+        handler = get_json_handler(type(obj))
+        if handler is not None:
+            obj = handler(obj)
+
+    if depth > 0 and isinstance(obj, dict):
+        yield "{"
+        for index, (key, value) in enumerate(obj.items()):
+            yield f'{", " if index > 0 else ""}{encode_json_key(key)}: '
+            yield from generate_json_fragments(value, depth - 1)
+        yield "}"
+    elif depth > 0 and isinstance(obj, (list, tuple)):
+        yield "["
+        for index, value in enumerate(obj):
+            if index > 0:
+                yield ", "
+            yield from generate_json_fragments(value, depth - 1)
+        yield "]"
+    else:
+        yield json.dumps(obj, cls=CustomJsonEncoder)
+
+
+def generate_compressed_json_stream(obj, content_encoding=GZIP_ENCODING, chunk_size=JSON_STREAM_CHUNK_SIZE):
+    """
+    generator that serialises an object in json and yields the compressed bytes while the json is written,
+    only one chunk of json text is kept in memory at a time (with the value being serialised).
+    The beginning of the json is buffered to choose the compression level from the payload size.
+
+    Args:
+        obj: object to serialise
+        content_encoding (str): content encoding of the stream (gzip, br, zstd or identity)
+        chunk_size (int): size of the json text compressed at once
+    """
+    json_fragments = generate_json_fragments(obj)
+
+    first_fragments = []
+    first_fragments_size = 0
+    for json_fragment in json_fragments:
+        first_fragments.append(json_fragment)
+        first_fragments_size += len(json_fragment)
+        if first_fragments_size > JSON_STREAM_LARGE_PAYLOAD_SIZE:
+            break
+
+    compressor = StreamCompressor(content_encoding, first_fragments_size > JSON_STREAM_LARGE_PAYLOAD_SIZE)
+
+    pending_fragments = []
+    pending_size = 0
+    for json_fragment in itertools.chain(first_fragments, json_fragments):
+        pending_fragments.append(json_fragment)
+        pending_size += len(json_fragment)
+        if pending_size >= chunk_size:
+            compressed_chunk = compressor.compress("".join(pending_fragments).encode("utf-8"))
+            pending_fragments = []
+            pending_size = 0
+            # an empty chunk would end a chunked http response
+            if len(compressed_chunk) > 0:
+                yield compressed_chunk
+
+    compressed_chunk = compressor.compress("".join(pending_fragments).encode("utf-8")) + compressor.flush()
+    if len(compressed_chunk) > 0:
+        yield compressed_chunk
 
 
-@time_function(app.logger)
 def make_gzipped_response(obj:Any):
     """
-    Generates a gzipped json response from an object
+    Generates a compressed json response from an object, streamed while it is serialised.
+    The encoding is chosen from the request Accept-Encoding header (zstd, brotli or gzip).
+    The beginning of the json (the whole json for a small payload) is serialised before the response is
+    returned so that a serialisation error gives an error response instead of a truncated one.
     """
-    json_data = json.dumps(obj, cls=CustomJsonEncoder)
-    gzip_buffer = io.BytesIO()
-    
-    with gzip.GzipFile(mode='w', fileobj=gzip_buffer) as gz:
-        gz.write(json_data.encode('utf-8'))
-    
-    response = Response(gzip_buffer.getvalue(), content_type='application/json')
-    response.headers['Content-Encoding'] = 'gzip'
-    response.headers['Content-Length'] = len(gzip_buffer.getvalue())
+    content_encoding = select_content_encoding(request.headers.get("Accept-Encoding"))
+    compressed_stream = generate_compressed_json_stream(obj, content_encoding)
+    first_chunks = list(itertools.islice(compressed_stream, 1))
+
+    def generate_response_stream():
+        try:
+            yield from first_chunks
+            yield from compressed_stream
+        except Exception as error:
+            # headers are already sent, the error is raised again to abort the transfer
+            # so that the client does not receive a truncated json as a complete response
+            current_app.logger.exception(f"Json response serialisation failed after its headers were sent: {error}")
+            raise
+
+    response = Response(stream_with_context(generate_response_stream()), content_type='application/json')
+    if content_encoding != IDENTITY_ENCODING:
+        response.headers['Content-Encoding'] = content_encoding
+    response.headers['Vary'] = 'Accept-Encoding'
     return response
 
 def send_zip_file_content(zip_content: bytes, filename: str = None):
@@ -87,41 +321,58 @@ def send_zip_file_content(zip_content: bytes, filename: str = None):
         if 'gzip_buffer' in locals():
             gzip_buffer.close()
 
-def zip_files_and_folders(zip_file_path, files_or_folders_path_to_zip, metadata = None):
+def get_zip_entries(files_or_folders_path_to_zip):
     """
-        function that zip all files and folders in the list into one archive
-        
+        function that list the files to write in an archive with their name in the archive,
+        folders are walked recursively to reproduce their organization into the archive
+
         Args:
-            zip_file_path (str): path to the zip file to be written
             files_or_folders_path_to_zip (list[str]): list of files or folders path to write in the archive
-            metadata (str or bytes): metadata content to add in a metadata.json file
+
+        Returns:
+            list of tuple (file path, name in the archive)
     """
-    
-    def zip_folder(zip_file, folder_path, root_path):
+
+    def get_folder_entries(folder_path, root_path):
         """
-        function that zip all files in a folder and its sub folders
-        
+        function that list all files in a folder and its sub folders
+
         Args:
-            zip_file (zipfile.ZipFile): zip file to be written
             folder_path (str): path of the folder to zip
             root_path (str): path of the root folder to zip to reproduce the folder organization into the zip file
         """
+        folder_entries = []
         for element in os.scandir(folder_path):
             if isdir(element):
-                zip_folder(zip_file, element.path, root_path)
+                folder_entries.extend(get_folder_entries(element.path, root_path))
             else:
-                zip_file.write(element.path, 
-                    relpath(element.path, root_path))
-
-    # create zip file
-    zip_file = zipfile.ZipFile(zip_file_path, 'w', zipfile.ZIP_DEFLATED, allowZip64=True, compresslevel=1)
+                folder_entries.append((element.path, relpath(element.path, root_path)))
+        return folder_entries
 
+    zip_entries = []
     # iterate throught each element of the list
     for file_or_folder_path in files_or_folders_path_to_zip:
         if isdir(file_or_folder_path):
-            zip_folder(zip_file, file_or_folder_path, dirname(file_or_folder_path))
+            zip_entries.extend(get_folder_entries(file_or_folder_path, dirname(file_or_folder_path)))
         else:
-            zip_file.write(file_or_folder_path, os.path.basename(file_or_folder_path))
+            zip_entries.append((file_or_folder_path, os.path.basename(file_or_folder_path)))
+    return zip_entries
+
+
+def zip_files_and_folders(zip_file_path, files_or_folders_path_to_zip, metadata = None):
+    """
+        function that zip all files and folders in the list into one archive
+        
+        Args:
+            zip_file_path (str): path to the zip file to be written
+            files_or_folders_path_to_zip (list[str]): list of files or folders path to write in the archive
+            metadata (str or bytes): metadata content to add in a metadata.json file
+    """
+    # create zip file
+    zip_file = zipfile.ZipFile(zip_file_path, 'w', zipfile.ZIP_DEFLATED, allowZip64=True, compresslevel=1)
+
+    for file_path, archive_name in get_zip_entries(files_or_folders_path_to_zip):
+        zip_file.write(file_path, archive_name)
 
     # add metadata file
     if metadata is not None:
@@ -130,3 +381,95 @@ def zip_files_and_folders(zip_file_path, files_or_folders_path_to_zip, metadata
     # close the zip file
     zip_file.close()
 
+
+class ZipStreamBuffer(io.RawIOBase):
+    """
+    Write only and not seekable stream used as zip file output, written bytes are kept until they are read back
+    with pop_chunk so the archive can be sent while being written
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.__chunks = []
+        self.__position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.__chunks.append(bytes(data))
+        self.__position += len(data)
+        return len(data)
+
+    def tell(self):
+        # needed by zipfile to compute entries offsets, seek is not supported so entries sizes
+        # and crc are written after each entry data
+        return self.__position
+
+    def pop_chunk(self) -> bytes:
+        """
+        Return the bytes written since the last call
+        """
+        chunk = b"".join(self.__chunks)
+        self.__chunks = []
+        return chunk
+
+
+def generate_zip_stream(files_or_folders_path_to_zip, metadata=None, chunk_size=ZIP_STREAM_CHUNK_SIZE):
+    """
+        generator that zip all files and folders in the list into one archive and yield the archive bytes
+        while it is written, only one chunk of a file is in memory at a time
+
+        Args:
+            files_or_folders_path_to_zip (list[str]): list of files or folders path to write in the archive
+            metadata (str or bytes): metadata content to add in a metadata.json file
+            chunk_size (int): size of the blocks read from the files to zip
+    """
+    zip_stream_buffer = ZipStreamBuffer()
+
+    def write_zip():
+        with zipfile.ZipFile(zip_stream_buffer, 'w', zipfile.ZIP_DEFLATED, allowZip64=True, compresslevel=1) as zip_file:
+            for file_path, archive_name in get_zip_entries(files_or_folders_path_to_zip):
+                # file size is set in the zip info so that zip64 extension is used for large files
+                zip_info = zipfile.ZipInfo.from_file(file_path, archive_name)
+                zip_info.compress_type = zipfile.ZIP_DEFLATED
+                # the archive compression level is only applied by zipfile to the entries it creates itself
+                zip_info._compresslevel = zip_file.compresslevel
+                with open(file_path, 'rb') as source_file, zip_file.open(zip_info, 'w') as zip_entry:
+                    while chunk := source_file.read(chunk_size):
+                        zip_entry.write(chunk)
+                        yield
+                yield
+
+            # add metadata file
+            if metadata is not None:
+                zip_file.writestr("metadata.json", metadata)
+        # central directory is written when the zip file is closed
+        yield
+
+    for _ in write_zip():
+        zip_chunk = zip_stream_buffer.pop_chunk()
+        # an empty chunk would end a chunked http response
+        if len(zip_chunk) > 0:
+            yield zip_chunk
+
+
+def generate_base64_stream(bytes_chunks):
+    """
+        generator that base64 encode a stream of bytes chunk by chunk, the concatenation of the yielded strings
+        is equal to the base64 encoding of the whole stream
+
+        Args:
+            bytes_chunks (iterable[bytes]): bytes chunks to encode
+    """
+    remaining_bytes = b""
+    for chunk in bytes_chunks:
+        chunk = remaining_bytes + chunk
+        # encode a multiple of 3 bytes to avoid padding in the middle of the stream
+        encoded_length = len(chunk) - len(chunk) % 3
+        remaining_bytes = chunk[encoded_length:]
+        if encoded_length > 0:
+            yield base64.b64encode(chunk[:encoded_length]).decode("ascii")
+
+    if len(remaining_bytes) > 0:
+        yield base64.b64encode(remaining_bytes).decode("ascii")
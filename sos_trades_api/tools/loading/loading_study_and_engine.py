@@ -38,7 +38,7 @@ from sos_trades_api.models.database_models import (
     StudyCaseExecution,
 )
 from sos_trades_api.server.base_server import db
-from sos_trades_api.tools.coedition.coedition import add_change_db
+from sos_trades_api.tools.coedition.coedition import StudyCaseChangesBatch
 from sos_trades_api.tools.data_graph_validation.data_graph_validation import (
     clean_obsolete_data_validation_entries,
 )
@@ -142,6 +142,7 @@ def study_case_manager_loading(study_case_manager, no_data, read_only, profile_l
         gc.collect()
         app.logger.info(
             f"End background loading {study_case_manager.study.name}")
+        study_case_manager.update_memory_footprint("load")
         app.logger.info("Elapsed time synthesis:")
         app.logger.info(
             f'{"Data load":<25} {load_study_case_time - start_time:<5} seconds')
@@ -200,6 +201,9 @@ def study_case_manager_update(study_case_manager, values, no_data, read_only):
         study_case_manager.load_data(
             from_input_dict=values, display_treeview=False)
 
+        # data changed, memoised post-processings are outdated
+        study_case_manager.post_processings = None
+
         # Persist data using the current persistence strategy
         study_case_manager.save_study_case()
 
@@ -229,8 +233,6 @@ def study_case_manager_update(study_case_manager, values, no_data, read_only):
 
         clean_obsolete_data_validation_entries(study_case_manager)
 
-        study_case_manager.n2_diagram = {}
-
         # write loadedstudy into a json file to load the study in read only
         # when loading
         study_case_manager.save_study_read_only_mode_in_file()
@@ -240,6 +242,7 @@ def study_case_manager_update(study_case_manager, values, no_data, read_only):
 
         app.logger.info(
             f"End background updating {study_case_manager.study.name}")
+        study_case_manager.update_memory_footprint("update")
     except Exception:
         study_case_manager.load_status = LoadStatus.IN_ERROR
         exc_type, exc_value, exc_traceback = sys.exc_info()
@@ -299,6 +302,9 @@ def study_case_manager_update_from_dataset_mapping(study_case_manager, datasets_
             if study_case_manager.dataset_load_status != LoadStatus.IN_ERROR:
                 study_case_manager.dataset_load_status = LoadStatus.LOADED
                 if datasets_parameter_changes is not None and len(datasets_parameter_changes) > 0:
+                    # data changed, memoised post-processings are outdated
+                    study_case_manager.post_processings = None
+
                     # Persist data using the current persistence strategy
                     study_case_manager.save_study_case()
 
@@ -306,6 +312,7 @@ def study_case_manager_update_from_dataset_mapping(study_case_manager, datasets_
                     modify_date = datetime.now().astimezone(timezone.utc).replace(tzinfo=None)
 
                     # Add change to database
+                    changes_batch = StudyCaseChangesBatch(notification_id)
                     for param_chg in datasets_parameter_changes:
 
 
@@ -332,8 +339,7 @@ def study_case_manager_update_from_dataset_mapping(study_case_manager, datasets_
                                 raise Exception(f'Error to set new value" : {error}')
 
                         # Add change into database
-                        add_change_db(
-                            notification_id,
+                        changes_batch.add_change(
                             param_chg.parameter_id,
                             param_chg.variable_type,
                             None,
@@ -349,6 +355,8 @@ def study_case_manager_update_from_dataset_mapping(study_case_manager, datasets_
                             param_chg.variable_key
                         )
 
+                    changes_batch.commit()
+
                     study_case = StudyCase.query.filter(StudyCase.id.like(study_case_manager.study.id)).first()
                     # Update modification date on database
                     study_case.modification_date = modify_date
@@ -369,14 +377,13 @@ def study_case_manager_update_from_dataset_mapping(study_case_manager, datasets_
 
             clean_obsolete_data_validation_entries(study_case_manager)
 
-            study_case_manager.n2_diagram = {}
-
 
             # set the loadStatus to loaded to end the loading of a study
             study_case_manager.load_status = LoadStatus.LOADED
 
             app.logger.info(
                 f"End background updating (from datasets mapping) {study_case_manager.study.name}")
+            study_case_manager.update_memory_footprint("datasets update")
 
     except Exception as ex:
         study_case_manager.load_status = LoadStatus.IN_ERROR
@@ -416,6 +423,7 @@ def study_case_manager_export_from_dataset_mapping(study_case_manager, datasets_
             from_datasets_mapping=datasets_mapping_deserialized)
         # Add change to database
         with app.app_context():
+            changes_batch = StudyCaseChangesBatch(notification_id)
             for param_chg in datasets_parameter_changes:
                 # Check if new value is a dataframe or dict
                 if isinstance(param_chg.old_value, (pandas.DataFrame, dict, ndarray)):
@@ -435,8 +443,7 @@ def study_case_manager_export_from_dataset_mapping(study_case_manager, datasets_
                     old_value_bytes = None
 
                 # Add change into database
-                add_change_db(
-                    notification_id,
+                changes_batch.add_change(
                     param_chg.parameter_id,
                     param_chg.variable_type,
                     None,
@@ -451,7 +458,9 @@ def study_case_manager_export_from_dataset_mapping(study_case_manager, datasets_
                     param_chg.dataset_data_path,
                     param_chg.variable_key
                 )
-                
+
+            changes_batch.commit()
+
             study_case_manager.dataset_export_status_dict[notification_id] = LoadStatus.LOADED
     except DatasetGenericException as ex:
         study_case_manager.dataset_export_error_dict[notification_id] = f"{ex}"
@@ -538,6 +547,7 @@ def study_case_manager_loading_from_reference(study_case_manager, no_data, read_
 
         app.logger.info(
             f"End background reference loading {study_name}")
+        study_case_manager.update_memory_footprint("reference load")
     except Exception:
         with app.app_context():
             study_case = StudyCase.query.filter(
@@ -627,6 +637,7 @@ def study_case_manager_loading_from_usecase_data(study_case_manager, no_data, re
 
         app.logger.info(
             f"End of loading usecase data in background {study_case_manager.study.name}")
+        study_case_manager.update_memory_footprint("usecase load")
     except Exception:
         with app.app_context():
             study_case = StudyCase.query.filter(
@@ -705,6 +716,7 @@ def study_case_manager_loading_from_study(study_case_manager, no_data, read_only
 
         app.logger.info(
             f"End of loading from study in background {study_case_manager.study.name}")
+        study_case_manager.update_memory_footprint("study copy load")
     except Exception:
 
         study_case_manager.load_status = LoadStatus.IN_ERROR
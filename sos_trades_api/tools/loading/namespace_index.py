@@ -0,0 +1,46 @@
+'''
+Copyright 2026 Capgemini
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+from bisect import bisect_left
+
+
+class NamespaceIndex():
+    """
+    Sorted array of parameters keys, the keys under a namespace are found by binary search
+    instead of checking the prefix of every key
+    """
+
+    def __init__(self, keys):
+        self.__keys = sorted(keys)
+
+    def __len__(self):
+        return len(self.__keys)
+
+    def get_keys_with_prefix(self, prefix) -> list:
+        """
+        Return the keys starting with the given prefix, in sorted order
+        """
+        if not prefix:
+            return list(self.__keys)
+        start = bisect_left(self.__keys, prefix)
+        # first string greater than all the strings starting with the prefix
+        end = bisect_left(self.__keys, prefix[:-1] + chr(ord(prefix[-1]) + 1), start)
+        return self.__keys[start:end]
+
+    def get_namespace_keys(self, namespace) -> list:
+        """
+        Return the keys of the parameters under the given namespace (disciplines or sub-namespaces)
+        """
+        return self.get_keys_with_prefix(f"{namespace}.")
@@ -14,12 +14,15 @@ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 See the License for the specific language governing permissions and
 limitations under the License.
 '''
+import hashlib
 import json
 import logging
 import os
+from datetime import datetime
 from os.path import join
 from pathlib import Path
 from shutil import copy
+from time import time
 
 from eventlet import sleep
 from sostrades_core.execution_engine.proxy_discipline import ProxyDiscipline
@@ -49,16 +52,30 @@ from sos_trades_api.models.database_models import (
 )
 from sos_trades_api.models.loaded_study_case import LoadedStudyCase, LoadStatus
 from sos_trades_api.server.base_server import app, db
-from sos_trades_api.tools.gzip_tools import zip_files_and_folders
+from sos_trades_api.tools.chart_tools import (
+    load_post_processing,
+    load_post_processing_filters_by_discipline,
+)
+from sos_trades_api.tools.file_stream.file_stream import copy_file_copy_on_write
+from sos_trades_api.tools.gzip_tools import (
+    generate_zip_stream,
+    zip_files_and_folders,
+)
 from sos_trades_api.tools.loading.loaded_tree_node import get_treenode_ontology_data
+from sos_trades_api.tools.loading.namespace_index import NamespaceIndex
+from sos_trades_api.tools.loading.study_dashboard_store import StudyDashboardStore
+from sos_trades_api.tools.loading.study_parameters_store import StudyParametersStore
 from sos_trades_api.tools.loading.study_read_only_rw_manager import (
     StudyReadOnlyRWHelper,
 )
+from sos_trades_api.tools.loading.treeview_snapshots import TreeviewSnapshots
 from sos_trades_api.tools.logger.study_case_sqlalchemy_handler import (
     StudyCaseSQLAlchemyHandler,
 )
+from sos_trades_api.tools.memory_accounting import get_study_memory_footprint
 from sos_trades_api.tools.visualisation.couplings_force_graph import (
     get_couplings_force_graph,
+    get_n2_treenode,
 )
 from sos_trades_api.tools.visualisation.execution_workflow_graph import (
     SoSExecutionWorkflow,
@@ -211,10 +228,25 @@ class StudyCaseManager(BaseStudyManager):
         self.dataset_export_status_dict = {}
         self.dataset_export_error_dict = {}
 
+        # stamp of the study data in memory, changed each time the data are loaded or saved
+        self.__data_stamp = 0
+        # visualisation diagrams memoised for the current process structure, status and data
         self.n2_diagram = {}
+        self.__n2_diagram_key = None
+        # post-processings filters memoised for the current process structure and execution status
+        self.post_processings = None
+        self.__post_processings_key = None
         self.__error_message = ""
 
         self.__read_only_rw_strategy = StudyReadOnlyRWHelper(self.dump_directory)
+        self.__parameters_store = StudyParametersStore(self.dump_directory)
+        # treeview versions sent to the clients, by (no_data, read_only) treeview kind
+        self.__treeview_snapshots = {}
+        # namespace index of the data manager parameters keys, rebuilt when the parameters change
+        self.__namespace_index = None
+        self.__namespace_index_key = None
+        # last estimation of the memory used by the study (see update_memory_footprint)
+        self.memory_footprint = None
 
     @property
     def study(self) -> StudyCase:
@@ -400,6 +432,7 @@ class StudyCaseManager(BaseStudyManager):
         self._build_execution_engine()
         self.clear_error()
         self.load_status = LoadStatus.NONE
+        self.__data_stamp += 1
 
     
     def load_study_case_from_source(self, source_directory=None):
@@ -410,10 +443,39 @@ class StudyCaseManager(BaseStudyManager):
         self.load_data(source_directory, display_treeview=False)
         self.load_disciplines_data(source_directory)
         self.read_cache_pickle(source_directory)
+        self.__data_stamp += 1
 
     def save_study_case(self):
         # Persist data using the current persistence strategy
         self.dump_study(self.dump_directory)
+        # data in memory have been updated before being saved
+        self.__data_stamp += 1
+
+        # Write the parameters side-car store used to read one parameter without loading the study
+        dm = self.execution_engine.dm
+        self.write_parameters_store({
+            self.execution_engine.anonymize_key(full_name): dm.data_dict[variable_id][ProxyDiscipline.VALUE]
+            for full_name, variable_id in dm.data_id_map.items()
+        })
+
+    def write_parameters_store(self, parameters_values, source_signature=None):
+        """
+        Write the parameters side-car store mirroring the study data file
+        Confidential studies data are encrypted so no clear side-car store is written for them
+
+        :param parameters_values: parameters values by anonymized parameter key
+        :type parameters_values: dict
+        :param source_signature: signature of the study data file when the values have been read from it,
+            the store is not written if the file has been saved again since
+        :type source_signature: dict
+        """
+        dm_pkl_file = join(self.dump_directory, DataSerializer.pkl_filename)
+        if isinstance(self.rw_strategy, DirectLoadDump) and os.path.exists(dm_pkl_file):
+            try:
+                self.__parameters_store.write(parameters_values, dm_pkl_file, source_signature)
+            except Exception as error:
+                # the store is only an optimisation, the study data file remains the reference
+                app.logger.exception(f"Error while writing parameters store of study {self.__study_identifier}: {error}")
 
     # def update_dashboard(self):
         # load dashboard json from file if exists else nothing
@@ -445,25 +507,26 @@ class StudyCaseManager(BaseStudyManager):
             try:
                 
                 # check study status is DONE
+                if self.execution_engine.root_process.status == ProxyDiscipline.STATUS_DONE:
 
-                #-------------------
-                # save loaded study in read only mode
-                loaded_study_case = LoadedStudyCase(self, False, True, None, True)
-                # Apply ontology
-                process_metadata = load_processes_metadata(
-                    [f"{loaded_study_case.study_case.repository}.{loaded_study_case.study_case.process}"])
+                    #-------------------
+                    # save loaded study in read only mode
+                    loaded_study_case = LoadedStudyCase(self, False, True, None, True, lazy_loading=False)
+                    if loaded_study_case.load_status != LoadStatus.LOADED:
+                        # treeview, post-processings and diagrams are only built by the constructor for a
+                        # loaded study, build them here once otherwise
+                        loaded_study_case.load_treeview_and_post_proc(self, False, True, None, True)
+                        loaded_study_case.load_n2_diagrams(self)
+                    # Apply ontology
+                    process_metadata = load_processes_metadata(
+                        [f"{loaded_study_case.study_case.repository}.{loaded_study_case.study_case.process}"])
 
-                repository_metadata = load_repositories_metadata(
-                    [loaded_study_case.study_case.repository])
+                    repository_metadata = load_repositories_metadata(
+                        [loaded_study_case.study_case.repository])
+
+                    loaded_study_case.study_case.apply_ontology(
+                        process_metadata, repository_metadata)
 
-                loaded_study_case.study_case.apply_ontology(
-                    process_metadata, repository_metadata)
-                
-                if self.execution_engine.root_process.status == ProxyDiscipline.STATUS_DONE:
-                    loaded_study_case.load_treeview_and_post_proc(
-                            self, False, True, None, True)
-                    loaded_study_case.load_n2_diagrams(self)
-                    
                     # fill loaded study data needed in read only file
                     loaded_study_case.load_status = LoadStatus.READ_ONLY_MODE
                     loaded_study_case.study_case.creation_status = StudyCase.CREATION_DONE
@@ -492,11 +555,18 @@ class StudyCaseManager(BaseStudyManager):
                     self.__read_only_rw_strategy.write_study_case_in_read_only_file(loaded_study_case, False)
                     
 
-                    # save the study with no data for restricted read only access:
-                    loaded_study_case.load_treeview_and_post_proc(
-                        self, True, True, None, True)
+                    # save the study with no data for restricted read only access, post-processings are kept
+                    loaded_study_case.load_treeview(self, True, True)
                     self.__read_only_rw_strategy.write_study_case_in_read_only_file(loaded_study_case, True)
 
+                    # save post-processing filters so that the charts panel is served without loading the study
+                    try:
+                        self.__read_only_rw_strategy.write_post_processing_filters(
+                            loaded_study_case.study_case.current_execution_id,
+                            load_post_processing_filters_by_discipline(self.execution_engine))
+                    except Exception as ex:
+                        self.logger.error(f"Error while saving post-processing filters: {str(ex)}")
+
                     #------------------
                     # save execution logs in read only folder
                     self.__read_only_rw_strategy.copy_file_in_read_only_folder(self.raw_log_file_path_absolute())
@@ -751,6 +821,13 @@ class StudyCaseManager(BaseStudyManager):
         self.__read_only_rw_strategy.delete_read_only_mode()
 
 
+    def read_post_processing_filters_in_json_file(self, execution_id):
+        """
+        Retrieve the post-processing filters of each discipline saved with the read only mode,
+        None if they have not been saved for the given execution
+        """
+        return self.__read_only_rw_strategy.read_post_processing_filters(execution_id)
+
     def check_study_case_json_file_exists(self):
         """
         Check study case loaded into json file for read only mode exists
@@ -778,31 +855,194 @@ class StudyCaseManager(BaseStudyManager):
         # get the anonimized key to retrieve the data into the pickle
         anonymize_key = self.execution_engine.anonymize_key(parameter_key)
 
-        # read pickle
-        input_datas = self._get_data_from_file(self.dump_directory)
-        if len(input_datas) > 0:
-            if anonymize_key in input_datas[0].keys():
-                data_value = input_datas[0][anonymize_key]
-                # convert data into dataframe then ioBytes to have the same
-                # format as if retrieved from the dm
-                if data_value is None:
-                    return None
-                else:
-                    serializer = DataSerializer()
-                    df_data = serializer.convert_to_dataframe_and_bytes_io(
-                        data_value, parameter_key)
-                    return df_data
-
-        # it should never be there because an exception should be raised if the
-        # file could not be red
-        return None
+        data_value = None
+        dm_pkl_file = join(self.dump_directory, DataSerializer.pkl_filename)
+        if self.__parameters_store.is_up_to_date(dm_pkl_file):
+            # read only the requested parameter from the side-car store
+            data_value = self.__parameters_store.read_parameters([anonymize_key]).get(anonymize_key)
+        else:
+            # read pickle, its signature is taken first so that a store is not built from an outdated read
+            source_signature = StudyParametersStore.get_source_signature(dm_pkl_file) \
+                if os.path.exists(dm_pkl_file) else None
+            input_datas = self._get_data_from_file(self.dump_directory)
+            if len(input_datas) > 0:
+                data_value = input_datas[0].get(anonymize_key)
+                # study data file has been written without the store (execution, import...), build it
+                # for the next downloads, once if several requests arrive together
+                if source_signature is not None:
+                    self.write_parameters_store(input_datas[0], source_signature)
+
+        # convert data into dataframe then ioBytes to have the same
+        # format as if retrieved from the dm
+        if data_value is None:
+            return None
+
+        serializer = DataSerializer()
+        return serializer.convert_to_dataframe_and_bytes_io(data_value, parameter_key)
     
 
+    def get_namespace_index(self) -> NamespaceIndex:
+        """
+        Get the namespace index of the data manager parameters keys, built again when the process structure
+        changes (a reconfiguration can replace parameters without changing their number)
+        """
+        namespace_index_key = self.get_process_structure_hash()
+        if self.__namespace_index is None or namespace_index_key != self.__namespace_index_key:
+            self.__namespace_index = NamespaceIndex(self.execution_engine.dm.data_id_map.keys())
+            self.__namespace_index_key = namespace_index_key
+        return self.__namespace_index
+
+    def get_namespace_parameters_values(self, namespace) -> dict:
+        """
+        Get the values of the parameters under a namespace, from the data manager if the study is loaded,
+        else from the study data files without loading the study
+
+        :param namespace: namespace of the parameters (discipline full name for example)
+        :type namespace: str
+        :return: parameters values by parameter name relative to the namespace
+        """
+        if self.load_status == LoadStatus.LOADED:
+            dm = self.execution_engine.dm
+            values = {}
+            for parameter_key in self.get_namespace_index().get_namespace_keys(namespace):
+                variable_id = dm.data_id_map.get(parameter_key)
+                if variable_id in dm.data_dict:
+                    values[parameter_key[len(namespace) + 1:]] = dm.data_dict[variable_id][ProxyDiscipline.VALUE]
+            return values
+
+        anonymized_namespace = self.execution_engine.anonymize_key(namespace)
+        dm_pkl_file = join(self.dump_directory, DataSerializer.pkl_filename)
+        if self.__parameters_store.is_up_to_date(dm_pkl_file):
+            anonymized_values = self.__parameters_store.read_parameters(
+                self.__parameters_store.get_namespace_keys(anonymized_namespace))
+        else:
+            # read pickle, its signature is taken first so that a store is not built from an outdated read
+            source_signature = StudyParametersStore.get_source_signature(dm_pkl_file) \
+                if os.path.exists(dm_pkl_file) else None
+            input_datas = self._get_data_from_file(self.dump_directory)
+            if len(input_datas) == 0:
+                return {}
+            prefix = f"{anonymized_namespace}."
+            anonymized_values = {key: value for key, value in input_datas[0].items() if key.startswith(prefix)}
+            # build the store for the next reads
+            if source_signature is not None:
+                self.write_parameters_store(input_datas[0], source_signature)
+
+        return {key[len(anonymized_namespace) + 1:]: value for key, value in anonymized_values.items()}
+
+    def update_memory_footprint(self, stage) -> dict:
+        """
+        Estimate the memory used by the study (data manager, disciplines, post-processings...) and log it,
+        the estimation is kept in memory_footprint
+
+        :param stage: step of the study life after which the memory is estimated (load, execution...)
+        :type stage: str
+        """
+        from sos_trades_api.server.base_server import chart_cache
+
+        try:
+            start_time = time()
+            footprint = get_study_memory_footprint(self, chart_cache.get_study_memory_charts(self.__study_identifier))
+            self.memory_footprint = {
+                "stage": stage,
+                "date": datetime.now(),
+                "sizes": footprint,
+            }
+            sizes = ", ".join(f"{part} {size / 1024 ** 2:.1f} MB" for part, size in footprint.items())
+            app.logger.info(f"Study {self.__study_identifier} memory footprint after {stage}: {sizes} "
+                            f"(estimated in {time() - start_time:.2f} seconds)")
+        except Exception as error:
+            # the estimation is only informative, it must not make the study loading fail
+            app.logger.warning(f"Unable to estimate the memory footprint of study {self.__study_identifier}: {error}")
+        return self.memory_footprint
+
+    def get_process_structure_hash(self) -> str:
+        """
+        Compute a hash of the configured process structure (disciplines and variables names with their io type)
+        Visualisation diagrams only depend on this structure, not on data values
+        """
+        dm = self.execution_engine.dm
+        structure_hash = hashlib.sha256()
+
+        for discipline_name in sorted(dm.disciplines_id_map.keys()):
+            structure_hash.update(discipline_name.encode())
+
+        for variable_name in sorted(dm.data_id_map.keys()):
+            io_type = dm.data_dict[dm.data_id_map[variable_name]].get(ProxyDiscipline.IO_TYPE, "")
+            structure_hash.update(f"{variable_name}|{io_type}".encode())
+
+        return structure_hash.hexdigest()
+
+    @property
+    def data_stamp(self) -> int:
+        """
+        Stamp of the study data in memory, changed each time the data are loaded, updated or reset
+        """
+        return self.__data_stamp
+
+    def get_memoised_diagram(self, diagram_name, generate_diagram) -> dict:
+        """
+        Return the requested diagram from the memoised diagrams, generate it if it does not exist
+        or if the process structure, the execution status or the study data have changed since its generation
+
+        :param diagram_name: diagram identifier (see LoadedStudyCase diagram names)
+        :type diagram_name: str
+
+        :param generate_diagram: method to call to generate the diagram
+        :type generate_diagram: callable
+        """
+        root_process = self.execution_engine.root_process
+        n2_diagram_key = (self.get_process_structure_hash(),
+                          root_process.status if root_process is not None else None,
+                          self.__data_stamp)
+        if n2_diagram_key != self.__n2_diagram_key:
+            self.n2_diagram = {}
+            self.__n2_diagram_key = n2_diagram_key
+
+        diagram = self.n2_diagram.get(diagram_name)
+        if diagram is None:
+            diagram = generate_diagram()
+            # do not memoise empty diagrams (ontology server not reachable for example)
+            if diagram:
+                self.n2_diagram[diagram_name] = diagram
+
+        return diagram
+
+    def get_treeview_snapshots(self, no_data, read_only) -> TreeviewSnapshots:
+        """
+        Get the versions of the treeview sent to the clients for the given data access
+        """
+        treeview_snapshots = self.__treeview_snapshots.get((no_data, read_only))
+        if treeview_snapshots is None:
+            treeview_snapshots = self.__treeview_snapshots.setdefault((no_data, read_only), TreeviewSnapshots())
+        return treeview_snapshots
+
+    def get_post_processings(self) -> dict:
+        """
+        Get the post-processings filters of all disciplines, memoised until the process structure,
+        the execution status or the study data change
+        """
+        root_process = self.execution_engine.root_process
+        if root_process is None or root_process.status != ProxyDiscipline.STATUS_DONE:
+            return {}
+
+        post_processings_key = (self.get_process_structure_hash(), root_process.status, self.__data_stamp)
+        if self.post_processings is None or post_processings_key != self.__post_processings_key:
+            self.post_processings = load_post_processing(self.execution_engine, False)
+            self.__post_processings_key = post_processings_key
+
+        return self.post_processings
+
     def get_n2_diagram_graph_data(self)-> dict:
         """
         Get coupling chart for visualisation part
         """
+        return self.get_memoised_diagram(LoadedStudyCase.N2_DIAGRAM, self.__generate_n2_diagram_graph_data)
 
+    def __generate_n2_diagram_graph_data(self) -> dict:
+        """
+        Generate coupling chart for visualisation part
+        """
         # Get couplings
         couplings = self.execution_engine.root_process.export_couplings()
         if couplings is None:
@@ -813,8 +1053,9 @@ class StudyCaseManager(BaseStudyManager):
         if treeview is None:
             raise Exception("Failed to get treeview")
 
-        # Load matrix and generate graph from ontology
-        ontology_matrix_data = load_n2_matrix(treeview)
+        # Load matrix and generate graph from ontology, only coupling variables are sent
+        coupling_variables = set(couplings["var_name"].tolist())
+        ontology_matrix_data = load_n2_matrix(get_n2_treenode(treeview.root, coupling_variables))
         graph = {}
         if len(ontology_matrix_data) > 0:
 
@@ -822,44 +1063,66 @@ class StudyCaseManager(BaseStudyManager):
             graph = get_couplings_force_graph(couplings, ontology_matrix_data)
 
         return graph
-    
 
     def get_execution_sequence_graph_data(self)-> dict:
+        """
+        Get execution sequence for visualisation part
+        """
+        return self.get_memoised_diagram(LoadedStudyCase.EXECUTION_SEQUENCE,
+                                         self.__generate_execution_sequence_graph_data)
+
+    def __generate_execution_sequence_graph_data(self) -> dict:
         """
         Generate execution sequence for visualisation part
         """
         GEMS_graph = self.execution_engine.root_process.coupling_structure.graph
 
         # execution workflow generation
-        execution_workflow = SoSExecutionWorkflow(GEMS_graph)
+        execution_workflow = SoSExecutionWorkflow(
+            GEMS_graph, app.config.get("SOS_TRADES_EXECUTION_SEQUENCE_MAX_PARALLEL_NODES"))
         execution_workflow.get_execution_workflow_graph()
 
         result = execution_workflow.create_result()
 
         return result
-    
+
     def get_interface_diagram_graph_data(self)-> dict:
         """
-        Generate execution sequence for visualisation part
+        Get interface diagram for visualisation part
+        """
+        return self.get_memoised_diagram(LoadedStudyCase.INTERFACE_DIAGRAM,
+                                         self.__generate_interface_diagram_graph_data)
+
+    def __generate_interface_diagram_graph_data(self) -> dict:
         """
-        interface_diagram = InterfaceDiagramGenerator(self)
+        Generate interface diagram for visualisation part
+        """
+        interface_diagram = InterfaceDiagramGenerator(
+            self, max_depth=app.config.get("SOS_TRADES_INTERFACE_DIAGRAM_MAX_DEPTH"))
         result = interface_diagram.generate_interface_diagram_data()
 
         return result
 
+    def get_dashboard_store(self) -> StudyDashboardStore:
+        """
+        Return the incremental store of the study dashboard
+        """
+        return self.__read_only_rw_strategy.dashboard_store
+
     def check_dashboard_json_file_exists(self):
         return self.__read_only_rw_strategy.dashboard_file_exists
 
     def get_dashboard_file_path(self):
         return self.__read_only_rw_strategy.get_dashboard_file_path()
     
-    def export_study_read_only_zip(self, zip_file_path)->bool:
-
-        # create a zip archive containing the read_only_mode folder
-        # plus the pkl files
+    def __get_read_only_zip_content(self):
+        """
+        Return the files and folders to write in the stand-alone zip archive (read_only_mode folder
+        plus the pkl files) and the study metadata, None if the study has no read only mode
+        """
         if not self.__read_only_rw_strategy.read_only_exists:
-            return False
-            
+            return None
+
         elements_to_zip = []
 
         dm_pkl_file = join(self.dump_directory, DataSerializer.pkl_filename)
@@ -878,9 +1141,32 @@ class StudyCaseManager(BaseStudyManager):
         # add read only files into the folder
         elements_to_zip.append(self.__read_only_rw_strategy.read_only_folder_path)
 
-        zip_files_and_folders(zip_file_path, elements_to_zip, json.dumps(metadata))
+        return elements_to_zip, json.dumps(metadata)
+
+    def export_study_read_only_zip(self, zip_file_path)->bool:
+
+        # create a zip archive containing the read_only_mode folder
+        # plus the pkl files
+        zip_content = self.__get_read_only_zip_content()
+        if zip_content is None:
+            return False
+
+        elements_to_zip, metadata = zip_content
+        zip_files_and_folders(zip_file_path, elements_to_zip, metadata)
 
         return True
+
+    def stream_study_read_only_zip(self):
+        """
+        Return a generator of the stand-alone zip archive bytes, the archive is written while it is sent
+        so no temporary file is needed, None if the study has no read only mode
+        """
+        zip_content = self.__get_read_only_zip_content()
+        if zip_content is None:
+            return None
+
+        elements_to_zip, metadata = zip_content
+        return generate_zip_stream(elements_to_zip, metadata)
     
     def check_study_standalone_files(self)->bool:
         dm_pkl_file = join(self.dump_directory, DataSerializer.pkl_filename)
@@ -890,6 +1176,33 @@ class StudyCaseManager(BaseStudyManager):
         return os.path.exists(dm_pkl_file) and os.path.exists(status_pkl_file) and self.__read_only_rw_strategy.read_only_exists
 
 
+    def copy_study_files_from(self, study_manager_source):
+        """
+        Copy the data, status and cache files of another study without loading any of the two studies,
+        the execution engine of this study will be built from the copied files when it is opened.
+        Files are copied as is (sharing their blocks with the source files when the file system allows it)
+        if the two studies use the same serialisation strategy, else they are loaded and dumped again.
+        The read only mode is not copied: its tree nodes, diagrams and post-processings are written under
+        the source study name, it is generated again when the copied study is loaded.
+
+        :param study_manager_source: study manager of the study to copy
+        :type study_manager_source: StudyCaseManager
+        """
+        if not os.path.exists(self.dump_directory):
+            os.makedirs(self.dump_directory)
+
+        same_rw_strategy = type(self.rw_strategy) is type(study_manager_source.rw_strategy)
+
+        for file_name in [DataSerializer.pkl_filename, DataSerializer.disc_status_filename,
+                          DataSerializer.cache_filename]:
+            source_file_path = join(study_manager_source.dump_directory, file_name)
+            if not os.path.exists(source_file_path):
+                continue
+            if same_rw_strategy:
+                copy_file_copy_on_write(source_file_path, join(self.dump_directory, file_name))
+            else:
+                self.copy_pkl_file(file_name, self, study_manager_source)
+
     @staticmethod
     def copy_pkl_file(file_name, study_case_manager, study_manager_source):
         """
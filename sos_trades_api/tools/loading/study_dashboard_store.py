@@ -0,0 +1,356 @@
+'''
+Copyright 2026 Capgemini
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import hashlib
+import json
+import os
+from os.path import exists, join
+from tempfile import NamedTemporaryFile
+
+from sos_trades_api.tools.file_stream.file_lock import file_lock
+
+
+class DashboardItemNotFound(Exception):
+    """Exception raised when a dashboard item does not exist in the store"""
+
+
+class StudyDashboardStore():
+    """
+    Incremental store of a study dashboard, written in the read only folder of the study.
+    Each dashboard item is written once in a file named after the hash of its content and an index gives
+    the items order with the dashboard version each item content has been set at, so that
+    editing an item only writes this item and the index, and a client only fetches the items changed
+    since the version it already has.
+    The store is shared by all the server processes (and pods) working on the study: writes hold an exclusive
+    file lock and reads a shared one, the items content files not referenced anymore are removed in batches.
+    """
+    DASHBOARD_FOLDER_NAME = "dashboard"
+    ITEMS_FOLDER_NAME = "items"
+    INDEX_FILE_NAME = "index.json"
+    LOCK_FILE_NAME = "dashboard.lock"
+
+    # key of the items list in the serialised dashboard
+    ITEMS_KEY = "items"
+
+    VERSION_KEY = "version"
+    PROPERTIES_KEY = "properties"
+    NEXT_ITEM_ID_KEY = "next_item_id"
+    ITEM_ID_KEY = "id"
+    ITEM_HASH_KEY = "hash"
+    PAYLOADS_KEY = "payloads"
+    ORPHAN_ITEMS_COUNT_KEY = "orphan_items_count"
+
+    # number of items content files left unreferenced by the edits before the items folder is cleaned
+    ORPHAN_ITEMS_CLEANUP_THRESHOLD = 50
+
+    def __init__(self, read_only_folder_path):
+        self.__dashboard_folder_path = join(read_only_folder_path, self.DASHBOARD_FOLDER_NAME)
+        self.__items_folder_path = join(self.__dashboard_folder_path, self.ITEMS_FOLDER_NAME)
+        self.__index_file_path = join(self.__dashboard_folder_path, self.INDEX_FILE_NAME)
+        self.__lock_file_path = join(self.__dashboard_folder_path, self.LOCK_FILE_NAME)
+        self.__index = None
+        self.__index_modification_time = None
+
+    @property
+    def dashboard_folder_path(self):
+        return self.__dashboard_folder_path
+
+    @property
+    def store_exists(self):
+        return exists(self.__index_file_path)
+
+    @staticmethod
+    def get_item_hash(item) -> str:
+        """
+        Return the hash of a serialised dashboard item content
+        """
+        return hashlib.sha256(json.dumps(item, sort_keys=True, default=str).encode()).hexdigest()
+
+    def read_dashboard(self) -> dict:
+        """
+        Return the serialised dashboard with all its items, None if there is no dashboard
+        """
+        if not self.store_exists:
+            return None
+        with self.__lock(shared=True):
+            index = self.__load_index()
+            dashboard = dict(index[self.PROPERTIES_KEY])
+            dashboard[self.ITEMS_KEY] = [self.__read_item(entry[self.ITEM_HASH_KEY])
+                                         for entry in index[self.ITEMS_KEY]]
+        return dashboard
+
+    def get_changes(self, since_version=None) -> dict:
+        """
+        Return the dashboard layout (items identifiers in order) with the content of the items
+        set after the given version only
+
+        :param since_version: dashboard version the client already has, None to get all the items
+        :type since_version: int
+
+        :return: dictionary with the dashboard version, its properties, its items entries (identifier,
+            content hash and version) and the changed items content by hash
+        """
+        if not self.store_exists:
+            return None
+        with self.__lock(shared=True):
+            index = self.__load_index()
+            payloads = {}
+            for entry in index[self.ITEMS_KEY]:
+                if since_version is None or entry[self.VERSION_KEY] > since_version:
+                    payloads[entry[self.ITEM_HASH_KEY]] = self.__read_item(entry[self.ITEM_HASH_KEY])
+
+        return {
+            self.VERSION_KEY: index[self.VERSION_KEY],
+            self.PROPERTIES_KEY: index[self.PROPERTIES_KEY],
+            self.ITEMS_KEY: index[self.ITEMS_KEY],
+            self.PAYLOADS_KEY: payloads,
+        }
+
+    def write_dashboard(self, dashboard) -> int:
+        """
+        Save a whole serialised dashboard, only the items whose content changed are written.
+        Items keep their identifier and version when an item with the same content already exists.
+
+        :param dashboard: serialised dashboard
+        :type dashboard: dict
+        :return: dashboard version
+        """
+        with self.__lock():
+            return self.__write_dashboard(dashboard)
+
+    def import_dashboard_file(self, dashboard_file_path):
+        """
+        Move a dashboard saved in a single json file into the store and remove the file.
+        The file is imported once even when several processes open the study at the same time,
+        it is only removed when the store already exists.
+
+        :param dashboard_file_path: path of the json file of the serialised dashboard
+        :type dashboard_file_path: str
+        """
+        with self.__lock():
+            if exists(dashboard_file_path):
+                if not self.store_exists:
+                    with open(dashboard_file_path) as dashboard_file:
+                        self.__write_dashboard(json.load(dashboard_file))
+                os.remove(dashboard_file_path)
+
+    def add_item(self, item, position=None) -> str:
+        """
+        Add an item to the dashboard without rewriting the other items
+
+        :param item: serialised dashboard item
+        :type item: dict
+        :param position: position of the item in the dashboard, at the end if not given
+        :type position: int
+        :return: identifier of the added item
+        """
+        with self.__lock():
+            index = self.__load_index() if self.store_exists else self.__get_empty_index()
+            version = index[self.VERSION_KEY] + 1
+            item_hash = self.get_item_hash(item)
+            self.__write_item(item_hash, item)
+
+            item_id = str(index[self.NEXT_ITEM_ID_KEY])
+            items_entries = list(index[self.ITEMS_KEY])
+            items_entries.insert(len(items_entries) if position is None else position,
+                                 self.__get_entry(item_id, item_hash, version))
+
+            self.__write_index(index, version, items_entries, index[self.PROPERTIES_KEY],
+                               index[self.NEXT_ITEM_ID_KEY] + 1)
+            return item_id
+
+    def update_item(self, item_id, item) -> int:
+        """
+        Replace the content of an item without rewriting the other items
+
+        :return: dashboard version
+        """
+        with self.__lock():
+            index, items_entries, item_position = self.__get_item_position(item_id)
+            item_hash = self.get_item_hash(item)
+            if item_hash == items_entries[item_position][self.ITEM_HASH_KEY]:
+                return index[self.VERSION_KEY]
+
+            version = index[self.VERSION_KEY] + 1
+            self.__write_item(item_hash, item)
+            items_entries[item_position] = self.__get_entry(item_id, item_hash, version)
+            self.__write_index(index, version, items_entries, index[self.PROPERTIES_KEY],
+                               index[self.NEXT_ITEM_ID_KEY])
+            return version
+
+    def move_item(self, item_id, position) -> int:
+        """
+        Move an item in the dashboard, no item content is written
+
+        :return: dashboard version
+        """
+        with self.__lock():
+            index, items_entries, item_position = self.__get_item_position(item_id)
+            version = index[self.VERSION_KEY] + 1
+            items_entries.insert(position, items_entries.pop(item_position))
+            self.__write_index(index, version, items_entries, index[self.PROPERTIES_KEY],
+                               index[self.NEXT_ITEM_ID_KEY])
+            return version
+
+    def remove_item(self, item_id) -> int:
+        """
+        Remove an item from the dashboard, no item content is written
+
+        :return: dashboard version
+        """
+        with self.__lock():
+            index, items_entries, item_position = self.__get_item_position(item_id)
+            version = index[self.VERSION_KEY] + 1
+            items_entries.pop(item_position)
+            self.__write_index(index, version, items_entries, index[self.PROPERTIES_KEY],
+                               index[self.NEXT_ITEM_ID_KEY])
+            return version
+
+    def __lock(self, shared=False):
+        """
+        Return the inter-process lock of the store, exclusive to edit it or shared to read it
+        """
+        os.makedirs(self.__dashboard_folder_path, exist_ok=True)
+        return file_lock(self.__lock_file_path, shared=shared)
+
+    def __write_dashboard(self, dashboard) -> int:
+        """
+        Save a whole serialised dashboard, the store lock is held by the caller
+        """
+        index = self.__load_index() if self.store_exists else self.__get_empty_index()
+        version = index[self.VERSION_KEY] + 1
+
+        # existing entries that can be reused by content
+        entries_by_hash = {}
+        for entry in index[self.ITEMS_KEY]:
+            entries_by_hash.setdefault(entry[self.ITEM_HASH_KEY], []).append(entry)
+
+        next_item_id = index[self.NEXT_ITEM_ID_KEY]
+        items_entries = []
+        for item in dashboard.get(self.ITEMS_KEY) or []:
+            item_hash = self.get_item_hash(item)
+            reusable_entries = entries_by_hash.get(item_hash)
+            if reusable_entries:
+                items_entries.append(reusable_entries.pop(0))
+            else:
+                self.__write_item(item_hash, item)
+                items_entries.append(self.__get_entry(str(next_item_id), item_hash, version))
+                next_item_id += 1
+
+        properties = {key: value for key, value in dashboard.items() if key != self.ITEMS_KEY}
+        if items_entries == index[self.ITEMS_KEY] and properties == index[self.PROPERTIES_KEY]:
+            # nothing changed, version is kept so that clients do not fetch anything
+            return index[self.VERSION_KEY]
+
+        self.__write_index(index, version, items_entries, properties, next_item_id)
+        return version
+
+    def __get_empty_index(self) -> dict:
+        return {
+            self.VERSION_KEY: 0,
+            self.PROPERTIES_KEY: {},
+            self.NEXT_ITEM_ID_KEY: 1,
+            self.ITEMS_KEY: [],
+            self.ORPHAN_ITEMS_COUNT_KEY: 0,
+        }
+
+    def __get_entry(self, item_id, item_hash, version) -> dict:
+        return {self.ITEM_ID_KEY: item_id, self.ITEM_HASH_KEY: item_hash, self.VERSION_KEY: version}
+
+    def __get_item_position(self, item_id) -> tuple:
+        """
+        Return the index, a copy of its items entries and the position of an item in them
+        """
+        if not self.store_exists:
+            raise DashboardItemNotFound(f"Dashboard item {item_id} does not exist")
+        index = self.__load_index()
+        items_entries = list(index[self.ITEMS_KEY])
+        for position, entry in enumerate(items_entries):
+            if entry[self.ITEM_ID_KEY] == item_id:
+                return index, items_entries, position
+        raise DashboardItemNotFound(f"Dashboard item {item_id} does not exist")
+
+    def __load_index(self) -> dict:
+        """
+        Load the index file, it is kept in memory until the file is written again
+        """
+        index_modification_time = os.stat(self.__index_file_path).st_mtime_ns
+        if self.__index is None or index_modification_time != self.__index_modification_time:
+            with open(self.__index_file_path) as index_file:
+                self.__index = json.load(index_file)
+            self.__index_modification_time = index_modification_time
+        return self.__index
+
+    def __write_index(self, previous_index, version, items_entries, properties, next_item_id):
+        """
+        Replace the index file, the items content files it does not reference anymore are counted and
+        only removed once there are enough of them
+        """
+        used_hashes = {entry[self.ITEM_HASH_KEY] for entry in items_entries}
+        orphan_items_count = previous_index.get(self.ORPHAN_ITEMS_COUNT_KEY, 0) + len(
+            {entry[self.ITEM_HASH_KEY] for entry in previous_index[self.ITEMS_KEY]} - used_hashes)
+        cleanup_items = orphan_items_count >= self.ORPHAN_ITEMS_CLEANUP_THRESHOLD
+
+        index = {
+            self.VERSION_KEY: version,
+            self.PROPERTIES_KEY: properties,
+            self.NEXT_ITEM_ID_KEY: next_item_id,
+            self.ITEMS_KEY: items_entries,
+            self.ORPHAN_ITEMS_COUNT_KEY: 0 if cleanup_items else orphan_items_count,
+        }
+        self.__write_json_file(index, self.__index_file_path)
+        self.__index = None
+
+        if cleanup_items:
+            self.__remove_unreferenced_items(used_hashes)
+
+    def __remove_unreferenced_items(self, used_hashes):
+        """
+        Remove the files of the items folder that the index does not reference, temporary files
+        left by an interrupted write included
+        """
+        used_file_names = {os.path.basename(self.__get_item_file_path(item_hash)) for item_hash in used_hashes}
+        for file_name in os.listdir(self.__items_folder_path):
+            if file_name not in used_file_names:
+                try:
+                    os.remove(join(self.__items_folder_path, file_name))
+                except OSError:
+                    pass
+
+    def __get_item_file_path(self, item_hash) -> str:
+        return join(self.__items_folder_path, f"{item_hash}.json")
+
+    def __write_item(self, item_hash, item):
+        """
+        Write an item content, the file of a content is never rewritten
+        """
+        item_file_path = self.__get_item_file_path(item_hash)
+        if not exists(item_file_path):
+            self.__write_json_file(item, item_file_path)
+
+    def __read_item(self, item_hash) -> dict:
+        with open(self.__get_item_file_path(item_hash)) as item_file:
+            return json.load(item_file)
+
+    @staticmethod
+    def __write_json_file(object_to_write, file_path):
+        """
+        Write a json file through a temporary file so that a reader never sees a partial file
+        """
+        folder_path = os.path.dirname(file_path)
+        os.makedirs(folder_path, exist_ok=True)
+        with NamedTemporaryFile("w", dir=folder_path, suffix=".tmp", delete=False) as json_file:
+            json.dump(object_to_write, json_file)
+        os.replace(json_file.name, file_path)
@@ -0,0 +1,208 @@
+'''
+Copyright 2026 Capgemini
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import json
+import os
+import pickle
+import uuid
+from os.path import exists, join
+
+from sostrades_core.tools.folder_operations import makedirs_safe
+
+from sos_trades_api.tools.file_stream.file_lock import file_lock
+from sos_trades_api.tools.loading.namespace_index import NamespaceIndex
+
+
+class StudyParametersStore():
+    """
+    Side-car store of the study parameters values, written next to the study data file.
+    Each value is pickled individually in one data file and an index gives its offset and length,
+    so that one parameter can be read without unpickling the whole study data file.
+    Each write creates a new data file named in the index, so replacing the index switches index and data at once.
+    """
+    DATA_FILE_PREFIX = "parameters_store."
+    DATA_FILE_SUFFIX = ".data"
+    INDEX_FILE_NAME = "parameters_store_index.json"
+    LOCK_FILE_NAME = "parameters_store.lock"
+
+    SOURCE_KEY = "source"
+    DATA_FILE_KEY = "data_file"
+    PARAMETERS_KEY = "parameters"
+
+    def __init__(self, dump_directory):
+        self.__dump_directory = dump_directory
+        self.__index_file_path = join(self.__dump_directory, self.INDEX_FILE_NAME)
+        self.__lock_file_path = join(self.__dump_directory, self.LOCK_FILE_NAME)
+        self.__index = None
+        self.__index_modification_time = None
+        # namespace index of the parameters keys, built on first lookup and reset with the index
+        self.__namespace_index = None
+
+    @property
+    def store_exists(self):
+        return exists(self.__index_file_path)
+
+    @staticmethod
+    def get_source_signature(source_file_path) -> dict:
+        """
+        Return the signature (size and modification time) of the file the store is built from.
+        Taken before reading the source file, it lets the write detect that the source changed in the meantime.
+        """
+        source_stat = os.stat(source_file_path)
+        return {"size": source_stat.st_size, "mtime_ns": source_stat.st_mtime_ns}
+
+    def __load_index(self, force=False) -> dict:
+        """
+        Load the index file, it is kept in memory until the file is written again
+        """
+        index_modification_time = os.stat(self.__index_file_path).st_mtime_ns
+        if force or self.__index is None or index_modification_time != self.__index_modification_time:
+            with open(self.__index_file_path) as index_file:
+                self.__index = json.load(index_file)
+            self.__index_modification_time = index_modification_time
+            self.__namespace_index = None
+        return self.__index
+
+    def is_up_to_date(self, source_file_path) -> bool:
+        """
+        Check that the store exists and has been built from the current version of the source file
+
+        :param source_file_path: path of the study data file the store mirrors
+        :type source_file_path: str
+        """
+        if not self.store_exists or not exists(source_file_path):
+            return False
+        try:
+            index = self.__load_index()
+            # stores written before the data file was versioned are rebuilt
+            return self.DATA_FILE_KEY in index and \
+                index.get(self.SOURCE_KEY) == self.get_source_signature(source_file_path)
+        except (OSError, ValueError):
+            return False
+
+    def write(self, parameters_values, source_file_path, source_signature=None) -> bool:
+        """
+        Write the store with the given values under the store lock, so that concurrent writers of several
+        processes are serialised. The values are written in a new data file and the index naming it is replaced
+        at the end, so a reader never sees a partial store nor an index pointing to another data file.
+        Nothing is written if the store is already up to date with the source file.
+
+        :param parameters_values: parameters values by parameter key
+        :type parameters_values: dict
+        :param source_file_path: path of the study data file the store mirrors
+        :type source_file_path: str
+        :param source_signature: signature of the source file when the values have been read from it,
+            nothing is written if the source file has changed since
+        :type source_signature: dict
+        :return: True if the store has been written
+        """
+        makedirs_safe(self.__dump_directory, exist_ok=True)
+        with file_lock(self.__lock_file_path):
+            if self.is_up_to_date(source_file_path):
+                return False
+            current_signature = self.get_source_signature(source_file_path)
+            if source_signature is not None and source_signature != current_signature:
+                return False
+
+            parameters_index = {}
+            offset = 0
+            data_file_name = f"{self.DATA_FILE_PREFIX}{uuid.uuid4().hex}{self.DATA_FILE_SUFFIX}"
+            with open(join(self.__dump_directory, data_file_name), "wb") as data_file:
+                for parameter_key, parameter_value in parameters_values.items():
+                    serialized_value = pickle.dumps(parameter_value, protocol=pickle.HIGHEST_PROTOCOL)
+                    data_file.write(serialized_value)
+                    parameters_index[parameter_key] = [offset, len(serialized_value)]
+                    offset += len(serialized_value)
+
+            temporary_index_file_path = f"{self.__index_file_path}.{uuid.uuid4().hex}.tmp"
+            with open(temporary_index_file_path, "w") as index_file:
+                json.dump({self.SOURCE_KEY: current_signature,
+                           self.DATA_FILE_KEY: data_file_name,
+                           self.PARAMETERS_KEY: parameters_index}, index_file)
+            os.replace(temporary_index_file_path, self.__index_file_path)
+
+            self.__remove_unreferenced_data_files(data_file_name)
+        return True
+
+    def __remove_unreferenced_data_files(self, data_file_name):
+        """
+        Remove the data files of the previous writes, a reader still using one of them reloads the index
+        """
+        for file_name in os.listdir(self.__dump_directory):
+            if file_name != data_file_name and file_name.startswith(self.DATA_FILE_PREFIX) and \
+                    file_name.endswith(self.DATA_FILE_SUFFIX):
+                try:
+                    os.remove(join(self.__dump_directory, file_name))
+                except OSError:
+                    # file opened by a reader on windows, removed by a next write
+                    pass
+
+    def __read_values(self, parameters_keys) -> dict:
+        """
+        Read parameters values from the data file of the index, in offset order.
+        If the data file has been replaced since the index has been loaded, the index is reloaded once.
+        """
+        for attempt in range(2):
+            index = self.__load_index(force=attempt > 0)
+            parameters_index = index[self.PARAMETERS_KEY]
+            parameters_locations = sorted((parameters_index[parameter_key], parameter_key)
+                                          for parameter_key in parameters_keys if parameter_key in parameters_index)
+            try:
+                with open(join(self.__dump_directory, index[self.DATA_FILE_KEY]), "rb") as data_file:
+                    parameters_values = {}
+                    for (offset, length), parameter_key in parameters_locations:
+                        data_file.seek(offset)
+                        parameters_values[parameter_key] = pickle.loads(data_file.read(length))
+                    return parameters_values
+            except FileNotFoundError as error:
+                if attempt > 0:
+                    raise error
+
+    def has_parameter(self, parameter_key) -> bool:
+        """
+        Check if a parameter value is in the store
+        """
+        return parameter_key in self.__load_index()[self.PARAMETERS_KEY]
+
+    def get_namespace_keys(self, namespace) -> list:
+        """
+        Return the keys of the parameters of the store under the given namespace
+        """
+        parameters_index = self.__load_index()[self.PARAMETERS_KEY]
+        if self.__namespace_index is None:
+            self.__namespace_index = NamespaceIndex(parameters_index)
+        return self.__namespace_index.get_namespace_keys(namespace)
+
+    def read_parameters(self, parameters_keys) -> dict:
+        """
+        Read several parameters values at once, the data file is opened once and read in offset order
+
+        :param parameters_keys: keys of the parameters to read, keys not in the store are ignored
+        :type parameters_keys: list
+        :return: parameters values by parameter key
+        """
+        return self.__read_values(parameters_keys)
+
+    def read_parameter(self, parameter_key):
+        """
+        Read one parameter value, only the bytes of this parameter are read
+
+        :param parameter_key: parameter key
+        :type parameter_key: str
+        """
+        parameters_values = self.__read_values([parameter_key])
+        if parameter_key not in parameters_values:
+            raise KeyError(parameter_key)
+        return parameters_values[parameter_key]
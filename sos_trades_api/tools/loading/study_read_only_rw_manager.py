@@ -13,6 +13,7 @@ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 See the License for the specific language governing permissions and
 limitations under the License.
 '''
+import json
 import os
 from os.path import basename, exists, join
 from shutil import copy
@@ -22,11 +23,13 @@ from sostrades_core.tools.dashboard.dashboard import (
 )
 from sostrades_core.tools.folder_operations import makedirs_safe, rmtree_safe
 
+from sos_trades_api.models.custom_json_encoder import CustomJsonEncoder
 from sos_trades_api.tools.file_stream.file_stream import verify_files_after_copy
 from sos_trades_api.tools.file_tools import (
     read_object_in_json_file,
     write_object_in_json_file,
 )
+from sos_trades_api.tools.loading.study_dashboard_store import StudyDashboardStore
 
 
 class StudyReadOnlyRWHelper():
@@ -39,6 +42,7 @@ class StudyReadOnlyRWHelper():
     DASHBOARD_FILE_NAME = "dashboard.json"
     ONTOLOGY_FILE_NAME = "ontology.json"
     DOCUMENTATION_FOLDER_NAME = "documentation"
+    POST_PROCESSING_FILTERS_FILE_NAME = "post_processing_filters.json"
 
     def __init__(self, dump_directory):
         self.__dump_directory = dump_directory
@@ -48,6 +52,9 @@ class StudyReadOnlyRWHelper():
         self.__documentation_folder_path = join(self.__read_only_folder_path, self.DOCUMENTATION_FOLDER_NAME)
         self.__ontology_file_path = join(self.__read_only_folder_path, self.ONTOLOGY_FILE_NAME)
         self.__dashboard_file_path = join(self.__read_only_folder_path, self.DASHBOARD_FILE_NAME)
+        self.__dashboard_store = StudyDashboardStore(self.__read_only_folder_path)
+        self.__post_processing_filters_file_path = join(self.__read_only_folder_path,
+                                                        self.POST_PROCESSING_FILTERS_FILE_NAME)
 
     @property
     def read_only_folder_path(self):
@@ -63,7 +70,16 @@ class StudyReadOnlyRWHelper():
 
     @property
     def dashboard_file_exists(self):
-        return exists(self.__dashboard_file_path)
+        return self.__dashboard_store.store_exists or exists(self.__dashboard_file_path)
+
+    @property
+    def dashboard_store(self) -> StudyDashboardStore:
+        """
+        Return the incremental store of the study dashboard, a dashboard saved in a single file is moved into it
+        """
+        if exists(self.__dashboard_file_path):
+            self.__dashboard_store.import_dashboard_file(self.__dashboard_file_path)
+        return self.__dashboard_store
 
     def __write_object_in_read_only_folder(self, object, file_path) -> str:
         """
@@ -116,7 +132,7 @@ class StudyReadOnlyRWHelper():
     
     def write_dashboard(self, dashboard:Dashboard):
         """
-        save dashboard data in a json file named dashboard.json
+        save dashboard data in the dashboard store, only the items that changed are written
         Args:
              dashboard_data (dict): dashboard data in json format
 
@@ -126,17 +142,18 @@ class StudyReadOnlyRWHelper():
         if dashboard is None:
             return False
         dashboard_json = dashboard.serialize()
-        return self.__write_object_in_read_only_folder(dashboard_json, self.__dashboard_file_path)
+        self.dashboard_store.write_dashboard(json.loads(json.dumps(dashboard_json, cls=CustomJsonEncoder)))
+        return True
 
     def read_dashboard(self)-> Dashboard:
         """
-        get content of the dashboard saved file if exists, return None if not
+        get content of the dashboard saved if exists, return None if not
         Return:
-            Dashboard file content
+            Dashboard content
         """
         dashboard = None
-        if exists(self.__dashboard_file_path):
-            dashboard_json = read_object_in_json_file(self.__dashboard_file_path)
+        dashboard_json = self.dashboard_store.read_dashboard()
+        if dashboard_json is not None:
             try:
                 dashboard = Dashboard.deserialize(dashboard_json)
             except Exception as e:
@@ -144,6 +161,37 @@ class StudyReadOnlyRWHelper():
             
         return dashboard
 
+    def write_post_processing_filters(self, execution_id, discipline_filters):
+        """
+        save the post-processing filters of each discipline in a json file named post_processing_filters.json
+        Args:
+            execution_id (int): identifier of the study execution the filters have been generated from
+            discipline_filters (dict): dictionary with discipline key as key and ChartFilter list as value
+        Return:
+            True if the write succeeded
+        """
+        post_processing_filters = {
+            "execution_id": execution_id,
+            "filters": discipline_filters,
+        }
+        return self.__write_object_in_read_only_folder(post_processing_filters,
+                                                       self.__post_processing_filters_file_path)
+
+    def read_post_processing_filters(self, execution_id):
+        """
+        get the post-processing filters of each discipline saved for an execution of the study
+        Args:
+            execution_id (int): identifier of the current study execution
+        Return:
+            dictionary with discipline key as key and filters list as value, None if there is no saved filters
+            or if they have been generated from another execution
+        """
+        post_processing_filters = read_object_in_json_file(self.__post_processing_filters_file_path)
+        if post_processing_filters is None or post_processing_filters.get("execution_id") != execution_id:
+            return None
+
+        return post_processing_filters.get("filters")
+
     def write_ontology(self, ontology_data):
         """
         save ontology data in a json file named ontology.json
@@ -214,6 +262,8 @@ class StudyReadOnlyRWHelper():
             os.remove(self.__read_only_file_path)
         if exists(self.__read_only_file_nodata_path):
             os.remove(self.__read_only_file_nodata_path)
+        if exists(self.__post_processing_filters_file_path):
+            os.remove(self.__post_processing_filters_file_path)
 
     def migrate_to_new_read_only_folder(self):
         """
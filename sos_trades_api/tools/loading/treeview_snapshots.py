@@ -0,0 +1,290 @@
+'''
+Copyright 2026 Capgemini
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import hashlib
+import pickle
+import threading
+import uuid
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+"""
+Versioned snapshots of a serialised study treeview, used to send to the clients only the changes
+between the treeview version they have and the current one
+"""
+
+# keys of a serialised tree node that are not node properties
+CHILDREN_KEY = "children"
+DATA_KEY = "data"
+NAMESPACE_KEY = "full_namespace"
+
+# keys of a treeview delta
+VERSION_KEY = "version"
+SINCE_VERSION_KEY = "since_version"
+ROOT_NAMESPACE_KEY = "root_namespace"
+ADDED_NODES_KEY = "added_nodes"
+REMOVED_NODES_KEY = "removed_nodes"
+CHANGED_NODES_KEY = "changed_nodes"
+CHANGED_DATA_KEY = "changed_data"
+REMOVED_DATA_KEY = "removed_data"
+
+# values kept as they are in the fingerprints, longer strings are hashed
+SCALAR_TYPES = (type(None), bool, int, float, str)
+FINGERPRINT_MAX_STRING_LENGTH = 64
+
+
+def get_fingerprint(value):
+    """
+    Return a fingerprint of a serialised tree node value, equal for equal values.
+    Scalars are their own fingerprint, other values are hashed: arrays and dataframes from their
+    memory buffers, dictionaries entry by entry and other objects from their pickle.
+    """
+    if isinstance(value, SCALAR_TYPES) and not (isinstance(value, str)
+                                                and len(value) > FINGERPRINT_MAX_STRING_LENGTH):
+        # the type tells 1, 1.0 and True apart, nan is not equal to itself
+        return type(value), "nan" if value != value else value
+    digest = hashlib.sha1()
+    __update_digest(digest, value)
+    return digest.digest()
+
+
+def __update_digest(digest, value):
+    """
+    Add a value to a digest, the data of numeric arrays and dataframes columns is hashed without being copied
+    """
+    if isinstance(value, dict):
+        digest.update(b"{")
+        for key, entry in value.items():
+            digest.update(f"{key!r}:".encode())
+            __update_digest(digest, entry)
+        digest.update(b"}")
+    elif isinstance(value, np.ndarray) and not value.dtype.hasobject:
+        digest.update(f"ndarray{value.dtype.str}{value.shape}".encode())
+        digest.update(np.ascontiguousarray(value).reshape(-1).view(np.uint8))
+    elif isinstance(value, pd.DataFrame):
+        digest.update(f"DataFrame{list(value.columns)!r}".encode())
+        __update_digest(digest, value.index.to_numpy())
+        for _, column in value.items():
+            __update_digest(digest, column.to_numpy())
+    elif isinstance(value, pd.Series):
+        digest.update(f"Series{value.name!r}".encode())
+        __update_digest(digest, value.index.to_numpy())
+        __update_digest(digest, value.to_numpy())
+    else:
+        try:
+            digest.update(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            digest.update(repr(value).encode())
+
+
+def get_node_namespace(tree_node, parent_namespace=None) -> str:
+    """
+    Return the identifier of a tree node in the treeview, its full namespace
+    """
+    namespace = tree_node.get(NAMESPACE_KEY)
+    if namespace is None:
+        namespace = tree_node.get("name", "") if parent_namespace is None \
+            else f"{parent_namespace}.{tree_node.get('name', '')}"
+    return namespace
+
+
+def get_node_record(tree_node, children_namespaces) -> dict:
+    """
+    Return a tree node without its children, replaced by the list of their namespaces
+    """
+    node_record = {key: value for key, value in tree_node.items() if key != CHILDREN_KEY}
+    node_record[CHILDREN_KEY] = children_namespaces
+    return node_record
+
+
+def get_treeview_index(tree_node) -> tuple:
+    """
+    Index a serialised treeview by node namespace
+
+    :param tree_node: serialised root tree node
+    :type tree_node: dict
+
+    :return: (nodes, fingerprints) with, for each namespace, the tree node and the fingerprints of its
+        properties ("children" being the list of the children namespaces) and of its data entries
+    """
+    nodes = {}
+    fingerprints = {}
+    nodes_to_index = [(tree_node, None)]
+    while nodes_to_index:
+        node, parent_namespace = nodes_to_index.pop()
+        namespace = get_node_namespace(node, parent_namespace)
+        children = node.get(CHILDREN_KEY) or []
+        children_namespaces = [get_node_namespace(child, namespace) for child in children]
+
+        nodes[namespace] = node
+        fingerprints[namespace] = (
+            {key: get_fingerprint(value) for key, value in node.items() if key not in (CHILDREN_KEY, DATA_KEY)}
+            | {CHILDREN_KEY: get_fingerprint(children_namespaces)},
+            {key: get_fingerprint(entry) for key, entry in (node.get(DATA_KEY) or {}).items()},
+        )
+        nodes_to_index.extend((child, namespace) for child in children)
+    return nodes, fingerprints
+
+
+def get_treeview_delta(previous_fingerprints, nodes, fingerprints) -> dict:
+    """
+    Compute the changes from a previous treeview to the current one
+
+    :param previous_fingerprints: fingerprints of the previous treeview (see get_treeview_index)
+    :param nodes: tree nodes of the current treeview by namespace
+    :param fingerprints: fingerprints of the current treeview
+
+    :return: dictionary with the added nodes (without their children, replaced by their namespaces),
+        the removed nodes namespaces, the changed properties of the kept nodes, and their changed
+        and removed data entries
+    """
+    delta = {
+        ADDED_NODES_KEY: {},
+        REMOVED_NODES_KEY: [namespace for namespace in previous_fingerprints if namespace not in fingerprints],
+        CHANGED_NODES_KEY: {},
+        CHANGED_DATA_KEY: {},
+        REMOVED_DATA_KEY: {},
+    }
+    for namespace, (properties_fingerprints, data_fingerprints) in fingerprints.items():
+        node = nodes[namespace]
+        children_namespaces = [get_node_namespace(child, namespace) for child in node.get(CHILDREN_KEY) or []]
+        if namespace not in previous_fingerprints:
+            delta[ADDED_NODES_KEY][namespace] = get_node_record(node, children_namespaces)
+            continue
+
+        previous_properties_fingerprints, previous_data_fingerprints = previous_fingerprints[namespace]
+        changed_properties = {}
+        for key, fingerprint in properties_fingerprints.items():
+            if previous_properties_fingerprints.get(key) != fingerprint:
+                changed_properties[key] = children_namespaces if key == CHILDREN_KEY else node[key]
+        if changed_properties:
+            delta[CHANGED_NODES_KEY][namespace] = changed_properties
+
+        node_data = node.get(DATA_KEY) or {}
+        changed_data = {key: node_data[key] for key, fingerprint in data_fingerprints.items()
+                        if previous_data_fingerprints.get(key) != fingerprint}
+        if changed_data:
+            delta[CHANGED_DATA_KEY][namespace] = changed_data
+        removed_data = [key for key in previous_data_fingerprints if key not in data_fingerprints]
+        if removed_data:
+            delta[REMOVED_DATA_KEY][namespace] = removed_data
+
+    return delta
+
+
+def apply_treeview_delta(tree_node, delta) -> dict:
+    """
+    Apply a treeview delta to a serialised treeview, as the clients do with the treeview they have
+
+    :param tree_node: serialised root tree node the delta has been computed from, not modified
+    :type tree_node: dict
+    :param delta: treeview delta (see TreeviewSnapshots.add_snapshot)
+    :type delta: dict
+
+    :return: serialised root tree node of the delta version
+    """
+    # flat records of the current nodes, children being referenced by namespace
+    records = {}
+    nodes_to_index = [(tree_node, None)]
+    while nodes_to_index:
+        node, parent_namespace = nodes_to_index.pop()
+        namespace = get_node_namespace(node, parent_namespace)
+        children = node.get(CHILDREN_KEY) or []
+        records[namespace] = get_node_record(node, [get_node_namespace(child, namespace) for child in children])
+        records[namespace][DATA_KEY] = dict(node.get(DATA_KEY) or {})
+        nodes_to_index.extend((child, namespace) for child in children)
+
+    for namespace in delta[REMOVED_NODES_KEY]:
+        records.pop(namespace, None)
+    for namespace, record in delta[ADDED_NODES_KEY].items():
+        records[namespace] = dict(record)
+        records[namespace][DATA_KEY] = dict(record.get(DATA_KEY) or {})
+    for namespace, changed_properties in delta[CHANGED_NODES_KEY].items():
+        records[namespace].update(changed_properties)
+    for namespace, changed_data in delta[CHANGED_DATA_KEY].items():
+        records[namespace][DATA_KEY].update(changed_data)
+    for namespace, removed_data in delta[REMOVED_DATA_KEY].items():
+        for key in removed_data:
+            records[namespace][DATA_KEY].pop(key, None)
+
+    def build_node(namespace):
+        node = {key: value for key, value in records[namespace].items() if key != CHILDREN_KEY}
+        node[CHILDREN_KEY] = [build_node(child_namespace) for child_namespace in records[namespace][CHILDREN_KEY]]
+        return node
+
+    return build_node(delta[ROOT_NAMESPACE_KEY])
+
+
+class TreeviewSnapshots():
+    """
+    Last versions of a study treeview, kept as fingerprints only so that the changes since any of them
+    can be computed against the treeview being sent.
+    Versions are opaque strings unique to this instance, a version of another instance (study reloaded
+    in another cache for example) is never matched and leads the client to a full reload.
+    """
+    # number of previous versions a delta can be computed from
+    SNAPSHOTS_COUNT = 10
+
+    def __init__(self, snapshots_count=SNAPSHOTS_COUNT):
+        self.__snapshots_count = snapshots_count
+        self.__instance_id = uuid.uuid4().hex[:12]
+        self.__last_version_number = 0
+        self.__snapshots = OrderedDict()
+        self.__lock = threading.Lock()
+
+    @property
+    def current_version(self) -> str:
+        with self.__lock:
+            return next(reversed(self.__snapshots)) if self.__snapshots else None
+
+    def add_snapshot(self, tree_node, since_version=None) -> tuple:
+        """
+        Record a treeview, a new version is created only if it differs from the last one, and compute the
+        changes from the version the client has to this treeview.
+        The delta is computed from the given treeview and the fingerprints of the requested version,
+        read in the same critical section as the version is recorded, so that it always leads to the
+        returned version whatever the snapshots added by other requests meanwhile.
+
+        :param tree_node: serialised root tree node
+        :type tree_node: dict
+        :param since_version: version of the treeview the client has, None if it has none
+        :type since_version: str
+        :return: (version of the treeview, treeview delta since the given version), the delta is None
+            if the version is not known anymore and a full treeview is needed
+        """
+        nodes, fingerprints = get_treeview_index(tree_node)
+        with self.__lock:
+            since_fingerprints = self.__snapshots.get(since_version) if since_version is not None else None
+
+            if self.__snapshots and next(reversed(self.__snapshots.values())) == fingerprints:
+                version = next(reversed(self.__snapshots))
+            else:
+                self.__last_version_number += 1
+                version = f"{self.__instance_id}.{self.__last_version_number}"
+                self.__snapshots[version] = fingerprints
+                while len(self.__snapshots) > self.__snapshots_count:
+                    self.__snapshots.popitem(last=False)
+
+        if since_fingerprints is None:
+            return version, None
+
+        # recorded fingerprints are never modified, the delta is computed outside of the lock
+        delta = get_treeview_delta(since_fingerprints, nodes, fingerprints)
+        delta[VERSION_KEY] = version
+        delta[SINCE_VERSION_KEY] = since_version
+        delta[ROOT_NAMESPACE_KEY] = get_node_namespace(tree_node)
+        return version, delta
@@ -0,0 +1,170 @@
+'''
+Copyright 2026 Capgemini
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import random
+import sys
+from collections import deque
+from types import (
+    BuiltinFunctionType,
+    FunctionType,
+    MethodType,
+    ModuleType,
+)
+
+import numpy as np
+
+"""
+Sampled estimation of the memory used by the objects of a study
+"""
+
+# number of items of a container that are walked, the size of the other items is extrapolated from them
+MEMORY_SAMPLE_SIZE = 100
+
+# objects shared by the whole server, never counted in a study footprint
+EXCLUDED_TYPES = (type, ModuleType, FunctionType, BuiltinFunctionType, MethodType)
+EXCLUDED_MODULES = {"logging", "threading", "_thread", "sqlalchemy", "flask", "werkzeug", "eventlet"}
+
+# keys of a study memory footprint
+DATA_MANAGER_KEY = "data_manager"
+DISCIPLINES_KEY = "disciplines"
+POST_PROCESSINGS_KEY = "post_processings"
+DIAGRAMS_KEY = "diagrams"
+OTHERS_KEY = "others"
+TOTAL_KEY = "total"
+
+# types whose items are the only references they hold
+SEQUENCE_TYPES = (list, tuple, set, frozenset, deque)
+# types without any reference to other objects
+ATOMIC_TYPES = (str, bytes, bytearray, int, float, complex, bool, type(None))
+
+
+def is_excluded(obj) -> bool:
+    """
+    Check if an object is shared by the whole server and must not be counted
+    """
+    return isinstance(obj, EXCLUDED_TYPES) or type(obj).__module__.split(".")[0] in EXCLUDED_MODULES
+
+
+def get_size_and_references(obj) -> tuple:
+    """
+    Return the size of an object itself and the list of the objects it references
+
+    :return: (size in bytes, referenced objects)
+    """
+    if type(obj).__module__.split(".")[0] == "pandas" and hasattr(obj, "memory_usage"):
+        # dataframes, series and indexes give their size with their objects values
+        try:
+            memory_usage = obj.memory_usage(deep=True)
+            return int(memory_usage.sum() if hasattr(memory_usage, "sum") else memory_usage), []
+        except Exception:
+            return 0, []
+
+    try:
+        size = sys.getsizeof(obj)
+    except Exception:
+        size = 0
+
+    if isinstance(obj, ATOMIC_TYPES):
+        return size, []
+    elif isinstance(obj, dict):
+        return size, [item for key_value in obj.items() for item in key_value]
+    elif isinstance(obj, SEQUENCE_TYPES):
+        return size, list(obj)
+    elif isinstance(obj, np.ndarray):
+        # the data of a view belongs to its base array
+        references = [] if obj.base is None else [obj.base]
+        if obj.dtype.kind == "O":
+            references.extend(obj.ravel().tolist())
+        return size, references
+
+    references = []
+    if hasattr(obj, "__dict__"):
+        references.append(obj.__dict__)
+    for slot_name in getattr(type(obj), "__slots__", ()):
+        if hasattr(obj, slot_name):
+            references.append(getattr(obj, slot_name))
+    return size, references
+
+
+def get_deep_size(obj, sample_size=MEMORY_SAMPLE_SIZE, seen=None) -> int:
+    """
+    Estimate the memory used by an object and all the objects it references.
+    Only sample_size items of a large container are walked, the size of the others is extrapolated from them.
+
+    :param obj: object to size
+    :param sample_size: number of items walked in each container
+    :type sample_size: int
+    :param seen: identifiers of the objects already counted, shared between calls so that an object referenced
+        by several sized objects is counted once
+    :type seen: set
+    :return: estimated size in bytes
+    """
+    seen = set() if seen is None else seen
+    # seeded so that the estimation of the same objects is always the same
+    sampler = random.Random(0)
+    total_size = 0.0
+    # objects to walk with the weight of their size in the estimation
+    objects_to_size = [(obj, 1.0)]
+    while objects_to_size:
+        current_object, weight = objects_to_size.pop()
+        if id(current_object) in seen or is_excluded(current_object):
+            continue
+        seen.add(id(current_object))
+
+        size, references = get_size_and_references(current_object)
+        total_size += size * weight
+
+        if len(references) > sample_size:
+            # random sample so that regularly structured containers are not sampled on a single pattern
+            if isinstance(current_object, dict):
+                # keys and values are sampled together
+                sampled_references = [references[2 * index + offset]
+                                      for index in sampler.sample(range(len(references) // 2), sample_size // 2)
+                                      for offset in (0, 1)]
+            else:
+                sampled_references = [references[index]
+                                      for index in sampler.sample(range(len(references)), sample_size)]
+            weight = weight * len(references) / len(sampled_references)
+            references = sampled_references
+        objects_to_size.extend((reference, weight) for reference in references)
+
+    return int(total_size)
+
+
+def get_study_memory_footprint(study_case_manager, charts=None, sample_size=MEMORY_SAMPLE_SIZE) -> dict:
+    """
+    Estimate the memory used by a loaded study, by part of the study
+
+    :param study_case_manager: study case manager to size
+    :type study_case_manager: sos_trades_api.tools.loading.study_case_manager.StudyCaseManager
+    :param charts: post-processings of the study kept in the charts cache
+    :type charts: list
+    :return: estimated size in bytes of the data manager, the disciplines, the post-processings, the diagrams,
+        the other objects of the study and their total
+    """
+    # parts are sized in this order, an object referenced by several parts is counted in the first one
+    seen = set()
+    dm = study_case_manager.execution_engine.dm
+    footprint = {
+        DATA_MANAGER_KEY: get_deep_size(dm.data_dict, sample_size, seen)
+                          + get_deep_size(dm.data_id_map, sample_size, seen),
+        DISCIPLINES_KEY: get_deep_size(dm.disciplines_dict, sample_size, seen),
+        POST_PROCESSINGS_KEY: get_deep_size(study_case_manager.post_processings, sample_size, seen)
+                              + get_deep_size(charts, sample_size, seen),
+        DIAGRAMS_KEY: get_deep_size(study_case_manager.n2_diagram, sample_size, seen),
+    }
+    footprint[OTHERS_KEY] = get_deep_size(study_case_manager, sample_size, seen)
+    footprint[TOTAL_KEY] = sum(footprint.values())
+    return footprint
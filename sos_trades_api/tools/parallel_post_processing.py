@@ -0,0 +1,144 @@
+'''
+Copyright 2026 Capgemini
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import logging
+import multiprocessing
+import os
+import pickle
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+"""
+Generation of the post-processings of a study namespace by namespace in a bounded pool of forked processes
+"""
+
+# maximum number of processes generating post-processings at the same time when parallel generation is enabled
+POST_PROCESSING_MAX_WORKERS = min(8, os.cpu_count() or 1)
+# below this number of namespaces, forking processes costs more than the generation itself
+POST_PROCESSING_PARALLEL_MIN_NAMESPACES = 16
+
+# generation method of the running generation, inherited by the forked processes with the loaded study
+# so that the execution engine is shared read-only without being serialised
+__generate_namespace_post_processings = None
+
+
+def partition_namespaces(namespaces, partitions_count) -> list[list[str]]:
+    """
+    Split namespaces in partitions of the same size, namespaces are dealt one by one so that the
+    disciplines of a same sub-process (generally of similar cost) are spread over all the partitions
+
+    :param namespaces: namespaces to split
+    :type namespaces: list[str]
+    :param partitions_count: maximum number of partitions
+    :type partitions_count: int
+    """
+    partitions_count = max(1, min(partitions_count, len(namespaces)))
+    return [namespaces[index::partitions_count] for index in range(partitions_count)]
+
+
+def generate_post_processings(namespaces, generate_namespace_post_processings, logger=logging.getLogger(__name__),
+                              max_workers=1) -> dict:
+    """
+    Generate the post-processings of each namespace, serially by default or in parallel when several workers
+    are given and there are enough namespaces.
+    A namespace failing to generate its post-processings is logged and left out of the result without
+    stopping the generation of the other ones.
+
+    :param namespaces: namespaces to generate post-processings for
+    :type namespaces: list[str]
+    :param generate_namespace_post_processings: method returning the post-processings of a namespace
+    :type generate_namespace_post_processings: callable
+    :param logger: logger used to report generation errors
+    :type logger: logging.Logger
+    :param max_workers: maximum number of processes generating post-processings at the same time,
+        1 generates them in the current process without forking
+    :type max_workers: int
+
+    :return: dictionary with namespace as key and its post-processings as value, in namespaces order
+    """
+    global __generate_namespace_post_processings
+
+    generated_post_processings = {}
+    if max_workers > 1 and len(namespaces) >= POST_PROCESSING_PARALLEL_MIN_NAMESPACES \
+            and "fork" in multiprocessing.get_all_start_methods():
+        partitions = partition_namespaces(list(namespaces), max_workers)
+        __generate_namespace_post_processings = generate_namespace_post_processings
+        try:
+            with ProcessPoolExecutor(max_workers=len(partitions), mp_context=multiprocessing.get_context("fork"),
+                                     initializer=__initialize_worker) as executor:
+                futures = [executor.submit(__generate_partition_post_processings, partition)
+                           for partition in partitions]
+                for partition, future in zip(partitions, futures):
+                    try:
+                        for namespace, serialised_post_processings, error in future.result():
+                            if error is not None:
+                                logger.error(f"Post-processing generation failed for {namespace}: {error}")
+                            else:
+                                generated_post_processings[namespace] = pickle.loads(serialised_post_processings)
+                    except Exception as error:
+                        # the worker process died (memory exhausted for example), the partition is generated here
+                        logger.warning(f"Post-processing worker failed ({error}), "
+                                       f"{len(partition)} namespace(s) generated in the current process")
+                        generated_post_processings.update(
+                            __generate_namespaces_post_processings(partition, generate_namespace_post_processings,
+                                                                   logger))
+        finally:
+            __generate_namespace_post_processings = None
+    else:
+        generated_post_processings = __generate_namespaces_post_processings(
+            namespaces, generate_namespace_post_processings, logger)
+
+    # results are merged in namespaces order whatever the order the partitions finished in
+    return {namespace: generated_post_processings[namespace] for namespace in namespaces
+            if generated_post_processings.get(namespace)}
+
+
+def __generate_namespaces_post_processings(namespaces, generate_namespace_post_processings, logger) -> dict:
+    """
+    Generate the post-processings of namespaces one by one in the current process
+    """
+    generated_post_processings = {}
+    for namespace in namespaces:
+        try:
+            generated_post_processings[namespace] = generate_namespace_post_processings(namespace)
+        except Exception as error:
+            logger.exception(f"Post-processing generation failed for {namespace}: {error}")
+    return generated_post_processings
+
+
+def __initialize_worker():
+    """
+    Forked processes share the handlers of the server (database connections among others),
+    they do not log anything and report their errors to the parent process instead
+    """
+    logging.disable(logging.CRITICAL)
+
+
+def __generate_partition_post_processings(namespaces) -> list[tuple]:
+    """
+    Generate the post-processings of a partition in a forked process.
+    Post-processings are serialised namespace by namespace so that a result that cannot be sent back
+    to the parent process only fails its own namespace.
+
+    :return: list of (namespace, serialised post-processings, error) tuples
+    """
+    results = []
+    for namespace in namespaces:
+        try:
+            post_processings = __generate_namespace_post_processings(namespace)
+            results.append((namespace, pickle.dumps(post_processings, protocol=pickle.HIGHEST_PROTOCOL), None))
+        except Exception as error:
+            results.append((namespace, None, f"{error}\n{traceback.format_exc()}"))
+    return results
@@ -27,6 +27,7 @@ from sos_trades_api.models.database_models import (
     User,
 )
 from sos_trades_api.server.base_server import db
+from sos_trades_api.tools.cache.process_catalogue_cache import bump_catalogue_version
 from sos_trades_api.tools.right_management.functional import process_access_right
 
 """
@@ -255,6 +256,7 @@ def update_database_with_process(additional_repository_list=None, logger=None, d
                 f'Removed process with id : {process.id} and name : "{process.name}"')
             db.session.delete(process)
 
+    bump_catalogue_version()
     db.session.commit()
 
 
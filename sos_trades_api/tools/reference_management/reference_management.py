@@ -14,181 +14,237 @@ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 See the License for the specific language governing permissions and
 limitations under the License.
 '''
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
+from hashlib import sha256
 from importlib import import_module
-from os import listdir, stat
+from importlib.util import find_spec
+from os import cpu_count, listdir, stat
 from os.path import dirname, isdir, join
+from traceback import format_exc
 
 from sos_trades_api.config import Config
 from sos_trades_api.models.database_models import Process, ReferenceStudy
 from sos_trades_api.server.base_server import db
+from sos_trades_api.tools.cache.process_catalogue_cache import bump_catalogue_version
 
 """
 Reference management
 """
 
+# number of processes importing the usecases during the reference discovery
+REFERENCE_DISCOVERY_MAX_WORKERS = min(8, cpu_count() or 1)
+
 
 def update_database_with_references(logger=None):
     """
     Method that retrieve all available references and inject them into database
-    If a reference already exist in database it will be enabled or disabled regarding
-    is the reference is found into the source code
+    If a reference already exist in database it is kept, references no more found into the source code
+    are deleted
 
     The methods check for processes using:
     - The PYTHONPATH environment variable
     - A list set in flask server configuration ('SOS_TRADES_PROCESS_REPOSITORY' key)
 
+    Usecases are only imported (in a pool of processes) for the process directories that changed since
+    the last discovery, the type of the references of unchanged processes is kept from database
+
     :params: logger, logging message
     :type: Logger
     """
     # Retrieve reference base path
     reference_basepath = Config().reference_root_dir
 
-    # Retrieve all references from database
+    # Index all references from database by reference path, type and process
     all_database_references = ReferenceStudy.query.all()
-
-    # Disabled all existing references
-    for reference in all_database_references:
-        reference.disabled = True
-        db.session.add(reference)
-    logger.info(f"{len(all_database_references)} existing references disabled found")
+    database_references_index = {}
+    for reference in sorted(all_database_references, key=lambda ref: ref.id):
+        database_references_index.setdefault(
+            (reference.reference_path, reference.reference_type, reference.process_id), []).append(reference)
+    logger.info(f"{len(all_database_references)} existing references found")
 
     # Retrieve all existing process from database
     all_database_processes = Process.query.all()
 
-    new_references_count = 0
-    enabled_references_count = 0
-
-    # Looping through processes to check reference(s) per process
+    # Find the usecases of each process without importing them
+    process_usecases = {}
+    usecases_to_import = []
+    process_fingerprint_mappings = []
     for process in all_database_processes:
-        # Retrieve process module
-        imported_module = import_module(".".join([process.process_path, process.name]))
-        if imported_module.__file__ is not None:
-            process_directory = dirname(imported_module.__file__)
-            # Loop through activated usecases in folder
-            for usecase_py in listdir(process_directory):
-                if usecase_py.startswith("usecase") and usecase_py.endswith(".py"):
-                    usecase = usecase_py.replace(".py", "")
-                    # Check if imported_usecase is already generated
-                    if isdir(join(reference_basepath, process.process_path, process.name, usecase)):
-                        dm_pkl_exists = True
-                    else:
-                        dm_pkl_exists = False
-
-                    is_uc_data = is_usecase_data(process, usecase, logger)
-                    if is_uc_data is not None:
-                        if is_usecase_data(process, usecase, logger):
-                            ref_type = ReferenceStudy.TYPE_USECASE_DATA
-                        else:
-                            ref_type = ReferenceStudy.TYPE_REFERENCE
-                        # Save reference in database
-                        enabled_ref, new_ref = save_reference_in_database(process, usecase, all_database_references,
-                                                                          reference_basepath, ref_type, dm_pkl_exists,
-                                                                          logger)
-                        enabled_references_count += enabled_ref
-                        new_references_count += new_ref
-
-    logger.info(f"{new_references_count} new reference(s) found")
-    logger.info(f"{enabled_references_count} enabled reference(s)")
-
-    disabled_references = ReferenceStudy.query.filter(ReferenceStudy.disabled).all()
-
-    if len(disabled_references) > 0:
-        logger.info(f"{len(disabled_references)} disabled reference found.")
-
-        logger.info("Start deleting disabled references...")
-        for ref in disabled_references:
-            db.session.delete(ref)
+        process_directory = get_process_directory(process)
+        if process_directory is None:
+            logger.warning(f"Process {process.process_path}.{process.name} cannot be found")
+            continue
+
+        usecases = sorted(usecase_py.replace(".py", "") for usecase_py in listdir(process_directory)
+                          if usecase_py.startswith("usecase") and usecase_py.endswith(".py"))
+        process_usecases[process.id] = usecases
+
+        # Usecases of unchanged process directories keep the result of the last discovery
+        fingerprint = get_process_directory_fingerprint(process_directory)
+        if fingerprint != process.reference_discovery_fingerprint:
+            process_fingerprint_mappings.append({"id": process.id, "reference_discovery_fingerprint": fingerprint})
+            usecases_to_import.extend((process.id, f"{process.process_path}.{process.name}.{usecase}")
+                                      for usecase in usecases)
+
+    logger.info(f"{len(usecases_to_import)} usecase(s) to import in "
+                f"{len(process_fingerprint_mappings)} new or modified process(es)")
+    usecases_data = get_usecases_data(usecases_to_import, logger)
+
+    # A process is recorded as discovered only if all its usecases have been imported,
+    # the usecases of the others are imported again at the next discovery
+    failed_process_ids = {process_id for process_id, reference_path in usecases_to_import
+                          if usecases_data.get((process_id, reference_path)) is None}
+    if len(failed_process_ids) > 0:
+        logger.warning(f"{len(failed_process_ids)} process(es) with usecase(s) that could not be imported, "
+                       "they will be discovered again")
+    process_fingerprint_mappings = [process_fingerprint_mapping
+                                    for process_fingerprint_mapping in process_fingerprint_mappings
+                                    if process_fingerprint_mapping["id"] not in failed_process_ids]
+
+    new_reference_mappings = []
+    updated_reference_mappings = []
+    kept_reference_ids = set()
 
+    for process in all_database_processes:
+        for usecase in process_usecases.get(process.id, []):
+            reference_path = f"{process.process_path}.{process.name}.{usecase}"
+
+            if (process.id, reference_path) in usecases_data:
+                is_uc_data = usecases_data[(process.id, reference_path)]
+                if is_uc_data is None:
+                    continue
+                ref_type = ReferenceStudy.TYPE_USECASE_DATA if is_uc_data else ReferenceStudy.TYPE_REFERENCE
+            elif (reference_path, ReferenceStudy.TYPE_REFERENCE, process.id) in database_references_index:
+                ref_type = ReferenceStudy.TYPE_REFERENCE
+            elif (reference_path, ReferenceStudy.TYPE_USECASE_DATA, process.id) in database_references_index:
+                ref_type = ReferenceStudy.TYPE_USECASE_DATA
+            else:
+                # the usecase could not be imported at the last discovery
+                continue
+
+            # Check if usecase is already generated
+            reference_mapping = {
+                "name": usecase,
+                "process_id": process.id,
+                "reference_type": ref_type,
+                "disabled": False,
+                "execution_status": ReferenceStudy.UNKNOWN,
+                "creation_date": None,
+            }
+            dm_pkl_path = join(reference_basepath, process.process_path, process.name, usecase, "dm.pkl")
+            if isdir(dirname(dm_pkl_path)):
+                reference_mapping["execution_status"] = ReferenceStudy.FINISHED
+                reference_mapping["creation_date"] = datetime.fromtimestamp(stat(dm_pkl_path).st_mtime)\
+                    .astimezone(timezone.utc).replace(tzinfo=None)
+
+            existing_references = database_references_index.get((reference_path, ref_type, process.id), [])
+            if len(existing_references) > 0:
+                # Keep initial reference, duplicates are deleted with the references no more found
+                existing_reference = existing_references[0]
+                kept_reference_ids.add(existing_reference.id)
+                reference_mapping["id"] = existing_reference.id
+                updated_reference_mappings.append(reference_mapping)
+            else:
+                reference_mapping["reference_path"] = reference_path
+                reference_mapping["generation_logs"] = ""
+                new_reference_mappings.append(reference_mapping)
+
+    deleted_reference_ids = [reference.id for reference in all_database_references
+                             if reference.id not in kept_reference_ids]
+
+    logger.info(f"{len(new_reference_mappings)} new reference(s) found")
+    logger.info(f"{len(updated_reference_mappings) + len(new_reference_mappings)} enabled reference(s)")
+
+    # References are written in bulk
+    if len(deleted_reference_ids) > 0:
+        logger.info(f"Start deleting {len(deleted_reference_ids)} reference(s) no more found...")
+        ReferenceStudy.query.filter(ReferenceStudy.id.in_(deleted_reference_ids)).delete(synchronize_session=False)
+    db.session.bulk_update_mappings(ReferenceStudy, updated_reference_mappings)
+    db.session.bulk_insert_mappings(ReferenceStudy, new_reference_mappings)
+    db.session.bulk_update_mappings(Process, process_fingerprint_mappings)
+
+    bump_catalogue_version()
     db.session.commit()
 
 
-def save_reference_in_database(process, usecase, all_database_references,
-                               reference_basepath, type_reference, dm_pkl_exists, logger):
-    # Check if reference is present in database and has correct information
-    enabled_ref = 0
-    new_ref = 0
-
-    loaded_reference = list(filter(
-        lambda ref: ref.reference_path == f"{process.process_path}.{process.name}.{usecase}" and
-                    ref.reference_type == type_reference and
-                    ref.process_id == process.id
-        , all_database_references),
-    )
-    # Case reference exist in database
-    if len(loaded_reference) > 0:
-        if len(loaded_reference) == 1:
-            existing_reference = loaded_reference[0]
-        else:
-            # Remove last entry in duplicate
-            loaded_reference_sorted = sorted(loaded_reference, key=lambda ref: ref.id)
-            for i in range(1, len(loaded_reference_sorted)):
-                logger.info(f"Removed one duplicate entry for reference {loaded_reference_sorted[i].name} "
-                            f"with process_id {loaded_reference_sorted[i].process_id}"
-                            f"and id of duplicate {loaded_reference_sorted[i].id}")
-                db.session.delete(loaded_reference_sorted[i])
-            # Keep initial process
-            existing_reference = loaded_reference_sorted[0]
-
-        existing_reference.name = usecase
-        existing_reference.process_id = process.id
-        existing_reference.reference_type = type_reference
-        existing_reference.disabled = False
-
-        if dm_pkl_exists:
-            # Update date in case regenerated by CI/CD job
-            existing_reference.execution_status = ReferenceStudy.FINISHED
-            existing_reference.creation_date = \
-                datetime.fromtimestamp(stat(join(reference_basepath, process.process_path,
-                                                 process.name, usecase, "dm.pkl"))
-                                       .st_mtime).astimezone(timezone.utc).replace(tzinfo=None)
-        else:
-            existing_reference.execution_status = ReferenceStudy.UNKNOWN
-            existing_reference.creation_date = None
+def get_process_directory(process):
+    """
+    Return the directory of a process module without importing it, None if it cannot be found
+
+    :param process: process to locate
+    :type process: sos_trades_api.models.database_models.Process
+    :return: str
+    """
+    try:
+        module_spec = find_spec(".".join([process.process_path, process.name]))
+    except (ImportError, ValueError):
+        return None
+    if module_spec is None or module_spec.origin is None:
+        return None
+    return dirname(module_spec.origin)
 
-        enabled_ref += 1
-        # Save in db updated ref
-        db.session.add(existing_reference)
 
+def get_process_directory_fingerprint(process_directory):
+    """
+    Compute a fingerprint of the files of a process directory from their name, size and modification time
+
+    :param process_directory: directory of the process module
+    :type process_directory: str
+    :return: str
+    """
+    fingerprint = sha256()
+    for file_name in sorted(listdir(process_directory)):
+        file_stat = stat(join(process_directory, file_name))
+        fingerprint.update(f"{file_name}:{file_stat.st_size}:{file_stat.st_mtime_ns};".encode())
+    return fingerprint.hexdigest()
+
+
+def get_usecases_data(usecases, logger):
+    """
+    Import usecases in a pool of processes to check if they are usecase data or references
+
+    :param usecases: process identifier and module name of the usecases to import
+    :type usecases: list[tuple[int, str]]
+    :param logger: logging message
+    :type logger: logging.Logger
+    :return: dict with the usecase data flag by process identifier and module name, None if the import failed
+    """
+    results = {}
+    if len(usecases) == 0:
+        return results
+
+    module_names = [module_name for _, module_name in usecases]
+    max_workers = min(REFERENCE_DISCOVERY_MAX_WORKERS, len(usecases))
+    if max_workers > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            usecases_results = list(executor.map(is_usecase_data, module_names))
     else:
-        # Create a new reference
-        new_reference = ReferenceStudy()
-        new_reference.name = usecase
-        new_reference.reference_path = f"{process.process_path}.{process.name}.{usecase}"
-        new_reference.process_id = process.id
-        new_reference.reference_type = type_reference
-        new_reference.creation_date = None
-        new_reference.disabled = False
-        new_reference.generation_logs = ""
-
-        if dm_pkl_exists:
-            new_reference.execution_status = ReferenceStudy.FINISHED
-            new_reference.creation_date = \
-                datetime.fromtimestamp(stat(join(reference_basepath, process.process_path,
-                                                 process.name, usecase, "dm.pkl"))
-                                       .st_mtime).astimezone(timezone.utc).replace(tzinfo=None)
-        else:
-            new_reference.execution_status = ReferenceStudy.UNKNOWN
+        usecases_results = [is_usecase_data(module_name) for module_name in module_names]
 
-        new_ref += 1
-        enabled_ref += 1
-        # Save in db new ref
-        db.session.add(new_reference)
+    for (process_id, module_name), (is_uc_data, error) in zip(usecases, usecases_results):
+        if error is not None:
+            logger.error(f"Usecase {module_name} cannot be imported\n{error}")
+        results[(process_id, module_name)] = is_uc_data
+    return results
 
-    return enabled_ref, new_ref
 
+def is_usecase_data(module_name):
+    """
+    Import a usecase to check if it is a usecase data, run in the discovery pool processes
 
-def is_usecase_data(process, usecase, logger):
+    :param module_name: module name of the usecase
+    :type module_name: str
+    :return: tuple with True if it is a usecase data, None if the import failed, and the import error
+    """
     try:
-        imported_module = import_module(".".join([process.process_path, process.name, usecase]))
+        imported_module = import_module(module_name)
         imported_usecase = imported_module.Study()
 
         if hasattr(imported_usecase, "run_usecase") and not imported_usecase.run_usecase:
-            return True
+            return True, None
         else:
-            return False
+            return False, None
 
-    except:
-        logger.exception(f"Usecase {process.process_path}.{process.name}.{usecase} "
-                         f"cannot be imported")
-        return None
+    except Exception:
+        return None, format_exc()
@@ -22,12 +22,14 @@ from importlib import import_module
 from sos_trades_api.config import Config
 from sos_trades_api.models.database_models import ReferenceStudy
 from sos_trades_api.server.base_server import app, db
+from sos_trades_api.tools.cache.process_catalogue_cache import bump_catalogue_version
 
 with app.app_context():
 
     ref_model_id = int(sys.argv[2])
     ref_gen_model = ReferenceStudy.query.filter(ReferenceStudy.id == ref_model_id).update({
         "execution_status": ReferenceStudy.RUNNING})
+    bump_catalogue_version()
     db.session.commit()
     # reference_basepath = sys.argv[3]  # Config().reference_root_dir
     reference_basepath = Config().reference_root_dir
@@ -44,8 +46,10 @@ with app.app_context():
             pass
         ref_gen_model = ReferenceStudy.query.filter(ReferenceStudy.id == ref_model_id).update({
             "execution_status": ReferenceStudy.FINISHED})
+        bump_catalogue_version()
         db.session.commit()
     except Exception as e:
         ref_gen_model = ReferenceStudy.query.filter(ReferenceStudy.id == ref_model_id).update(
             {"execution_status": ReferenceStudy.FAILED, "generation_logs": str(e)})
+        bump_catalogue_version()
         db.session.commit()
@@ -22,6 +22,7 @@ from sos_trades_api.models.database_models import (
 )
 from sos_trades_api.models.loaded_process import LoadedProcess
 from sos_trades_api.server.base_server import db
+from sos_trades_api.tools.cache.process_catalogue_cache import get_process_catalogue
 from sos_trades_api.tools.right_management.functional.tools_access_right import (
     ResourceAccess,
 )
@@ -66,13 +67,14 @@ class ProcessAccess(ResourceAccess):
         1 - get process declared for the user
         2 - get process declared for groups where the user belongs
         3 - add all non accessible process (no rights but listed anyway)
+        Processes come from the in-memory catalogue, only the rights are read in database
         """
         self.__reset()
+        catalogue = get_process_catalogue()
 
         # Manage retrieving of process where the user is declared
         user_process_list = (
-            db.session.query(Process, AccessRights)
-            .filter(Process.id == ProcessAccessUser.process_id)
+            db.session.query(ProcessAccessUser.process_id, AccessRights)
             .filter(ProcessAccessUser.user_id == self.user_id)
             .filter(AccessRights.id == ProcessAccessUser.right_id)
             .all()
@@ -80,8 +82,10 @@ class ProcessAccess(ResourceAccess):
 
         for ups in user_process_list:
 
-            current_process = ups[0]
+            current_process = catalogue.get_process(ups[0])
             current_access_rights = ups[1]
+            if current_process is None:
+                continue
 
             # Adding process to process list
             self._user_process_list[current_process.id] = current_process
@@ -104,17 +108,18 @@ class ProcessAccess(ResourceAccess):
         # Manage retrieving of process where the user belong to q declared groups
         # retrieve all process authorised by groups
         group_process_list = (
-            db.session.query(Process, AccessRights)
-            .filter(Process.id == ProcessAccessGroup.process_id)
+            db.session.query(ProcessAccessGroup.process_id, AccessRights)
             .filter(ProcessAccessGroup.group_id.in_(user_group_ids))
             .filter(AccessRights.id == ProcessAccessGroup.right_id)
             .all()
         )
 
         for gpl in group_process_list:
-            current_group_process = gpl[0]
+            current_group_process = catalogue.get_process(gpl[0])
             current_access_rights = gpl[1]
             loaded_process_to_manage = None
+            if current_group_process is None:
+                continue
 
             if current_group_process.id in self._user_process_list:
 
@@ -143,16 +148,9 @@ class ProcessAccess(ResourceAccess):
                 loaded_process_to_manage.is_contributor = True
 
         # Add all other process with no rights
-        all_processes = Process.query.all()
+        for one_process in catalogue.get_processes():
 
-        # Get all process already in the user list
-        already_manage_processes_identifier = list(
-            self._user_loaded_process_list.keys(),
-        )
-
-        for one_process in all_processes:
-
-            if one_process.id not in already_manage_processes_identifier:
+            if one_process.id not in self._user_loaded_process_list:
                 new_loaded_process = LoadedProcess(
                     one_process.id, one_process.name, one_process.process_path,
                 )
@@ -189,12 +187,9 @@ class ProcessAccess(ResourceAccess):
 
             # retrieve process id
             if process_name is not None and repository_name is not None:
-                current_process = Process.query.filter(
-                    Process.name == process_name,
-                    Process.process_path == repository_name,
-                ).first()
+                current_process = get_process_catalogue().get_process_by_name(process_name, repository_name)
             elif process_id is not None:
-                current_process = Process.query.filter(Process.id == process_id).first()
+                current_process = get_process_catalogue().get_process(process_id)
 
             if current_process is not None:
                 if current_process.id in self._user_loaded_process_list:
@@ -242,11 +237,7 @@ class ProcessAccess(ResourceAccess):
         """
         authorized_process_list = []
 
-        all_processes = Process.query.filter(
-            Process.disabled == with_disabled_process,
-        ).all()
-
-        for process in all_processes:
+        for process in get_process_catalogue().get_processes(disabled=with_disabled_process):
 
             if process.id in self._user_loaded_process_list:
                 authorized_process_list.append(
@@ -14,6 +14,8 @@ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 See the License for the specific language governing permissions and
 limitations under the License.
 '''
+from sqlalchemy import and_, false, or_
+
 from sos_trades_api.controllers.error_classes import InvalidStudy
 from sos_trades_api.models.database_models import (
     AccessRights,
@@ -36,18 +38,24 @@ methods to define access rights for a group
 class StudyCaseAccess(ProcessAccess):
     """Class containing the access right for study case regarding a given user in SoSTrades."""
 
-    def __init__(self, user_id, study_case_identifier=None):
+    def __init__(self, user_id, study_case_identifier=None, study_case_filters=None, load_study_cases=True):
         """
         Constructor
         :param user_id: user identifier to manage
         :type user_id: int
         :param study_case_identifier: (Optional) specific study case to check
+        :param study_case_filters: (Optional) sqlalchemy criteria on StudyCase limiting the retrieved study cases
+        :type study_case_filters: list
+        :param load_study_cases: (Optional) False to only load the user groups and processes, the study cases
+        are then retrieved by calling retrieve_user_study_cases
+        :type load_study_cases: bool
         """
         super().__init__(user_id)
 
         self.__reset()
 
-        self.retrieve_user_study_cases(study_case_identifier)
+        if load_study_cases:
+            self.retrieve_user_study_cases(study_case_identifier, study_case_filters)
 
     @property
     def user_study_cases(self):
@@ -67,7 +75,7 @@ class StudyCaseAccess(ProcessAccess):
         # List that contains every study visible for the user
         self.__raw_study_case_list = {}
 
-    def retrieve_user_study_cases(self, study_case_identifier=None):
+    def retrieve_user_study_cases(self, study_case_identifier=None, study_case_filters=None):
         """
         Retrieve all study cases in database and set access right regarding user for which the request is done
         Algorithm work in three phase
@@ -76,6 +84,8 @@ class StudyCaseAccess(ProcessAccess):
 
         :param study_case_identifier: (Optional) is provided limit search to the given study case
         :type study_case_identifier: int
+        :param study_case_filters: (Optional) sqlalchemy criteria on StudyCase, applied in the database queries
+        :type study_case_filters: list
         """
         self.__reset()
 
@@ -104,6 +114,8 @@ class StudyCaseAccess(ProcessAccess):
             user_study_cases_query = user_study_cases_query.filter(
                 StudyCase.id == study_case_identifier,
             )
+        if study_case_filters:
+            user_study_cases_query = user_study_cases_query.filter(*study_case_filters)
 
         user_study_cases = user_study_cases_query.all()
 
@@ -154,6 +166,8 @@ class StudyCaseAccess(ProcessAccess):
             group_study_cases_query = group_study_cases_query.filter(
                 StudyCase.id == study_case_identifier,
             )
+        if study_case_filters:
+            group_study_cases_query = group_study_cases_query.filter(*study_case_filters)
 
         group_study_cases = group_study_cases_query.all()
 
@@ -213,6 +227,38 @@ class StudyCaseAccess(ProcessAccess):
             elif current_access_rights.access_right == AccessRights.RESTRICTED_VIEWER:
                 new_study_dto.is_restricted_viewer = True
 
+    def get_user_study_cases_criterion(self):
+        """
+        Return the sqlalchemy criterion on StudyCase selecting the enabled study cases available for the user,
+        same rules as retrieve_user_study_cases so that the study cases can be filtered, sorted and paginated
+        by the database. The owner group of the study cases is not checked, it has to be joined by the query
+
+        :return: sqlalchemy criterion
+        """
+        # Study cases authorised directly to the user are kept only for the processes of the catalogue
+        repository_processes = {}
+        for loaded_process in self._user_loaded_process_list_by_name.values():
+            repository_processes.setdefault(loaded_process.repository_id, []).append(loaded_process.process_id)
+        process_criterion = or_(false(), *[
+            and_(StudyCase.repository == repository, StudyCase.process.in_(processes))
+            for repository, processes in repository_processes.items()
+        ])
+
+        user_study_case_identifiers = db.session.query(StudyCaseAccessUser.study_case_id).filter(
+            StudyCaseAccessUser.user_id == self.user_id,
+        )
+        group_study_case_identifiers = db.session.query(StudyCaseAccessGroup.study_case_id).filter(
+            StudyCaseAccessGroup.group_id.in_(list(self._user_groups_list.keys())),
+        )
+
+        return and_(
+            StudyCase.disabled.is_(False),
+            or_(
+                and_(StudyCase.id.in_(user_study_case_identifiers), process_criterion),
+                StudyCase.id.in_(group_study_case_identifiers),
+            ),
+        )
+
     def check_user_right_for_study(self, right_type, study_case_identifier):
         """
         Methods that check that the given user right to have a specific right for a specific study
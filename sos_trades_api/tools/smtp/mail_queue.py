@@ -0,0 +1,257 @@
+'''
+Copyright 2026 Capgemini
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import smtplib
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email import message_from_bytes, policy
+from smtplib import SMTPRecipientsRefused, SMTPResponseException
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from sos_trades_api.models.database_models import MailQueueItem
+from sos_trades_api.server.base_server import app, db
+
+"""
+Outbound mail queue: mails are stored in database by the requests and sent by a background worker
+"""
+
+# number of mails claimed and sent on the same SMTP connection at each iteration
+MAIL_QUEUE_BATCH_SIZE = 50
+# number of failed attempts before a mail is set in error
+MAIL_QUEUE_MAX_ATTEMPTS = 5
+# delay in seconds before the first retry, doubled at each failed attempt
+MAIL_QUEUE_RETRY_DELAY = 30
+# delay in seconds between two checks of the queue when the worker is not woken up
+MAIL_QUEUE_POLL_INTERVAL = 60
+# delay in seconds after which an unused SMTP connection is closed
+MAIL_QUEUE_CONNECTION_IDLE_TIMEOUT = 30
+# delay in seconds after which a mail claimed by a worker that did not send it (killed server) is claimed again
+MAIL_QUEUE_SENDING_TIMEOUT = 600
+# number of days sent mails are kept in the queue table, their content (reset links...) is removed once sent
+MAIL_QUEUE_SENT_RETENTION_DAYS = 7
+
+
+def get_utc_now():
+    return datetime.now().astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def queue_mail(message) -> bool:
+    """
+    Store a mail in the outbound mail queue and wake the worker up, the mail is sent asynchronously
+
+    :param message: mail to send
+    :type message: email.message.EmailMessage
+
+    :return: True if the mail has been queued
+    """
+    mail = MailQueueItem()
+    mail.sender = message["From"]
+    mail.recipients = message["To"]
+    mail.subject = message["Subject"]
+    mail.message = message.as_bytes()
+    mail.status = MailQueueItem.PENDING
+    mail.attempts = 0
+    mail.next_attempt_date = get_utc_now()
+
+    try:
+        # own session so that the pending changes of the caller are neither committed nor rolled back here
+        with Session(db.engine) as mail_session:
+            mail_session.add(mail)
+            mail_session.commit()
+    except Exception:
+        app.logger.exception("Unable to store mail in the outbound mail queue")
+        return False
+
+    MailQueueWorker.get_instance().wake_up()
+    return True
+
+
+class MailQueueWorker:
+    """
+    Background worker sending the queued mails by batch, reusing one SMTP connection across messages.
+    Mails are claimed in database before being sent so that several servers can run a worker on the same queue.
+    """
+
+    __instance = None
+    __instance_lock = threading.Lock()
+
+    def __init__(self, batch_size=MAIL_QUEUE_BATCH_SIZE, max_attempts=MAIL_QUEUE_MAX_ATTEMPTS,
+                 retry_delay=MAIL_QUEUE_RETRY_DELAY, poll_interval=MAIL_QUEUE_POLL_INTERVAL,
+                 connection_idle_timeout=MAIL_QUEUE_CONNECTION_IDLE_TIMEOUT):
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.poll_interval = poll_interval
+        self.connection_idle_timeout = connection_idle_timeout
+
+        self.__wake_up_event = threading.Event()
+        self.__thread = None
+        self.__thread_lock = threading.Lock()
+        self.__smtp_connection = None
+        self.__smtp_connection_last_use = None
+
+    @classmethod
+    def get_instance(cls):
+        """
+        Return the worker of this server, it is created at the first call
+        """
+        with cls.__instance_lock:
+            if cls.__instance is None:
+                cls.__instance = MailQueueWorker()
+            return cls.__instance
+
+    def start(self):
+        """
+        Start the worker thread if it is not already running
+        """
+        with self.__thread_lock:
+            if self.__thread is None or not self.__thread.is_alive():
+                self.__thread = threading.Thread(target=self.__run, name="mail_queue_worker", daemon=True)
+                self.__thread.start()
+
+    def wake_up(self):
+        """
+        Notify the worker that new mails have been queued
+        """
+        self.start()
+        self.__wake_up_event.set()
+
+    def __run(self):
+        while True:
+            self.__wake_up_event.clear()
+            processed_count = 0
+            try:
+                with app.app_context():
+                    processed_count = self.process_batch()
+                    if processed_count == 0:
+                        self.purge_sent_mails()
+            except Exception:
+                app.logger.exception("Error while processing the outbound mail queue")
+
+            # a full batch means that other mails may be waiting
+            if processed_count < self.batch_size:
+                wait_delay = self.poll_interval
+                if self.__smtp_connection is not None:
+                    wait_delay = min(wait_delay, self.connection_idle_timeout)
+                self.__wake_up_event.wait(timeout=wait_delay)
+
+            if self.__smtp_connection is not None and \
+                    time.monotonic() - self.__smtp_connection_last_use >= self.connection_idle_timeout:
+                self.__close_connection()
+
+    def __claim_batch(self) -> list:
+        """
+        Claim the mails to send, the claim is committed before sending so that another worker skips them
+        """
+        now = get_utc_now()
+        mails = MailQueueItem.query.filter(or_(
+            and_(MailQueueItem.status == MailQueueItem.PENDING,
+                 MailQueueItem.next_attempt_date <= now),
+            and_(MailQueueItem.status == MailQueueItem.SENDING,
+                 MailQueueItem.claim_date <= now - timedelta(seconds=MAIL_QUEUE_SENDING_TIMEOUT)),
+        )).order_by(MailQueueItem.id).limit(self.batch_size).with_for_update(skip_locked=True).all()
+
+        for mail in mails:
+            mail.status = MailQueueItem.SENDING
+            mail.claim_date = now
+        db.session.commit()
+
+        return mails
+
+    def process_batch(self) -> int:
+        """
+        Send a batch of queued mails on the same SMTP connection
+
+        :return: number of mails processed
+        """
+        mails = self.__claim_batch()
+
+        try:
+            for index, mail in enumerate(mails):
+                try:
+                    connection = self.__get_connection()
+                except Exception as error:
+                    # the server is not reachable, the remaining mails are released without consuming an attempt
+                    self.__set_mail_failed(mail, error)
+                    for remaining_mail in mails[index + 1:]:
+                        remaining_mail.status = MailQueueItem.PENDING
+                        remaining_mail.next_attempt_date = get_utc_now() + timedelta(seconds=self.retry_delay)
+                    break
+
+                try:
+                    message = message_from_bytes(mail.message, policy=policy.default)
+                    try:
+                        connection.send_message(message)
+                    except smtplib.SMTPServerDisconnected:
+                        # the server closed the kept connection (idle timeout), send again on a new one
+                        self.__close_connection()
+                        self.__get_connection().send_message(message)
+                    self.__smtp_connection_last_use = time.monotonic()
+                    mail.status = MailQueueItem.SENT
+                    mail.sent_date = get_utc_now()
+                    mail.last_error = None
+                    # only the envelope is kept until the purge, the content may hold a password reset link
+                    mail.message = b""
+                except Exception as error:
+                    # a refused mail does not compromise the connection, unlike a network or protocol error
+                    if not isinstance(error, (SMTPRecipientsRefused, SMTPResponseException)):
+                        self.__close_connection()
+                    self.__set_mail_failed(mail, error)
+        finally:
+            # the mails already sent must not be claimed and sent again
+            db.session.commit()
+        return len(mails)
+
+    def __set_mail_failed(self, mail, error):
+        mail.attempts += 1
+        mail.last_error = str(error)
+        if mail.attempts >= self.max_attempts:
+            mail.status = MailQueueItem.IN_ERROR
+            mail.message = b""
+            app.logger.error(f'Mail "{mail.subject}" to {mail.recipients} not sent after {mail.attempts} attempts: {error}')
+        else:
+            mail.status = MailQueueItem.PENDING
+            mail.next_attempt_date = get_utc_now() + timedelta(seconds=self.retry_delay * 2 ** (mail.attempts - 1))
+            app.logger.warning(f'Mail "{mail.subject}" to {mail.recipients} not sent, new attempt planned: {error}')
+
+    def purge_sent_mails(self):
+        """
+        Delete the sent mails older than the retention delay
+        """
+        MailQueueItem.query.filter(
+            MailQueueItem.status == MailQueueItem.SENT,
+            MailQueueItem.sent_date < get_utc_now() - timedelta(days=MAIL_QUEUE_SENT_RETENTION_DAYS),
+        ).delete(synchronize_session=False)
+        db.session.commit()
+
+    def __get_connection(self):
+        """
+        Return the current SMTP connection, a new one is opened if there is none
+        """
+        if self.__smtp_connection is None:
+            self.__smtp_connection = smtplib.SMTP(app.config["SMTP_SERVER"])
+            self.__smtp_connection_last_use = time.monotonic()
+        return self.__smtp_connection
+
+    def __close_connection(self):
+        if self.__smtp_connection is not None:
+            try:
+                self.__smtp_connection.quit()
+            except (smtplib.SMTPException, OSError):
+                self.__smtp_connection.close()
+            self.__smtp_connection = None
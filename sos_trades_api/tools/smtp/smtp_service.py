@@ -14,14 +14,13 @@ See the License for the specific language governing permissions and
 limitations under the License.
 
 '''
-import smtplib
 from email.message import EmailMessage
-from smtplib import SMTPException
 
 from sos_trades_api.server.base_server import app
+from sos_trades_api.tools.smtp.mail_queue import queue_mail
 
 """
-SMTP service
+SMTP service, mails are stored in the outbound mail queue and sent asynchronously by its worker
 """
 
 
@@ -65,12 +64,7 @@ def send_new_user_mail(user):
         </html>
     """ % (user.username, user.firstname, user.lastname, user.email, app.config["SOS_TRADES_ENVIRONMENT"]), subtype="html")
 
-    try:
-        smtp_obj = smtplib.SMTP(app.config["SMTP_SERVER"])
-        smtp_obj.send_message(message)
-        return True
-    except SMTPException:
-        return False
+    return queue_mail(message)
 
 
 def send_right_update_mail(user, profilename):
@@ -105,12 +99,7 @@ def send_right_update_mail(user, profilename):
         </html>
     """ % (profilename), subtype="html")
 
-    try:
-        smtp_obj = smtplib.SMTP(app.config["SMTP_SERVER"])
-        smtp_obj.send_message(message)
-        return True
-    except SMTPException:
-        return False
+    return queue_mail(message)
 
 
 def send_password_reset_mail(user, reset_link):
@@ -148,10 +137,4 @@ def send_password_reset_mail(user, reset_link):
         </html>
     """)
 
-    try:
-        smtp_obj = smtplib.SMTP(app.config["SMTP_SERVER"])
-        smtp_obj.send_message(message)
-        return True
-    except SMTPException as ex:
-        print(ex)
-        return False
+    return queue_mail(message)
@@ -23,6 +23,19 @@ tooling to generate D3 js data structure for N2 matrix purpose
 
 
 def get_couplings_force_graph(coupling_matrix_df, ontology_matrix_data):
+    """
+    Build the D3 js force graph data structure of the N2 matrix
+
+    Couplings are indexed by parameter and by discipline in a single pass and
+    ancestors are memoised, so that the generation time is linear regarding the
+    number of couplings
+
+    :param coupling_matrix_df: couplings with 'disc_1', 'disc_2' and 'var_name' columns
+    :type coupling_matrix_df: pandas.DataFrame
+
+    :param ontology_matrix_data: ontology n2 matrix with tree nodes, parameter nodes and hierarchy links
+    :type ontology_matrix_data: dict
+    """
     tree_nodes = ontology_matrix_data["tree_nodes"]
     parameter_nodes = ontology_matrix_data["parameter_nodes"]
     hierarchy_links = ontology_matrix_data["hierarchy_links"]
@@ -35,60 +48,76 @@ def get_couplings_force_graph(coupling_matrix_df, ontology_matrix_data):
     # Create dictionaries to simplify access
     tree_nodes_dict = {element["id"]: element for element in tree_nodes}
     parameters_dict = {element["id"]: element for element in parameter_nodes}
+    ancestors_dict = {}
+
+    # coupling links positions indexed by discipline (output links by source, input links by target)
+    output_links_by_discipline = {}
+    input_links_by_discipline = {}
 
     # Create coupling links
     if coupling_matrix_df is not None:
-        # convert dataframe to dict
-        coupling_matrix_dict = coupling_matrix_df.to_dict(orient="index")
+        couplings = list(zip(coupling_matrix_df["disc_1"].tolist(),
+                             coupling_matrix_df["disc_2"].tolist(),
+                             coupling_matrix_df["var_name"].tolist()))
 
         # create a unique set of ids
-        ids_list = set([key["id"] for key in parameter_nodes + tree_nodes])
+        ids_list = set(tree_nodes_dict.keys()) | set(parameters_dict.keys())
+
+        # in and out links of each parameter
+        parameter_links_dict = {}
 
-        for row in coupling_matrix_dict.values():
-            row_links = []
-            disc_from_id = row["disc_1"]
-            disc_to_id = row["disc_2"]
-            parameter_id = row["var_name"]
+        for disc_from_id, disc_to_id, parameter_id in couplings:
+            output_link_id = disc_from_id + "_TO_" + parameter_id + "_TYPE_OUTPUT OF"
+            input_link_id = parameter_id + "_TO_" + disc_to_id + "_TYPE_INPUT OF"
+
+            in_links, out_links = parameter_links_dict.setdefault(parameter_id, ([], []))
+            out_links.append({"link": output_link_id, "node": disc_from_id})
+            in_links.append({"link": input_link_id, "node": disc_to_id})
 
             # Avoid to create links to nodes that do not exists which would
             # crash the drawing of the matrix
             if disc_from_id in ids_list and parameter_id in ids_list and disc_to_id in ids_list:
-                row_links.append(dict({
-                    "id": disc_from_id + "_TO_" + parameter_id + "_TYPE_OUTPUT OF",
-                    "source": disc_from_id,
-                    "target": parameter_id,
-                    "Type": "OUTPUT_OF",
-                    "Size": 3,
-                    "ancestors": get_ancestors(tree_nodes_dict, disc_from_id),
-                    "active": 0,
-                }))
-
-                row_links.append(dict({
-                    "id": parameter_id + "_TO_" + disc_to_id + "_TYPE_INPUT OF",
-                    "source": parameter_id,
-                    "target": disc_to_id,
-                    "Type": "INPUT_TO",
-                    "Size": 3,
-                    "ancestors": get_ancestors(tree_nodes_dict, disc_to_id),
-                    "active": 0,
-                }))
-
-                for link in row_links:
-                    coupling_links.append(link)
+                disc_from_ancestors = get_ancestors(tree_nodes_dict, disc_from_id, ancestors_dict)
+                disc_to_ancestors = get_ancestors(tree_nodes_dict, disc_to_id, ancestors_dict)
+
+                row_links = [
+                    {
+                        "id": output_link_id,
+                        "source": disc_from_id,
+                        "target": parameter_id,
+                        "Type": "OUTPUT_OF",
+                        "Size": 3,
+                        "ancestors": disc_from_ancestors,
+                        "active": 0,
+                    },
+                    {
+                        "id": input_link_id,
+                        "source": parameter_id,
+                        "target": disc_to_id,
+                        "Type": "INPUT_TO",
+                        "Size": 3,
+                        "ancestors": disc_to_ancestors,
+                        "active": 0,
+                    },
+                ]
+
+                output_links_by_discipline.setdefault(disc_from_id, []).append(len(coupling_links))
+                coupling_links.append(row_links[0])
+                input_links_by_discipline.setdefault(disc_to_id, []).append(len(coupling_links))
+                coupling_links.append(row_links[1])
 
                 # Create an entry for the grouped links
                 id = disc_from_id + "_TO_" + \
                     disc_to_id + "_TYPE_GROUPLINK"
+                parameter = {"id": parameter_id, "Name": parameters_dict.get(parameter_id, {}).get("label", "")}
 
                 if id in grouped_links_dict:
                     grouped_links_dict[id]["Size"] += 1
-                    grouped_links_dict[id]["parameterList"].append(
-                        {"id": parameter_id, "Name": parameters_dict.get(parameter_id, {}).get("label", "")}),
-                    grouped_links_dict[id]["groupedLinks"] += row_links,
-                    grouped_links_dict[id]["groupedNodes"].append(
-                        parameter_id)
+                    grouped_links_dict[id]["parameterList"].append(parameter)
+                    grouped_links_dict[id]["groupedLinks"].append(row_links)
+                    grouped_links_dict[id]["groupedNodes"].append(parameter_id)
                 else:
-                    grouped_links_dict[id] = dict({
+                    grouped_links_dict[id] = {
                         "id": id,
                         "source": disc_from_id,
                         "sourceLabel": tree_nodes_dict[disc_from_id]["Name"],
@@ -96,53 +125,40 @@ def get_couplings_force_graph(coupling_matrix_df, ontology_matrix_data):
                         "targetLabel": tree_nodes_dict[disc_to_id]["Name"],
                         "Type": "parameterExchange",
                         "Size": 1,
-                        "parameterList": [{"id": parameter_id, "Name": parameters_dict.get(parameter_id, {}).get("label", "")}],
-                        "sourceAncestors": get_ancestors(tree_nodes_dict, disc_from_id),
-                        "targetAncestors": get_ancestors(tree_nodes_dict, disc_to_id),
+                        "parameterList": [parameter],
+                        "sourceAncestors": disc_from_ancestors,
+                        "targetAncestors": disc_to_ancestors,
                         "groupedLinks": row_links,
                         "groupedNodes": [parameter_id],
                         "active": 1,
-                    })
+                    }
 
             else:
                 logger.debug(
-                    f'{row["disc_1"]} to {row["disc_2"]} not found in matrix nodes for parameter {row["var_name"]}')
+                    f"{disc_from_id} to {disc_to_id} not found in matrix nodes for parameter {parameter_id}")
 
         #  adding the out and in links for each parameter
         for p in parameter_nodes:
-            in_links = []
-            out_links = []
-            for row in coupling_matrix_dict.values():
-                disc_from_id = row["disc_1"]
-                disc_to_id = row["disc_2"]
-                parameter_id = row["var_name"]
-                if p["id"] == parameter_id:
-                    out_links.append({"link":
-                                     disc_from_id + "_TO_" + parameter_id + "_TYPE_OUTPUT OF", "node": disc_from_id})
-                    in_links.append({"link":
-                                    parameter_id + "_TO_" + disc_to_id + "_TYPE_INPUT OF", "node": disc_to_id})
-            p["in_links"] = in_links
-            p["out_links"] = out_links
+            in_links, out_links = parameter_links_dict.get(p["id"], ([], []))
+            p["in_links"] = list(in_links)
+            p["out_links"] = list(out_links)
     else:
         logger.info("Coupling Matrix is empty")
 
     # adding the list of parameters linked to each children for each node
     for node in tree_nodes:
-        in_parameter_list = []
-        out_parameter_list = []
-
-        idList = node["childrenIDs"] + [node["id"]]
+        id_set = set(node["childrenIDs"])
+        id_set.add(node["id"])
 
-        for p in coupling_links:
-            if p["Type"] == "OUTPUT_OF":
-                if p["source"] in idList:
-                    out_parameter_list.append(p["id"])
-            elif p["Type"] == "INPUT_TO":
-                if p["target"] in idList:
-                    in_parameter_list.append(p["id"])
+        out_positions = []
+        in_positions = []
+        for node_id in id_set:
+            out_positions.extend(output_links_by_discipline.get(node_id, []))
+            in_positions.extend(input_links_by_discipline.get(node_id, []))
 
-        node["in_parameter_list"] = in_parameter_list
-        node["out_parameter_list"] = out_parameter_list
+        # keep coupling links order
+        node["in_parameter_list"] = [coupling_links[position]["id"] for position in sorted(in_positions)]
+        node["out_parameter_list"] = [coupling_links[position]["id"] for position in sorted(out_positions)]
 
     coupling_matrix_dict = dict({"nodes": tree_nodes + parameter_nodes,
                                "links": hierarchy_links + coupling_links,
@@ -158,10 +174,95 @@ def get_couplings_force_graph(coupling_matrix_df, ontology_matrix_data):
     return coupling_matrix_dict
 
 
-def get_ancestors(treeview, starting_id):
-    ancestors = []
-    parent_id = treeview[starting_id]["Parent Node"]
-    while parent_id != "":
-        ancestors.append(parent_id)
-        parent_id = treeview[parent_id]["Parent Node"]
-    return ancestors
+def get_ancestors(treeview, starting_id, ancestors_dict=None):
+    """
+    Return the list of ancestors identifiers of a tree node, from its parent to the root node
+
+    :param treeview: tree nodes by identifier
+    :type treeview: dict
+
+    :param starting_id: identifier of the tree node
+    :type starting_id: str
+
+    :param ancestors_dict: optional memo of already computed ancestors by tree node identifier
+    :type ancestors_dict: dict
+    """
+    if ancestors_dict is None:
+        ancestors_dict = {}
+
+    if starting_id not in ancestors_dict:
+        # walk up until a node with already known ancestors is found
+        path = []
+        current_id = starting_id
+        while current_id not in ancestors_dict:
+            path.append(current_id)
+            parent_id = treeview[current_id]["Parent Node"]
+            if parent_id == "":
+                ancestors_dict[current_id] = []
+                path.pop()
+                break
+            current_id = parent_id
+
+        for node_id in reversed(path):
+            parent_id = treeview[node_id]["Parent Node"]
+            ancestors_dict[node_id] = [parent_id] + ancestors_dict[parent_id]
+
+    return ancestors_dict[starting_id]
+
+
+# tree node properties sent to the ontology with the reduced treeview
+N2_TREE_NODE_PROPERTIES = ["name", "label", "node_type", "full_namespace", "status", "model_name_full_path", "maturity"]
+N2_TREE_NODE_COLLECTIONS = ["data", "data_management_disciplines", "children"]
+DISCIPLINARY_IO_KEYS = ["disciplinary_inputs", "disciplinary_outputs"]
+
+
+def get_n2_treenode(tree_node, coupling_variables):
+    """
+    Build a serialized treeview reduced to what the ontology needs to generate the n2 matrix:
+    the tree structure and the coupling variables, without any variable value.
+    The treeview is read node by node so that it is never fully serialized.
+
+    :param tree_node: tree node (TreeNode or serialized tree node with 'data', 'data_management_disciplines'
+        and 'children' keys)
+    :type tree_node: TreeNode or dict
+
+    :param coupling_variables: full names of the coupling variables
+    :type coupling_variables: set
+
+    :return: reduced serialized tree node
+    :rtype: dict
+    """
+    if isinstance(tree_node, dict):
+        n2_tree_node = {key: value for key, value in tree_node.items() if key not in N2_TREE_NODE_COLLECTIONS}
+    else:
+        n2_tree_node = {key: getattr(tree_node, key) for key in N2_TREE_NODE_PROPERTIES if hasattr(tree_node, key)}
+
+    n2_tree_node["data"] = {name: _get_variable_without_value(data)
+                            for name, data in (_get_tree_node_collection(tree_node, "data") or {}).items()
+                            if name in coupling_variables}
+
+    n2_tree_node["data_management_disciplines"] = {}
+    disciplines = _get_tree_node_collection(tree_node, "data_management_disciplines") or {}
+    for disc_name, discipline in disciplines.items():
+        if not isinstance(discipline, dict):
+            discipline = discipline.to_dict()
+        n2_discipline = {key: value for key, value in discipline.items() if key not in DISCIPLINARY_IO_KEYS}
+        for io_key in DISCIPLINARY_IO_KEYS:
+            if io_key in discipline:
+                n2_discipline[io_key] = {name: _get_variable_without_value(data)
+                                         for name, data in discipline[io_key].items()
+                                         if name in coupling_variables}
+        n2_tree_node["data_management_disciplines"][disc_name] = n2_discipline
+
+    n2_tree_node["children"] = [get_n2_treenode(child, coupling_variables)
+                                for child in _get_tree_node_collection(tree_node, "children") or []]
+
+    return n2_tree_node
+
+
+def _get_tree_node_collection(tree_node, key):
+    return tree_node.get(key) if isinstance(tree_node, dict) else getattr(tree_node, key, None)
+
+
+def _get_variable_without_value(variable_data):
+    return {key: value for key, value in variable_data.items() if key != "value"}
@@ -30,13 +30,26 @@ class SoSExecutionWorkflow:
     Class to construct an execution workflow from GEMS execution sequence
     """
 
-    def __init__(self, gems_graph=None):
+    def __init__(self, gems_graph=None, max_parallel_nodes=None):
         """
         Constructor
+
+        :param gems_graph: coupling structure graph of the root process
+        :param max_parallel_nodes: maximum number of nodes displayed in a parallel node (None for no limit),
+            the remaining ones are summarised into a single node
+        :type max_parallel_nodes: int
         """
         self.gems_graph = gems_graph
         self.nodes_dict = {}
         self.links_dict = {}
+        # links identifiers indexed by source node and by target node
+        self.links_from_index = {}
+        self.links_to_index = {}
+        # ancestors identifiers of each node, from its parent up to the root
+        self.ancestors_dict = {}
+        self.max_parallel_nodes = max_parallel_nodes
+        # summary node identifier of each summarised discipline
+        self.summarised_nodes = {}
         self.unique_disc = set()
         self.unique_parameters = set()
         self.step_count = 0
@@ -58,6 +71,8 @@ class SoSExecutionWorkflow:
 
         self.create_study_output_links()
 
+        self.summarise_links()
+
         self.create_cluster_links()
 
         self.create_dot_graph()
@@ -253,7 +268,7 @@ class SoSExecutionWorkflow:
                         "parameters": {p for p in parameters_list},
                         "type": "couplingLink",
                     }
-                    self.links_dict[link_id] = link
+                    self.add_link(link)
 
         # creating a dictionary of parameter and emitter discipline id
         parameter_input_disc = {}
@@ -289,7 +304,7 @@ class SoSExecutionWorkflow:
                         "parameters": {p for p in parameters_list},
                         "type": "couplingLink",
                     }
-                    self.links_dict[link_id] = link
+                    self.add_link(link)
 
     def create_mda_node(self, cycle_disc, level, parent_id, gems_graph):
 
@@ -331,7 +346,14 @@ class SoSExecutionWorkflow:
             children=[],
             is_MDA=False,
         )
-        for cycle_disc in parallel_tasks:
+        # too many parallel tasks (large scatter or DOE), the last ones are summarised into one node
+        displayed_tasks = parallel_tasks
+        summarised_tasks = []
+        if self.max_parallel_nodes is not None and len(parallel_tasks) > self.max_parallel_nodes:
+            displayed_tasks = parallel_tasks[:self.max_parallel_nodes]
+            summarised_tasks = parallel_tasks[self.max_parallel_nodes:]
+
+        for cycle_disc in displayed_tasks:
             if len(cycle_disc) > 1:
                 MDAnode = self.create_mda_node(
                     cycle_disc=cycle_disc,
@@ -352,9 +374,92 @@ class SoSExecutionWorkflow:
 
                 parallel_node_info["children"].append(node["id"])
 
+        if len(summarised_tasks) > 0:
+            summary_node = self.create_summary_node(
+                summarised_tasks=summarised_tasks,
+                level=level + 1,
+                parent_id=parallel_node_id,
+            )
+            parallel_node_info["children"].append(summary_node["id"])
+
         self.nodes_dict[parallel_node_id] = parallel_node_info
         return parallel_node_info
 
+    def create_summary_node(self, summarised_tasks, level, parent_id):
+        """
+        Create a single node standing for several parallel tasks, links of the summarised disciplines
+        are redirected to it (see summarise_links)
+        """
+        summary_node_id = f"{parent_id}Summary"
+        summarised_disciplines_count = 0
+        for cycle_disc in summarised_tasks:
+            for disc in cycle_disc:
+                self.summarised_nodes[disc.disc_id] = summary_node_id
+                summarised_disciplines_count += 1
+
+        summary_node_info = dict(
+            id=summary_node_id,
+            type="DisciplineNode",
+            disc_name="",
+            label=f"{summarised_disciplines_count} more disciplines",
+            status="",
+            level=level,
+            parent=parent_id,
+            path="",
+            children=[],
+            is_MDA=False,
+            summarised_count=summarised_disciplines_count,
+        )
+        self.nodes_dict[summary_node_id] = summary_node_info
+        return summary_node_info
+
+    def summarise_links(self):
+        """
+        Redirect the links of the summarised disciplines to their summary node
+        """
+        if len(self.summarised_nodes) == 0:
+            return
+
+        links = list(self.links_dict.values())
+        self.links_dict = {}
+        self.links_from_index = {}
+        self.links_to_index = {}
+
+        for link in links:
+            from_id = self.summarised_nodes.get(link["from"], link["from"])
+            to_id = self.summarised_nodes.get(link["to"], link["to"])
+            if from_id == to_id:
+                continue
+
+            link_id = f"{from_id}->{to_id}"
+            if link_id in self.links_dict:
+                self.links_dict[link_id]["parameters"] = self.links_dict[link_id]["parameters"].union(
+                    link["parameters"],
+                )
+            else:
+                self.add_link(dict(link, id=link_id, **{"from": from_id, "to": to_id}))
+
+    def add_link(self, link):
+        """
+        Register a link and index it by its source and target nodes
+        """
+        self.links_dict[link["id"]] = link
+        self.links_from_index.setdefault(link["from"], []).append(link["id"])
+        self.links_to_index.setdefault(link["to"], []).append(link["id"])
+
+    def get_ancestors(self, node_id):
+        """
+        Return the ancestors identifiers of a node, from its parent up to the root (memoised)
+        """
+        if node_id not in self.ancestors_dict:
+            parent_id = self.nodes_dict[node_id]["parent"]
+            if parent_id is None:
+                self.ancestors_dict[node_id] = []
+            else:
+                self.ancestors_dict[node_id] = [parent_id] + self.get_ancestors(parent_id)
+
+        return self.ancestors_dict[node_id]
+
     def get_initial_links(self, gems_graph):
         couplings = gems_graph.get_disciplines_couplings()
         for (disc_from, disc_to, edge_parameters_list) in couplings:
@@ -369,7 +474,7 @@ class SoSExecutionWorkflow:
                     "parameters": set(),
                     "type": "couplingLink",
                 }
-                self.links_dict[link_id] = link
+                self.add_link(link)
                 for output_param in edge_parameters_list:
                     output_param_data = disc_from.ee.dm.get_data(output_param)
                     param_usage_name = f'{disc_from.get_module()}_{output_param_data.get("io_type","")}put_{output_param_data.get("var_name","")}'
@@ -417,7 +522,7 @@ class SoSExecutionWorkflow:
                         "parameters": parameters,
                         "type": "outputLink",
                     }
-                    self.links_dict[link_id] = link
+                    self.add_link(link)
 
     def create_cluster_links(self):
         # create in and out links from / to parents of disc nodes
@@ -445,29 +550,18 @@ class SoSExecutionWorkflow:
         node["inLinks"] = []
         node["outLinks"] = []
 
-        inLinksDict = {
-            link_id: link
-            for (link_id, link) in self.links_dict.items()
-            if link["to"] == node["id"]
-        }
-        outLinksDict = {
-            link_id: link
-            for (link_id, link) in self.links_dict.items()
-            if link["from"] == node["id"]
-        }
-
-        inLinksList = list(inLinksDict.keys())
-        outLinksList = list(outLinksDict.keys())
+        # snapshot of the current links of the node, parent links created below are not walked
+        inLinksList = list(self.links_to_index.get(node["id"], []))
+        outLinksList = list(self.links_from_index.get(node["id"], []))
+        inLinks = [self.links_dict[link_id] for link_id in inLinksList]
+        outLinks = [self.links_dict[link_id] for link_id in outLinksList]
 
         if len(inLinksList) > 0 or len(outLinksList) > 0:
             node["hasLinks"] = True
 
         # create out links to parent group nodes
-        for outlink in outLinksDict.values():
-            discToId = outlink["to"]
-            discTo = self.nodes_dict[discToId]
-            parent_id = discTo["parent"]
-            while parent_id is not None:
+        for outlink in outLinks:
+            for parent_id in self.get_ancestors(outlink["to"]):
                 if outlink["from"] != parent_id:
                     link_id = f'{outlink["from"]}->{parent_id}'
                     if link_id not in self.links_dict:
@@ -479,22 +573,17 @@ class SoSExecutionWorkflow:
                             "parameters": outlink["parameters"],
                             "type": outlink["type"],
                         }
-                        self.links_dict[link_id] = link
+                        self.add_link(link)
                         outLinksList.append(link_id)
                     else:
                         parameters = self.links_dict[link_id]["parameters"].union(
                             outlink["parameters"],
                         )
                         self.links_dict[link_id]["parameters"] = parameters
-                discToParent = self.nodes_dict[parent_id]
-                parent_id = discToParent["parent"]
 
         # create in links to parent group nodes
-        for inlink in inLinksDict.values():
-            discFromId = inlink["from"]
-            discFrom = self.nodes_dict[discFromId]
-            parent_id = discFrom["parent"]
-            while parent_id is not None:
+        for inlink in inLinks:
+            for parent_id in self.get_ancestors(inlink["from"]):
                 if inlink["to"] != parent_id:
                     link_id = f'{parent_id}->{inlink["to"]}'
                     if link_id not in self.links_dict:
@@ -506,15 +595,13 @@ class SoSExecutionWorkflow:
                             "parameters": inlink["parameters"],
                             "type": inlink["type"],
                         }
-                        self.links_dict[link_id] = link
+                        self.add_link(link)
                         inLinksList.append(link_id)
                     else:
                         parameters = self.links_dict[link_id]["parameters"].union(
                             inlink["parameters"],
                         )
                         self.links_dict[link_id]["parameters"] = parameters
-                discFromParent = self.nodes_dict[parent_id]
-                parent_id = discFromParent["parent"]
 
         node["inLinks"] = inLinksList
         node["outLinks"] = outLinksList
@@ -660,7 +747,7 @@ class SoSExecutionWorkflow:
                             # 'type': 'scatterDataLink',
                             "type": "couplingLink",
                         }
-                        self.links_dict[new_link_id] = link
+                        self.add_link(link)
                     else:
                         self.links_dict[new_link_id]["parameters"].add(
                             scatter_param_name,
@@ -712,7 +799,7 @@ class SoSExecutionWorkflow:
                             # 'type': 'scatterDataLink',
                             "type": "couplingLink",
                         }
-                        self.links_dict[new_link_id] = link
+                        self.add_link(link)
                     else:
                         self.links_dict[new_link_id]["parameters"].add(
                             scatter_param_name,
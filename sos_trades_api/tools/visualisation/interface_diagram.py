@@ -18,12 +18,30 @@ from graphviz import Digraph
 from sostrades_core.study_manager.base_study_manager import BaseStudyManager
 from sostrades_core.study_manager.study_manager import StudyManager
 
-from sos_trades_api.controllers.sostrades_data.ontology_controller import load_ontology
-
 
 class InterfaceDiagramGenerator:
-    def __init__(self, study: StudyManager, draw_subgraphs=True):
+
+    COLLAPSED_CLASSNAME = "SubProcess"
+
+    def __init__(self, study: StudyManager, draw_subgraphs=True, max_depth=None):
+        """
+        Constructor
+
+        :param study: study to generate the interface diagram from
+        :param draw_subgraphs: draw namespaces as graphviz clusters
+        :param max_depth: level of detail, disciplines deeper than this namespace depth are collapsed
+            into one node per sub-process (None to display all disciplines)
+        :type max_depth: int
+        """
         self.study = study
+        self.max_depth = max_depth
+        # caches of the discipline node identifiers and parameters data, to avoid recomputing them
+        # for each coupling
+        self.__disciplines_node_id = {}
+        self.__parameters_data = {}
+        self.__base_namespaces = {}
+        # collapsed node identifier of each collapsed discipline identifier
+        self.collapsed_disc_ids = {}
         self.coupling_graph = (
             self.study.execution_engine.root_process.coupling_structure.graph
         )
@@ -88,7 +106,10 @@ class InterfaceDiagramGenerator:
         discipline_node_list = []
         base_namespace_list = list(self.base_namespace_dict.keys())
         unique_disc_ids = set()
+        collapsed_nodes_dict = {}
         for ns_node, disc_list in self.disciplines_dict.items():
+            # remove study name from namespace
+            namespace = ".".join(ns_node.split(".")[1:])
             for disc_dict in disc_list:
                 disc = disc_dict["reference"]
                 label = ""
@@ -107,17 +128,25 @@ class InterfaceDiagramGenerator:
                 if classname == "ProxyDiscipline":
                     classname = type(disc.discipline_wrapp.wrapper).__name__
                 if classname not in ["SoSCoupling", "ProxyCoupling"]:
-                    disc_id = ".".join(ns_node.split(".")[1:]) + "." + classname
+                    disc_id = namespace + "." + classname
                     if disc_id not in unique_disc_ids:
                         unique_disc_ids.add(disc_id)
-                        namespace = ".".join(ns_node.split(".")[1:])
-                        base_namespace = self.get_base_namespace(
+                        if self.is_collapsed_namespace(namespace):
+                            self.collapse_discipline(
+                                disc_id=disc_id,
+                                namespace=namespace,
+                                collapsed_nodes_dict=collapsed_nodes_dict,
+                                discipline_node_list=discipline_node_list,
+                                base_namespace_list=base_namespace_list,
+                            )
+                            continue
+                        base_namespace = self.get_discipline_base_namespace(
                             namespace=namespace, base_namespace_list=base_namespace_list,
                         )
                         disc_node_info = {
                             "id": disc_id,
                             "type": "DisciplineNode",
-                            "namespace": ".".join(ns_node.split(".")[1:]),
+                            "namespace": namespace,
                             "cluster": base_namespace,
                             "classname": classname,
                             # 'model_name':disc_dict.get('model_name',None),
@@ -129,136 +158,164 @@ class InterfaceDiagramGenerator:
                         discipline_node_list.append(disc_node_info)
         return discipline_node_list
 
+    def is_collapsed_namespace(self, namespace: str) -> bool:
+        """
+        Check if disciplines of the given namespace are collapsed regarding the level of detail
+        """
+        return self.max_depth is not None and namespace != "" and len(namespace.split(".")) > self.max_depth
+
+    def collapse_discipline(self, disc_id: str, namespace: str, collapsed_nodes_dict: dict,
+                            discipline_node_list: list, base_namespace_list: list) -> None:
+        """
+        Gather a discipline into the node of its sub-process at max_depth level
+        """
+        collapsed_namespace = ".".join(namespace.split(".")[:self.max_depth])
+        collapsed_disc_id = f"{collapsed_namespace}.{self.COLLAPSED_CLASSNAME}"
+        self.collapsed_disc_ids[disc_id] = collapsed_disc_id
+
+        if collapsed_disc_id not in collapsed_nodes_dict:
+            collapsed_node_info = {
+                "id": collapsed_disc_id,
+                "type": "DisciplineNode",
+                "namespace": collapsed_namespace,
+                "cluster": self.get_discipline_base_namespace(
+                    namespace=collapsed_namespace, base_namespace_list=base_namespace_list,
+                ),
+                "classname": self.COLLAPSED_CLASSNAME,
+                "model_name_full_path": None,
+                "ontology_label": "",
+                "collapsed_disciplines_count": 0,
+            }
+            collapsed_nodes_dict[collapsed_disc_id] = collapsed_node_info
+            discipline_node_list.append(collapsed_node_info)
+
+        collapsed_nodes_dict[collapsed_disc_id]["collapsed_disciplines_count"] += 1
+
+    def get_discipline_node_id(self, disc) -> str:
+        """
+        Return the discipline node identifier (namespace without study name and classname) of a discipline
+        """
+        disc_key = id(disc)
+        if disc_key not in self.__disciplines_node_id:
+            classname = type(disc).__name__
+            if classname == "ProxyDiscipline":
+                classname = type(disc.discipline_wrapp.wrapper).__name__
+            self.__disciplines_node_id[disc_key] = (
+                ".".join(disc.get_disc_full_name().split(".")[1:]) + "." + classname
+            )
+        return self.__disciplines_node_id[disc_key]
+
+    def get_parameter_data(self, parameter_full_name: str) -> dict:
+        """
+        Return the data needed to build a parameter node, retrieved once from the data manager
+        """
+        if parameter_full_name not in self.__parameters_data:
+            data = self.study.ee.dm.get_data(parameter_full_name)
+            parameter_type = data.get("type", "")
+            descriptor = None
+            value = data.get("value", None)
+            if value is not None:
+                if parameter_type == "dataframe":
+                    descriptor = list(value.columns)
+                elif parameter_type == "dict":
+                    descriptor = list(value.keys())
+
+            self.__parameters_data[parameter_full_name] = {
+                "id": ".".join(parameter_full_name.split(".")[1:]),
+                "parameter_name": data.get("var_name", ""),
+                "datatype": parameter_type,
+                "unit": data.get("unit", ""),
+                "descriptor": descriptor,
+                "model_origin": data.get("model_origin", None),
+            }
+        return self.__parameters_data[parameter_full_name]
+
     def generate_parameters_and_links_data(self, discipline_node_list: list) -> tuple:
         links_list = []
         parameters_list = []
         unique_links_ids = set()
         unique_parameters_ids = set()
-        parameters_node_info = None
-        try:
-            for (disc_from, disc_to, edge_parameters_list) in self.couplings_list:
-                disc_from_classname = type(disc_from).__name__
-                if disc_from_classname == "ProxyDiscipline":
-                    disc_from_classname = type(
-                        disc_from.discipline_wrapp.wrapper,
-                    ).__name__
-                disc_from_id = (
-                    ".".join(disc_from.get_disc_full_name().split(".")[1:])
-                    + "."
-                    + disc_from_classname
-                )
-                disc_to_classname = type(disc_to).__name__
-                if disc_to_classname == "ProxyDiscipline":
-                    disc_to_classname = type(disc_to.discipline_wrapp.wrapper).__name__
-                disc_to_id = (
-                    ".".join(disc_to.get_disc_full_name().split(".")[1:])
-                    + "."
-                    + disc_to_classname
-                )
-                disc_from_namespace_list = [
-                    d["namespace"] for d in discipline_node_list if d["id"] == disc_from_id
-                ]
-                disc_from_namespace = (
-                    disc_from_namespace_list[0]
-                    if disc_from_namespace_list
-                    else disc_from_id
-                )
-
-                disc_to_namespace_list = [
-                    d["namespace"] for d in discipline_node_list if d["id"] == disc_to_id
-                ]
-                disc_to_namespace = (
-                    disc_to_namespace_list[0] if disc_to_namespace_list else disc_to_id
-                )
-
-                for output_param in edge_parameters_list:
-                    param_id = ".".join(output_param.split(".")[1:])
-                    output_param_data = disc_from.ee.dm.get_data(output_param)
-                    parameter_name = output_param_data.get("var_name", "")
-                    parameter_type = output_param_data.get("type", "")
-                    descriptor = None
-                    value = output_param_data.get("value", None)
-                    if value is not None:
-                        if parameter_type == "dataframe":
-                            descriptor = list(value.columns)
-                        elif parameter_type == "dict":
-                            descriptor = list(value.keys())
-
-                    # by default, we retrieve the namespace of the discipline outputting this parameter
-                    parameter_namespace = disc_from_namespace
-
-                    # check if disc_from is a coupling
-                    if type(disc_from).__name__ == "SoSCoupling":
-                        # in that case, we will try to found the real discipline from which the parameter is outputting
-                        disc_origin_uuid = self.study.ee.dm.get_data(output_param)[
-                            "model_origin"
-                        ]
-                        disc_origin = self.study.ee.dm.get_discipline(disc_origin_uuid)
-                        disc_from_id = (
-                            ".".join(disc_origin.get_disc_full_name().split(".")[1:])
-                            + "."
-                            + type(disc_origin).__name__
-                        )
-                        disc_origin_namespace_list = [
-                            d["namespace"]
-                            for d in discipline_node_list
-                            if d["id"] == disc_from_id
-                        ]
-                        parameter_namespace = (
-                            disc_origin_namespace_list[0]
-                            if disc_origin_namespace_list
-                            else disc_from_id
-                        )
-                    if type(disc_to).__name__ == "SoSCoupling":
-                        # case that is not yet taken into account
-                        print("parameter going to a SoSCouling, not taken care of")
-
-                    # add parameter node if does not exists
-                    if param_id not in unique_parameters_ids:
-                        unique_parameters_ids.add(param_id)
-                        parameters_node_info = {
-                            "id": param_id,
-                            "namespace": parameter_namespace,
-                            "type": "ParameterNode",
-                            "parameter_name": parameter_name,
-                            "datatype": parameter_type,
-                            "unit": output_param_data.get("unit", ""),
-                            "descriptor": descriptor,
-                        }
-                    parameters_list.append(parameters_node_info)
-
-                    # add link from out disc to parameter and from parameter to in
-                    # disc
-                    out_link_id = f"{disc_from_id}->{param_id}"
-                    in_link_id = f"{param_id}->{disc_to_id}"
-                    weight = 0
-                    if out_link_id not in unique_links_ids:
-                        unique_links_ids.add(out_link_id)
-                        out_link_info = {
-                            "id": out_link_id,
-                            "from": disc_from_id,
-                            "to": param_id,
-                            "constraint": "false",
-                            "weight": weight,
-                        }
-                        links_list.append(out_link_info)
-                    if in_link_id not in unique_links_ids:
-                        unique_links_ids.add(in_link_id)
-                        constraint = "true"
-                        if disc_from_namespace == disc_to_namespace:
-                            constraint = "false"
-                            weight = 3
-                        in_link_info = {
-                            "id": in_link_id,
-                            "from": param_id,
-                            "to": disc_to_id,
-                            "constraint": constraint,
-                            "weight": weight,
-                        }
-                        links_list.append(in_link_info)
-            return parameters_list, links_list
-        except Exception as ex:
-            raise ex
+        # namespace of each discipline node
+        namespaces_dict = {}
+        for disc_node in discipline_node_list:
+            namespaces_dict.setdefault(disc_node["id"], disc_node["namespace"])
+
+        for (disc_from, disc_to, edge_parameters_list) in self.couplings_list:
+            disc_from_id = self.get_discipline_node_id(disc_from)
+            disc_from_id = self.collapsed_disc_ids.get(disc_from_id, disc_from_id)
+            disc_to_id = self.get_discipline_node_id(disc_to)
+            disc_to_id = self.collapsed_disc_ids.get(disc_to_id, disc_to_id)
+
+            if disc_from_id == disc_to_id and disc_to_id.endswith(f".{self.COLLAPSED_CLASSNAME}"):
+                # exchanges inside a collapsed sub-process are not displayed
+                continue
+
+            disc_from_namespace = namespaces_dict.get(disc_from_id, disc_from_id)
+            disc_to_namespace = namespaces_dict.get(disc_to_id, disc_to_id)
+
+            for output_param in edge_parameters_list:
+                parameter_data = self.get_parameter_data(output_param)
+                param_id = parameter_data["id"]
+
+                # by default, we retrieve the namespace of the discipline outputting this parameter
+                parameter_namespace = disc_from_namespace
+                param_disc_from_id = disc_from_id
+
+                # check if disc_from is a coupling
+                if type(disc_from).__name__ == "SoSCoupling":
+                    # in that case, we will try to found the real discipline from which the parameter is outputting,
+                    # for each parameter and with the same identifier as its discipline node (wrapper classname)
+                    disc_origin = self.study.ee.dm.get_discipline(parameter_data["model_origin"])
+                    param_disc_from_id = self.get_discipline_node_id(disc_origin)
+                    param_disc_from_id = self.collapsed_disc_ids.get(param_disc_from_id, param_disc_from_id)
+                    parameter_namespace = namespaces_dict.get(param_disc_from_id, param_disc_from_id)
+                if type(disc_to).__name__ == "SoSCoupling":
+                    # case that is not yet taken into account
+                    print("parameter going to a SoSCouling, not taken care of")
+
+                # add parameter node if does not exists
+                if param_id not in unique_parameters_ids:
+                    unique_parameters_ids.add(param_id)
+                    parameters_list.append({
+                        "id": param_id,
+                        "namespace": parameter_namespace,
+                        "type": "ParameterNode",
+                        "parameter_name": parameter_data["parameter_name"],
+                        "datatype": parameter_data["datatype"],
+                        "unit": parameter_data["unit"],
+                        "descriptor": parameter_data["descriptor"],
+                    })
+
+                # add link from out disc to parameter and from parameter to in
+                # disc
+                out_link_id = f"{param_disc_from_id}->{param_id}"
+                in_link_id = f"{param_id}->{disc_to_id}"
+                weight = 0
+                if out_link_id not in unique_links_ids:
+                    unique_links_ids.add(out_link_id)
+                    out_link_info = {
+                        "id": out_link_id,
+                        "from": param_disc_from_id,
+                        "to": param_id,
+                        "constraint": "false",
+                        "weight": weight,
+                    }
+                    links_list.append(out_link_info)
+                if in_link_id not in unique_links_ids:
+                    unique_links_ids.add(in_link_id)
+                    constraint = "true"
+                    if disc_from_namespace == disc_to_namespace:
+                        constraint = "false"
+                        weight = 3
+                    in_link_info = {
+                        "id": in_link_id,
+                        "from": param_id,
+                        "to": disc_to_id,
+                        "constraint": constraint,
+                        "weight": weight,
+                    }
+                    links_list.append(in_link_info)
+        return parameters_list, links_list
 
     def create_dot_graph(
         self, discipline_node_list: list, parameter_nodes_list: list, links_list: list,
@@ -279,7 +336,16 @@ class InterfaceDiagramGenerator:
             # edge_attr={'minlen':'0'},
         )
         if self.draw_subgraphs:
-            main_nodes = [n for n in discipline_node_list if n["namespace"] == ""]
+            # nodes positions indexed by namespace, to draw each subgraph without scanning all nodes
+            self.discipline_nodes_by_namespace = self.index_nodes_by_namespace(discipline_node_list)
+            self.parameter_nodes_by_namespace = self.index_nodes_by_namespace(parameter_nodes_list)
+            # collapsed sub-processes outside of the namespaces tree are drawn in the main graph
+            tree_namespaces = {ns for ns_list in self.base_namespace_dict.values() for ns in ns_list}
+            main_nodes = [
+                n for n in discipline_node_list
+                if n["namespace"] == ""
+                or (n["classname"] == self.COLLAPSED_CLASSNAME and n["namespace"] not in tree_namespaces)
+            ]
             # draw discipline nodes
             for node_dict in main_nodes:
                 self.draw_discipline_node(digraph=dot, node_info_dict=node_dict)
@@ -403,6 +469,16 @@ class InterfaceDiagramGenerator:
                 node_base_namespace = base_ns
         return node_base_namespace
 
+    def get_discipline_base_namespace(self, namespace: str, base_namespace_list: list) -> str:
+        """
+        Memoised get_base_namespace for disciplines nodes, several disciplines share the same namespace
+        """
+        if namespace not in self.__base_namespaces:
+            self.__base_namespaces[namespace] = self.get_base_namespace(
+                namespace=namespace, base_namespace_list=base_namespace_list,
+            )
+        return self.__base_namespaces[namespace]
+
     def generate_base_namespace_dict(self, base_discipline_dict: dict) -> dict:
         # namespace list
         base_namespace_list = self.get_namespace_list(base_discipline_dict)
@@ -483,22 +559,22 @@ class InterfaceDiagramGenerator:
                 subgraph_nodes_namespace_list = subgraph_children_list.get(
                     "disciplines", [],
                 )
-                subgraph_nodes = [
-                    n
-                    for n in discipline_node_list
-                    if n["namespace"] in subgraph_nodes_namespace_list
-                ]
+                subgraph_nodes = self.get_nodes_in_namespaces(
+                    nodes_list=discipline_node_list,
+                    nodes_by_namespace=self.discipline_nodes_by_namespace,
+                    namespace_list=subgraph_nodes_namespace_list,
+                )
 
                 # draw discipline nodes
                 for node_dict in subgraph_nodes:
                     self.draw_discipline_node(
                         digraph=subgraph, node_info_dict=node_dict,
                     )
-                subgraph_parameters_nodes = [
-                    n
-                    for n in parameter_nodes_list
-                    if n["namespace"] in subgraph_nodes_namespace_list
-                ]
+                subgraph_parameters_nodes = self.get_nodes_in_namespaces(
+                    nodes_list=parameter_nodes_list,
+                    nodes_by_namespace=self.parameter_nodes_by_namespace,
+                    namespace_list=subgraph_nodes_namespace_list,
+                )
                 # draw parameter nodes
                 for node_dict in subgraph_parameters_nodes:
                     self.draw_parameter_node(digraph=subgraph, node_info_dict=node_dict)
@@ -515,7 +591,30 @@ class InterfaceDiagramGenerator:
                     )
         return parent_graph
 
+    def index_nodes_by_namespace(self, nodes_list: list) -> dict:
+        """
+        Return the positions of the nodes in the given list, indexed by namespace
+        """
+        nodes_by_namespace = {}
+        for position, node in enumerate(nodes_list):
+            nodes_by_namespace.setdefault(node["namespace"], []).append(position)
+        return nodes_by_namespace
+
+    def get_nodes_in_namespaces(self, nodes_list: list, nodes_by_namespace: dict, namespace_list: list) -> list:
+        """
+        Return the nodes belonging to one of the given namespaces, keeping the nodes list order
+        """
+        positions = []
+        for namespace in set(namespace_list):
+            positions.extend(nodes_by_namespace.get(namespace, []))
+        return [nodes_list[position] for position in sorted(positions)]
+
     def add_ontology_metadata_to_parameter(self, parameter_nodes_list: list) -> list:
+        # the ontology controller needs the server, imported only when the diagram is generated
+        from sos_trades_api.controllers.sostrades_data.ontology_controller import (
+            load_ontology,
+        )
+
         parameter_list = [
             p["parameter_name"].split(".")[-1] for p in parameter_nodes_list
         ]
@@ -539,14 +638,16 @@ class InterfaceDiagramGenerator:
     def filter_discipline_with_no_exchanges(
         self, discipline_node_list: list, links_list: list,
     ) -> list:
+        # count links of each node in one pass
+        links_count = {}
+        for link in links_list:
+            for node_id in {link["from"], link["to"]}:
+                links_count[node_id] = links_count.get(node_id, 0) + 1
+
         filtered_discipline_node_list = []
         for disc_dict in discipline_node_list:
-            disc_links = [
-                link["id"]
-                for link in links_list
-                if link["from"] == disc_dict["id"] or link["to"] == disc_dict["id"]
-            ]
-            if len(disc_links) > 0:
-                disc_dict["couplings_number"] = len(disc_links)
+            couplings_number = links_count.get(disc_dict["id"], 0)
+            if couplings_number > 0:
+                disc_dict["couplings_number"] = couplings_number
                 filtered_discipline_node_list.append(disc_dict)
         return filtered_discipline_node_list